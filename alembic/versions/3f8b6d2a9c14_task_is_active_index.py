@@ -0,0 +1,37 @@
+"""task is_active index
+
+Revision ID: 3f8b6d2a9c14
+Revises: 7a2d4e9b1f38
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8b6d2a9c14'
+down_revision: Union[str, None] = '7a2d4e9b1f38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Индекс фильтра по активности без исполнителя: первая и следующие страницы /tasks/?is_active= читаются
+# по индексу в порядке id. Индекс создается с CONCURRENTLY, как в миграции 9d3f5a0c7e21.
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_is_active_id',
+            'tasks',
+            ['is_active', 'id'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_is_active_id', table_name='tasks', if_exists=True, postgresql_concurrently=True)
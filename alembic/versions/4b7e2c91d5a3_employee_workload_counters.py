@@ -0,0 +1,150 @@
+"""employee workload counters
+
+Revision ID: 4b7e2c91d5a3
+Revises: eeb067e5f5fc
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2c91d5a3'
+down_revision: Union[str, None] = 'eeb067e5f5fc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# DDL триггеров счетчиков задан в миграции как на момент этой ревизии, а не импортируется
+# из app.models.workload: последующие изменения моделей не должны менять уже примененную миграцию.
+
+# Функция триггеров PostgreSQL: счетчики задач сотрудников обновляются один раз на запрос
+# по таблицам переходов (вставленные, измененные и удаленные строки), а не на каждую строку.
+POSTGRESQL_WORKLOAD_FUNCTION = """
+CREATE OR REPLACE FUNCTION tasks_update_workload() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE employees
+        SET task_count = task_count + delta.total, active_task_count = active_task_count + delta.active
+        FROM (
+            SELECT executor_id, count(*) AS total, count(*) FILTER (WHERE is_active) AS active
+            FROM new_rows WHERE executor_id IS NOT NULL GROUP BY executor_id
+        ) AS delta
+        WHERE employees.id = delta.executor_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE employees
+        SET task_count = task_count - delta.total, active_task_count = active_task_count - delta.active
+        FROM (
+            SELECT executor_id, count(*) AS total, count(*) FILTER (WHERE is_active) AS active
+            FROM old_rows WHERE executor_id IS NOT NULL GROUP BY executor_id
+        ) AS delta
+        WHERE employees.id = delta.executor_id;
+    ELSE
+        UPDATE employees
+        SET task_count = task_count + delta.total, active_task_count = active_task_count + delta.active
+        FROM (
+            SELECT executor_id, sum(total) AS total, sum(active) AS active
+            FROM (
+                SELECT executor_id, 1 AS total, CASE WHEN is_active THEN 1 ELSE 0 END AS active FROM new_rows
+                UNION ALL
+                SELECT executor_id, -1, CASE WHEN is_active THEN -1 ELSE 0 END FROM old_rows
+            ) AS changes
+            WHERE executor_id IS NOT NULL
+            GROUP BY executor_id
+        ) AS delta
+        WHERE employees.id = delta.executor_id AND (delta.total <> 0 OR delta.active <> 0);
+    END IF;
+
+    RETURN NULL;
+END
+$$
+"""
+
+# Триггеры по DDL-командам для каждого диалекта. В SQLite нет триггеров на запрос, поэтому счетчики
+# обновляются построчно, а изменение строки без смены исполнителя и активности пропускается.
+WORKLOAD_TRIGGERS = {
+    "postgresql": [
+        POSTGRESQL_WORKLOAD_FUNCTION,
+        "CREATE TRIGGER tasks_workload_insert AFTER INSERT ON tasks "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_update_workload()",
+        "CREATE TRIGGER tasks_workload_update AFTER UPDATE ON tasks "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION tasks_update_workload()",
+        "CREATE TRIGGER tasks_workload_delete AFTER DELETE ON tasks "
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_update_workload()",
+    ],
+    "sqlite": [
+        """
+        CREATE TRIGGER tasks_workload_insert AFTER INSERT ON tasks WHEN NEW.executor_id IS NOT NULL
+        BEGIN
+            UPDATE employees
+            SET task_count = task_count + 1, active_task_count = active_task_count + (NEW.is_active IS 1)
+            WHERE id = NEW.executor_id;
+        END
+        """,
+        """
+        CREATE TRIGGER tasks_workload_update AFTER UPDATE OF executor_id, is_active ON tasks
+        WHEN OLD.executor_id IS NOT NEW.executor_id OR OLD.is_active IS NOT NEW.is_active
+        BEGIN
+            UPDATE employees
+            SET task_count = task_count - 1, active_task_count = active_task_count - (OLD.is_active IS 1)
+            WHERE id = OLD.executor_id;
+            UPDATE employees
+            SET task_count = task_count + 1, active_task_count = active_task_count + (NEW.is_active IS 1)
+            WHERE id = NEW.executor_id;
+        END
+        """,
+        """
+        CREATE TRIGGER tasks_workload_delete AFTER DELETE ON tasks WHEN OLD.executor_id IS NOT NULL
+        BEGIN
+            UPDATE employees
+            SET task_count = task_count - 1, active_task_count = active_task_count - (OLD.is_active IS 1)
+            WHERE id = OLD.executor_id;
+        END
+        """,
+    ],
+}
+
+# Команды удаления триггеров для отката миграции.
+DROP_WORKLOAD_TRIGGERS = {
+    "postgresql": [
+        "DROP TRIGGER IF EXISTS tasks_workload_insert ON tasks",
+        "DROP TRIGGER IF EXISTS tasks_workload_update ON tasks",
+        "DROP TRIGGER IF EXISTS tasks_workload_delete ON tasks",
+        "DROP FUNCTION IF EXISTS tasks_update_workload()",
+    ],
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS tasks_workload_insert",
+        "DROP TRIGGER IF EXISTS tasks_workload_update",
+        "DROP TRIGGER IF EXISTS tasks_workload_delete",
+    ],
+}
+
+
+def upgrade() -> None:
+    op.add_column('employees', sa.Column('task_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('employees', sa.Column('active_task_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_employees_task_count'), 'employees', ['task_count'], unique=False)
+    op.create_index(op.f('ix_employees_active_task_count'), 'employees', ['active_task_count'], unique=False)
+
+    for statement in WORKLOAD_TRIGGERS.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+
+    # Заполнение счетчиков по существующим задачам (то же делает команда python -m app.cli repair-workload).
+    op.execute(
+        "UPDATE employees SET "
+        "task_count = (SELECT count(*) FROM tasks WHERE tasks.executor_id = employees.id), "
+        "active_task_count = (SELECT count(*) FROM tasks WHERE tasks.executor_id = employees.id AND tasks.is_active)"
+    )
+
+
+def downgrade() -> None:
+    for statement in DROP_WORKLOAD_TRIGGERS.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+
+    op.drop_index(op.f('ix_employees_active_task_count'), table_name='employees')
+    op.drop_index(op.f('ix_employees_task_count'), table_name='employees')
+    op.drop_column('employees', 'active_task_count')
+    op.drop_column('employees', 'task_count')
@@ -0,0 +1,28 @@
+"""row versions
+
+Revision ID: 5e0a9c3d71b4
+Revises: c41e8b7f2d06
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0a9c3d71b4'
+down_revision: Union[str, None] = 'c41e8b7f2d06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('employees', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('employees', 'version')
+    op.drop_column('tasks', 'version')
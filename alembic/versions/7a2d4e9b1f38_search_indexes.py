@@ -0,0 +1,52 @@
+"""search indexes
+
+Revision ID: 7a2d4e9b1f38
+Revises: 5e0a9c3d71b4
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2d4e9b1f38'
+down_revision: Union[str, None] = '5e0a9c3d71b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# GIN-индексы полнотекстового поиска (app.models.search) есть только в PostgreSQL: в SQLite поиск
+# выполняется без индекса. Выражение индекса должно совпадать с search_vector, иначе планировщик его не использует.
+# Индексы создаются с CONCURRENTLY, как в миграции 9d3f5a0c7e21.
+INDEXES = [
+    ('ix_tasks_title_search', 'tasks', 'title'),
+    ('ix_employees_full_name_search', 'employees', 'full_name'),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text(f"to_tsvector('simple', {column})")],
+                unique=False,
+                if_not_exists=True,
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,49 @@
+"""task filter indexes
+
+Revision ID: 9d3f5a0c7e21
+Revises: 4b7e2c91d5a3
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f5a0c7e21'
+down_revision: Union[str, None] = '4b7e2c91d5a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Индексы создаются с CONCURRENTLY, чтобы не блокировать запись в таблицу задач. CREATE INDEX CONCURRENTLY
+# нельзя выполнить в транзакции, поэтому миграция выполняется в autocommit_block. Если построение индекса
+# прервется, в PostgreSQL останется невалидный индекс: его нужно удалить (DROP INDEX) и повторить миграцию.
+INDEXES = [
+    ('ix_tasks_parent_task_id', ['parent_task_id'], None),
+    ('ix_tasks_deadline', ['deadline'], None),
+    ('ix_tasks_executor_id_is_active', ['executor_id', 'is_active'], None),
+    ('ix_tasks_active_executor_id', ['executor_id'], sa.text('is_active IS true')),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.create_index(
+                name,
+                'tasks',
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=where,
+                sqlite_where=where,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='tasks', if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""task deadline id index
+
+Revision ID: b62f0d8e4a17
+Revises: 3f8b6d2a9c14
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b62f0d8e4a17'
+down_revision: Union[str, None] = '3f8b6d2a9c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Индекс по сроку и id заменяет индекс ix_tasks_deadline: страницы /tasks/?order_by=deadline по курсору,
+# в том числе страницы задач без срока, читаются диапазоном индекса в порядке страницы, без досортировки по id.
+# Новый индекс создается до удаления старого, оба - с CONCURRENTLY, как в миграции 9d3f5a0c7e21.
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_deadline_id',
+            'tasks',
+            ['deadline', 'id'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_tasks_deadline', table_name='tasks', if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_deadline',
+            'tasks',
+            ['deadline'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_tasks_deadline_id', table_name='tasks', if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,29 @@
+"""updated_at columns
+
+Revision ID: c41e8b7f2d06
+Revises: 9d3f5a0c7e21
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e8b7f2d06'
+down_revision: Union[str, None] = '9d3f5a0c7e21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Существующие строки получают время применения миграции из значения по умолчанию.
+    op.add_column('tasks', sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.add_column('employees', sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('employees', 'updated_at')
+    op.drop_column('tasks', 'updated_at')
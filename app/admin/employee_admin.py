@@ -1,7 +1,17 @@
 from sqladmin import ModelView
 
+from app.cache import invalidate, invalidate_all
 from app.models.employee import Employee
+from app.models.task import Task
 
 
 class EmployeeAdmin(ModelView, model=Employee):
     column_list = [Employee.id, Employee.full_name]
+
+    async def after_model_change(self, data, model, is_created, request):
+        invalidate(Employee, [model.id])
+
+    async def after_model_delete(self, model, request):
+        invalidate(Employee, [model.id])
+        # Задачи удаленного сотрудника остаются без исполнителя.
+        invalidate_all(Task)
@@ -1,7 +1,14 @@
 from sqladmin import ModelView
 
+from app.cache import invalidate
 from app.models.task import Task
 
 
 class TaskAdmin(ModelView, model=Task):
     column_list = [Task.id, Task.title, Task.parent_task_id, Task.executor_id, Task.deadline, Task.is_active]
+
+    async def after_model_change(self, data, model, is_created, request):
+        invalidate(Task, [model.id])
+
+    async def after_model_delete(self, model, request):
+        invalidate(Task, [model.id])
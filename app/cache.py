@@ -0,0 +1,646 @@
+import asyncio
+import pickle
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, Awaitable, Callable, Iterable, NamedTuple, Sequence, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+import config
+from app.etag import make_etag
+
+T = TypeVar("T")
+
+# Количество ключей в одной команде удаления Redis.
+REDIS_DELETE_CHUNK_SIZE = 1000
+
+
+class CacheStats:
+    """
+    Потокобезопасные счетчики кэша.
+    Attributes:
+        hits (int): Количество найденных записей.
+        misses (int): Количество отсутствующих записей.
+        evictions (int): Количество записей, вытесненных из-за ограничения размера или истекшего времени жизни.
+        invalidations (int): Количество ключей, удаленных при изменении данных.
+        errors (int): Количество ошибок обращения к хранилищу кэша.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def add(self, name: str, value: int = 1) -> None:
+        """
+        Увеличение счетчика.
+        Args:
+            name (str): Имя счетчика.
+            value (int): Величина увеличения (по умолчанию 1).
+        Returns:
+            None
+        """
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self) -> dict:
+        """
+        Текущие значения счетчиков.
+        Returns:
+            dict: Словарь с ключами 'hits', 'misses', 'evictions', 'invalidations' и 'errors'.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+            }
+
+
+class NullCache:
+    """
+    Выключенный кэш: не хранит записей, каждое обращение - промах.
+    Версии данных таблиц ведутся в памяти процесса и при выключенном кэше: от них зависят результаты VersionedMemo.
+    Остальные хранилища наследуют от него интерфейс.
+    Attributes:
+        backend (str): Название хранилища.
+        stats (CacheStats): Счетчики кэша.
+    """
+    backend = "none"
+
+    def __init__(self):
+        self.stats = CacheStats()
+        self._versions: dict[str, int] = {}
+        self._versions_lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        """
+        Получение значения по ключу.
+        Args:
+            key (str): Ключ.
+        Returns:
+            Any | None: Значение или None, если записи нет.
+        """
+        self.stats.add("misses")
+
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Сохранение значения по ключу.
+        Args:
+            key (str): Ключ.
+            value (Any): Значение, отличное от None.
+        Returns:
+            None
+        """
+
+    def delete(self, keys: Iterable[str]) -> None:
+        """
+        Удаление записей по ключам.
+        Args:
+            keys (Iterable[str]): Ключи.
+        Returns:
+            None
+        """
+
+    def clear(self, prefix: str = "") -> None:
+        """
+        Удаление записей с ключами, начинающимися с prefix.
+        Args:
+            prefix (str): Префикс ключей (по умолчанию - все записи).
+        Returns:
+            None
+        """
+
+    def size(self) -> int | None:
+        """
+        Количество записей.
+        Returns:
+            int | None: Количество записей или None, если хранилище его не сообщает.
+        """
+        return 0
+
+    def get_versions(self, names: Sequence[str]) -> tuple[int, ...] | None:
+        """
+        Версии данных таблиц, увеличиваемые при каждом изменении таблицы через CRUD-функции.
+        Args:
+            names (Sequence[str]): Имена таблиц.
+        Returns:
+            tuple[int, ...] | None: Версии в порядке names или None, если хранилище версий недоступно.
+        """
+        return tuple(self._versions.get(name, 0) for name in names)
+
+    def bump_versions(self, names: Sequence[str]) -> None:
+        """
+        Увеличение версий данных таблиц.
+        Args:
+            names (Sequence[str]): Имена таблиц.
+        Returns:
+            None
+        """
+        with self._versions_lock:
+            for name in names:
+                self._versions[name] = self._versions.get(name, 0) + 1
+
+
+class MemoryCache(NullCache):
+    """
+    Кэш в памяти процесса с вытеснением давно не использованных записей (LRU) и временем жизни записи (TTL).
+    Attributes:
+        max_size (int): Максимальное количество записей.
+        ttl (float): Время жизни записи в секундах.
+    """
+    backend = "memory"
+
+    def __init__(self, max_size: int = config.CACHE_MAX_SIZE, ttl: float = config.CACHE_TTL):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[0] <= monotonic():
+                del self._entries[key]
+                self.stats.add("evictions")
+                entry = None
+
+            if entry is None:
+                self.stats.add("misses")
+                return None
+
+            self._entries.move_to_end(key)
+
+        self.stats.add("hits")
+
+        return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            evicted = max(len(self._entries) - self.max_size, 0)
+
+            for _ in range(evicted):
+                self._entries.popitem(last=False)
+
+        if evicted:
+            self.stats.add("evictions", evicted)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            deleted = sum(self._entries.pop(key, None) is not None for key in keys)
+
+        self.stats.add("invalidations", deleted)
+
+    def clear(self, prefix: str = "") -> None:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+
+            for key in keys:
+                del self._entries[key]
+
+        self.stats.add("invalidations", len(keys))
+
+    def size(self) -> int | None:
+        return len(self._entries)
+
+
+class RedisCache(NullCache):
+    """
+    Кэш в Redis (или совместимом по протоколу хранилище), общий для всех процессов приложения.
+    Значения сериализуются pickle, время жизни записи задается самому Redis, вытеснение по памяти
+    выполняет сервер, поэтому evictions клиентом не учитываются.
+    Ошибки соединения не прерывают запрос: чтение считается промахом, запись пропускается.
+    Attributes:
+        client (redis.Redis): Клиент Redis.
+        ttl (float): Время жизни записи в секундах.
+        prefix (str): Префикс ключей приложения.
+    """
+    backend = "redis"
+
+    def __init__(
+        self,
+        client: Any = None,
+        url: str = config.CACHE_REDIS_URL,
+        ttl: float = config.CACHE_TTL,
+        prefix: str = "tracker:",
+    ):
+        super().__init__()
+        # Библиотека redis нужна только для этого хранилища.
+        import redis
+
+        self._errors = redis.RedisError
+        self.client = client if client is not None else redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Any | None:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except self._errors:
+            self.stats.add("errors")
+            raw = None
+
+        if raw is None:
+            self.stats.add("misses")
+            return None
+
+        self.stats.add("hits")
+
+        return pickle.loads(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            self.client.set(self.prefix + key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), px=int(self.ttl * 1000))
+        except self._errors:
+            self.stats.add("errors")
+
+    def _delete_names(self, names: Sequence[bytes | str]) -> None:
+        for start in range(0, len(names), REDIS_DELETE_CHUNK_SIZE):
+            deleted = self.client.delete(*names[start:start + REDIS_DELETE_CHUNK_SIZE])
+            self.stats.add("invalidations", deleted)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        try:
+            self._delete_names([self.prefix + key for key in keys])
+        except self._errors:
+            self.stats.add("errors")
+
+    def clear(self, prefix: str = "") -> None:
+        try:
+            self._delete_names(list(self.client.scan_iter(match=f"{self.prefix}{prefix}*", count=1000)))
+        except self._errors:
+            self.stats.add("errors")
+
+    def size(self) -> int | None:
+        return None
+
+    def get_versions(self, names: Sequence[str]) -> tuple[int, ...] | None:
+        try:
+            versions = self.client.mget([f"{self.prefix}version:{name}" for name in names])
+        except self._errors:
+            self.stats.add("errors")
+            return None
+
+        return tuple(int(version or 0) for version in versions)
+
+    def bump_versions(self, names: Sequence[str]) -> None:
+        try:
+            with self.client.pipeline(transaction=False) as pipeline:
+                for name in names:
+                    pipeline.incr(f"{self.prefix}version:{name}")
+
+                pipeline.execute()
+        except self._errors:
+            self.stats.add("errors")
+
+
+def create_cache(backend: str = config.CACHE_BACKEND) -> NullCache:
+    """
+    Создание кэша по названию хранилища из настроек.
+    Args:
+        backend (str): "none", "memory" или "redis" (по умолчанию CACHE_BACKEND).
+    Returns:
+        NullCache: Кэш.
+    Raises:
+        ValueError: Если хранилище неизвестно.
+    """
+    backends = {"none": NullCache, "memory": MemoryCache, "redis": RedisCache}
+
+    if backend not in backends:
+        raise ValueError(f"Unknown cache backend: {backend}")
+
+    return backends[backend]()
+
+
+_cache = create_cache()
+
+
+def get_cache() -> NullCache:
+    """
+    Текущий кэш приложения.
+    Returns:
+        NullCache: Кэш.
+    """
+    return _cache
+
+
+def set_cache(cache: NullCache) -> NullCache:
+    """
+    Замена кэша приложения, например, в тестах и бенчмарках.
+    Args:
+        cache (NullCache): Новый кэш.
+    Returns:
+        NullCache: Предыдущий кэш.
+    """
+    global _cache
+    previous, _cache = _cache, cache
+
+    return previous
+
+
+def get_cache_status() -> dict:
+    """
+    Текущее состояние кэша приложения.
+    Returns:
+        dict: Хранилище, количество записей (None для Redis) и счетчики попаданий, промахов,
+            вытеснений, удалений при изменении данных и ошибок.
+    """
+    cache = get_cache()
+
+    return {"backend": cache.backend, "size": cache.size(), **cache.stats.snapshot()}
+
+
+def cache_key(model: type, object_id: Any) -> str:
+    """
+    Ключ записи кэша для объекта модели.
+    Args:
+        model (type): Модель SQLAlchemy.
+        object_id (Any): Идентификатор объекта.
+    Returns:
+        str: Ключ вида "<таблица>:<идентификатор>".
+    """
+    return f"{model.__tablename__}:{object_id}"
+
+
+def get_cached(db: Session, model: type[T], object_id: int, columns: Iterable[str]) -> T | None:
+    """
+    Чтение объекта по идентификатору через кэш.
+
+    В кэше хранятся значения колонок columns, а не сам объект: при попадании объект собирается заново
+    и присоединяется к сессии без запроса (Session.merge с load=False), поэтому остальные колонки
+    и связи загружаются из базы данных при первом обращении, как у обычного объекта сессии.
+    При промахе объект читается из базы данных и сохраняется в кэш; отсутствие объекта не кэшируется.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        model (type[T]): Модель SQLAlchemy.
+        object_id (int): Идентификатор объекта.
+        columns (Iterable[str]): Кэшируемые колонки, включая id.
+    Returns:
+        T | None: Объект, присоединенный к сессии, или None, если объекта нет.
+    """
+    # Объект, уже загруженный в сессию, не перезаписывается значениями из кэша.
+    instance = db.identity_map.get(db.identity_key(model, object_id))
+
+    if instance is not None:
+        return instance
+
+    cache = get_cache()
+    key = cache_key(model, object_id)
+    values = cache.get(key)
+
+    if values is not None:
+        instance = model(**values)
+        make_transient_to_detached(instance)
+
+        return db.merge(instance, load=False)
+
+    instance = db.query(model).filter(model.id == object_id).first()
+
+    if instance is not None:
+        cache.set(key, {column: getattr(instance, column) for column in columns})
+
+    return instance
+
+
+def get_cached_row(db: Session, model: type, object_id: int, columns: Iterable[str]) -> dict[str, Any] | None:
+    """
+    Чтение значений колонок объекта по идентификатору через кэш, без создания ORM-объекта.
+    Использует те же ключи и значения кэша, что и get_cached: при промахе колонки columns читаются
+    одним запросом select() и сохраняются в кэш.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        model (type): Модель SQLAlchemy.
+        object_id (int): Идентификатор объекта.
+        columns (Iterable[str]): Кэшируемые колонки, включая id.
+    Returns:
+        dict[str, Any] | None: Значения колонок или None, если объекта нет.
+    """
+    cache = get_cache()
+    key = cache_key(model, object_id)
+    values = cache.get(key)
+
+    if values is not None:
+        return values
+
+    row = db.execute(select(*(getattr(model, column) for column in columns)).where(model.id == object_id)).first()
+
+    if row is None:
+        return None
+
+    values = row._asdict()
+    cache.set(key, values)
+
+    return values
+
+
+# Функции, вызываемые после изменения данных через invalidate и invalidate_all (например, индекс графа задач).
+# Получают модель и список идентификаторов измененных объектов или None, если изменены все объекты модели.
+_invalidation_listeners: list[Callable[[type, list[int] | None], None]] = []
+
+
+def add_invalidation_listener(listener: Callable[[type, list[int] | None], None]) -> None:
+    """
+    Подписка на изменения данных через invalidate и invalidate_all.
+    Args:
+        listener (Callable[[type, list[int] | None], None]): Функция от модели и идентификаторов измененных объектов.
+    Returns:
+        None
+    """
+    _invalidation_listeners.append(listener)
+
+
+def remove_invalidation_listener(listener: Callable[[type, list[int] | None], None]) -> None:
+    """
+    Отписка от изменений данных.
+    Args:
+        listener (Callable[[type, list[int] | None], None]): Функция, переданная в add_invalidation_listener.
+    Returns:
+        None
+    """
+    if listener in _invalidation_listeners:
+        _invalidation_listeners.remove(listener)
+
+
+def invalidate(model: type, object_ids: Iterable[int | None]) -> None:
+    """
+    Удаление из кэша записей объектов модели после их изменения или удаления и увеличение версии данных модели.
+    Вызывается после фиксации транзакции: при удалении до фиксации параллельное чтение вернуло бы
+    в кэш старые значения.
+    Args:
+        model (type): Модель SQLAlchemy.
+        object_ids (Iterable[int | None]): Идентификаторы измененных объектов, None пропускаются.
+    Returns:
+        None
+    """
+    object_ids = [object_id for object_id in object_ids if object_id is not None]
+
+    if object_ids:
+        get_cache().delete([cache_key(model, object_id) for object_id in object_ids])
+        bump_version(model)
+
+        for listener in _invalidation_listeners:
+            listener(model, object_ids)
+
+
+def invalidate_all(model: type) -> None:
+    """
+    Удаление из кэша всех записей модели, например, после импорта, и увеличение версии данных модели.
+    Args:
+        model (type): Модель SQLAlchemy.
+    Returns:
+        None
+    """
+    get_cache().clear(f"{model.__tablename__}:")
+    bump_version(model)
+
+    for listener in _invalidation_listeners:
+        listener(model, None)
+
+
+def bump_version(model: type) -> None:
+    """
+    Увеличение версии данных модели после изменения, не затрагивающего кэшируемые колонки.
+    От версий зависят результаты VersionedMemo.
+    Args:
+        model (type): Модель SQLAlchemy.
+    Returns:
+        None
+    """
+    get_cache().bump_versions([model.__tablename__])
+
+
+class MemoEntry(NamedTuple):
+    """
+    Сохраненный результат VersionedMemo.
+    Attributes:
+        value (Any): Результат.
+        versions (tuple[int, ...] | None): Версии данных таблиц, для которых получен результат.
+        etag (str): ETag результата.
+        last_modified (datetime): Время получения результата (UTC).
+        expires_at (float): Момент устаревания по monotonic().
+    """
+    value: Any
+    versions: tuple[int, ...] | None
+    etag: str
+    last_modified: datetime
+    expires_at: float
+
+
+class VersionedMemo:
+    """
+    Результат дорогого запроса, пересчитываемый не чаще одного раза на изменение данных таблиц.
+    Результат сохраняется вместе с версиями таблиц (bump_version) и отдается, пока версии не изменились
+    и не истекло время жизни (защита от изменений в обход CRUD-функций). Пересчет выполняет один поток,
+    остальные запросы ждут его результата (single-flight). Версии ведутся и при выключенном кэше (NullCache);
+    если хранилище версий недоступно (ошибка Redis), результат пересчитывается при каждом запросе.
+    В асинхронном режиме используется get_async: ожидание блокировки потока внутри run_sync остановило бы
+    цикл событий, в котором выполняется пересчет.
+    Attributes:
+        tables (list[str]): Таблицы, от данных которых зависит результат.
+        ttl (float): Время жизни результата в секундах.
+        computations (int): Количество пересчетов.
+    """
+
+    def __init__(self, models: Sequence[type], ttl: float = config.CACHE_TTL):
+        self.tables = [model.__tablename__ for model in models]
+        self.ttl = ttl
+        self.computations = 0
+        self._entry: MemoEntry | None = None
+        self._lock = threading.Lock()
+        self._async_lock = asyncio.Lock()
+
+    def _fresh_entry(self, versions: tuple[int, ...]) -> MemoEntry | None:
+        entry = self._entry
+
+        if entry is not None and entry.versions == versions and entry.expires_at > monotonic():
+            return entry
+
+        return None
+
+    def get(self, compute: Callable[[], Any]) -> MemoEntry:
+        """
+        Получение результата с пересчетом при изменении данных.
+        Args:
+            compute (Callable[[], Any]): Функция пересчета результата.
+        Returns:
+            MemoEntry: Результат с ETag и временем получения.
+        """
+        versions = get_cache().get_versions(self.tables)
+
+        if versions is None:
+            return self._compute(compute, versions)
+
+        entry = self._fresh_entry(versions)
+
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            # Пока поток ждал блокировку, результат мог пересчитать другой поток.
+            entry = self._fresh_entry(versions)
+
+            if entry is None:
+                entry = self._entry = self._compute(compute, versions)
+
+        return entry
+
+    async def get_async(self, compute: Callable[[], Awaitable[Any]]) -> MemoEntry:
+        """
+        Получение результата с пересчетом при изменении данных, как get, для асинхронного режима.
+        Пересчет выполняет одна корутина, остальные ждут его результата, не блокируя цикл событий.
+        Args:
+            compute (Callable[[], Awaitable[Any]]): Асинхронная функция пересчета результата.
+        Returns:
+            MemoEntry: Результат с ETag и временем получения.
+        """
+        versions = get_cache().get_versions(self.tables)
+
+        if versions is None:
+            return self._make_entry(await compute(), versions)
+
+        entry = self._fresh_entry(versions)
+
+        if entry is not None:
+            return entry
+
+        async with self._async_lock:
+            entry = self._fresh_entry(versions)
+
+            if entry is None:
+                entry = self._entry = self._make_entry(await compute(), versions)
+
+        return entry
+
+    def _compute(self, compute: Callable[[], Any], versions: tuple[int, ...] | None) -> MemoEntry:
+        return self._make_entry(compute(), versions)
+
+    def _make_entry(self, value: Any, versions: tuple[int, ...] | None) -> MemoEntry:
+        # Версии прочитаны до пересчета: изменение во время пересчета увеличит их, и следующий запрос пересчитает снова.
+        self.computations += 1
+        etag, previous = make_etag(value), self._entry
+        # Если результат не изменился, время изменения тоже остается прежним.
+        last_modified = previous.last_modified if previous and previous.etag == etag else datetime.now(timezone.utc)
+
+        return MemoEntry(value, versions, etag, last_modified, monotonic() + self.ttl)
+
+    def clear(self) -> None:
+        """
+        Удаление сохраненного результата.
+        Returns:
+            None
+        """
+        self._entry = None
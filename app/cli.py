@@ -0,0 +1,62 @@
+import argparse
+import json
+from pathlib import Path
+
+from app.crud.employee_crud import import_employees, repair_workload_counters
+from app.crud.task_crud import import_tasks
+from app.database import SessionLocal
+from app.importing import iter_import_rows
+
+# Функции импорта по командам.
+IMPORTERS = {"import-tasks": import_tasks, "import-employees": import_employees}
+
+
+def run_import(command: str, path: Path, import_format: str | None) -> dict:
+    """
+    Импорт файла в базу данных приложения.
+    Args:
+        command (str): Команда импорта: import-tasks или import-employees.
+        path (Path): Путь к файлу в формате выгрузки.
+        import_format (str | None): Формат файла: ndjson или csv. По умолчанию определяется по расширению.
+    Returns:
+        dict: Результат импорта.
+    """
+    import_format = import_format or ("csv" if path.suffix.lower() == ".csv" else "ndjson")
+
+    with path.open("rb") as file, SessionLocal() as db:
+        return IMPORTERS[command](db, iter_import_rows(file, import_format))
+
+
+def run_repair_workload() -> dict:
+    """
+    Пересчет счетчиков задач сотрудников.
+    Returns:
+        dict: Количество исправленных сотрудников.
+    """
+    with SessionLocal() as db:
+        return {"repaired": repair_workload_counters(db)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Служебные команды трекера задач.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for command, entity in (("import-tasks", "задач"), ("import-employees", "сотрудников")):
+        command_parser = commands.add_parser(command, help=f"Импорт {entity} из файла NDJSON или CSV.")
+        command_parser.add_argument("path", type=Path)
+        command_parser.add_argument("--format", choices=["ndjson", "csv"])
+
+    commands.add_parser("repair-workload", help="Пересчет счетчиков задач сотрудников по таблице задач.")
+
+    args = parser.parse_args()
+
+    if args.command == "repair-workload":
+        result = run_repair_workload()
+    else:
+        result = run_import(args.command, args.path, args.format)
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import zlib
+from importlib.util import find_spec
+
+from starlette.datastructures import Headers, MutableHeaders
+
+import config
+
+# Уровни сжатия: быстрые настройки, при которых сжатие не становится узким местом ответа.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+
+class GzipEncoder:
+    """
+    Потоковое сжатие gzip (zlib из стандартной библиотеки).
+    Каждая часть тела сжимается с Z_SYNC_FLUSH, поэтому клиент может распаковать ее, не дожидаясь конца ответа.
+    """
+    name = "gzip"
+    module = None
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    """
+    Потоковое сжатие brotli. Требует библиотеку brotli, без нее кодировка br не предлагается.
+    """
+    name = "br"
+    module = "brotli"
+
+    def __init__(self):
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    """
+    Потоковое сжатие zstd. Требует библиотеку zstandard, без нее кодировка zstd не предлагается.
+    """
+    name = "zstd"
+    module = "zstandard"
+
+    def __init__(self):
+        import zstandard
+
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Кодировщики в порядке предпочтения сервера при равном q клиента.
+ENCODERS = (ZstdEncoder, BrotliEncoder, GzipEncoder)
+
+
+def available_encoders() -> dict[str, type]:
+    """
+    Кодировки, для которых установлены библиотеки, в порядке ENCODERS.
+    Returns:
+        dict[str, type]: Классы кодировщиков по названиям кодировок.
+    """
+    return {encoder.name: encoder for encoder in ENCODERS if encoder.module is None or find_spec(encoder.module)}
+
+
+def choose_encoding(accept_encoding: str, encoders: dict[str, type]) -> str | None:
+    """
+    Выбор кодировки по заголовку Accept-Encoding: наибольший q, при равных - порядок encoders.
+    Args:
+        accept_encoding (str): Значение заголовка, например "gzip, br;q=0.9, zstd;q=0".
+        encoders (dict[str, type]): Доступные кодировки в порядке предпочтения.
+    Returns:
+        str | None: Название кодировки или None, если клиент не принимает ни одну из доступных.
+    """
+    weights = {}
+
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+
+        weights[name.strip().lower()] = weight
+
+    candidates = [
+        (weights.get(name, weights.get("*", 0.0)), -index, name) for index, name in enumerate(encoders)
+    ]
+    weight, _, name = max(candidates, default=(0.0, 0, None))
+
+    return name if weight > 0 else None
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware, сжимающее ответы в кодировке, выбранной по Accept-Encoding (zstd, br или gzip).
+    Ответ целиком в одной части тела меньше minimum_size байт не сжимается. Потоковые ответы сжимаются
+    по частям, каждая часть отправляется сразу после сжатия. Ответы с Content-Encoding и без тела
+    (например, 304) передаются без изменений. Сжатый ответ получает заголовок Vary: Accept-Encoding, а его ETag
+    становится слабым (W/): байты сжатого и несжатого ответа различаются, хотя версия данных та же.
+    Условные запросы сравнивают ETag слабым сравнением (app.etag.is_not_modified), поэтому If-None-Match
+    со слабым ETag дает 304.
+    """
+
+    def __init__(
+        self, app, minimum_size: int = config.COMPRESSION_MINIMUM_SIZE, encoders: dict[str, type] | None = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = encoders if encoders is not None else available_encoders()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("Accept-Encoding", ""), self.encoders)
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        encoder = None
+
+        async def send_compressed(message):
+            nonlocal start, encoder
+
+            if message["type"] == "http.response.start":
+                # Заголовки откладываются до первой части тела: от нее зависит, сжимается ли ответ.
+                start = message
+                return
+
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                headers = MutableHeaders(scope=start)
+
+                if "Content-Encoding" in headers or (not more_body and len(body) < max(self.minimum_size, 1)):
+                    await send(start)
+                    await send(message)
+                    start = None
+                    return
+
+                encoder = self.encoders[encoding]()
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+
+                if "ETag" in headers and not headers["ETag"].startswith("W/"):
+                    headers["ETag"] = "W/" + headers["ETag"]
+
+                if more_body:
+                    del headers["Content-Length"]
+                    await send(start)
+                else:
+                    body = encoder.compress(body) + encoder.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+            body = encoder.compress(body) if body else b""
+
+            if not more_body:
+                body += encoder.finish()
+
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
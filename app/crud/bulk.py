@@ -0,0 +1,68 @@
+from itertools import groupby
+from typing import Any, Iterable, Iterator, Sequence, TypeVar
+
+from sqlalchemy import Table, bindparam, select, update
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+# Количество строк в одном запросе пакетных операций.
+BULK_CHUNK_SIZE = 1000
+
+T = TypeVar("T")
+
+
+def chunked(items: Sequence[T], size: int = BULK_CHUNK_SIZE) -> Iterator[Sequence[T]]:
+    """
+    Разбиение последовательности на части не длиннее size.
+    Args:
+        items (Sequence[T]): Последовательность.
+        size (int): Размер части (по умолчанию BULK_CHUNK_SIZE).
+    Yields:
+        Sequence[T]: Очередная часть последовательности.
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def select_existing_ids(db: Session, id_column: InstrumentedAttribute, ids: Iterable[int | None]) -> set[int]:
+    """
+    Получение идентификаторов, которые есть в таблице, запросами по BULK_CHUNK_SIZE значений.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        id_column (InstrumentedAttribute): Колонка идентификатора.
+        ids (Iterable[int | None]): Проверяемые идентификаторы, значения None пропускаются.
+    Returns:
+        set[int]: Идентификаторы из ids, которые есть в таблице.
+    """
+    existing = set()
+
+    for chunk in chunked(sorted(set(ids) - {None})):
+        existing.update(db.scalars(select(id_column).where(id_column.in_(chunk))))
+
+    return existing
+
+
+def update_rows_by_id(db: Session, table: Table, rows: list[dict[str, Any]], size: int = BULK_CHUNK_SIZE) -> None:
+    """
+    Пакетное обновление строк по идентификатору запросами UPDATE ... WHERE id = :row_id (executemany).
+    Строки группируются по набору обновляемых колонок, каждая группа выполняется частями по size строк.
+    Запрос строится по таблице, а не по модели: так onupdate колонок (updated_at, version) применяются
+    без передачи текущей версии каждой строки, которую требует пакетное обновление модели с version_id_col.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        table (Table): Таблица с колонкой id.
+        rows (list[dict[str, Any]]): Строки с идентификатором id и новыми значениями колонок.
+        size (int): Количество строк в одном запросе (по умолчанию BULK_CHUNK_SIZE).
+    Returns:
+        None
+    """
+    def columns(row: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(sorted(row.keys() - {"id"}))
+
+    for names, group in groupby(sorted(rows, key=columns), key=columns):
+        statement = update(table).where(table.c.id == bindparam("row_id")).values(
+            {name: bindparam(name) for name in names}
+        )
+        params = [{"row_id": row["id"], **{name: row[name] for name in names}} for row in group]
+
+        for chunk in chunked(params, size):
+            db.execute(statement, chunk)
@@ -1,58 +1,426 @@
-from typing import List, Type
+from typing import Any, Iterable, Iterator, List, Type
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, RowMapping, Select, delete, func, insert, select, update
+from sqlalchemy.orm import Session, selectinload
 
+from app.cache import bump_version, get_cached, get_cached_row, invalidate, invalidate_all
+from app.crud.bulk import chunked, select_existing_ids, update_rows_by_id
+from app.crud.staging import (
+    IMPORT_BATCH_SIZE,
+    create_staging_table,
+    merge_staging,
+    new_import_result,
+    reject_duplicate_ids,
+    reset_id_sequence,
+    stage_rows,
+)
+from app.crud.versioning import VersionConflictError, object_exists, versioned_update
 from app.models.employee import Employee
+from app.models.search import search_condition
 from app.models.task import Task
-from app.schemas.employee_schemas import EmployeeCreateSchema, EmployeeUpdateSchema
+from app.pagination import PageSummary, decode_cursor, iter_page, paginate, summarize_page
+from app.serialization import projection_columns, response_columns
+from app.schemas.employee_schemas import (
+    EmployeeCreateSchema,
+    EmployeeUpdateSchema,
+    EmployeeOrderBy,
+    EmployeeBulkUpdateSchema,
+    EmployeeSchema,
+    EmployeeTasksSchema,
+)
+from app.schemas.task_schemas import TaskSchema
+
+# Загрузка активных задач сотрудников одним дополнительным запросом на весь список (SELECT ... WHERE executor_id IN),
+# чтобы сериализация EmployeeTasksSchema не выполняла ленивый запрос для каждого сотрудника.
+ACTIVE_TASKS_LOADER = selectinload(Employee.task.and_(Task.is_active.is_(True)))
+
+# Кэшируемые колонки сотрудника: поля ответа, время изменения и версия, по которой строится ETag.
+EMPLOYEE_CACHED_COLUMNS = [*EmployeeSchema.model_fields, "updated_at", "version"]
+
+# Поля строк списка сотрудников без ORM-объектов (get_employee_rows), если параметр fields не передан.
+EMPLOYEE_ROW_FIELDS = tuple(EmployeeSchema.model_fields)
+
+# Колонки строк списка сотрудников с задачами и их активных задач без ORM-объектов (get_employees_tasks_rows).
+EMPLOYEE_TASKS_ROW_COLUMNS = response_columns(EmployeeTasksSchema, Employee)
+ACTIVE_TASK_ROW_COLUMNS = response_columns(TaskSchema, Task)
+
+# Колонки, по которым можно сортировать список сотрудников.
+EMPLOYEE_SORT_COLUMNS = {
+    "id": Employee.id,
+    "full_name": Employee.full_name,
+    "task_count": Employee.task_count,
+    "active_task_count": Employee.active_task_count,
+}
 
 
 def get_employee(db: Session, employee_id: int) -> Type[Employee]:
     """
     Получение информации о сотруднике по его идентификатору.
+    Сотрудник читается через кэш (app.cache), изменяющие сотрудников функции удаляют его из кэша.
+    Счетчики задач меняются триггерами в обход CRUD-функций, поэтому не кэшируются и читаются при обращении.
     Args:
         db (Session): Сессия базы данных SQLAlchemy.
         employee_id (int): Идентификатор сотрудника.
     Returns:
         Employee: Объект с информацией о сотруднике.
     """
-    return db.query(Employee).filter(Employee.id == employee_id).first()
+    return get_cached(db, Employee, employee_id, EMPLOYEE_CACHED_COLUMNS)
 
 
-def get_employees(db: Session, skip: int = 0, limit: int = 100) -> List[Type[Employee]]:
+def get_employee_row(db: Session, employee_id: int) -> dict[str, Any] | None:
     """
-    Получение списка сотрудников с возможностью пагинации.
+    Значения колонок сотрудника (EMPLOYEE_CACHED_COLUMNS) без создания ORM-объекта, через тот же кэш,
+    что и get_employee. Ответ с частью полей (параметр fields) строится из этих значений.
     Args:
         db (Session): Сессия базы данных SQLAlchemy.
-        skip (int): Количество записей, которые следует пропустить (по умолчанию 0).
+        employee_id (int): Идентификатор сотрудника.
+    Returns:
+        dict[str, Any] | None: Значения колонок или None, если сотрудника нет.
+    """
+    return get_cached_row(db, Employee, employee_id, EMPLOYEE_CACHED_COLUMNS)
+
+
+def select_employees_page(
+    skip: int = 0,
+    limit: int = 100,
+    order_by: EmployeeOrderBy = "id",
+    cursor: str | None = None,
+    search: str | None = None,
+) -> list[Select]:
+    """
+    Построение запросов страницы списка сотрудников (общих для синхронного и асинхронного режимов).
+    Args:
+        skip (int): Количество записей, которые следует пропустить, если курсор не передан (по умолчанию 0).
         limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+        order_by (EmployeeOrderBy): Ключ сортировки ("id", "full_name", "task_count" или "active_task_count",
+            по умолчанию "id").
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        search (str | None): Поисковый запрос по ФИО (app.models.search.search_condition) или None.
+    Returns:
+        list[Select]: Запросы диапазонов страницы сотрудников (app.pagination.paginate).
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    sort_column = EMPLOYEE_SORT_COLUMNS[order_by]
+    after = decode_cursor(cursor, order_by, sort_column) if cursor else None
+    statement = select(Employee)
+
+    if search is not None:
+        statement = statement.where(search_condition(Employee.full_name, search))
+
+    return paginate(statement, sort_column, Employee.id, skip=skip, limit=limit, after=after)
+
+
+def get_employees(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: EmployeeOrderBy = "id",
+    cursor: str | None = None,
+    search: str | None = None,
+) -> List[Type[Employee]]:
+    """
+    Получение списка сотрудников с возможностью пагинации по смещению или по курсору.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        skip (int): Количество записей, которые следует пропустить, если курсор не передан (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+        order_by (EmployeeOrderBy): Ключ сортировки ("id", "full_name", "task_count" или "active_task_count",
+            по умолчанию "id").
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        search (str | None): Поисковый запрос по ФИО или None.
     Returns:
         List[Employee]: Список сотрудников.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_employees_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, search=search)
+
+    return list(iter_page(statements, limit, db.scalars))
+
+
+def employee_row_columns(order_by: EmployeeOrderBy = "id", fields: tuple[str, ...] | None = None) -> list:
+    """
+    Колонки строк списка сотрудников: поля EmployeeSchema (все или только fields), идентификатор и ключ сортировки,
+    по которым строится курсор следующей страницы, и версия для ETag.
+    Args:
+        order_by (EmployeeOrderBy): Ключ сортировки (по умолчанию "id").
+        fields (tuple[str, ...] | None): Поля EmployeeSchema (app.serialization.parse_fields) или None - все поля.
+    Returns:
+        list: Колонки для select().
+    """
+    return projection_columns(Employee, fields or EMPLOYEE_ROW_FIELDS, "id", order_by)
+
+
+def get_employee_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: EmployeeOrderBy = "id",
+    cursor: str | None = None,
+    search: str | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Страница списка сотрудников (как get_employees) словарями с полями EmployeeSchema и версией,
+    без создания ORM-объектов. Строки сериализуются ответом EmployeeRowsResponse (app.serialization).
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        skip (int): Количество записей, которые следует пропустить, если курсор не передан (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+        order_by (EmployeeOrderBy): Ключ сортировки ("id", "full_name", "task_count" или "active_task_count",
+            по умолчанию "id").
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        search (str | None): Поисковый запрос по ФИО или None.
+        fields (tuple[str, ...] | None): Читаемые поля EmployeeSchema (employee_row_columns) или None - все поля.
+    Returns:
+        list[dict[str, Any]]: Строки сотрудников.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_employees_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, search=search)
+    columns = employee_row_columns(order_by, fields)
+    statements = [statement.with_only_columns(*columns) for statement in statements]
+
+    return [row._asdict() for row in iter_page(statements, limit, db.execute)]
+
+
+def iter_employee_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: EmployeeOrderBy = "id",
+    cursor: str | None = None,
+    search: str | None = None,
+    fields: tuple[str, ...] | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[dict[str, Any]]:
+    """
+    Потоковое чтение страницы списка сотрудников (как get_employee_rows) для ответа, отправляющего строки потоком.
+    Запрос выполняется сразу, строки читаются курсором по chunk_size строк по мере отправки ответа.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        skip (int): Количество записей, которые следует пропустить, если курсор не передан (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+        order_by (EmployeeOrderBy): Ключ сортировки ("id", "full_name", "task_count" или "active_task_count",
+            по умолчанию "id").
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        search (str | None): Поисковый запрос по ФИО или None.
+        fields (tuple[str, ...] | None): Читаемые поля EmployeeSchema (employee_row_columns) или None - все поля.
+        chunk_size (int): Количество строк, получаемых из курсора за раз (по умолчанию 1000).
+    Returns:
+        Iterator[dict[str, Any]]: Строки сотрудников.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_employees_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, search=search)
+    columns = employee_row_columns(order_by, fields)
+    statements = [
+        statement.with_only_columns(*columns).execution_options(yield_per=chunk_size) for statement in statements
+    ]
+    result = iter_page(statements, limit, db.execute)
+
+    return (row._asdict() for row in result)
+
+
+def select_employee_page_keys(
+    skip: int = 0,
+    limit: int = 100,
+    order_by: EmployeeOrderBy = "id",
+    cursor: str | None = None,
+    search: str | None = None,
+) -> list[Select]:
     """
-    return db.query(Employee).offset(skip).limit(limit).all()
+    Запросы ключей строк страницы списка сотрудников (идентификатор, версия и ключ сортировки) для summarize_page.
+    Args:
+        skip (int): Количество записей, которые следует пропустить, если курсор не передан (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+        order_by (EmployeeOrderBy): Ключ сортировки ("id", "full_name", "task_count" или "active_task_count",
+            по умолчанию "id").
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        search (str | None): Поисковый запрос по ФИО или None.
+    Returns:
+        list[Select]: Запросы ключей диапазонов страницы.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_employees_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, search=search)
+    columns = Employee.id, Employee.version, EMPLOYEE_SORT_COLUMNS[order_by]
+
+    return [statement.with_only_columns(*columns) for statement in statements]
+
+
+def get_employee_page_summary(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: EmployeeOrderBy = "id",
+    cursor: str | None = None,
+    search: str | None = None,
+    chunk_size: int = 1000,
+) -> PageSummary:
+    """
+    ETag и курсор следующей страницы списка сотрудников по ключам ее строк, без чтения самих строк.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        skip (int): Количество записей, которые следует пропустить, если курсор не передан (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+        order_by (EmployeeOrderBy): Ключ сортировки ("id", "full_name", "task_count" или "active_task_count",
+            по умолчанию "id").
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        search (str | None): Поисковый запрос по ФИО или None.
+        chunk_size (int): Количество ключей, получаемых из курсора за раз (по умолчанию 1000).
+    Returns:
+        PageSummary: ETag и курсор следующей страницы.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_employee_page_keys(skip=skip, limit=limit, order_by=order_by, cursor=cursor, search=search)
+    statements = [statement.execution_options(yield_per=chunk_size) for statement in statements]
+    keys = iter_page(statements, limit, db.execute)
+
+    return summarize_page(keys, Employee.__tablename__, order_by, limit)
+
+
+def employee_row_versions(employees: Iterable[dict[str, Any]]) -> Iterator[tuple[str, int, int]]:
+    """
+    Версии строк сотрудников get_employee_rows для make_versions_etag.
+    Args:
+        employees (Iterable[dict[str, Any]]): Строки сотрудников.
+    Returns:
+        Iterator[tuple[str, int, int]]: Таблица, идентификатор и версия каждого сотрудника.
+    """
+    return ((Employee.__tablename__, employee["id"], employee["version"]) for employee in employees)
+
+
+def iter_employees(db: Session, chunk_size: int = 1000) -> Iterator[RowMapping]:
+    """
+    Потоковое чтение сотрудников для выгрузки.
+    Строки читаются серверным курсором по chunk_size строк без создания ORM-объектов.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        chunk_size (int): Количество строк, получаемых из курсора за раз (по умолчанию 1000).
+    Yields:
+        RowMapping: Строка сотрудника с полями EmployeeSchema.
+    """
+    statement = select(*(getattr(Employee, field) for field in EmployeeSchema.model_fields))
+    result = db.execute(statement.order_by(Employee.id).execution_options(yield_per=chunk_size))
+
+    yield from result.mappings()
 
 
 def get_employees_tasks(db: Session, skip: int = 0, limit: int = 100) -> List[Type[Employee]]:
     """
     Получение списка сотрудников с числом активных задач, отсортированных по убыванию количества задач.
+    Количество активных задач берется из счетчика active_task_count, поэтому задачи не агрегируются.
+    Активные задачи сотрудников загружаются заранее (ACTIVE_TASKS_LOADER).
     Args:
         db (Session): Сессия базы данных SQLAlchemy.
         skip (int): Количество записей, которые следует пропустить (по умолчанию 0).
         limit (int): Максимальное количество записей для возврата (по умолчанию 100).
     Returns:
-        List[Employee]: Список сотрудников с числом активных задач.
+        List[Employee]: Список сотрудников с активными задачами.
     """
-    employees = db.query(Employee).join(Employee.task).filter(Task.is_active.is_(True))
-    employees = employees.group_by(Employee.id).order_by(func.count(Task.id).desc())
+    employees = db.query(Employee).filter(Employee.active_task_count > 0).options(ACTIVE_TASKS_LOADER)
+    employees = employees.order_by(Employee.active_task_count.desc(), Employee.id)
     employees = employees.offset(skip).limit(limit).all()
 
     return employees
 
 
+def select_employees_tasks_rows(skip: int = 0, limit: int = 100) -> Select:
+    """
+    Запрос строк страницы списка сотрудников с задачами (общий для синхронного и асинхронного режимов):
+    сотрудники с активными задачами по убыванию их количества, колонки EMPLOYEE_TASKS_ROW_COLUMNS.
+    Args:
+        skip (int): Количество записей, которые следует пропустить (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+    Returns:
+        Select: Запрос строк сотрудников.
+    """
+    return (
+        select(*EMPLOYEE_TASKS_ROW_COLUMNS)
+        .where(Employee.active_task_count > 0)
+        .order_by(Employee.active_task_count.desc(), Employee.id)
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def select_active_task_rows(employee_ids: list[int]) -> Select:
+    """
+    Запрос строк активных задач сотрудников (колонки ACTIVE_TASK_ROW_COLUMNS), упорядоченных по идентификатору.
+    Args:
+        employee_ids (list[int]): Идентификаторы сотрудников.
+    Returns:
+        Select: Запрос строк задач.
+    """
+    return (
+        select(*ACTIVE_TASK_ROW_COLUMNS)
+        .where(Task.executor_id.in_(employee_ids), Task.is_active.is_(True))
+        .order_by(Task.id)
+    )
+
+
+def attach_active_tasks(employees: list[dict[str, Any]], tasks: Iterable[Row]) -> list[dict[str, Any]]:
+    """
+    Добавление строк активных задач к строкам их исполнителей (ключ task).
+    Args:
+        employees (list[dict[str, Any]]): Строки сотрудников, изменяются на месте.
+        tasks (Iterable[Row]): Строки задач запроса select_active_task_rows.
+    Returns:
+        list[dict[str, Any]]: Те же строки сотрудников.
+    """
+    tasks_by_executor = {}
+
+    for employee in employees:
+        employee["task"] = tasks_by_executor[employee["id"]] = []
+
+    for task in tasks:
+        tasks_by_executor[task.executor_id].append(task._asdict())
+
+    return employees
+
+
+def get_employees_tasks_rows(db: Session, skip: int = 0, limit: int = 100) -> list[dict[str, Any]]:
+    """
+    Страница списка сотрудников с активными задачами (как get_employees_tasks) словарями с полями
+    EmployeeTasksSchema и версией, без создания ORM-объектов: двумя запросами, сотрудников и их активных задач.
+    Строки сериализуются ответом EmployeeTasksRowsResponse (app.serialization) без проверки по схеме.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        skip (int): Количество записей, которые следует пропустить (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+    Returns:
+        list[dict[str, Any]]: Строки сотрудников с задачами в ключе task.
+    """
+    employees = [row._asdict() for row in db.execute(select_employees_tasks_rows(skip=skip, limit=limit))]
+
+    if not employees:
+        return employees
+
+    tasks = db.execute(select_active_task_rows([employee["id"] for employee in employees]))
+
+    return attach_active_tasks(employees, tasks)
+
+
+def employee_tasks_row_versions(employees: Iterable[dict[str, Any]]) -> Iterator[tuple[str, int, int]]:
+    """
+    Версии строк get_employees_tasks_rows для make_versions_etag: каждый сотрудник, затем его задачи.
+    Args:
+        employees (Iterable[dict[str, Any]]): Строки сотрудников с задачами.
+    Returns:
+        Iterator[tuple[str, int, int]]: Таблица, идентификатор и версия каждой строки.
+    """
+    for employee in employees:
+        yield Employee.__tablename__, employee["id"], employee["version"]
+        yield from ((Task.__tablename__, task["id"], task["version"]) for task in employee["task"])
+
+
 def get_min_loaded_employees(db: Session, min_tasks_count: int) -> List[Type[Employee]]:
     """
     Получает список сотрудников с минимальной нагрузкой задач.
+    Нагрузка берется из счетчика task_count, поиск выполняется по индексу.
     Args:
         db (Session): Сессия базы данных SQLAlchemy.
         min_tasks_count (int): Минимальное количество задач.
@@ -61,15 +429,31 @@ def get_min_loaded_employees(db: Session, min_tasks_count: int) -> List[Type[Emp
     """
     min_loaded_employees = (
         db.query(Employee)
-        .outerjoin(Employee.task)
-        .group_by(Employee.id)
-        .having(func.count(Task.id) == min_tasks_count)
+        .filter(Employee.task_count == min_tasks_count)
+        .order_by(Employee.id)
         .all()
     )
 
     return min_loaded_employees
 
 
+def get_update_values(employee: EmployeeUpdateSchema) -> dict[str, Any]:
+    """
+    Значения для частичного обновления сотрудника: только поля, переданные в запросе (exclude_unset).
+    Args:
+        employee (EmployeeUpdateSchema): Данные для частичного обновления сотрудника.
+    Returns:
+        dict[str, Any]: Новые значения полей сотрудника без идентификатора.
+    """
+    values = employee.model_dump(exclude_unset=True, exclude={"id"})
+
+    # ФИО сотрудника обязательно, пустое значение означает "не обновлять".
+    if values.get("full_name") is None:
+        values.pop("full_name", None)
+
+    return values
+
+
 def create_employee(db: Session, employee: EmployeeCreateSchema) -> Employee:
     """
     Создание нового сотрудника.
@@ -87,49 +471,226 @@ def create_employee(db: Session, employee: EmployeeCreateSchema) -> Employee:
     db.add(db_employee)
     db.commit()
     db.refresh(db_employee)
+    invalidate(Employee, [db_employee.id])
 
     return db_employee
 
 
-def partial_update_employee(db: Session, employee_id: int, employee: EmployeeUpdateSchema) -> Type[Employee]:
+def partial_update_employee(
+    db: Session, employee_id: int, employee: EmployeeUpdateSchema, versions: list[int] | None = None
+) -> Type[Employee]:
     """
-    Частичное обновление данных о сотруднике.
+    Частичное обновление данных о сотруднике одним запросом UPDATE ... RETURNING с проверкой версии.
+    Изменяются только поля, переданные в запросе.
     Args:
         db (Session): Сессия базы данных SQLAlchemy.
         employee_id (int): Идентификатор сотрудника, данные которого обновляются.
         employee (EmployeeUpdateSchema): Данные для частичного обновления сотрудника.
+        versions (list[int] | None): Допустимые текущие версии сотрудника (из If-Match) или None.
     Returns:
         Employee: Обновленный сотрудник или None, если сотрудник не найден.
+    Raises:
+        VersionConflictError: Сотрудник есть, но его версия не входит в versions.
     """
-    db_employee = db.query(Employee).filter(Employee.id == employee_id).first()
-
-    if db_employee:
+    values = get_update_values(employee)
+    db_employee = db.scalars(versioned_update(Employee, employee_id, values, versions)).one_or_none()
 
-        if employee.full_name:
-            db_employee.full_name = employee.full_name
+    if db_employee is None:
+        if versions is not None and db.scalar(object_exists(Employee, employee_id)) is not None:
+            raise VersionConflictError(f"Employee {employee_id} has been modified")
 
-        if employee.position:
-            db_employee.position = employee.position
+        return None
 
-        db.commit()
-        db.refresh(db_employee)
+    # Сотрудник отсоединяется от сессии до фиксации, чтобы фиксация не сбросила значения из RETURNING
+    # и ответ не требовал повторного чтения.
+    db.expunge(db_employee)
+    db.commit()
+    invalidate(Employee, [employee_id])
 
     return db_employee
 
 
 def delete_employee(db: Session, employee_id: int) -> Type[Employee]:
     """
-    Удаление сотрудника.
+    Удаление сотрудника запросами UPDATE ... RETURNING (снятие сотрудника с задач) и DELETE ... RETURNING.
     Args:
         db (Session): Сессия базы данных SQLAlchemy.
         employee_id (int): Идентификатор сотрудника, которого следует удалить.
     Returns:
         Employee: Удаленный сотрудник или None, если сотрудник не найден.
     """
-    db_employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    task_ids = db.scalars(
+        update(Task).where(Task.executor_id == employee_id).values(executor_id=None).returning(Task.id)
+    ).all()
+    db_employee = db.scalars(delete(Employee).where(Employee.id == employee_id).returning(Employee)).one_or_none()
+
+    if db_employee is None:
+        db.rollback()
+        return None
 
-    if db_employee:
-        db.delete(db_employee)
-        db.commit()
+    # Сотрудник отсоединяется от сессии до фиксации, чтобы его значения остались доступны после фиксации.
+    db.expunge(db_employee)
+    db.commit()
+    # Задачи удаленного сотрудника остались без исполнителя, их записи в кэше тоже устарели.
+    invalidate(Employee, [employee_id])
+    invalidate(Task, task_ids)
 
     return db_employee
+
+
+def bulk_create_employees(
+    db: Session, employees: list[tuple[int, EmployeeCreateSchema]]
+) -> list[tuple[int, int | None, str | None]]:
+    """
+    Пакетное создание сотрудников в одной транзакции многострочными INSERT ... RETURNING.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        employees (list[tuple[int, EmployeeCreateSchema]]): Позиции в запросе и данные для создания сотрудников.
+    Returns:
+        list[tuple[int, int | None, str | None]]: Позиция, идентификатор созданного сотрудника и ошибка
+            для каждого сотрудника.
+    """
+    results = []
+
+    for chunk in chunked(employees):
+        employee_ids = db.scalars(
+            insert(Employee).returning(Employee.id, sort_by_parameter_order=True),
+            [employee.model_dump() for _, employee in chunk],
+        ).all()
+        results.extend((index, employee_id, None) for (index, _), employee_id in zip(chunk, employee_ids))
+
+    db.commit()
+    invalidate(Employee, (employee_id for _, employee_id, _ in results))
+
+    return results
+
+
+def bulk_update_employees(
+    db: Session, employees: list[tuple[int, EmployeeBulkUpdateSchema]]
+) -> list[tuple[int, int | None, str | None]]:
+    """
+    Пакетное частичное обновление сотрудников в одной транзакции.
+    Обновляются только переданные поля, пакетами UPDATE ... WHERE id = :id (executemany).
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        employees (list[tuple[int, EmployeeBulkUpdateSchema]]): Позиции в запросе и данные для обновления.
+    Returns:
+        list[tuple[int, int | None, str | None]]: Позиция, идентификатор обновленного сотрудника и ошибка
+            для каждого сотрудника.
+    """
+    existing = select_existing_ids(db, Employee.id, (employee.id for _, employee in employees))
+    results, rows, seen = [], [], set()
+
+    for index, employee in employees:
+        values = get_update_values(employee)
+
+        if employee.id not in existing:
+            results.append((index, None, "Employee not found"))
+        elif employee.id in seen:
+            results.append((index, employee.id, "Duplicate employee id in request"))
+        else:
+            seen.add(employee.id)
+            results.append((index, employee.id, None))
+
+            if values:
+                rows.append({"id": employee.id, **values})
+
+    update_rows_by_id(db, Employee.__table__, rows)
+
+    db.commit()
+    invalidate(Employee, (row["id"] for row in rows))
+
+    return results
+
+
+def bulk_delete_employees(db: Session, employee_ids: list[int]) -> list[tuple[int, int | None, str | None]]:
+    """
+    Пакетное удаление сотрудников в одной транзакции.
+    Как и при удалении одного сотрудника, его задачи остаются без исполнителя.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        employee_ids (list[int]): Идентификаторы удаляемых сотрудников.
+    Returns:
+        list[tuple[int, int | None, str | None]]: Позиция, идентификатор удаленного сотрудника и ошибка
+            для каждого сотрудника.
+    """
+    existing = select_existing_ids(db, Employee.id, employee_ids)
+    task_ids = []
+
+    for chunk in chunked(sorted(existing)):
+        task_ids.extend(db.scalars(
+            update(Task).where(Task.executor_id.in_(chunk)).values(executor_id=None).returning(Task.id)
+        ))
+        db.execute(delete(Employee).where(Employee.id.in_(chunk)))
+
+    db.commit()
+    invalidate(Employee, existing)
+    invalidate(Task, task_ids)
+
+    return [
+        (index, employee_id, None) if employee_id in existing else (index, None, "Employee not found")
+        for index, employee_id in enumerate(employee_ids)
+    ]
+
+
+def import_employees(db: Session, rows: Iterable[Any], batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+    """
+    Импорт сотрудников из файла в формате выгрузки (строки по схеме EmployeeSchema, с идентификаторами).
+    Строки проверяются частями по batch_size и загружаются в промежуточную таблицу (COPY в PostgreSQL),
+    затем переносятся в таблицу сотрудников одним запросом: сотрудники с существующим идентификатором
+    обновляются, остальные добавляются. Повторы идентификатора в файле отклоняются.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        rows (Iterable[Any]): Строки файла.
+        batch_size (int): Количество строк, проверяемых и загружаемых за раз (по умолчанию IMPORT_BATCH_SIZE).
+    Returns:
+        dict: Данные для ImportResultSchema.
+    """
+    result = new_import_result()
+    staging = create_staging_table(db, Employee.__table__, list(EmployeeSchema.model_fields))
+    stage_rows(db, staging, rows, EmployeeSchema, result, batch_size=batch_size)
+
+    reject_duplicate_ids(db, staging, result, "Duplicate employee id in file")
+
+    result["imported"] = merge_staging(db, staging, Employee.__table__)
+    staging.drop(db.connection())
+    reset_id_sequence(db, Employee.__table__)
+    db.commit()
+    # Импорт может затронуть любое количество сотрудников, поэтому кэш сотрудников очищается целиком.
+    invalidate_all(Employee)
+
+    result["errors"].sort(key=lambda error: error["row"])
+
+    return result
+
+
+def repair_workload_counters(db: Session) -> int:
+    """
+    Пересчет счетчиков задач сотрудников по таблице задач.
+    Нужен после заполнения счетчиков в миграции и для исправления расхождений, например после
+    изменения таблицы задач в обход триггеров (TRUNCATE, отключенные триггеры).
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        int: Количество сотрудников, у которых счетчики были исправлены.
+    """
+    task_count = (
+        select(func.count(Task.id))
+        .where(Task.executor_id == Employee.id)
+        .scalar_subquery()
+    )
+    active_task_count = (
+        select(func.count(Task.id))
+        .where(Task.executor_id == Employee.id, Task.is_active.is_(True))
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Employee)
+        .where((Employee.task_count != task_count) | (Employee.active_task_count != active_task_count))
+        .values(task_count=task_count, active_task_count=active_task_count)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    bump_version(Employee)
+
+    return result.rowcount
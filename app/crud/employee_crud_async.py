@@ -0,0 +1,322 @@
+from typing import Any, AsyncIterator, List
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import invalidate
+from app.crud import employee_crud
+from app.crud.employee_crud import (
+    ACTIVE_TASKS_LOADER,
+    attach_active_tasks,
+    employee_row_columns,
+    select_employee_page_keys,
+    get_update_values,
+    select_active_task_rows,
+    select_employees_page,
+    select_employees_tasks_rows,
+)
+from app.crud.versioning import VersionConflictError, object_exists, versioned_update
+from app.models.employee import Employee
+from app.models.task import Task
+from app.pagination import PageSummary, stream_page, summarize_page
+from app.schemas.employee_schemas import EmployeeCreateSchema, EmployeeUpdateSchema, EmployeeOrderBy
+
+
+async def get_employee(db: AsyncSession, employee_id: int) -> Employee | None:
+    """
+    Получение информации о сотруднике по его идентификатору.
+    Сотрудник читается через кэш синхронной реализацией employee_crud.get_employee в run_sync, как в синхронном режиме.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        employee_id (int): Идентификатор сотрудника.
+    Returns:
+        Employee: Объект с информацией о сотруднике.
+    """
+    return await db.run_sync(employee_crud.get_employee, employee_id)
+
+
+async def get_employee_row(db: AsyncSession, employee_id: int) -> dict[str, Any] | None:
+    """
+    Значения колонок сотрудника без создания ORM-объекта, через тот же кэш, что и get_employee
+    (см. employee_crud.get_employee_row).
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        employee_id (int): Идентификатор сотрудника.
+    Returns:
+        dict[str, Any] | None: Значения колонок или None, если сотрудника нет.
+    """
+    return await db.run_sync(employee_crud.get_employee_row, employee_id)
+
+
+async def get_employees(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: EmployeeOrderBy = "id",
+    cursor: str | None = None,
+    search: str | None = None,
+) -> List[Employee]:
+    """
+    Получение списка сотрудников с возможностью пагинации по смещению или по курсору.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        skip (int): Количество записей, которые следует пропустить, если курсор не передан (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+        order_by (EmployeeOrderBy): Ключ сортировки ("id", "full_name", "task_count" или "active_task_count",
+            по умолчанию "id").
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        search (str | None): Поисковый запрос по ФИО или None.
+    Returns:
+        List[Employee]: Список сотрудников.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_employees_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, search=search)
+
+    return [row async for row in await stream_page(statements, limit, db.stream_scalars)]
+
+
+async def get_employee_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: EmployeeOrderBy = "id",
+    cursor: str | None = None,
+    search: str | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Страница списка сотрудников словарями с полями EmployeeSchema и версией, без создания ORM-объектов
+    (см. employee_crud.get_employee_rows).
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        skip (int): Количество записей, которые следует пропустить, если курсор не передан (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+        order_by (EmployeeOrderBy): Ключ сортировки ("id", "full_name", "task_count" или "active_task_count",
+            по умолчанию "id").
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        search (str | None): Поисковый запрос по ФИО или None.
+        fields (tuple[str, ...] | None): Читаемые поля EmployeeSchema или None - все поля.
+    Returns:
+        list[dict[str, Any]]: Строки сотрудников.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_employees_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, search=search)
+    columns = employee_row_columns(order_by, fields)
+    statements = [statement.with_only_columns(*columns) for statement in statements]
+
+    return [row._asdict() async for row in await stream_page(statements, limit, db.stream)]
+
+
+async def iter_employee_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: EmployeeOrderBy = "id",
+    cursor: str | None = None,
+    search: str | None = None,
+    fields: tuple[str, ...] | None = None,
+    chunk_size: int = 1000,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Потоковое чтение страницы списка сотрудников для ответа, отправляющего строки потоком
+    (см. employee_crud.iter_employee_rows).
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        skip (int): Количество записей, которые следует пропустить, если курсор не передан (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+        order_by (EmployeeOrderBy): Ключ сортировки ("id", "full_name", "task_count" или "active_task_count",
+            по умолчанию "id").
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        search (str | None): Поисковый запрос по ФИО или None.
+        fields (tuple[str, ...] | None): Читаемые поля EmployeeSchema или None - все поля.
+        chunk_size (int): Количество строк, получаемых из курсора за раз (по умолчанию 1000).
+    Returns:
+        AsyncIterator[dict[str, Any]]: Строки сотрудников.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_employees_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, search=search)
+    columns = employee_row_columns(order_by, fields)
+    statements = [
+        statement.with_only_columns(*columns).execution_options(yield_per=chunk_size) for statement in statements
+    ]
+    result = await stream_page(statements, limit, db.stream)
+
+    return (row._asdict() async for row in result)
+
+
+async def get_employee_page_summary(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: EmployeeOrderBy = "id",
+    cursor: str | None = None,
+    search: str | None = None,
+) -> PageSummary:
+    """
+    ETag и курсор следующей страницы списка сотрудников по ключам ее строк, без чтения самих строк.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        skip (int): Количество записей, которые следует пропустить, если курсор не передан (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+        order_by (EmployeeOrderBy): Ключ сортировки ("id", "full_name", "task_count" или "active_task_count",
+            по умолчанию "id").
+        cursor (str | None): Курсор следующей страницы из предыдущего ответа.
+        search (str | None): Поисковый запрос по ФИО или None.
+    Returns:
+        PageSummary: ETag и курсор следующей страницы.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_employee_page_keys(skip=skip, limit=limit, order_by=order_by, cursor=cursor, search=search)
+    keys = [key async for key in await stream_page(statements, limit, db.stream)]
+
+    return summarize_page(keys, Employee.__tablename__, order_by, limit)
+
+
+async def get_employees_tasks(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Employee]:
+    """
+    Получение списка сотрудников с числом активных задач, отсортированных по убыванию количества задач.
+    Количество активных задач берется из счетчика active_task_count, поэтому задачи не агрегируются.
+    Активные задачи сотрудников загружаются заранее, так как ленивая загрузка недоступна в асинхронной сессии.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        skip (int): Количество записей, которые следует пропустить (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+    Returns:
+        List[Employee]: Список сотрудников с активными задачами.
+    """
+    employees = await db.scalars(
+        select(Employee)
+        .where(Employee.active_task_count > 0)
+        .order_by(Employee.active_task_count.desc(), Employee.id)
+        .offset(skip)
+        .limit(limit)
+        .options(ACTIVE_TASKS_LOADER)
+    )
+
+    return list(employees)
+
+
+async def get_employees_tasks_rows(db: AsyncSession, skip: int = 0, limit: int = 100) -> list[dict[str, Any]]:
+    """
+    Страница списка сотрудников с активными задачами словарями с полями EmployeeTasksSchema и версией,
+    без создания ORM-объектов (см. employee_crud.get_employees_tasks_rows).
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        skip (int): Количество записей, которые следует пропустить (по умолчанию 0).
+        limit (int): Максимальное количество записей для возврата (по умолчанию 100).
+    Returns:
+        list[dict[str, Any]]: Строки сотрудников с задачами в ключе task.
+    """
+    employees = [row._asdict() for row in await db.execute(select_employees_tasks_rows(skip=skip, limit=limit))]
+
+    if not employees:
+        return employees
+
+    tasks = await db.execute(select_active_task_rows([employee["id"] for employee in employees]))
+
+    return attach_active_tasks(employees, tasks)
+
+
+async def get_min_loaded_employees(db: AsyncSession, min_tasks_count: int) -> List[Employee]:
+    """
+    Получает список сотрудников с минимальной нагрузкой задач.
+    Нагрузка берется из счетчика task_count, поиск выполняется по индексу.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        min_tasks_count (int): Минимальное количество задач.
+    Returns:
+        List[Employee]: Список сотрудников с минимальной нагрузкой.
+    """
+    min_loaded_employees = await db.scalars(
+        select(Employee)
+        .where(Employee.task_count == min_tasks_count)
+        .order_by(Employee.id)
+    )
+
+    return list(min_loaded_employees)
+
+
+async def create_employee(db: AsyncSession, employee: EmployeeCreateSchema) -> Employee:
+    """
+    Создание нового сотрудника.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        employee (EmployeeCreateSchema): Данные для создания нового сотрудника.
+    Returns:
+        Employee: Созданный сотрудник.
+    """
+    db_employee = Employee(
+        full_name=employee.full_name,
+        position=employee.position
+    )
+
+    db.add(db_employee)
+    await db.commit()
+    await db.refresh(db_employee)
+    invalidate(Employee, [db_employee.id])
+
+    return db_employee
+
+
+async def partial_update_employee(
+    db: AsyncSession, employee_id: int, employee: EmployeeUpdateSchema, versions: list[int] | None = None
+) -> Employee | None:
+    """
+    Частичное обновление данных о сотруднике одним запросом UPDATE ... RETURNING с проверкой версии.
+    Изменяются только поля, переданные в запросе.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        employee_id (int): Идентификатор сотрудника, данные которого обновляются.
+        employee (EmployeeUpdateSchema): Данные для частичного обновления сотрудника.
+        versions (list[int] | None): Допустимые текущие версии сотрудника (из If-Match) или None.
+    Returns:
+        Employee: Обновленный сотрудник или None, если сотрудник не найден.
+    Raises:
+        VersionConflictError: Сотрудник есть, но его версия не входит в versions.
+    """
+    values = get_update_values(employee)
+    db_employee = (await db.scalars(versioned_update(Employee, employee_id, values, versions))).one_or_none()
+
+    if db_employee is None:
+        if versions is not None and await db.scalar(object_exists(Employee, employee_id)) is not None:
+            raise VersionConflictError(f"Employee {employee_id} has been modified")
+
+        return None
+
+    await db.commit()
+    invalidate(Employee, [employee_id])
+
+    return db_employee
+
+
+async def delete_employee(db: AsyncSession, employee_id: int) -> Employee | None:
+    """
+    Удаление сотрудника запросами UPDATE (снятие сотрудника с задач) и DELETE ... RETURNING.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        employee_id (int): Идентификатор сотрудника, которого следует удалить.
+    Returns:
+        Employee: Удаленный сотрудник или None, если сотрудник не найден.
+    """
+    task_ids = (
+        await db.scalars(
+            update(Task).where(Task.executor_id == employee_id).values(executor_id=None).returning(Task.id)
+        )
+    ).all()
+    db_employee = (
+        await db.scalars(delete(Employee).where(Employee.id == employee_id).returning(Employee))
+    ).one_or_none()
+
+    if db_employee is None:
+        await db.rollback()
+        return None
+
+    await db.commit()
+    invalidate(Employee, [employee_id])
+    invalidate(Task, task_ids)
+
+    return db_employee
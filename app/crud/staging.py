@@ -0,0 +1,303 @@
+import io
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Iterable, Sequence
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Column, ColumnElement, Index, Integer, MetaData, Table, delete, func, select, text, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.schemas.bulk_schemas import format_validation_error
+
+# Колонка с номером строки файла импорта в промежуточной таблице.
+ROW_NUMBER_COLUMN = "row_number"
+
+# Количество строк файла, которые проверяются и загружаются в промежуточную таблицу за раз.
+IMPORT_BATCH_SIZE = 5000
+
+# Максимальное количество ошибок в результате импорта, остальные отклоненные строки только считаются.
+IMPORT_MAX_ERRORS = 1000
+
+# Экранирование спецсимволов в текстовом формате COPY.
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+# Диалекты, поддерживающие INSERT ... ON CONFLICT DO UPDATE.
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class ImportNotSupportedError(ValueError):
+    """Импорт через промежуточную таблицу не поддерживается диалектом базы данных."""
+
+
+def check_import_supported(db: Session) -> None:
+    """
+    Проверка поддержки импорта диалектом базы данных: перенос строк из промежуточной таблицы
+    выполняется запросом INSERT ... ON CONFLICT DO UPDATE (UPSERT_DIALECTS).
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        None
+    Raises:
+        ImportNotSupportedError: Если диалект не поддерживает импорт.
+    """
+    dialect = db.get_bind().dialect.name
+
+    if dialect not in UPSERT_DIALECTS:
+        raise ImportNotSupportedError(f"Import is not supported for {dialect}")
+
+
+def create_staging_table(db: Session, table: Table, columns: Sequence[str]) -> Table:
+    """
+    Создание временной промежуточной таблицы для импорта в table.
+    Таблица повторяет колонки columns таблицы table без ограничений и дополнительно хранит номер строки файла.
+    Индекс по id нужен для поиска ссылок между строками файла.
+    Временная таблица видна только соединению сессии и удаляется при его закрытии.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        table (Table): Таблица, в которую выполняется импорт.
+        columns (Sequence[str]): Импортируемые колонки, включая id.
+    Returns:
+        Table: Промежуточная таблица.
+    Raises:
+        ImportNotSupportedError: Если диалект не поддерживает импорт: строки не загружаются напрасно.
+    """
+    check_import_supported(db)
+    staging = Table(
+        f"{table.name}_staging",
+        MetaData(),
+        Column(ROW_NUMBER_COLUMN, Integer, nullable=False),
+        *(Column(column, table.c[column].type) for column in columns),
+        Index(f"ix_{table.name}_staging_id", "id"),
+        prefixes=["TEMPORARY"],
+    )
+    connection = db.connection()
+    # Таблица могла остаться в соединении после прерванного импорта.
+    staging.drop(connection, checkfirst=True)
+    staging.create(connection)
+
+    return staging
+
+
+def _copy_value(value: Any) -> str:
+    """
+    Представление значения в текстовом формате COPY.
+    Args:
+        value (Any): Значение колонки.
+    Returns:
+        str: Значение с экранированными спецсимволами, \\N для NULL.
+    """
+    if value is None:
+        return "\\N"
+
+    if isinstance(value, str):
+        return value.translate(COPY_ESCAPES)
+
+    if isinstance(value, bool):
+        return "t" if value else "f"
+
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    return str(value)
+
+
+def copy_into(db: Session, staging: Table, rows: Sequence[dict]) -> None:
+    """
+    Загрузка строк в промежуточную таблицу.
+    В PostgreSQL с драйвером psycopg2 используется COPY FROM STDIN,
+    в остальных базах данных - INSERT с executemany.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        staging (Table): Промежуточная таблица.
+        rows (Sequence[dict]): Строки с ключами по именам колонок staging.
+    Returns:
+        None
+    """
+    if not rows:
+        return
+
+    connection = db.connection()
+
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+        columns = [column.name for column in staging.columns]
+        buffer = io.StringIO()
+
+        for row in rows:
+            buffer.write("\t".join(_copy_value(row.get(column)) for column in columns))
+            buffer.write("\n")
+
+        buffer.seek(0)
+
+        with connection.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {staging.name} ({', '.join(columns)}) FROM STDIN", buffer)
+    else:
+        connection.execute(staging.insert(), list(rows))
+
+
+def new_import_result() -> dict:
+    """
+    Пустой результат импорта.
+    Returns:
+        dict: Данные для ImportResultSchema.
+    """
+    return {"received": 0, "imported": 0, "rejected": 0, "errors": []}
+
+
+def add_import_error(result: dict, row: int, item_id: Any, error: str) -> None:
+    """
+    Учет отклоненной строки в результате импорта.
+    Args:
+        result (dict): Результат импорта.
+        row (int): Номер строки файла (с 1).
+        item_id (Any): Идентификатор из строки или None.
+        error (str): Причина отклонения.
+    Returns:
+        None
+    """
+    result["rejected"] += 1
+
+    if len(result["errors"]) < IMPORT_MAX_ERRORS:
+        result["errors"].append({"row": row, "id": item_id, "error": error})
+
+
+def stage_rows(
+    db: Session,
+    staging: Table,
+    rows: Iterable[Any],
+    schema: type[BaseModel],
+    result: dict,
+    check: Callable[[BaseModel], str | None] | None = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> None:
+    """
+    Проверка строк файла по схеме и загрузка корректных строк в промежуточную таблицу частями по batch_size.
+    В памяти одновременно находится не больше batch_size строк.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        staging (Table): Промежуточная таблица.
+        rows (Iterable[Any]): Строки файла.
+        schema (type[BaseModel]): Схема строки.
+        result (dict): Результат импорта, в котором учитываются полученные и отклоненные строки.
+        check (Callable[[BaseModel], str | None] | None): Дополнительная проверка строки, возвращающая ошибку.
+        batch_size (int): Количество строк в части (по умолчанию IMPORT_BATCH_SIZE).
+    Returns:
+        None
+    """
+    numbered = enumerate(rows, start=1)
+
+    while batch := list(islice(numbered, batch_size)):
+        valid = []
+
+        for row_number, row in batch:
+            try:
+                item = schema.model_validate(row)
+            except ValidationError as error:
+                item_id = row.get("id") if isinstance(row, dict) else None
+                item_id = item_id if isinstance(item_id, (int, str)) else None
+                add_import_error(result, row_number, item_id, format_validation_error(error))
+                continue
+
+            error = check(item) if check else None
+
+            if error:
+                add_import_error(result, row_number, item.id, error)
+            else:
+                valid.append({ROW_NUMBER_COLUMN: row_number, **item.model_dump()})
+
+        copy_into(db, staging, valid)
+        result["received"] += len(batch)
+
+
+def reject_staged_rows(
+    db: Session,
+    staging: Table,
+    condition: ColumnElement[bool],
+    result: dict,
+    error: str,
+) -> int:
+    """
+    Удаление из промежуточной таблицы строк, которые нельзя импортировать, с учетом их в результате импорта.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        staging (Table): Промежуточная таблица.
+        condition (ColumnElement[bool]): Условие отбора отклоняемых строк.
+        result (dict): Результат импорта.
+        error (str): Причина отклонения.
+    Returns:
+        int: Количество отклоненных строк.
+    """
+    statement = delete(staging).where(condition).returning(staging.c[ROW_NUMBER_COLUMN], staging.c.id)
+    rejected = db.execute(statement).all()
+
+    for row_number, item_id in rejected:
+        add_import_error(result, row_number, item_id, error)
+
+    return len(rejected)
+
+
+def reject_duplicate_ids(db: Session, staging: Table, result: dict, error: str) -> int:
+    """
+    Отклонение повторов идентификатора в файле: импортируется первая строка с идентификатором.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        staging (Table): Промежуточная таблица.
+        result (dict): Результат импорта.
+        error (str): Причина отклонения.
+    Returns:
+        int: Количество отклоненных строк.
+    """
+    first_rows = select(func.min(staging.c[ROW_NUMBER_COLUMN])).group_by(staging.c.id)
+    condition = staging.c[ROW_NUMBER_COLUMN].not_in(first_rows.scalar_subquery())
+
+    return reject_staged_rows(db, staging, condition, result, error)
+
+
+def merge_staging(db: Session, staging: Table, table: Table) -> int:
+    """
+    Перенос строк из промежуточной таблицы в table одним запросом.
+    Строки с существующим идентификатором обновляются, остальные добавляются.
+    Колонки table, которых нет в промежуточной таблице, не изменяются, кроме колонок с onupdate (updated_at):
+    они получают новое значение, как при обновлении через ORM.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        staging (Table): Промежуточная таблица.
+        table (Table): Таблица, в которую выполняется импорт.
+    Returns:
+        int: Количество перенесенных строк.
+    Raises:
+        ImportNotSupportedError: Если диалект не поддерживает импорт.
+    """
+    check_import_supported(db)
+    dialect = db.connection().dialect.name
+    columns = [column.name for column in staging.columns if column.name != ROW_NUMBER_COLUMN]
+    # Условие WHERE нужно SQLite, чтобы ON CONFLICT не разбирался как часть JOIN.
+    rows = select(*(staging.c[column] for column in columns)).where(true())
+    statement = UPSERT_DIALECTS[dialect](table).from_select(columns, rows)
+    set_ = {column: statement.excluded[column] for column in columns if column != "id"}
+    set_.update({
+        column.name: column.onupdate.arg(None) if column.onupdate.is_callable else column.onupdate.arg
+        for column in table.columns
+        if column.onupdate is not None and column.name not in columns
+    })
+    statement = statement.on_conflict_do_update(index_elements=[table.c.id], set_=set_)
+    db.execute(statement)
+
+    return db.scalar(select(func.count()).select_from(staging))
+
+
+def reset_id_sequence(db: Session, table: Table) -> None:
+    """
+    Сдвиг последовательности идентификаторов table после вставки строк с явными идентификаторами.
+    В SQLite следующий идентификатор вычисляется по максимальному, поэтому сдвиг нужен только в PostgreSQL.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        table (Table): Таблица с колонкой id.
+    Returns:
+        None
+    """
+    if db.connection().dialect.name == "postgresql":
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {table.name}), false)"
+        ))
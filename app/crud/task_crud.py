@@ -1,54 +1,391 @@
-from typing import Type, List
+import heapq
+from datetime import datetime
+from typing import Any, Iterable, Type, List, Iterator
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, RowMapping, Select, case, delete, exists, func, insert, select, update
+from sqlalchemy.orm import Session, aliased
 
+from app.cache import MemoEntry, VersionedMemo, get_cached, get_cached_row, invalidate, invalidate_all
+from app.crud.bulk import chunked, select_existing_ids, update_rows_by_id
 from app.crud.employee_crud import get_employee, get_min_loaded_employees
+from app.crud.task_graph import (
+    CYCLE_ERROR,
+    TOO_DEEP_ERROR,
+    TaskHierarchyError,
+    find_hierarchy_errors,
+    find_too_deep_parents,
+)
+from app.crud.staging import (
+    IMPORT_BATCH_SIZE,
+    create_staging_table,
+    merge_staging,
+    new_import_result,
+    reject_duplicate_ids,
+    reject_staged_rows,
+    reset_id_sequence,
+    stage_rows,
+)
+from app.crud.versioning import VersionConflictError, object_exists, versioned_update
 from app.models.employee import Employee
+from app.models.search import search_condition
 from app.models.task import Task
-from app.schemas.task_schemas import TaskCreateSchema, TaskUpdateSchema
+from app.pagination import PageSummary, decode_cursor, iter_page, paginate, summarize_page
+from app.serialization import projection_columns, response_columns
+from app.schemas.task_schemas import (
+    TaskSchema,
+    TaskCreateSchema,
+    TaskUpdateSchema,
+    TaskOrderBy,
+    TaskBulkUpdateSchema,
+    TaskFilterSchema,
+)
+from app.task_index import get_task_index
+from config import TASK_GRAPH_MAX_DEPTH
+
+# Колонки, по которым можно сортировать список задач.
+TASK_SORT_COLUMNS = {"id": Task.id, "deadline": Task.deadline, "title": Task.title}
+
+# Кэшируемые колонки задачи: поля ответа, время изменения и версия, по которой строится ETag.
+TASK_CACHED_COLUMNS = [*TaskSchema.model_fields, "updated_at", "version"]
+
+# Колонки строк списка задач без ORM-объектов (get_task_rows): поля TaskSchema и версия.
+TASK_ROW_COLUMNS = response_columns(TaskSchema, Task)
+
+# Результат get_important_tasks зависит от задач и сотрудников (их ФИО и нагрузки).
+important_tasks_memo = VersionedMemo([Task, Employee])
 
 
 def get_task(db: Session, task_id: int) -> Type[Task]:
     """
     Получение информации о задаче по её идентификатору.
+    Задача читается через кэш (app.cache), изменяющие задачи функции удаляют ее из кэша.
     Args:
         db (Session): Сессия базы данных SQLAlchemy.
         task_id (int): Идентификатор задачи.
     Returns:
         Task: Информация о задаче.
     """
-    return db.query(Task).filter(Task.id == task_id).first()
+    return get_cached(db, Task, task_id, TASK_CACHED_COLUMNS)
 
 
-def get_tasks(db: Session, skip: int = 0, limit: int = 100) -> List[Type[Task]]:
+def get_task_row(db: Session, task_id: int) -> dict[str, Any] | None:
     """
-    Получение списка задач с пропуском и лимитом.
+    Значения колонок задачи (TASK_CACHED_COLUMNS) без создания ORM-объекта, через тот же кэш, что и get_task.
+    Ответ с частью полей (параметр fields) строится из этих значений.
     Args:
         db (Session): Сессия базы данных SQLAlchemy.
-        skip (int, optional): Количество пропускаемых элементов. По умолчанию 0.
+        task_id (int): Идентификатор задачи.
+    Returns:
+        dict[str, Any] | None: Значения колонок или None, если задачи нет.
+    """
+    return get_cached_row(db, Task, task_id, TASK_CACHED_COLUMNS)
+
+
+def select_tasks_page(
+    skip: int = 0,
+    limit: int = 100,
+    order_by: TaskOrderBy = "id",
+    cursor: str | None = None,
+    filters: TaskFilterSchema | None = None,
+) -> list[Select]:
+    """
+    Построение запросов страницы списка задач (общих для синхронного и асинхронного режимов).
+    Args:
+        skip (int, optional): Количество пропускаемых элементов, если курсор не передан. По умолчанию 0.
         limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        order_by (TaskOrderBy, optional): Ключ сортировки ("id", "deadline" или "title"). По умолчанию "id".
+        cursor (str | None, optional): Курсор следующей страницы из предыдущего ответа.
+        filters (TaskFilterSchema | None, optional): Фильтры списка задач. По умолчанию не применяются.
+    Returns:
+        list[Select]: Запросы диапазонов страницы задач (app.pagination.paginate).
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    sort_column = TASK_SORT_COLUMNS[order_by]
+    after = decode_cursor(cursor, order_by, sort_column) if cursor else None
+    statement = select(Task)
+
+    if filters is not None:
+        statement = filter_tasks(statement, **filters.model_dump())
+
+    return paginate(statement, sort_column, Task.id, skip=skip, limit=limit, after=after)
+
+
+def get_tasks(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: TaskOrderBy = "id",
+    cursor: str | None = None,
+    filters: TaskFilterSchema | None = None,
+) -> List[Type[Task]]:
+    """
+    Получение списка задач с пропуском и лимитом или по курсору.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        skip (int, optional): Количество пропускаемых элементов, если курсор не передан. По умолчанию 0.
+        limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        order_by (TaskOrderBy, optional): Ключ сортировки ("id", "deadline" или "title"). По умолчанию "id".
+        cursor (str | None, optional): Курсор следующей страницы из предыдущего ответа.
+        filters (TaskFilterSchema | None, optional): Фильтры списка задач. По умолчанию не применяются.
     Returns:
         List[Task]: Список задач.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_tasks_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, filters=filters)
+
+    return list(iter_page(statements, limit, db.scalars))
+
+
+def get_task_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: TaskOrderBy = "id",
+    cursor: str | None = None,
+    filters: TaskFilterSchema | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Страница списка задач (как get_tasks) словарями с полями TaskSchema и версией, без создания ORM-объектов.
+    Строки сериализуются ответом TaskRowsResponse (app.serialization) без проверки по схеме.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        skip (int, optional): Количество пропускаемых элементов, если курсор не передан. По умолчанию 0.
+        limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        order_by (TaskOrderBy, optional): Ключ сортировки ("id", "deadline" или "title"). По умолчанию "id".
+        cursor (str | None, optional): Курсор следующей страницы из предыдущего ответа.
+        filters (TaskFilterSchema | None, optional): Фильтры списка задач. По умолчанию не применяются.
+        fields (tuple[str, ...] | None, optional): Читаемые поля TaskSchema (task_row_columns). По умолчанию все.
+    Returns:
+        list[dict[str, Any]]: Строки задач.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_tasks_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, filters=filters)
+    columns = task_row_columns(order_by, fields)
+    statements = [statement.with_only_columns(*columns) for statement in statements]
+
+    return [row._asdict() for row in iter_page(statements, limit, db.execute)]
+
+
+def iter_task_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: TaskOrderBy = "id",
+    cursor: str | None = None,
+    filters: TaskFilterSchema | None = None,
+    fields: tuple[str, ...] | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[dict[str, Any]]:
+    """
+    Потоковое чтение страницы списка задач (как get_task_rows) для ответа, отправляющего строки потоком.
+    Запрос выполняется сразу, строки читаются курсором по chunk_size строк по мере отправки ответа.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        skip (int, optional): Количество пропускаемых элементов, если курсор не передан. По умолчанию 0.
+        limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        order_by (TaskOrderBy, optional): Ключ сортировки ("id", "deadline" или "title"). По умолчанию "id".
+        cursor (str | None, optional): Курсор следующей страницы из предыдущего ответа.
+        filters (TaskFilterSchema | None, optional): Фильтры списка задач. По умолчанию не применяются.
+        fields (tuple[str, ...] | None, optional): Читаемые поля TaskSchema (task_row_columns). По умолчанию все.
+        chunk_size (int, optional): Количество строк, получаемых из курсора за раз. По умолчанию 1000.
+    Returns:
+        Iterator[dict[str, Any]]: Строки задач.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_tasks_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, filters=filters)
+    columns = task_row_columns(order_by, fields)
+    statements = [
+        statement.with_only_columns(*columns).execution_options(yield_per=chunk_size) for statement in statements
+    ]
+    result = iter_page(statements, limit, db.execute)
+
+    return (row._asdict() for row in result)
+
+
+def select_task_page_keys(
+    skip: int = 0,
+    limit: int = 100,
+    order_by: TaskOrderBy = "id",
+    cursor: str | None = None,
+    filters: TaskFilterSchema | None = None,
+) -> list[Select]:
+    """
+    Запросы ключей строк страницы списка задач (идентификатор, версия и ключ сортировки) для summarize_page.
+    Args:
+        skip (int, optional): Количество пропускаемых элементов, если курсор не передан. По умолчанию 0.
+        limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        order_by (TaskOrderBy, optional): Ключ сортировки ("id", "deadline" или "title"). По умолчанию "id".
+        cursor (str | None, optional): Курсор следующей страницы из предыдущего ответа.
+        filters (TaskFilterSchema | None, optional): Фильтры списка задач. По умолчанию не применяются.
+    Returns:
+        list[Select]: Запросы ключей диапазонов страницы.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
     """
-    return db.query(Task).offset(skip).limit(limit).all()
+    statements = select_tasks_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, filters=filters)
+    columns = Task.id, Task.version, TASK_SORT_COLUMNS[order_by]
+
+    return [statement.with_only_columns(*columns) for statement in statements]
+
+
+def get_task_page_summary(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: TaskOrderBy = "id",
+    cursor: str | None = None,
+    filters: TaskFilterSchema | None = None,
+    chunk_size: int = 1000,
+) -> PageSummary:
+    """
+    ETag и курсор следующей страницы списка задач по ключам ее строк, без чтения самих строк.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        skip (int, optional): Количество пропускаемых элементов, если курсор не передан. По умолчанию 0.
+        limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        order_by (TaskOrderBy, optional): Ключ сортировки ("id", "deadline" или "title"). По умолчанию "id".
+        cursor (str | None, optional): Курсор следующей страницы из предыдущего ответа.
+        filters (TaskFilterSchema | None, optional): Фильтры списка задач. По умолчанию не применяются.
+        chunk_size (int, optional): Количество ключей, получаемых из курсора за раз. По умолчанию 1000.
+    Returns:
+        PageSummary: ETag и курсор следующей страницы.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_task_page_keys(skip=skip, limit=limit, order_by=order_by, cursor=cursor, filters=filters)
+    statements = [statement.execution_options(yield_per=chunk_size) for statement in statements]
+    keys = iter_page(statements, limit, db.execute)
+
+    return summarize_page(keys, Task.__tablename__, order_by, limit)
+
+
+def task_row_columns(order_by: TaskOrderBy = "id", fields: tuple[str, ...] | None = None) -> list:
+    """
+    Колонки строк списка задач: все поля TaskSchema (TASK_ROW_COLUMNS) или только поля fields,
+    идентификатор и ключ сортировки, по которым строится курсор следующей страницы, и версия для ETag.
+    Args:
+        order_by (TaskOrderBy, optional): Ключ сортировки. По умолчанию "id".
+        fields (tuple[str, ...] | None, optional): Поля TaskSchema (app.serialization.parse_fields) или None.
+    Returns:
+        list: Колонки для select().
+    """
+    if fields is None:
+        return TASK_ROW_COLUMNS
+
+    return projection_columns(Task, fields, "id", order_by)
+
+
+def task_row_versions(tasks: Iterable[dict[str, Any]]) -> Iterator[tuple[str, int, int]]:
+    """
+    Версии строк задач get_task_rows для make_versions_etag.
+    Args:
+        tasks (Iterable[dict[str, Any]]): Строки задач.
+    Returns:
+        Iterator[tuple[str, int, int]]: Таблица, идентификатор и версия каждой задачи.
+    """
+    return ((Task.__tablename__, task["id"], task["version"]) for task in tasks)
+
+
+def filter_tasks(
+    statement: Select,
+    is_active: bool | None = None,
+    executor_id: int | None = None,
+    deadline_from: datetime | None = None,
+    deadline_to: datetime | None = None,
+    parent_task_id: int | None = None,
+    has_children: bool | None = None,
+    search: str | None = None,
+) -> Select:
+    """
+    Добавление фильтров по задачам к запросу. Фильтры со значением None не применяются.
+    Фильтрам соответствуют индексы таблицы задач: по исполнителю и активности, по активности и id,
+    по сроку выполнения, по родительской задаче и полнотекстовый индекс названия. Фильтр has_children индексом
+    не отбирается: задачи читаются в порядке сортировки, наличие дочерних задач проверяется по индексу
+    родительской задачи, поэтому время страницы растет с числом пропущенных задач.
+    Args:
+        statement (Select): Запрос, в котором участвует таблица задач.
+        is_active (bool | None): Флаг активности задачи.
+        executor_id (int | None): Идентификатор исполнителя.
+        deadline_from (datetime | None): Срок выполнения не раньше указанного.
+        deadline_to (datetime | None): Срок выполнения не позже указанного.
+        parent_task_id (int | None): Идентификатор родительской задачи.
+        has_children (bool | None): Наличие задач, для которых задача является родительской.
+        search (str | None): Поисковый запрос по названию (app.models.search.search_condition).
+    Returns:
+        Select: Запрос с фильтрами.
+    """
+    if is_active is not None:
+        statement = statement.where(Task.is_active.is_(is_active))
+
+    if executor_id is not None:
+        statement = statement.where(Task.executor_id == executor_id)
+
+    if deadline_from is not None:
+        statement = statement.where(Task.deadline >= deadline_from)
+
+    if deadline_to is not None:
+        statement = statement.where(Task.deadline <= deadline_to)
+
+    if parent_task_id is not None:
+        statement = statement.where(Task.parent_task_id == parent_task_id)
+
+    if has_children is not None:
+        child_task = aliased(Task)
+        children = exists().where(child_task.parent_task_id == Task.id)
+        statement = statement.where(children if has_children else ~children)
+
+    if search is not None:
+        statement = statement.where(search_condition(Task.title, search))
+
+    return statement
+
+
+def iter_tasks(
+    db: Session,
+    is_active: bool | None = None,
+    executor_id: int | None = None,
+    deadline_from: datetime | None = None,
+    deadline_to: datetime | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[RowMapping]:
+    """
+    Потоковое чтение задач для выгрузки.
+    Строки читаются серверным курсором по chunk_size строк без создания ORM-объектов,
+    поэтому расход памяти не зависит от размера таблицы.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        is_active (bool | None): Флаг активности задачи.
+        executor_id (int | None): Идентификатор исполнителя.
+        deadline_from (datetime | None): Срок выполнения не раньше указанного.
+        deadline_to (datetime | None): Срок выполнения не позже указанного.
+        chunk_size (int): Количество строк, получаемых из курсора за раз (по умолчанию 1000).
+    Yields:
+        RowMapping: Строка задачи с полями TaskSchema.
+    """
+    statement = select(*(getattr(Task, field) for field in TaskSchema.model_fields))
+    statement = filter_tasks(statement, is_active, executor_id, deadline_from, deadline_to)
+    result = db.execute(statement.order_by(Task.id).execution_options(yield_per=chunk_size))
+
+    yield from result.mappings()
 
 
 def get_min_task_count(db: Session) -> int:
     """
     Получение минимального количества задач у сотрудников.
+    Минимум берется по индексу счетчика task_count, поэтому задачи не агрегируются.
     Args:
         db (Session): Сессия базы данных SQLAlchemy.
     Returns:
-        int: Минимальное количество задач.
+        int: Минимальное количество задач (0, если сотрудников нет).
     """
-    min_tasks_count = (
-        db.query(Employee.id, func.count(Task.id).label('task_count'))
-        .outerjoin(Employee.task)
-        .group_by(Employee.id)
-    ).order_by(func.count(Task.id)).first().task_count
+    min_tasks_count = db.query(func.min(Employee.task_count)).scalar()
 
-    return min_tasks_count
+    return min_tasks_count or 0
 
 
 def get_unassigned_parent_tasks(db: Session) -> List[Type[Task]]:
@@ -59,10 +396,12 @@ def get_unassigned_parent_tasks(db: Session) -> List[Type[Task]]:
     Returns:
         List[Task]: Список родительских задач без исполнителя.
     """
+    child_task = aliased(Task)
+    # Наличие дочерней задачи проверяется по индексу parent_task_id только для задач без исполнителя.
     unassigned_parent_tasks = (
         db.query(Task)
-        .filter(Task.id.in_(db.query(Task.parent_task_id)))
         .filter(Task.executor_id.is_(None))
+        .filter(exists().where(child_task.parent_task_id == Task.id))
         .all()
     )
 
@@ -71,7 +410,85 @@ def get_unassigned_parent_tasks(db: Session) -> List[Type[Task]]:
 
 def get_important_tasks(db: Session):
     """
-    Получает список важных задач.
+    Получает список важных задач за фиксированное число запросов.
+
+    Результат совпадает с get_important_tasks_reference, но нагрузка сотрудников берется
+    из счетчика task_count, а исполнитель родительской задачи подтягивается
+    соединением, поэтому число запросов не зависит от количества задач:
+    1. Запрос ФИО сотрудников с минимальным количеством задач.
+    2. Запрос родительских задач без исполнителя вместе с исполнителем их родительской задачи,
+       если его нагрузка не превышает (минимальное количество задач + 2).
+
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        List[dict]: Список словарей с информацией о важных задачах.
+            Каждый словарь содержит:
+            - 'title': Название задачи.
+            - 'deadline': Срок выполнения задачи.
+            - 'employees': Список ФИО сотрудников, способных взять важную задачу.
+    """
+    # Сотрудники с минимальным количеством задач (все задачи, включая неактивные)
+    min_loaded_employees = db.execute(
+        select(Employee.full_name, Employee.task_count)
+        .where(Employee.task_count == select(func.min(Employee.task_count)).scalar_subquery())
+        .order_by(Employee.id)
+    ).all()
+    min_tasks_count = min_loaded_employees[0].task_count if min_loaded_employees else 0
+    min_loaded_employees = [employee.full_name for employee in min_loaded_employees]
+
+    parent_task = aliased(Task)
+    child_task = aliased(Task)
+    parent_executor = aliased(Employee)
+
+    # Родительские задачи без исполнителя и подходящий исполнитель их родительской задачи
+    rows = db.execute(
+        select(Task.title, Task.deadline, parent_executor.full_name.label("parent_executor"))
+        .outerjoin(parent_task, parent_task.id == Task.parent_task_id)
+        .outerjoin(
+            parent_executor,
+            (parent_executor.id == parent_task.executor_id) & (parent_executor.task_count <= min_tasks_count + 2),
+        )
+        .where(Task.executor_id.is_(None))
+        .where(exists().where(child_task.parent_task_id == Task.id))
+        .order_by(Task.id)
+    ).all()
+
+    return [
+        {
+            'title': row.title,
+            'deadline': row.deadline,
+            'employees': [row.parent_executor] if row.parent_executor is not None else min_loaded_employees,
+        }
+        for row in rows
+    ]
+
+
+def get_important_tasks_memoized(db: Session) -> MemoEntry:
+    """
+    Получение списка важных задач из сохраненного результата get_important_tasks.
+    Результат пересчитывается только после изменения задач или сотрудников через CRUD-функции
+    (или по истечении времени жизни), одновременные запросы ждут одного пересчета.
+    Если включен индекс графа задач (TASK_GRAPH_INDEX), результат берется из графа в памяти.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        MemoEntry: Список важных задач (value) с ETag и временем изменения.
+    """
+    index = get_task_index()
+
+    if index is not None:
+        return index.important_tasks(db)
+
+    return important_tasks_memo.get(lambda: get_important_tasks(db))
+
+
+def get_important_tasks_reference(db: Session):
+    """
+    Эталонная построчная реализация поиска важных задач.
+
+    Выполняет по два запроса на каждую родительскую задачу, поэтому используется только
+    для сверки результатов get_important_tasks в тестах и бенчмарках.
 
     Важные задачи определяются следующим образом:
     1. Выбираются невыполненные родительские задачи, у которых не указан исполнитель.
@@ -133,6 +550,152 @@ def get_important_tasks(db: Session):
     return important_tasks
 
 
+def plan_assignments(tasks: Iterable[Row], loads: dict[int, int]) -> list[tuple[int, int, str]]:
+    """
+    Жадное распределение задач между сотрудниками с кучей по нагрузке.
+
+    Задачи обрабатываются по порядку. Задача достается исполнителю родительской задачи, если его текущая
+    нагрузка не превышает (минимальная нагрузка + 2), иначе - наименее загруженному сотруднику
+    (при равной нагрузке - с меньшим идентификатором). После каждого назначения нагрузка сотрудника растет,
+    поэтому следующие задачи распределяются с ее учетом. Устаревшие записи кучи пропускаются при извлечении.
+    Сложность O((T + E) log E) для T задач и E сотрудников.
+    Args:
+        tasks (Iterable[Row]): Задачи с полями id и parent_executor_id (исполнитель родительской задачи или None).
+        loads (dict[int, int]): Текущее количество задач по идентификаторам сотрудников, изменяется на месте.
+    Returns:
+        list[tuple[int, int, str]]: Тройки (идентификатор задачи, идентификатор сотрудника, причина назначения):
+            "parent_executor" или "least_loaded". Пустой список, если сотрудников нет.
+    """
+    heap = [(load, employee_id) for employee_id, load in loads.items()]
+    heapq.heapify(heap)
+    assignments = []
+
+    if not heap:
+        return assignments
+
+    for task in tasks:
+        # Вершина кучи с устаревшей нагрузкой отбрасывается, пока не найдется актуальная.
+        while heap[0][0] != loads[heap[0][1]]:
+            heapq.heappop(heap)
+
+        min_load = heap[0][0]
+        employee_id = task.parent_executor_id
+
+        if employee_id is not None and employee_id in loads and loads[employee_id] <= min_load + 2:
+            reason = "parent_executor"
+        else:
+            employee_id, reason = heap[0][1], "least_loaded"
+
+        loads[employee_id] += 1
+        heapq.heappush(heap, (loads[employee_id], employee_id))
+        assignments.append((task.id, employee_id, reason))
+
+    return assignments
+
+
+def select_assignable_tasks() -> Select:
+    """
+    Запрос родительских задач без исполнителя вместе с исполнителем их родительской задачи.
+    Задачи упорядочены по сроку выполнения (без срока - в конце), чтобы срочные задачи
+    доставались наименее загруженным сотрудникам.
+    Returns:
+        Select: Запрос с колонками id, title, deadline и parent_executor_id.
+    """
+    parent_task = aliased(Task)
+    child_task = aliased(Task)
+
+    return (
+        select(Task.id, Task.title, Task.deadline, parent_task.executor_id.label("parent_executor_id"))
+        .outerjoin(parent_task, parent_task.id == Task.parent_task_id)
+        .where(Task.executor_id.is_(None))
+        .where(exists().where(child_task.parent_task_id == Task.id))
+        .order_by(Task.deadline.asc().nulls_last(), Task.id)
+    )
+
+
+def assign_important_tasks(db: Session, dry_run: bool = False) -> dict:
+    """
+    Назначение исполнителей всем важным задачам (родительским задачам без исполнителя) за один раз.
+    Распределение строится plan_assignments по нагрузке из счетчиков task_count и применяется
+    в одной транзакции частями: на каждую часть один запрос UPDATE ... SET executor_id = CASE id WHEN ... END
+    WHERE id IN (...) AND executor_id IS NULL. В PostgreSQL задачи блокируются (FOR UPDATE SKIP LOCKED),
+    поэтому одновременные назначения не распределяют одни и те же задачи; задачи, которым исполнитель
+    назначен в обход блокировки, не перезаписываются и не учитываются в 'assigned'.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        dry_run (bool): Только рассчитать распределение, не изменяя задачи и не фиксируя транзакцию.
+    Returns:
+        dict: Ключи 'dry_run', 'assigned' (количество назначенных задач, при dry_run - количество задач
+            в распределении), 'unassigned' (количество задач,
+            оставшихся без исполнителя, если сотрудников нет) и 'assignments' (список назначений
+            с ключами 'task_id', 'title', 'deadline', 'employee_id', 'full_name' и 'reason').
+    """
+    statement = select_assignable_tasks()
+
+    if not dry_run:
+        statement = statement.with_for_update(of=Task, skip_locked=True)
+
+    tasks = db.execute(statement).all()
+    employees = db.execute(select(Employee.id, Employee.full_name, Employee.task_count)).all()
+    plan = plan_assignments(tasks, {employee.id: employee.task_count for employee in employees})
+
+    assigned = len(plan)
+
+    if not dry_run:
+        assigned = 0
+
+        # Одна часть назначений - один запрос UPDATE ... SET executor_id = CASE id WHEN ... END:
+        # триггеры счетчиков нагрузки выполняются один раз на запрос, а не на каждую задачу.
+        for chunk in chunked(plan):
+            executors = {task_id: employee_id for task_id, employee_id, _ in chunk}
+            assigned += db.execute(
+                update(Task.__table__)
+                .where(Task.id.in_(executors), Task.executor_id.is_(None))
+                .values(executor_id=case(executors, value=Task.id))
+            ).rowcount
+
+        db.commit()
+        invalidate(Task, (task_id for task_id, _, _ in plan))
+
+    tasks_by_id = {task.id: task for task in tasks}
+    names = {employee.id: employee.full_name for employee in employees}
+
+    return {
+        "dry_run": dry_run,
+        "assigned": assigned,
+        "unassigned": len(tasks) - len(plan),
+        "assignments": [
+            {
+                "task_id": task_id,
+                "title": tasks_by_id[task_id].title,
+                "deadline": tasks_by_id[task_id].deadline,
+                "employee_id": employee_id,
+                "full_name": names[employee_id],
+                "reason": reason,
+            }
+            for task_id, employee_id, reason in plan
+        ],
+    }
+
+
+def get_update_values(task: TaskUpdateSchema) -> dict[str, Any]:
+    """
+    Значения для частичного обновления задачи: только поля, переданные в запросе (exclude_unset),
+    поэтому записываются и значения False, 0 и None.
+    Args:
+        task (TaskUpdateSchema): Данные для частичного обновления задачи.
+    Returns:
+        dict[str, Any]: Новые значения полей задачи без идентификатора.
+    """
+    values = task.model_dump(exclude_unset=True, exclude={"id"})
+
+    # Название задачи обязательно, пустое значение означает "не обновлять".
+    if values.get("title") is None:
+        values.pop("title", None)
+
+    return values
+
+
 def create_task(db: Session, task: TaskCreateSchema) -> Task:
     """
     Создание новой задачи.
@@ -141,7 +704,12 @@ def create_task(db: Session, task: TaskCreateSchema) -> Task:
         task (TaskCreateSchema): Данные для создания новой задачи.
     Returns:
         Task: Созданная задача.
+    Raises:
+        TaskHierarchyError: Задача оказалась бы глубже TASK_GRAPH_MAX_DEPTH.
     """
+    if task.parent_task_id is not None and find_too_deep_parents(db, [task.parent_task_id], TASK_GRAPH_MAX_DEPTH):
+        raise TaskHierarchyError(TOO_DEEP_ERROR)
+
     db_task = Task(
         title=task.title,
         parent_task_id=task.parent_task_id,
@@ -153,53 +721,314 @@ def create_task(db: Session, task: TaskCreateSchema) -> Task:
     db.add(db_task)
     db.commit()
     db.refresh(db_task)
+    invalidate(Task, [db_task.id])
 
     return db_task
 
 
-def partial_update_task(db: Session, task_id: int, task: TaskUpdateSchema) -> Type[Task]:
+def partial_update_task(
+    db: Session, task_id: int, task: TaskUpdateSchema, versions: list[int] | None = None
+) -> Type[Task]:
     """
-    Частичное обновление задачи.
+    Частичное обновление задачи одним запросом UPDATE ... RETURNING с проверкой версии задачи.
+    Изменяются только поля, переданные в запросе.
     Args:
         db (Session): Сессия базы данных SQLAlchemy.
         task_id (int): Идентификатор задачи.
         task (TaskUpdateSchema): Данные для частичного обновления задачи.
+        versions (list[int] | None): Допустимые текущие версии задачи (из If-Match) или None.
     Returns:
-        Task: Обновленная задача.
+        Task: Обновленная задача или None, если задача не найдена.
+    Raises:
+        VersionConflictError: Задача есть, но ее версия не входит в versions.
+        TaskHierarchyError: Новая родительская задача образует цикл или слишком глубокую иерархию.
     """
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+    values = get_update_values(task)
+    db_task = db.scalars(versioned_update(Task, task_id, values, versions)).one_or_none()
 
-    if db_task:
-        if task.title:
-            db_task.title = task.title
-        if task.parent_task_id:
-            db_task.parent_task_id = task.parent_task_id
-        if task.executor_id:
-            db_task.executor_id = task.executor_id
-        if task.deadline:
-            db_task.deadline = task.deadline
-        if task.is_active:
-            db_task.is_active = task.is_active
+    if db_task is None:
+        if versions is not None and db.scalar(object_exists(Task, task_id)) is not None:
+            raise VersionConflictError(f"Task {task_id} has been modified")
 
-        db.commit()
-        db.refresh(db_task)
+        return None
+
+    # Иерархия проверяется после изменения, в той же транзакции, одним запросом по цепочке предков.
+    if values.get("parent_task_id") is not None and (
+        errors := find_hierarchy_errors(db, [task_id], TASK_GRAPH_MAX_DEPTH)
+    ):
+        db.rollback()
+        raise TaskHierarchyError(errors[task_id])
+
+    # Задача отсоединяется от сессии до фиксации, чтобы фиксация не сбросила значения из RETURNING
+    # и ответ не требовал повторного чтения.
+    db.expunge(db_task)
+    db.commit()
+    invalidate(Task, [task_id])
 
     return db_task
 
 
 def delete_task(db: Session, task_id: int) -> Type[Task]:
     """
-    Удаление задачи.
+    Удаление задачи одним запросом DELETE ... RETURNING.
     Args:
         db (Session): Сессия базы данных SQLAlchemy.
         task_id (int): Идентификатор задачи.
     Returns:
-        Task: Удаленная задача.
+        Task: Удаленная задача или None, если задача не найдена.
     """
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+    db_task = db.scalars(delete(Task).where(Task.id == task_id).returning(Task)).one_or_none()
 
     if db_task:
-        db.delete(db_task)
+        # Задача отсоединяется от сессии до фиксации, чтобы ее значения остались доступны после фиксации.
+        db.expunge(db_task)
         db.commit()
+        invalidate(Task, [task_id])
 
     return db_task
+
+
+def bulk_create_tasks(
+    db: Session, tasks: list[tuple[int, TaskCreateSchema]]
+) -> list[tuple[int, int | None, str | None]]:
+    """
+    Пакетное создание задач в одной транзакции.
+    Ссылки на исполнителей и родительские задачи проверяются заранее несколькими запросами на весь пакет,
+    задачи с несуществующими ссылками не создаются, как и задачи, которые оказались бы глубже
+    TASK_GRAPH_MAX_DEPTH. Остальные задачи вставляются многострочными
+    INSERT ... RETURNING по BULK_CHUNK_SIZE строк.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        tasks (list[tuple[int, TaskCreateSchema]]): Позиции в запросе и данные для создания задач.
+    Returns:
+        list[tuple[int, int | None, str | None]]: Позиция, идентификатор созданной задачи и ошибка для каждой задачи.
+    """
+    existing_employees = select_existing_ids(db, Employee.id, (task.executor_id for _, task in tasks))
+    existing_tasks = select_existing_ids(db, Task.id, (task.parent_task_id for _, task in tasks))
+    too_deep_parents = find_too_deep_parents(db, existing_tasks, TASK_GRAPH_MAX_DEPTH)
+    results, rows, positions = [], [], []
+
+    for index, task in tasks:
+        if task.executor_id is not None and task.executor_id not in existing_employees:
+            results.append((index, None, "Executor not found"))
+        elif task.parent_task_id is not None and task.parent_task_id not in existing_tasks:
+            results.append((index, None, "Parent task not found"))
+        elif task.parent_task_id in too_deep_parents:
+            results.append((index, None, TOO_DEEP_ERROR))
+        else:
+            rows.append(task.model_dump())
+            positions.append(index)
+
+    for chunk_positions, chunk in zip(chunked(positions), chunked(rows)):
+        task_ids = db.scalars(insert(Task).returning(Task.id, sort_by_parameter_order=True), chunk).all()
+        results.extend((index, task_id, None) for index, task_id in zip(chunk_positions, task_ids))
+
+    db.commit()
+    invalidate(Task, (task_id for _, task_id, error in results if error is None))
+
+    return results
+
+
+def bulk_update_tasks(
+    db: Session, tasks: list[tuple[int, TaskBulkUpdateSchema]]
+) -> list[tuple[int, int | None, str | None]]:
+    """
+    Пакетное частичное обновление задач в одной транзакции.
+    Обновляются только переданные поля. Задачи группируются по набору полей и обновляются
+    пакетами UPDATE ... WHERE id = :id (executemany). Если новые родительские задачи образуют цикл
+    или слишком глубокую иерархию, изменения откатываются и применяются повторно без ошибочных задач.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        tasks (list[tuple[int, TaskBulkUpdateSchema]]): Позиции в запросе и данные для обновления задач.
+    Returns:
+        list[tuple[int, int | None, str | None]]: Позиция, идентификатор обновленной задачи и ошибка для каждой задачи.
+    """
+    existing_tasks = select_existing_ids(
+        db, Task.id, [task.id for _, task in tasks] + [task.parent_task_id for _, task in tasks]
+    )
+    existing_employees = select_existing_ids(db, Employee.id, (task.executor_id for _, task in tasks))
+    results, rows, seen = [], [], set()
+
+    for index, task in tasks:
+        values = get_update_values(task)
+
+        if task.id not in existing_tasks:
+            results.append((index, None, "Task not found"))
+        elif task.id in seen:
+            results.append((index, task.id, "Duplicate task id in request"))
+        elif values.get("executor_id") is not None and values["executor_id"] not in existing_employees:
+            results.append((index, task.id, "Executor not found"))
+        elif values.get("parent_task_id") is not None and values["parent_task_id"] not in existing_tasks:
+            results.append((index, task.id, "Parent task not found"))
+        elif values.get("parent_task_id") == task.id:
+            results.append((index, task.id, "Task cannot be its own parent"))
+        else:
+            seen.add(task.id)
+            results.append((index, task.id, None))
+
+            if values:
+                rows.append({"id": task.id, **values})
+
+    while True:
+        update_rows_by_id(db, Task.__table__, rows)
+        moved = (row["id"] for row in rows if row.get("parent_task_id") is not None)
+        errors = find_hierarchy_errors(db, moved, TASK_GRAPH_MAX_DEPTH)
+
+        if not errors:
+            break
+
+        db.rollback()
+        # Цепочка задачи, которая ведет в цикл, тоже выглядит слишком глубокой, поэтому сначала
+        # отклоняются только задачи, образующие цикл.
+        errors = {task_id: error for task_id, error in errors.items() if error == CYCLE_ERROR} or errors
+        rows = [row for row in rows if row["id"] not in errors]
+        results = [
+            (index, task_id, errors[task_id] if error is None and task_id in errors else error)
+            for index, task_id, error in results
+        ]
+
+    db.commit()
+    invalidate(Task, (row["id"] for row in rows))
+
+    return results
+
+
+def bulk_delete_tasks(db: Session, task_ids: list[int]) -> list[tuple[int, int | None, str | None]]:
+    """
+    Пакетное удаление задач в одной транзакции.
+    Задача, от которой зависят задачи вне пакета, не удаляется. Ссылки между удаляемыми задачами
+    предварительно обнуляются, поэтому порядок задач в пакете не важен.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        task_ids (list[int]): Идентификаторы удаляемых задач.
+    Returns:
+        list[tuple[int, int | None, str | None]]: Позиция, идентификатор удаленной задачи и ошибка для каждой задачи.
+    """
+    deletable = select_existing_ids(db, Task.id, task_ids)
+    existing = set(deletable)
+    children = []
+
+    for chunk in chunked(sorted(deletable)):
+        children.extend(db.execute(select(Task.id, Task.parent_task_id).where(Task.parent_task_id.in_(chunk))))
+
+    # Задача с неудаляемой дочерней задачей тоже не удаляется, поэтому исключаем их, пока список меняется.
+    blocked = set()
+
+    while True:
+        newly_blocked = {parent_id for child_id, parent_id in children if child_id not in deletable} - blocked
+
+        if not newly_blocked:
+            break
+
+        blocked |= newly_blocked
+        deletable -= newly_blocked
+
+    for chunk in chunked(sorted(deletable)):
+        db.execute(update(Task).where(Task.id.in_(chunk)).values(parent_task_id=None))
+
+    for chunk in chunked(sorted(deletable)):
+        db.execute(delete(Task).where(Task.id.in_(chunk)))
+
+    db.commit()
+    invalidate(Task, deletable)
+
+    results = []
+
+    for index, task_id in enumerate(task_ids):
+        if task_id not in existing:
+            results.append((index, None, "Task not found"))
+        elif task_id in blocked:
+            results.append((index, task_id, "Task has dependent tasks"))
+        else:
+            results.append((index, task_id, None))
+
+    return results
+
+
+def _check_imported_task(task: TaskSchema) -> str | None:
+    """
+    Проверка строки импорта задач, которую нельзя выразить в схеме.
+    Args:
+        task (TaskSchema): Задача из файла.
+    Returns:
+        str | None: Описание ошибки или None.
+    """
+    if task.parent_task_id == task.id:
+        return "Task cannot be its own parent"
+
+    return None
+
+
+def import_tasks(db: Session, rows: Iterable[Any], batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+    """
+    Импорт задач из файла в формате выгрузки (строки по схеме TaskSchema, с идентификаторами).
+    Строки проверяются частями по batch_size и загружаются в промежуточную таблицу (COPY в PostgreSQL),
+    затем отклоняются повторы идентификаторов и строки с несуществующими исполнителем или родительской задачей.
+    Родительская задача может находиться в таблице задач или в любом месте файла; если она отклонена,
+    отклоняются и ее дочерние задачи. Оставшиеся строки переносятся в таблицу задач одним запросом:
+    задачи с существующим идентификатором обновляются, остальные добавляются. Задачи, которые после переноса
+    образуют цикл или иерархию глубже TASK_GRAPH_MAX_DEPTH (find_hierarchy_errors), отклоняются.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        rows (Iterable[Any]): Строки файла.
+        batch_size (int): Количество строк, проверяемых и загружаемых за раз (по умолчанию IMPORT_BATCH_SIZE).
+    Returns:
+        dict: Данные для ImportResultSchema.
+    """
+    result = new_import_result()
+    staging = create_staging_table(db, Task.__table__, list(TaskSchema.model_fields))
+    stage_rows(db, staging, rows, TaskSchema, result, check=_check_imported_task, batch_size=batch_size)
+
+    reject_duplicate_ids(db, staging, result, "Duplicate task id in file")
+    reject_staged_rows(
+        db,
+        staging,
+        staging.c.executor_id.is_not(None) & ~exists().where(Employee.id == staging.c.executor_id),
+        result,
+        "Executor not found",
+    )
+
+    staged_parent = staging.alias("staged_parent")
+    missing_parent = (
+        staging.c.parent_task_id.is_not(None)
+        & ~exists().where(staged_parent.c.id == staging.c.parent_task_id)
+        & ~exists().where(Task.id == staging.c.parent_task_id)
+    )
+
+    # Отклонение строки может оставить без родителя ее дочерние строки, поэтому проверка повторяется,
+    # пока отклоняются строки (не больше, чем глубина дерева задач в файле).
+    while reject_staged_rows(db, staging, missing_parent, result, "Parent task not found"):
+        pass
+
+    # Иерархия проверяется после переноса, как при массовом изменении: перенос выполняется в точке сохранения,
+    # при ошибках откатывается, строки с ошибками и оставшиеся без родителя строки отклоняются, и перенос повторяется.
+    while True:
+        savepoint = db.begin_nested()
+        result["imported"] = merge_staging(db, staging, Task.__table__)
+        moved = db.scalars(select(staging.c.id).where(staging.c.parent_task_id.is_not(None)))
+        errors = find_hierarchy_errors(db, moved, TASK_GRAPH_MAX_DEPTH)
+
+        if not errors:
+            savepoint.commit()
+            break
+
+        savepoint.rollback()
+        # Сначала отклоняются только задачи, образующие цикл (см. bulk_update_tasks).
+        errors = {task_id: error for task_id, error in errors.items() if error == CYCLE_ERROR} or errors
+
+        for error in set(errors.values()):
+            rejected = [task_id for task_id, task_error in errors.items() if task_error == error]
+            reject_staged_rows(db, staging, staging.c.id.in_(rejected), result, error)
+
+        while reject_staged_rows(db, staging, missing_parent, result, "Parent task not found"):
+            pass
+
+    staging.drop(db.connection())
+    reset_id_sequence(db, Task.__table__)
+    db.commit()
+    # Импорт может затронуть любое количество задач, поэтому кэш задач очищается целиком.
+    invalidate_all(Task)
+
+    result["errors"].sort(key=lambda error: error["row"])
+
+    return result
@@ -0,0 +1,343 @@
+from typing import Any, AsyncIterator, List
+
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.cache import MemoEntry, invalidate
+from app.crud import task_crud
+from app.models.employee import Employee
+from app.crud.task_crud import select_task_page_keys, select_tasks_page, task_row_columns
+from app.crud.task_graph import (
+    TOO_DEEP_ERROR,
+    TaskHierarchyError,
+    hierarchy_errors,
+    select_hierarchy_errors,
+    select_too_deep_parents,
+)
+from app.crud.versioning import VersionConflictError, object_exists, versioned_update
+from app.models.task import Task
+from app.pagination import PageSummary, stream_page, summarize_page
+from app.schemas.task_schemas import TaskCreateSchema, TaskUpdateSchema, TaskOrderBy, TaskFilterSchema
+from app.task_index import get_task_index
+from config import TASK_GRAPH_MAX_DEPTH
+
+
+async def get_task(db: AsyncSession, task_id: int) -> Task | None:
+    """
+    Получение информации о задаче по её идентификатору.
+    Задача читается через кэш синхронной реализацией task_crud.get_task в run_sync, как в синхронном режиме.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        task_id (int): Идентификатор задачи.
+    Returns:
+        Task: Информация о задаче.
+    """
+    return await db.run_sync(task_crud.get_task, task_id)
+
+
+async def get_task_row(db: AsyncSession, task_id: int) -> dict[str, Any] | None:
+    """
+    Значения колонок задачи без создания ORM-объекта, через тот же кэш, что и get_task (см. task_crud.get_task_row).
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        task_id (int): Идентификатор задачи.
+    Returns:
+        dict[str, Any] | None: Значения колонок или None, если задачи нет.
+    """
+    return await db.run_sync(task_crud.get_task_row, task_id)
+
+
+async def get_tasks(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: TaskOrderBy = "id",
+    cursor: str | None = None,
+    filters: TaskFilterSchema | None = None,
+) -> List[Task]:
+    """
+    Получение списка задач с пропуском и лимитом или по курсору.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        skip (int, optional): Количество пропускаемых элементов, если курсор не передан. По умолчанию 0.
+        limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        order_by (TaskOrderBy, optional): Ключ сортировки ("id", "deadline" или "title"). По умолчанию "id".
+        cursor (str | None, optional): Курсор следующей страницы из предыдущего ответа.
+        filters (TaskFilterSchema | None, optional): Фильтры списка задач. По умолчанию не применяются.
+    Returns:
+        List[Task]: Список задач.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_tasks_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, filters=filters)
+
+    return [row async for row in await stream_page(statements, limit, db.stream_scalars)]
+
+
+async def get_task_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: TaskOrderBy = "id",
+    cursor: str | None = None,
+    filters: TaskFilterSchema | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Страница списка задач словарями с полями TaskSchema и версией, без создания ORM-объектов
+    (см. task_crud.get_task_rows).
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        skip (int, optional): Количество пропускаемых элементов, если курсор не передан. По умолчанию 0.
+        limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        order_by (TaskOrderBy, optional): Ключ сортировки ("id", "deadline" или "title"). По умолчанию "id".
+        cursor (str | None, optional): Курсор следующей страницы из предыдущего ответа.
+        filters (TaskFilterSchema | None, optional): Фильтры списка задач. По умолчанию не применяются.
+        fields (tuple[str, ...] | None, optional): Читаемые поля TaskSchema (task_row_columns). По умолчанию все.
+    Returns:
+        list[dict[str, Any]]: Строки задач.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_tasks_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, filters=filters)
+    columns = task_row_columns(order_by, fields)
+    statements = [statement.with_only_columns(*columns) for statement in statements]
+
+    return [row._asdict() async for row in await stream_page(statements, limit, db.stream)]
+
+
+async def iter_task_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: TaskOrderBy = "id",
+    cursor: str | None = None,
+    filters: TaskFilterSchema | None = None,
+    fields: tuple[str, ...] | None = None,
+    chunk_size: int = 1000,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Потоковое чтение страницы списка задач для ответа, отправляющего строки потоком (см. task_crud.iter_task_rows).
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        skip (int, optional): Количество пропускаемых элементов, если курсор не передан. По умолчанию 0.
+        limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        order_by (TaskOrderBy, optional): Ключ сортировки ("id", "deadline" или "title"). По умолчанию "id".
+        cursor (str | None, optional): Курсор следующей страницы из предыдущего ответа.
+        filters (TaskFilterSchema | None, optional): Фильтры списка задач. По умолчанию не применяются.
+        fields (tuple[str, ...] | None, optional): Читаемые поля TaskSchema (task_row_columns). По умолчанию все.
+        chunk_size (int, optional): Количество строк, получаемых из курсора за раз. По умолчанию 1000.
+    Returns:
+        AsyncIterator[dict[str, Any]]: Строки задач.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_tasks_page(skip=skip, limit=limit, order_by=order_by, cursor=cursor, filters=filters)
+    columns = task_row_columns(order_by, fields)
+    statements = [
+        statement.with_only_columns(*columns).execution_options(yield_per=chunk_size) for statement in statements
+    ]
+    result = await stream_page(statements, limit, db.stream)
+
+    return (row._asdict() async for row in result)
+
+
+async def get_task_page_summary(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: TaskOrderBy = "id",
+    cursor: str | None = None,
+    filters: TaskFilterSchema | None = None,
+) -> PageSummary:
+    """
+    ETag и курсор следующей страницы списка задач по ключам ее строк, без чтения самих строк.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        skip (int, optional): Количество пропускаемых элементов, если курсор не передан. По умолчанию 0.
+        limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        order_by (TaskOrderBy, optional): Ключ сортировки ("id", "deadline" или "title"). По умолчанию "id".
+        cursor (str | None, optional): Курсор следующей страницы из предыдущего ответа.
+        filters (TaskFilterSchema | None, optional): Фильтры списка задач. По умолчанию не применяются.
+    Returns:
+        PageSummary: ETag и курсор следующей страницы.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    statements = select_task_page_keys(skip=skip, limit=limit, order_by=order_by, cursor=cursor, filters=filters)
+    keys = [key async for key in await stream_page(statements, limit, db.stream)]
+
+    return summarize_page(keys, Task.__tablename__, order_by, limit)
+
+
+async def get_min_task_count(db: AsyncSession) -> int:
+    """
+    Получение минимального количества задач у сотрудников.
+    Минимум берется по индексу счетчика task_count, поэтому задачи не агрегируются.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+    Returns:
+        int: Минимальное количество задач (0, если сотрудников нет).
+    """
+    min_tasks_count = await db.scalar(select(func.min(Employee.task_count)))
+
+    return min_tasks_count or 0
+
+
+async def get_unassigned_parent_tasks(db: AsyncSession) -> List[Task]:
+    """
+    Получение списка задач, не взятых в работу, и от которых зависят другие задачи.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+    Returns:
+        List[Task]: Список родительских задач без исполнителя.
+    """
+    child_task = aliased(Task)
+    # Наличие дочерней задачи проверяется по индексу parent_task_id только для задач без исполнителя.
+    unassigned_parent_tasks = await db.scalars(
+        select(Task)
+        .where(Task.executor_id.is_(None))
+        .where(exists().where(child_task.parent_task_id == Task.id))
+    )
+
+    return list(unassigned_parent_tasks)
+
+
+async def get_important_tasks(db: AsyncSession) -> List[dict]:
+    """
+    Получает список важных задач.
+    Запросы строятся и выполняются синхронной реализацией task_crud.get_important_tasks
+    через run_sync, поэтому логика отбора задач и сотрудников у обоих режимов общая.
+    Если включен индекс графа задач (TASK_GRAPH_INDEX), результат берется из графа в памяти.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+    Returns:
+        List[dict]: Список словарей с информацией о важных задачах.
+    """
+    index = get_task_index()
+
+    if index is not None:
+        return (await db.run_sync(index.important_tasks)).value
+
+    return await db.run_sync(task_crud.get_important_tasks)
+
+
+async def get_important_tasks_memoized(db: AsyncSession) -> MemoEntry:
+    """
+    Получение списка важных задач из сохраненного результата, общего с task_crud.get_important_tasks_memoized.
+    Результат пересчитывается только после изменения задач или сотрудников (или по истечении времени жизни),
+    одновременные запросы ждут одного пересчета.
+    Если включен индекс графа задач (TASK_GRAPH_INDEX), результат берется из графа в памяти.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+    Returns:
+        MemoEntry: Список важных задач (value) с ETag и временем изменения.
+    """
+    index = get_task_index()
+
+    if index is not None:
+        return await db.run_sync(index.important_tasks)
+
+    return await task_crud.important_tasks_memo.get_async(lambda: db.run_sync(task_crud.get_important_tasks))
+
+
+async def get_important_tasks_reference(db: AsyncSession) -> List[dict]:
+    """
+    Эталонная построчная реализация поиска важных задач (см. task_crud.get_important_tasks_reference).
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+    Returns:
+        List[dict]: Список словарей с информацией о важных задачах.
+    """
+    return await db.run_sync(task_crud.get_important_tasks_reference)
+
+
+async def create_task(db: AsyncSession, task: TaskCreateSchema) -> Task:
+    """
+    Создание новой задачи.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        task (TaskCreateSchema): Данные для создания новой задачи.
+    Returns:
+        Task: Созданная задача.
+    Raises:
+        TaskHierarchyError: Задача оказалась бы глубже TASK_GRAPH_MAX_DEPTH.
+    """
+    if task.parent_task_id is not None:
+        too_deep = await db.execute(select_too_deep_parents([task.parent_task_id], TASK_GRAPH_MAX_DEPTH))
+
+        if too_deep.first() is not None:
+            raise TaskHierarchyError(TOO_DEEP_ERROR)
+
+    db_task = Task(
+        title=task.title,
+        parent_task_id=task.parent_task_id,
+        executor_id=task.executor_id,
+        deadline=task.deadline,
+        is_active=task.is_active,
+    )
+
+    db.add(db_task)
+    await db.commit()
+    await db.refresh(db_task)
+    invalidate(Task, [db_task.id])
+
+    return db_task
+
+
+async def partial_update_task(
+    db: AsyncSession, task_id: int, task: TaskUpdateSchema, versions: list[int] | None = None
+) -> Task | None:
+    """
+    Частичное обновление задачи одним запросом UPDATE ... RETURNING с проверкой версии задачи.
+    Изменяются только поля, переданные в запросе.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        task_id (int): Идентификатор задачи.
+        task (TaskUpdateSchema): Данные для частичного обновления задачи.
+        versions (list[int] | None): Допустимые текущие версии задачи (из If-Match) или None.
+    Returns:
+        Task: Обновленная задача или None, если задача не найдена.
+    Raises:
+        VersionConflictError: Задача есть, но ее версия не входит в versions.
+        TaskHierarchyError: Новая родительская задача образует цикл или слишком глубокую иерархию.
+    """
+    values = task_crud.get_update_values(task)
+    db_task = (await db.scalars(versioned_update(Task, task_id, values, versions))).one_or_none()
+
+    if db_task is None:
+        if versions is not None and await db.scalar(object_exists(Task, task_id)) is not None:
+            raise VersionConflictError(f"Task {task_id} has been modified")
+
+        return None
+
+    if values.get("parent_task_id") is not None:
+        errors = hierarchy_errors(await db.execute(select_hierarchy_errors([task_id], TASK_GRAPH_MAX_DEPTH)))
+
+        if errors:
+            await db.rollback()
+            raise TaskHierarchyError(errors[task_id])
+
+    await db.commit()
+    invalidate(Task, [task_id])
+
+    return db_task
+
+
+async def delete_task(db: AsyncSession, task_id: int) -> Task | None:
+    """
+    Удаление задачи одним запросом DELETE ... RETURNING.
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+        task_id (int): Идентификатор задачи.
+    Returns:
+        Task: Удаленная задача или None, если задача не найдена.
+    """
+    db_task = (await db.scalars(delete(Task).where(Task.id == task_id).returning(Task))).one_or_none()
+
+    if db_task:
+        await db.commit()
+        invalidate(Task, [task_id])
+
+    return db_task
@@ -0,0 +1,319 @@
+from typing import Any, Iterable
+
+from sqlalchemy import CTE, Integer, Row, Select, and_, case, func, literal_column, or_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.crud.bulk import chunked
+from app.models.task import Task
+from app.schemas.task_schemas import TaskSchema
+from config import TASK_GRAPH_MAX_DEPTH
+
+# Ошибки проверки иерархии задач.
+CYCLE_ERROR = "Task cannot be its own ancestor"
+TOO_DEEP_ERROR = "Task hierarchy is too deep"
+
+
+class TaskHierarchyError(ValueError):
+    """Новая родительская задача образует цикл или иерархию глубже TASK_GRAPH_MAX_DEPTH."""
+
+
+def _task_columns() -> list[Any]:
+    return [getattr(Task, field) for field in TaskSchema.model_fields]
+
+
+def subtree_cte(task_id: int, max_depth: int) -> CTE:
+    """
+    Рекурсивный CTE поддерева задачи: сама задача (глубина 0) и ее потомки не глубже max_depth.
+    Дочерние задачи каждого уровня находятся по индексу ix_tasks_parent_task_id.
+    Args:
+        task_id (int): Идентификатор корня поддерева.
+        max_depth (int): Максимальная глубина потомков.
+    Returns:
+        CTE: Колонки id и depth.
+    """
+    tree = (
+        select(Task.id, literal_column("0", Integer).label("depth"))
+        .where(Task.id == task_id)
+        .cte("subtree", recursive=True)
+    )
+    child = aliased(Task)
+
+    return tree.union_all(
+        select(child.id, tree.c.depth + 1)
+        .join_from(tree, child, child.parent_task_id == tree.c.id)
+        .where(tree.c.depth < max_depth)
+    )
+
+
+def ancestors_cte(task_id: int, max_depth: int) -> CTE:
+    """
+    Рекурсивный CTE цепочки предков задачи: сама задача (глубина 0), ее родитель (1) и так далее до корня,
+    но не больше max_depth уровней.
+    Args:
+        task_id (int): Идентификатор задачи.
+        max_depth (int): Максимальное количество предков.
+    Returns:
+        CTE: Колонки id, parent_task_id и depth.
+    """
+    chain = (
+        select(Task.id, Task.parent_task_id, literal_column("0", Integer).label("depth"))
+        .where(Task.id == task_id)
+        .cte("ancestors", recursive=True)
+    )
+    parent = aliased(Task)
+
+    return chain.union_all(
+        select(parent.id, parent.parent_task_id, chain.c.depth + 1)
+        .join_from(chain, parent, parent.id == chain.c.parent_task_id)
+        .where(chain.c.depth < max_depth)
+    )
+
+
+def subtree_heights_cte(task_ids: Iterable[int], max_depth: int) -> CTE:
+    """
+    Высоты поддеревьев задач (как subtree_cte для нескольких корней): наибольшая глубина потомка каждой задачи,
+    но не больше max_depth. Обход не спускается в поддеревья других задач task_ids: их глубина проверяется
+    отдельно, и ошибка приписывается ближайшей к слишком глубокому потомку задаче. Поэтому же обход
+    не возвращается в исходную задачу, если изменение образовало цикл.
+    Args:
+        task_ids (Iterable[int]): Идентификаторы корней поддеревьев.
+        max_depth (int): Максимальная глубина потомков.
+    Returns:
+        CTE: Колонки task_id и height (0 - задача без дочерних задач).
+    """
+    task_ids = list(task_ids)
+    tree = (
+        select(Task.id.label("task_id"), Task.id, literal_column("0", Integer).label("depth"))
+        .where(Task.id.in_(task_ids))
+        .cte("subtrees", recursive=True)
+    )
+    child = aliased(Task)
+    tree = tree.union_all(
+        select(tree.c.task_id, child.id, tree.c.depth + 1)
+        .join_from(tree, child, child.parent_task_id == tree.c.id)
+        .where(tree.c.depth < max_depth, child.id.not_in(task_ids))
+    )
+
+    return (
+        select(tree.c.task_id, func.max(tree.c.depth).label("height"))
+        .group_by(tree.c.task_id)
+        .cte("subtree_heights")
+    )
+
+
+def select_hierarchy_errors(task_ids: Iterable[int], max_depth: int, with_subtrees: bool = True) -> Select:
+    """
+    Запрос проверки иерархии задач после изменения их родительских задач: от каждой задачи рекурсивный CTE
+    поднимается по цепочке предков. Задача с ошибкой либо снова встречается среди своих предков (цикл),
+    либо вместе с поддеревом оказывается глубже max_depth: количество ее предков и высота ее поддерева
+    (subtree_heights_cte) в сумме больше max_depth.
+    Args:
+        task_ids (Iterable[int]): Идентификаторы проверяемых задач.
+        max_depth (int): Максимальная глубина иерархии.
+        with_subtrees (bool): Учитывать высоту поддеревьев задач (по умолчанию True). Без нее проверяется
+            только количество предков самих задач.
+    Returns:
+        Select: Строки (task_id, cycle) для задач с ошибкой, cycle равен 1 для цикла и 0 для слишком глубокой иерархии.
+    """
+    task_ids = list(task_ids)
+    chain = (
+        select(
+            Task.id.label("task_id"), Task.id, Task.parent_task_id, literal_column("0", Integer).label("depth")
+        )
+        .where(Task.id.in_(task_ids))
+        .cte("chain", recursive=True)
+    )
+    parent = aliased(Task)
+    chain = chain.union_all(
+        select(chain.c.task_id, parent.id, parent.parent_task_id, chain.c.depth + 1)
+        .join_from(chain, parent, parent.id == chain.c.parent_task_id)
+        # Обход останавливается, вернувшись к исходной задаче.
+        .where(chain.c.depth < max_depth, or_(chain.c.depth == 0, chain.c.id != chain.c.task_id))
+    )
+    cycle = and_(chain.c.id == chain.c.task_id, chain.c.depth > 0)
+    statement = select(chain.c.task_id, func.max(case((cycle, 1), else_=0)).label("cycle"))
+
+    # Предок на глубине depth с родительской задачей: у задачи больше depth предков,
+    # у самого глубокого ее потомка - больше depth + height.
+    if with_subtrees:
+        heights = subtree_heights_cte(task_ids, max_depth)
+        statement = statement.join_from(chain, heights, heights.c.task_id == chain.c.task_id)
+        too_deep = and_(chain.c.parent_task_id.is_not(None), chain.c.depth + heights.c.height >= max_depth)
+    else:
+        too_deep = and_(chain.c.depth == max_depth, chain.c.parent_task_id.is_not(None))
+
+    return statement.where(or_(cycle, too_deep)).group_by(chain.c.task_id)
+
+
+def hierarchy_errors(rows: Iterable[Row]) -> dict[int, str]:
+    """
+    Описания ошибок по строкам запроса select_hierarchy_errors.
+    Args:
+        rows (Iterable[Row]): Строки (task_id, cycle).
+    Returns:
+        dict[int, str]: Ошибка для каждой задачи.
+    """
+    return {row.task_id: CYCLE_ERROR if row.cycle else TOO_DEEP_ERROR for row in rows}
+
+
+def find_hierarchy_errors(
+    db: Session, task_ids: Iterable[int], max_depth: int = TASK_GRAPH_MAX_DEPTH
+) -> dict[int, str]:
+    """
+    Проверка иерархии задач после изменения их родительских задач, до фиксации транзакции.
+    Глубина проверяется с поддеревьями задач: перенесенные вместе с задачей потомки тоже не глубже max_depth.
+    Поддерево задачи не включает поддеревья других задач той же части task_ids (chunked, subtree_heights_cte),
+    поэтому слишком глубокий потомок нескольких перенесенных задач - ошибка ближайшей к нему из них.
+    Новая задача не может образовать цикл, ее глубина проверяется до вставки (find_too_deep_parents).
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        task_ids (Iterable[int]): Идентификаторы задач с измененной родительской задачей.
+        max_depth (int): Максимальная глубина иерархии (по умолчанию TASK_GRAPH_MAX_DEPTH).
+    Returns:
+        dict[int, str]: Ошибки по идентификаторам задач, пустой словарь, если иерархия корректна.
+    """
+    errors = {}
+
+    for chunk in chunked(sorted(set(task_ids))):
+        errors.update(hierarchy_errors(db.execute(select_hierarchy_errors(chunk, max_depth))))
+
+    return errors
+
+
+def select_too_deep_parents(parent_ids: Iterable[int], max_depth: int) -> Select:
+    """
+    Запрос проверки родительских задач новых задач до вставки: дочерняя задача оказалась бы глубже max_depth,
+    если цепочка предков родительской задачи не заканчивается корнем за max_depth - 1 уровней.
+    Поддеревья родительских задач не учитываются: новая задача не имеет дочерних.
+    Args:
+        parent_ids (Iterable[int]): Идентификаторы существующих родительских задач.
+        max_depth (int): Максимальная глубина иерархии.
+    Returns:
+        Select: Строки (task_id, cycle) select_hierarchy_errors для родительских задач, к которым нельзя
+            добавить дочернюю задачу.
+    """
+    return select_hierarchy_errors(parent_ids, max_depth - 1, with_subtrees=False)
+
+
+def find_too_deep_parents(
+    db: Session, parent_ids: Iterable[int], max_depth: int = TASK_GRAPH_MAX_DEPTH
+) -> set[int]:
+    """
+    Проверка глубины иерархии для новых задач с родительскими задачами (select_too_deep_parents).
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        parent_ids (Iterable[int]): Идентификаторы существующих родительских задач.
+        max_depth (int): Максимальная глубина иерархии (по умолчанию TASK_GRAPH_MAX_DEPTH).
+    Returns:
+        set[int]: Идентификаторы родительских задач, к которым нельзя добавить дочернюю задачу.
+    """
+    too_deep = set()
+
+    for chunk in chunked(sorted(set(parent_ids))):
+        too_deep.update(row.task_id for row in db.execute(select_too_deep_parents(chunk, max_depth)))
+
+    return too_deep
+
+
+def select_descendants(task_id: int, max_depth: int) -> Select:
+    """
+    Запрос задачи и ее потомков с глубиной относительно задачи, по уровням.
+    Args:
+        task_id (int): Идентификатор задачи.
+        max_depth (int): Максимальная глубина потомков.
+    Returns:
+        Select: Поля TaskSchema и depth.
+    """
+    tree = subtree_cte(task_id, max_depth)
+
+    return (
+        select(*_task_columns(), tree.c.depth)
+        .join_from(tree, Task, Task.id == tree.c.id)
+        .order_by(tree.c.depth, Task.id)
+    )
+
+
+def select_ancestors(task_id: int, max_depth: int) -> Select:
+    """
+    Запрос задачи и цепочки ее предков от родителя к корню.
+    Args:
+        task_id (int): Идентификатор задачи.
+        max_depth (int): Максимальное количество предков.
+    Returns:
+        Select: Поля TaskSchema и depth (1 - родитель, 2 - родитель родителя и так далее).
+    """
+    chain = ancestors_cte(task_id, max_depth)
+
+    return (
+        select(*_task_columns(), chain.c.depth)
+        .join_from(chain, Task, Task.id == chain.c.id)
+        .order_by(chain.c.depth)
+    )
+
+
+def select_subtree_summary(task_id: int, max_depth: int) -> Select:
+    """
+    Запрос сводки по поддереву задачи: количество задач, активных задач, ближайший срок и глубина.
+    Args:
+        task_id (int): Идентификатор корня поддерева.
+        max_depth (int): Максимальная глубина потомков.
+    Returns:
+        Select: Одна строка с колонками count, active_count, earliest_deadline и depth.
+    """
+    tree = subtree_cte(task_id, max_depth)
+
+    return (
+        select(
+            func.count().label("count"),
+            func.count(case((Task.is_active.is_(True), 1))).label("active_count"),
+            func.min(Task.deadline).label("earliest_deadline"),
+            func.max(tree.c.depth).label("depth"),
+        )
+        .join_from(tree, Task, Task.id == tree.c.id)
+    )
+
+
+def get_descendants(db: Session, task_id: int, max_depth: int = TASK_GRAPH_MAX_DEPTH) -> list[Row] | None:
+    """
+    Получение всех потомков задачи одним запросом с рекурсивным CTE.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        task_id (int): Идентификатор задачи.
+        max_depth (int): Максимальная глубина потомков (по умолчанию TASK_GRAPH_MAX_DEPTH).
+    Returns:
+        list[Row] | None: Потомки с глубиной относительно задачи или None, если задача не найдена.
+    """
+    rows = db.execute(select_descendants(task_id, max_depth)).all()
+
+    # Первая строка - сама задача, по ней проверяется существование задачи.
+    return rows[1:] if rows else None
+
+
+def get_ancestors(db: Session, task_id: int, max_depth: int = TASK_GRAPH_MAX_DEPTH) -> list[Row] | None:
+    """
+    Получение цепочки предков задачи от родителя к корню одним запросом с рекурсивным CTE.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        task_id (int): Идентификатор задачи.
+        max_depth (int): Максимальное количество предков (по умолчанию TASK_GRAPH_MAX_DEPTH).
+    Returns:
+        list[Row] | None: Предки с расстоянием до задачи или None, если задача не найдена.
+    """
+    rows = db.execute(select_ancestors(task_id, max_depth)).all()
+
+    return rows[1:] if rows else None
+
+
+def get_subtree_summary(db: Session, task_id: int, max_depth: int = TASK_GRAPH_MAX_DEPTH) -> Row | None:
+    """
+    Получение сводки по поддереву задачи (включая саму задачу) одним запросом с рекурсивным CTE.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        task_id (int): Идентификатор корня поддерева.
+        max_depth (int): Максимальная глубина потомков (по умолчанию TASK_GRAPH_MAX_DEPTH).
+    Returns:
+        Row | None: Сводка по поддереву или None, если задача не найдена.
+    """
+    summary = db.execute(select_subtree_summary(task_id, max_depth)).one()
+
+    return summary if summary.count else None
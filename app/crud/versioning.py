@@ -0,0 +1,47 @@
+from typing import Any
+
+from sqlalchemy import Select, Update, select, update
+
+
+class VersionConflictError(Exception):
+    """Версия объекта в базе данных отличается от версии, которую ожидал клиент (If-Match)."""
+
+
+def versioned_update(model: type, object_id: int, values: dict[str, Any], versions: list[int] | None) -> Update:
+    """
+    Запрос частичного обновления объекта с проверкой версии: UPDATE ... WHERE id = :id AND version IN (...)
+    RETURNING. Проверка, изменение и чтение результата выполняются одним запросом без блокировки строки.
+    Версия увеличивается, только если есть изменяемые поля; пустое обновление лишь проверяет версию
+    и возвращает объект.
+    Args:
+        model (type): Модель SQLAlchemy с колонкой version.
+        object_id (int): Идентификатор объекта.
+        values (dict[str, Any]): Новые значения полей.
+        versions (list[int] | None): Допустимые текущие версии или None, чтобы не проверять версию.
+    Returns:
+        Update: Запрос, возвращающий обновленный объект или ничего, если объекта нет или версия другая.
+    """
+    statement = update(model).where(model.id == object_id)
+
+    if versions is not None:
+        statement = statement.where(model.version.in_(versions))
+
+    version = model.version + 1 if values else model.version
+
+    return (
+        statement.values(**values, version=version)
+        .returning(model)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    )
+
+
+def object_exists(model: type, object_id: int) -> Select:
+    """
+    Запрос проверки существования объекта, чтобы отличить конфликт версий от отсутствия объекта.
+    Args:
+        model (type): Модель SQLAlchemy.
+        object_id (int): Идентификатор объекта.
+    Returns:
+        Select: Запрос, возвращающий идентификатор объекта или ничего.
+    """
+    return select(model.id).where(model.id == object_id)
@@ -1,23 +1,254 @@
 import os
+from functools import lru_cache
 
-from sqlalchemy import create_engine
+from sqlalchemy import URL, create_engine, event, make_url
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from dotenv import load_dotenv
 
+import config
+from app.metrics import PoolMetrics, instrumented_pool_class
+
 load_dotenv()
 
-DATABASE_URL = os.getenv("POSTGRESQL_DATABASE_URL")
+# Асинхронные драйверы для поддерживаемых СУБД.
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Настройки соединений SQLite. WAL позволяет читать во время записи, synchronous=NORMAL в режиме WAL
+# сохраняет целостность базы данных при сбое процесса, busy_timeout ожидает снятия блокировки записи
+# вместо немедленной ошибки. Внешние ключи в SQLite по умолчанию не проверяются, в отличие от PostgreSQL.
+# Для базы данных в памяти journal_mode остается memory.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "foreign_keys": "ON",
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+    "cache_size": -64000,
+}
+
+# Уровень изоляции транзакций, все запросы которых должны читать один снимок базы данных (begin_snapshot).
+# В PostgreSQL по умолчанию READ COMMITTED: каждый запрос видит данные, зафиксированные до его начала.
+SNAPSHOT_ISOLATION_LEVEL = "REPEATABLE READ"
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Преобразование URL базы данных в URL с асинхронным драйвером.
+    Args:
+        database_url (str): URL базы данных с синхронным драйвером.
+    Returns:
+        str: URL базы данных с асинхронным драйвером.
+    """
+    url = make_url(database_url)
+    url = url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+
+    return url.render_as_string(hide_password=False)
+
+
+def is_sqlite_memory(database_url: str | URL) -> bool:
+    """
+    Проверка, что URL указывает на базу данных SQLite в памяти процесса
+    (sqlite://, sqlite:///:memory: или URI с mode=memory).
+    Args:
+        database_url (str | URL): URL базы данных.
+    Returns:
+        bool: True для базы данных SQLite в памяти.
+    """
+    url = make_url(database_url)
+
+    if url.get_backend_name() != "sqlite":
+        return False
+
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def on_sqlite_connect(dbapi_connection, connection_record) -> None:
+    """
+    Обработчик события connect: отключение собственного управления транзакциями драйвера и установка SQLITE_PRAGMAS.
+    Драйвер sqlite3 сам начинает транзакцию только перед изменением данных и фиксирует ее перед DDL,
+    из-за чего не работают SAVEPOINT и откат транзакции, внутри которой были вызваны commit сессии.
+    """
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+    cursor.close()
+
+
+def on_sqlite_begin(connection) -> None:
+    """
+    Обработчик события begin: транзакция SQLite начинается вместе с транзакцией SQLAlchemy.
+    BEGIN выполняется курсором драйвера, а не через SQLAlchemy, поэтому не учитывается как запрос
+    в событиях before_cursor_execute (метрики, счетчики запросов в тестах).
+    """
+    cursor = connection.connection.cursor()
+    cursor.execute("BEGIN")
+    cursor.close()
+
+
+def configure_sqlite_engine(bind: Engine) -> Engine:
+    """
+    Подключение обработчиков on_sqlite_connect и on_sqlite_begin к engine SQLite.
+    Для других СУБД engine не меняется. Для асинхронного engine передается его sync_engine.
+    Args:
+        bind (Engine): SQLAlchemy engine.
+    Returns:
+        Engine: Тот же engine.
+    """
+    if bind.dialect.name == "sqlite" and not event.contains(bind, "connect", on_sqlite_connect):
+        event.listen(bind, "connect", on_sqlite_connect)
+        event.listen(bind, "begin", on_sqlite_begin)
+
+    return bind
+
+
+def needs_snapshot_isolation(db: Session) -> bool:
+    """
+    Нужно ли начать транзакцию сессии с уровнем изоляции SNAPSHOT_ISOLATION_LEVEL (begin_snapshot).
+    Транзакция SQLite (on_sqlite_begin) в режиме WAL и так читает один снимок с первого запроса.
+    Уровень изоляции нельзя изменить в начатой транзакции: сессии с начатой транзакцией и сессии,
+    привязанные к соединению с открытой транзакцией (тесты), читают в ней.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        bool: True, если транзакция сессии еще не начата и СУБД - PostgreSQL.
+    """
+    bind = db.get_bind()
+
+    if db.in_transaction() or bind.dialect.name != "postgresql":
+        return False
 
-engine = create_engine(DATABASE_URL)
+    return not (isinstance(bind, Connection) and bind.in_transaction())
+
+
+def begin_snapshot(db: Session) -> None:
+    """
+    Начало транзакции сессии, все запросы которой читают один снимок базы данных, например, сводка страницы
+    (ETag, курсор) и строки потокового ответа: изменения, зафиксированные между запросами, не попадают
+    в ответ частично.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        None
+    """
+    if needs_snapshot_isolation(db):
+        db.connection(execution_options={"isolation_level": SNAPSHOT_ISOLATION_LEVEL})
+
+
+async def begin_async_snapshot(db: AsyncSession) -> None:
+    """
+    Начало транзакции асинхронной сессии, все запросы которой читают один снимок базы данных (begin_snapshot).
+    Args:
+        db (AsyncSession): Асинхронная сессия базы данных SQLAlchemy.
+    Returns:
+        None
+    """
+    if needs_snapshot_isolation(db.sync_session):
+        await db.connection(execution_options={"isolation_level": SNAPSHOT_ISOLATION_LEVEL})
+
+
+def get_engine_options(database_url: str, pool_metrics: PoolMetrics, is_async: bool = False) -> dict:
+    """
+    Параметры create_engine/create_async_engine из настроек пула соединений в config.py.
+    Args:
+        database_url (str): URL базы данных.
+        pool_metrics (PoolMetrics): Метрики, в которые пул пишет время ожидания соединения.
+        is_async (bool): Параметры для асинхронного engine (по умолчанию False).
+    Returns:
+        dict: Именованные аргументы для create_engine/create_async_engine.
+    """
+    url = make_url(database_url)
+    options = {"pool_pre_ping": config.DB_POOL_PRE_PING}
+
+    if is_sqlite_memory(url):
+        # База данных в памяти существует, пока открыто ее единственное соединение. Пул из одного соединения
+        # не закрывает его и выдает сессиям по очереди: одновременные запросы ждут соединение,
+        # а не выполняют свои транзакции в одном соединении.
+        options.update(
+            poolclass=instrumented_pool_class(AsyncAdaptedQueuePool if is_async else QueuePool, pool_metrics),
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            connect_args={"check_same_thread": False},
+        )
+    elif config.DB_USE_NULLPOOL:
+        options["poolclass"] = NullPool
+    elif url.get_backend_name() != "sqlite":
+        # Для SQLite SQLAlchemy сам выбирает пул в зависимости от вида базы данных (файл или память).
+        options.update(
+            poolclass=instrumented_pool_class(AsyncAdaptedQueuePool if is_async else QueuePool, pool_metrics),
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE,
+            pool_use_lifo=config.DB_POOL_USE_LIFO,
+        )
+
+    if config.DB_STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        # asyncpg принимает параметры сервера отдельно, psycopg2 - через строку options libpq.
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"}
+
+    return options
+
+
+DATABASE_URL = config.POSTGRESQL_DATABASE_URL
+ASYNC_DATABASE_URL = os.getenv("ASYNC_POSTGRESQL_DATABASE_URL") or get_async_database_url(DATABASE_URL)
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+engine = configure_sqlite_engine(create_engine(DATABASE_URL, **get_engine_options(DATABASE_URL, pool_metrics)))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    """
+    Асинхронный engine приложения. Создается при первом обращении: асинхронный драйвер (asyncpg, aiosqlite)
+    нужен только в режиме DATABASE_MODE=async.
+    Returns:
+        AsyncEngine: Асинхронный engine.
+    """
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL, **get_engine_options(ASYNC_DATABASE_URL, async_pool_metrics, is_async=True)
+    )
+    configure_sqlite_engine(async_engine.sync_engine)
+
+    return async_engine
+
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> async_sessionmaker:
+    """
+    Фабрика асинхронных сессий приложения (get_async_engine).
+    Returns:
+        async_sessionmaker: Фабрика сессий.
+    """
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -0,0 +1,153 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Iterable
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+
+# Описание ответа 304 для OpenAPI.
+NOT_MODIFIED_RESPONSES = {status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}}
+
+# Описание ответа 409 для OpenAPI: версия из If-Match устарела.
+VERSION_CONFLICT_RESPONSES = {status.HTTP_409_CONFLICT: {"description": "Version conflict"}}
+
+
+def make_etag(value: Any) -> str:
+    """
+    ETag по содержимому ответа: одинаковые данные дают одинаковый ETag в любом процессе приложения.
+    Args:
+        value (Any): Данные ответа.
+    Returns:
+        str: ETag в кавычках.
+    """
+    # jsonable_encoder вызывается только для значений, которые json не сериализует сам (даты, модели):
+    # обход всего ответа jsonable_encoder в несколько раз медленнее.
+    body = json.dumps(value, default=jsonable_encoder, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+    return f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+
+
+def make_rows_etag(rows: Iterable[Any]) -> str:
+    """
+    ETag по версиям строк: таблице, идентификатору и версии (version) каждой строки ответа.
+    Не требует сериализации ответа, поэтому проверка If-None-Match обходится без построения тела.
+    Порядок строк учитывается: другая сортировка той же страницы дает другой ETag.
+    Args:
+        rows (Iterable[Any]): Объекты моделей с колонками id и version.
+    Returns:
+        str: ETag в кавычках.
+    """
+    return make_versions_etag((row.__tablename__, row.id, row.version) for row in rows)
+
+
+def make_versions_etag(versions: Iterable[tuple[str, int, int]]) -> str:
+    """
+    ETag по версиям строк, прочитанных без ORM-объектов (колонками). Совпадает с make_rows_etag
+    для тех же строк.
+    Args:
+        versions (Iterable[tuple[str, int, int]]): Таблица, идентификатор и версия каждой строки ответа.
+    Returns:
+        str: ETag в кавычках.
+    """
+    digest = hashlib.sha1()
+
+    for table, row_id, version in versions:
+        digest.update(f"{table}:{row_id}:{version};".encode())
+
+    return f'"{digest.hexdigest()}"'
+
+
+def make_version_etag(version: int) -> str:
+    """
+    ETag отдельного объекта: его версия. Клиент передает его в If-Match при изменении объекта.
+    Args:
+        version (int): Версия объекта.
+    Returns:
+        str: ETag в кавычках.
+    """
+    return f'"{version}"'
+
+
+def if_match_versions(request: Request) -> list[int] | None:
+    """
+    Версии объекта из заголовка If-Match запроса на изменение.
+    Слабые ETag (W/) и ETag, которые не являются версией, не совпадают ни с одной версией (RFC 9110).
+    Args:
+        request (Request): Запрос.
+    Returns:
+        list[int] | None: Допустимые версии или None, если заголовка нет или он равен "*".
+    """
+    if_match = request.headers.get("if-match")
+
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    tags = [tag.strip() for tag in if_match.split(",")]
+
+    return [int(tag[1:-1]) for tag in tags if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit()]
+
+
+def cache_headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    """
+    Заголовки условных запросов для ответа.
+    Args:
+        etag (str): ETag ответа.
+        last_modified (datetime | None): Время изменения данных (UTC) или None.
+    Returns:
+        dict[str, str]: Заголовки ETag и Last-Modified.
+    """
+    headers = {"ETag": etag}
+
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """
+    Проверка условного запроса: у клиента актуальная версия ответа.
+    If-None-Match проверяется первым, If-Modified-Since учитывается, только если его нет (RFC 9110).
+    Args:
+        request (Request): Запрос.
+        etag (str): Текущий ETag ответа.
+        last_modified (datetime | None): Время изменения данных (UTC) или None.
+    Returns:
+        bool: True, если можно ответить 304 Not Modified.
+    """
+    if_none_match = request.headers.get("if-none-match")
+
+    if if_none_match is not None:
+        # Слабое сравнение: прокси могут пометить ETag как слабый (W/).
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    # Дата в заголовке передается с точностью до секунды.
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified_response(etag: str, last_modified: datetime | None = None) -> Response:
+    """
+    Ответ 304 Not Modified без тела.
+    Args:
+        etag (str): ETag ответа.
+        last_modified (datetime | None): Время изменения данных (UTC) или None.
+    Returns:
+        Response: Ответ 304 с заголовками ETag и Last-Modified.
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, last_modified))
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Literal, Mapping, Sequence
+
+from fastapi.responses import StreamingResponse
+
+# Формат выгрузки: JSON-объект на строку или CSV с заголовком.
+ExportFormat = Literal["ndjson", "csv"]
+
+# MIME-типы ответа для форматов выгрузки.
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Количество строк, объединяемых в один фрагмент ответа.
+EXPORT_BATCH_SIZE = 1000
+
+
+def _json_default(value: Any) -> str:
+    """
+    Сериализация значений, которые не поддерживает модуль json.
+    Args:
+        value (Any): Значение поля строки.
+    Returns:
+        str: Дата и время в формате ISO 8601, как в ответах API.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_ndjson(rows: Iterable[Mapping[str, Any]], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Кодирование строк в NDJSON.
+    Args:
+        rows (Iterable[Mapping]): Строки выгрузки.
+        batch_size (int): Количество строк в одном фрагменте ответа.
+    Yields:
+        bytes: Фрагмент ответа из batch_size строк.
+    """
+    batch = []
+
+    for row in rows:
+        batch.append(json.dumps(dict(row), default=_json_default, ensure_ascii=False))
+
+        if len(batch) >= batch_size:
+            yield ("\n".join(batch) + "\n").encode()
+            batch.clear()
+
+    if batch:
+        yield ("\n".join(batch) + "\n").encode()
+
+
+def encode_csv(
+    rows: Iterable[Mapping[str, Any]],
+    fieldnames: Sequence[str],
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """
+    Кодирование строк в CSV с заголовком.
+    Пустые значения выгружаются пустыми ячейками, дата и время - в формате ISO 8601.
+    Args:
+        rows (Iterable[Mapping]): Строки выгрузки.
+        fieldnames (Sequence[str]): Колонки CSV в порядке вывода.
+        batch_size (int): Количество строк в одном фрагменте ответа.
+    Yields:
+        bytes: Фрагмент ответа из batch_size строк.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(fieldnames)
+    count = 0
+
+    for row in rows:
+        writer.writerow(
+            [value.isoformat() if isinstance(value, datetime) else value for value in (row[f] for f in fieldnames)]
+        )
+        count += 1
+
+        if count >= batch_size:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+
+    yield buffer.getvalue().encode()
+
+
+def export_response(
+    rows: Iterable[Mapping[str, Any]],
+    fieldnames: Sequence[str],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """
+    Потоковый ответ с выгрузкой строк.
+    Args:
+        rows (Iterable[Mapping]): Строки выгрузки, читаемые по мере отправки ответа.
+        fieldnames (Sequence[str]): Колонки выгрузки.
+        export_format (ExportFormat): Формат выгрузки.
+        filename (str): Имя файла без расширения.
+    Returns:
+        StreamingResponse: Ответ, отправляющий выгрузку фрагментами.
+    """
+    if export_format == "csv":
+        content = encode_csv(rows, fieldnames)
+    else:
+        content = encode_ndjson(rows)
+
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from tempfile import SpooledTemporaryFile
+from typing import Any, BinaryIO, Iterator
+
+from fastapi import Request
+
+from app.export import EXPORT_MEDIA_TYPES, ExportFormat
+
+# Максимальный объем загружаемого файла, который хранится в памяти, дальше файл пишется на диск.
+IMPORT_SPOOL_SIZE = 8 * 1024 * 1024
+
+# Описание тела запроса импорта для OpenAPI: тело читается из запроса напрямую, без схемы FastAPI.
+IMPORT_OPENAPI_EXTRA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            media_type.split(";")[0]: {"schema": {"type": "string", "format": "binary"}}
+            for media_type in EXPORT_MEDIA_TYPES.values()
+        },
+    },
+}
+
+
+def iter_ndjson_rows(file: BinaryIO) -> Iterator[Any]:
+    """
+    Чтение строк NDJSON. Пустые строки пропускаются.
+    Строка с некорректным JSON возвращается как есть и отклоняется при проверке по схеме.
+    Args:
+        file (BinaryIO): Файл импорта.
+    Yields:
+        Any: Разобранный JSON-объект или текст некорректной строки.
+    """
+    for line in io.TextIOWrapper(file, encoding="utf-8"):
+        if not line.strip():
+            continue
+
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            yield line.rstrip("\n")
+
+
+def iter_csv_rows(file: BinaryIO) -> Iterator[dict[str, str | None]]:
+    """
+    Чтение строк CSV с заголовком. Пустые ячейки считаются отсутствующими значениями, как при выгрузке.
+    Args:
+        file (BinaryIO): Файл импорта.
+    Yields:
+        dict[str, str | None]: Значения строки по колонкам заголовка.
+    """
+    for row in csv.DictReader(io.TextIOWrapper(file, encoding="utf-8", newline="")):
+        yield {key: value if value != "" else None for key, value in row.items()}
+
+
+def iter_import_rows(file: BinaryIO, import_format: ExportFormat) -> Iterator[Any]:
+    """
+    Чтение строк файла импорта в формате выгрузки.
+    Args:
+        file (BinaryIO): Файл импорта.
+        import_format (ExportFormat): Формат файла: ndjson или csv.
+    Returns:
+        Iterator[Any]: Строки файла.
+    """
+    if import_format == "csv":
+        return iter_csv_rows(file)
+
+    return iter_ndjson_rows(file)
+
+
+async def spool_request_body(request: Request) -> SpooledTemporaryFile:
+    """
+    Сохранение тела запроса во временный файл по мере получения.
+    Файл хранится в памяти, пока не превысит IMPORT_SPOOL_SIZE, затем переносится на диск.
+    Args:
+        request (Request): Запрос с файлом импорта в теле.
+    Returns:
+        SpooledTemporaryFile: Файл, открытый на чтение с начала.
+    """
+    file = SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE)
+
+    async for chunk in request.stream():
+        file.write(chunk)
+
+    file.seek(0)
+
+    return file
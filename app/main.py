@@ -1,17 +1,101 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from sqladmin import Admin
 
 from app.admin.employee_admin import EmployeeAdmin
 from app.admin.task_admin import TaskAdmin
-from app.database import engine
-from app.routers import employee, task
+from app.database import DATABASE_URL, Base, SessionLocal, engine, get_async_engine, is_sqlite_memory
+from app.compression import CompressionMiddleware
+from app.metrics import MetricsMiddleware, instrument_engines, instrument_routes
+from app.routers import (
+    diagnostics,
+    employee,
+    employee_async,
+    employee_bulk,
+    employee_export,
+    employee_import,
+    metrics,
+    task,
+    task_assignment,
+    task_async,
+    task_bulk,
+    task_export,
+    task_graph,
+    task_import,
+)
+from app.models.employee import Employee
+from app.models.task import Task
+from app.snapshots import start_snapshots, stop_snapshots
+from app.task_index import start_task_index, stop_task_index
+from config import ANALYTICS_SNAPSHOTS, COMPRESSION_ENABLED, DATABASE_MODE, METRICS_ENABLED, TASK_GRAPH_INDEX
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Загрузка индекса графа задач при запуске приложения (если он включен) и остановка его сверки при завершении.
+    Запуск и остановка фонового пересчета снимков отчетов (ANALYTICS_SNAPSHOTS).
+    Схема базы данных SQLite в памяти процесса создается при запуске: миграции к ней применить нельзя.
+    """
+    if is_sqlite_memory(DATABASE_URL):
+        tables = [Employee.__table__, Task.__table__]
+        Base.metadata.create_all(engine, tables=tables)
+
+        # У асинхронного engine собственное соединение и, следовательно, своя база данных в памяти.
+        if DATABASE_MODE == "async":
+            async with get_async_engine().begin() as connection:
+                await connection.run_sync(Base.metadata.create_all, tables=tables)
+
+    if TASK_GRAPH_INDEX:
+        start_task_index(SessionLocal)
+
+    if ANALYTICS_SNAPSHOTS:
+        start_snapshots(SessionLocal)
+
+    yield
 
-app = FastAPI()
+    if ANALYTICS_SNAPSHOTS:
+        stop_snapshots()
+
+    if TASK_GRAPH_INDEX:
+        stop_task_index()
+
+
+app = FastAPI(lifespan=lifespan)
 
 admin = Admin(app, engine)
 
-app.include_router(employee.router)
-app.include_router(task.router)
+app.include_router(diagnostics.router)
+
+# Пакетные операции, выгрузка и импорт подключаются до основных роутеров,
+# чтобы пути /bulk, /export и /import не совпали с /{id}.
+app.include_router(employee_bulk.router)
+app.include_router(task_bulk.router)
+app.include_router(employee_export.router)
+app.include_router(task_export.router)
+app.include_router(employee_import.router)
+app.include_router(task_import.router)
+app.include_router(task_graph.router)
+app.include_router(task_assignment.router)
+
+if DATABASE_MODE == "async":
+    app.include_router(employee_async.router)
+    app.include_router(task_async.router)
+else:
+    app.include_router(employee.router)
+    app.include_router(task.router)
 
 admin.add_view(EmployeeAdmin)
 admin.add_view(TaskAdmin)
+
+if COMPRESSION_ENABLED:
+    # Сжатие подключается до замеров: MetricsMiddleware, добавленное позже, учитывает и время сжатия.
+    app.add_middleware(CompressionMiddleware)
+
+if METRICS_ENABLED:
+    # Замеры подключаются после всех роутеров: instrument_routes оборачивает функции уже добавленных маршрутов.
+    app.include_router(metrics.router)
+    app.add_middleware(MetricsMiddleware)
+    instrument_engines()
+    instrument_routes(app)
@@ -0,0 +1,560 @@
+import asyncio
+import bisect
+import functools
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+from starlette.datastructures import MutableHeaders
+
+# Границы корзин гистограммы времени ожидания соединения из пула, в секундах.
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Потокобезопасная гистограмма с фиксированными границами корзин.
+    Attributes:
+        buckets (tuple[float, ...]): Верхние границы корзин по возрастанию.
+        count (int): Количество наблюдений.
+        sum (float): Сумма наблюдений.
+    """
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Добавление наблюдения.
+        Args:
+            value (float): Наблюдаемое значение.
+        Returns:
+            None
+        """
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> dict:
+        """
+        Текущее состояние гистограммы с накопительными счетчиками, как в формате Prometheus.
+        Returns:
+            dict: Словарь с ключами 'buckets' (список пар [граница, количество], последняя граница - "+Inf"),
+                'count' и 'sum'.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, total_sum = self.count, self.sum
+
+        cumulative, buckets = 0, []
+
+        for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+            cumulative += bucket_count
+            buckets.append([bound, cumulative])
+
+        return {"buckets": buckets, "count": total, "sum": total_sum}
+
+
+class PoolMetrics:
+    """
+    Накопленные метрики пула соединений.
+    Attributes:
+        checkout_wait (Histogram): Время ожидания соединения из пула в секундах.
+        timeouts (int): Количество ожиданий, завершившихся таймаутом.
+    """
+
+    def __init__(self):
+        self.checkout_wait = Histogram(POOL_WAIT_BUCKETS)
+        self.timeouts = 0
+
+
+class InstrumentedPoolMixin:
+    """
+    Примесь к классу пула, замеряющая время получения соединения.
+    Класс пула с примесью создается функцией instrumented_pool_class и хранит метрики в атрибуте класса,
+    поэтому они переживают пересоздание пула (Pool.recreate) при dispose engine.
+    """
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = perf_counter()
+
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.checkout_wait.observe(perf_counter() - started)
+
+
+def instrumented_pool_class(pool_class: type[Pool], metrics: PoolMetrics) -> type[Pool]:
+    """
+    Создание класса пула, замеряющего время получения соединения.
+    Args:
+        pool_class (type[Pool]): Класс пула SQLAlchemy.
+        metrics (PoolMetrics): Метрики, в которые пишутся замеры.
+    Returns:
+        type[Pool]: Подкласс pool_class с InstrumentedPoolMixin.
+    """
+    return type(f"Instrumented{pool_class.__name__}", (InstrumentedPoolMixin, pool_class), {"metrics": metrics})
+
+
+def get_pool_status(pool: Pool, metrics: PoolMetrics) -> dict:
+    """
+    Текущее состояние пула соединений и накопленные метрики.
+    Args:
+        pool (Pool): Пул соединений engine.
+        metrics (PoolMetrics): Метрики пула.
+    Returns:
+        dict: Класс пула, размер, количество выданных, свободных и сверхлимитных соединений,
+            количество таймаутов и гистограмма времени ожидания. Для пулов без очереди (NullPool)
+            размер и счетчики соединений равны None.
+    """
+    has_queue = hasattr(pool, "checkedout")
+
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size() if has_queue else None,
+        "checked_out": pool.checkedout() if has_queue else None,
+        "checked_in": pool.checkedin() if has_queue else None,
+        "overflow": max(pool.overflow(), 0) if has_queue else None,
+        "timeouts": metrics.timeouts,
+        "checkout_wait": metrics.checkout_wait.snapshot(),
+    }
+
+
+# Границы корзин гистограммы времени обработки запроса, в секундах (как по умолчанию в клиентах Prometheus).
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+# Метка маршрута для запросов, не совпавших ни с одним маршрутом: пути таких запросов не попадают в метки,
+# чтобы количество рядов метрик не росло от произвольных URL.
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    """
+    Замеры текущего запроса, которые накапливают обработчики событий SQLAlchemy и обертка функции маршрута.
+    Attributes:
+        statements (int): Количество выполненных SQL-запросов.
+        db_time (float): Суммарное время выполнения SQL-запросов в секундах.
+        statement_started (float | None): Время начала выполняемого SQL-запроса (perf_counter).
+        endpoint_finished (float | None): Время завершения функции маршрута (perf_counter): после него
+            ответ проверяется по response_model и сериализуется.
+    """
+    __slots__ = ("statements", "db_time", "statement_started", "endpoint_finished")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.statement_started = None
+        self.endpoint_finished = None
+
+
+# Замеры обрабатываемого запроса. Синхронные обработчики выполняются в пуле потоков с копией контекста,
+# поэтому видят тот же объект RequestStats и дописывают в него свои запросы.
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class RouteMetrics:
+    """
+    Накопленные метрики одного маршрута.
+    Attributes:
+        duration (Histogram): Время обработки запроса в секундах.
+        responses (dict[int, int]): Количество ответов по кодам состояния.
+        statements (int): Количество SQL-запросов.
+        db_time (float): Время выполнения SQL-запросов в секундах.
+        serialization_time (float): Время проверки и сериализации ответов в секундах.
+    """
+
+    def __init__(self):
+        self.duration = Histogram(REQUEST_DURATION_BUCKETS)
+        self.responses = {}
+        self.statements = 0
+        self.db_time = 0.0
+        self.serialization_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, status_code: int, duration: float, serialization_time: float, stats: RequestStats) -> None:
+        """
+        Учет завершенного запроса.
+        Args:
+            status_code (int): Код состояния ответа.
+            duration (float): Время обработки запроса в секундах.
+            serialization_time (float): Время сериализации ответа в секундах.
+            stats (RequestStats): Замеры SQL-запросов.
+        Returns:
+            None
+        """
+        self.duration.observe(duration)
+
+        with self._lock:
+            self.responses[status_code] = self.responses.get(status_code, 0) + 1
+            self.statements += stats.statements
+            self.db_time += stats.db_time
+            self.serialization_time += serialization_time
+
+
+class RequestMetrics:
+    """
+    Метрики запросов по маршрутам: ключ - пара (метод, шаблон пути маршрута).
+    """
+
+    def __init__(self):
+        self._routes: dict[tuple[str, str], RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def route(self, method: str, route: str) -> RouteMetrics:
+        """
+        Метрики маршрута, создаются при первом запросе.
+        Args:
+            method (str): HTTP-метод.
+            route (str): Шаблон пути маршрута.
+        Returns:
+            RouteMetrics: Метрики маршрута.
+        """
+        key = (method, route)
+        metrics = self._routes.get(key)
+
+        if metrics is None:
+            with self._lock:
+                metrics = self._routes.setdefault(key, RouteMetrics())
+
+        return metrics
+
+    def items(self) -> list[tuple[tuple[str, str], RouteMetrics]]:
+        """
+        Метрики всех маршрутов, упорядоченные по методу и пути.
+        Returns:
+            list[tuple[tuple[str, str], RouteMetrics]]: Пары ((метод, шаблон пути), метрики).
+        """
+        with self._lock:
+            return sorted(self._routes.items(), key=lambda item: item[0])
+
+    def clear(self) -> None:
+        """
+        Удаление накопленных метрик.
+        Returns:
+            None
+        """
+        with self._lock:
+            self._routes.clear()
+
+
+request_metrics = RequestMetrics()
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+
+    if stats is not None:
+        stats.statement_started = perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+
+    if stats is not None and stats.statement_started is not None:
+        stats.statements += 1
+        stats.db_time += perf_counter() - stats.statement_started
+        stats.statement_started = None
+
+
+def instrument_engines() -> None:
+    """
+    Подключение замеров SQL-запросов ко всем engine (в том числе синхронным engine асинхронных engine).
+    Запросы вне обработки HTTP-запроса (current_request не задан) не учитываются. Повторный вызов ничего не делает.
+    Returns:
+        None
+    """
+    if not event.contains(Engine, "before_cursor_execute", before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", after_cursor_execute)
+
+
+def timed_endpoint(call: Callable) -> Callable:
+    """
+    Обертка функции маршрута, сохраняющая время ее завершения в RequestStats текущего запроса.
+    Сигнатура и признак корутины сохраняются, поэтому FastAPI разбирает параметры обертки как у исходной функции.
+    Args:
+        call (Callable): Функция маршрута.
+    Returns:
+        Callable: Обертка с атрибутами __wrapped__ и timed_endpoint.
+    """
+    def finish():
+        stats = current_request.get()
+
+        if stats is not None:
+            stats.endpoint_finished = perf_counter()
+
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_endpoint(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                finish()
+
+        async_endpoint.timed_endpoint = True
+
+        return async_endpoint
+
+    @functools.wraps(call)
+    def endpoint(*args, **kwargs):
+        try:
+            return call(*args, **kwargs)
+        finally:
+            finish()
+
+    endpoint.timed_endpoint = True
+
+    return endpoint
+
+
+def instrument_routes(app: FastAPI) -> None:
+    """
+    Замер времени сериализации ответов маршрутов приложения: функция каждого маршрута заменяется оберткой
+    timed_endpoint в уже построенной зависимости маршрута (APIRoute.dependant), поэтому роутеры не меняются.
+    Вызывается после подключения всех роутеров. Повторный вызов не оборачивает функции повторно.
+    Args:
+        app (FastAPI): Приложение.
+    Returns:
+        None
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute) and not getattr(route.dependant.call, "timed_endpoint", False):
+            route.dependant.call = timed_endpoint(route.dependant.call)
+
+
+def route_label(scope: dict, root_path: str) -> str:
+    """
+    Метка маршрута запроса: шаблон пути маршрута FastAPI, путь подключенного приложения (например, админ-панели)
+    или UNMATCHED_ROUTE.
+    Args:
+        scope (dict): ASGI scope запроса после обработки.
+        root_path (str): root_path запроса до обработки.
+    Returns:
+        str: Метка маршрута.
+    """
+    route = scope.get("route")
+
+    if route is not None:
+        return route.path
+
+    if scope.get("root_path", root_path) != root_path:
+        return f"{scope['root_path'][len(root_path):]}/*"
+
+    return UNMATCHED_ROUTE
+
+
+def server_timing(stats: RequestStats, serialization_time: float, elapsed: float) -> str:
+    """
+    Значение заголовка Server-Timing: время SQL-запросов, сериализации и обработки до начала ответа в миллисекундах.
+    Args:
+        stats (RequestStats): Замеры SQL-запросов.
+        serialization_time (float): Время сериализации ответа в секундах.
+        elapsed (float): Время от начала обработки запроса до начала ответа в секундах.
+    Returns:
+        str: Значение заголовка.
+    """
+    return (
+        f'db;dur={stats.db_time * 1000:.3f};desc="{stats.statements} statements", '
+        f"serialize;dur={serialization_time * 1000:.3f}, "
+        f"app;dur={elapsed * 1000:.3f}"
+    )
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware, собирающее метрики запросов по маршрутам (request_metrics) и добавляющее к ответам
+    заголовок Server-Timing. Время обработки запроса считается до отправки последней части тела ответа,
+    Server-Timing - до начала ответа (заголовки отправляются раньше тела).
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        root_path = scope.get("root_path", "")
+        started = perf_counter()
+        status_code, serialization_time = 500, 0.0
+
+        async def send_with_timing(message):
+            nonlocal status_code, serialization_time
+
+            if message["type"] == "http.response.start":
+                now = perf_counter()
+                status_code = message["status"]
+
+                if stats.endpoint_finished is not None:
+                    serialization_time = now - stats.endpoint_finished
+
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(stats, serialization_time, now - started))
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            self.metrics.route(scope["method"], route_label(scope, root_path)).record(
+                status_code, perf_counter() - started, serialization_time, stats
+            )
+
+
+def format_labels(labels: dict[str, Any]) -> str:
+    """
+    Метки ряда в текстовом формате Prometheus.
+    Args:
+        labels (dict[str, Any]): Имена и значения меток.
+    Returns:
+        str: Метки в фигурных скобках.
+    """
+    values = []
+
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        values.append(f'{name}="{value}"')
+
+    return "{" + ",".join(values) + "}"
+
+
+def render_histogram(lines: list[str], name: str, labels: dict[str, Any], histogram: Histogram) -> None:
+    """
+    Добавление рядов гистограммы (корзины, сумма и количество) в текстовом формате Prometheus.
+    Args:
+        lines (list[str]): Строки ответа, в которые добавляются ряды.
+        name (str): Имя метрики.
+        labels (dict[str, Any]): Метки ряда.
+        histogram (Histogram): Гистограмма.
+    Returns:
+        None
+    """
+    snapshot = histogram.snapshot()
+
+    for bound, count in snapshot["buckets"]:
+        lines.append(f"{name}_bucket{format_labels({**labels, 'le': bound})} {count}")
+
+    lines.append(f"{name}_sum{format_labels(labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{format_labels(labels)} {snapshot['count']}")
+
+
+# Счетчики маршрутов: имя метрики, описание и атрибут RouteMetrics.
+ROUTE_COUNTERS = [
+    ("http_request_db_statements_total", "SQL statements executed while handling requests.", "statements"),
+    ("http_request_db_seconds_total", "Time spent in SQL statements while handling requests.", "db_time"),
+    ("http_request_serialization_seconds_total", "Time spent validating and serializing responses.",
+     "serialization_time"),
+]
+
+
+# Счетчики снимков отчетов: имя метрики, описание и атрибут SnapshotJob (app.snapshots).
+SNAPSHOT_COUNTERS = [
+    ("snapshot_runs_total", "Completed background report computations.", "runs"),
+    ("snapshot_failures_total", "Background report computations that raised an error.", "failures"),
+    ("snapshot_skipped_total", "Background report computations skipped while a previous one was running.", "skipped"),
+    ("snapshot_missed_total", "Scheduled background report runs missed because a computation overran.", "missed"),
+]
+
+
+def render_metrics(
+    metrics: RequestMetrics, pools: dict[str, tuple[Pool, PoolMetrics]], snapshot_jobs: dict[str, Any] | None = None
+) -> str:
+    """
+    Метрики запросов по маршрутам, пулов соединений и снимков отчетов в текстовом формате Prometheus.
+    Args:
+        metrics (RequestMetrics): Метрики запросов.
+        pools (dict[str, tuple[Pool, PoolMetrics]]): Пулы соединений и их метрики по имени engine.
+        snapshot_jobs (dict[str, SnapshotJob] | None): Отчеты планировщика снимков по названиям или None,
+            если снимки выключены.
+    Returns:
+        str: Текст ответа /metrics.
+    """
+    routes = [({"method": method, "route": route}, route_metrics) for (method, route), route_metrics in metrics.items()]
+    lines = [
+        "# HELP http_request_duration_seconds Request processing time by route.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+
+    for labels, route_metrics in routes:
+        render_histogram(lines, "http_request_duration_seconds", labels, route_metrics.duration)
+
+    lines += ["# HELP http_responses_total Responses by route and status code.", "# TYPE http_responses_total counter"]
+
+    for labels, route_metrics in routes:
+        for status_code, count in sorted(route_metrics.responses.items()):
+            lines.append(f"http_responses_total{format_labels({**labels, 'status': status_code})} {count}")
+
+    for name, description, attribute in ROUTE_COUNTERS:
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+        lines += [
+            f"{name}{format_labels(labels)} {getattr(route_metrics, attribute)}" for labels, route_metrics in routes
+        ]
+
+    lines += [
+        "# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled connection.",
+        "# TYPE db_pool_checkout_wait_seconds histogram",
+    ]
+
+    for engine_name, (_, pool_metrics) in pools.items():
+        render_histogram(lines, "db_pool_checkout_wait_seconds", {"engine": engine_name}, pool_metrics.checkout_wait)
+
+    lines += ["# HELP db_pool_timeouts_total Connection waits that timed out.", "# TYPE db_pool_timeouts_total counter"]
+    lines += [
+        f"db_pool_timeouts_total{format_labels({'engine': engine_name})} {pool_metrics.timeouts}"
+        for engine_name, (_, pool_metrics) in pools.items()
+    ]
+
+    lines += ["# HELP db_pool_checked_out Connections currently checked out.", "# TYPE db_pool_checked_out gauge"]
+    lines += [
+        f"db_pool_checked_out{format_labels({'engine': engine_name})} {pool.checkedout()}"
+        for engine_name, (pool, _) in pools.items()
+        if hasattr(pool, "checkedout")
+    ]
+
+    if snapshot_jobs:
+        lines += [
+            "# HELP snapshot_compute_seconds Background report computation time.",
+            "# TYPE snapshot_compute_seconds histogram",
+        ]
+
+        for name, job in snapshot_jobs.items():
+            render_histogram(lines, "snapshot_compute_seconds", {"snapshot": name}, job.compute_time)
+
+        for metric, description, attribute in SNAPSHOT_COUNTERS:
+            lines += [f"# HELP {metric} {description}", f"# TYPE {metric} counter"]
+            lines += [
+                f"{metric}{format_labels({'snapshot': name})} {getattr(job, attribute)}"
+                for name, job in snapshot_jobs.items()
+            ]
+
+        lines += ["# HELP snapshot_age_seconds Age of the latest report snapshot.", "# TYPE snapshot_age_seconds gauge"]
+        lines += [
+            f"snapshot_age_seconds{format_labels({'snapshot': name})} {job.snapshot.age()}"
+            for name, job in snapshot_jobs.items()
+            if job.snapshot is not None
+        ]
+
+    return "\n".join(lines) + "\n"
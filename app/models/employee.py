@@ -2,6 +2,9 @@ from sqlalchemy import Column, Integer, String, MetaData
 from sqlalchemy.orm import relationship
 
 from app.database import Base
+from app.models.search import search_index
+from app.models.timestamps import updated_at_column
+from app.models.versioning import version_column
 
 metadata_employee = MetaData()
 
@@ -12,7 +15,19 @@ class Employee(Base):
     id = Column(Integer, primary_key=True, index=True)
     full_name = Column(String, nullable=False, index=True)
     position = Column(String)
+    # Счетчики задач сотрудника (всех и активных), их поддерживают триггеры таблицы задач (app.models.workload).
+    task_count = Column(Integer, nullable=False, default=0, server_default="0", index=True)
+    active_task_count = Column(Integer, nullable=False, default=0, server_default="0", index=True)
+    updated_at = updated_at_column()
+    version = version_column(__tablename__)
+
+    __table_args__ = (
+        # Полнотекстовый поиск по ФИО (только PostgreSQL).
+        search_index("ix_employees_full_name_search", full_name),
+    )
 
     task = relationship("Task", back_populates="executor")
 
+    __mapper_args__ = {"version_id_col": version}
+
     metadata = metadata_employee
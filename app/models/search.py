@@ -0,0 +1,82 @@
+import re
+
+from sqlalchemy import Boolean, Column, ColumnElement, Index, and_, false, func, literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# Конфигурация полнотекстового поиска PostgreSQL: без морфологии и стоп-слов, только приведение к нижнему регистру,
+# поэтому одинаково работает для русских и английских названий и ФИО.
+SEARCH_CONFIG = "simple"
+
+# Слова поискового запроса: буквы и цифры. Остальные символы (включая символы синтаксиса tsquery
+# и шаблонов LIKE) считаются разделителями.
+SEARCH_WORD = re.compile(r"[^\W_]+")
+
+
+def search_vector(column: Column) -> ColumnElement:
+    """
+    Выражение to_tsvector по колонке. Конфигурация передается литералом, а не параметром,
+    чтобы выражение в запросе совпадало с выражением индекса search_index.
+    Args:
+        column (Column): Текстовая колонка.
+    Returns:
+        ColumnElement: Выражение to_tsvector('simple', column).
+    """
+    return func.to_tsvector(literal_column(f"'{SEARCH_CONFIG}'"), column)
+
+
+def search_index(name: str, column: Column) -> Index:
+    """
+    GIN-индекс полнотекстового поиска по колонке. Создается только в PostgreSQL,
+    в SQLite поиск выполняется без индекса (search_condition).
+    Args:
+        name (str): Имя индекса.
+        column (Column): Текстовая колонка.
+    Returns:
+        Index: Индекс по выражению search_vector(column).
+    """
+    return Index(name, search_vector(column), postgresql_using="gin").ddl_if(dialect="postgresql")
+
+
+class matches_word(FunctionElement):
+    """
+    Условие: в тексте колонки есть слово, начинающееся с заданного (matches_word(column, word)).
+    В PostgreSQL - поиск по tsvector с префиксным tsquery, который использует индекс search_index.
+    В остальных базах данных - LIKE по началу слова после пробела: без индекса, регистр не учитывается
+    только для латиницы.
+    """
+    type = Boolean()
+    inherit_cache = True
+    name = "matches_word"
+
+
+@compiles(matches_word)
+def compile_matches_word(element, compiler, **kw):
+    column, word = element.clauses
+    return f"(' ' || {compiler.process(column, **kw)}) LIKE ('% ' || {compiler.process(word, **kw)} || '%')"
+
+
+@compiles(matches_word, "postgresql")
+def compile_matches_word_postgresql(element, compiler, **kw):
+    column, word = element.clauses
+    return (
+        f"{compiler.process(search_vector(column), **kw)} "
+        f"@@ to_tsquery('{SEARCH_CONFIG}', {compiler.process(word, **kw)} || ':*')"
+    )
+
+
+def search_condition(column: Column, query: str) -> ColumnElement:
+    """
+    Условие поиска по колонке: каждое слово запроса должно быть началом одного из слов текста.
+    Args:
+        column (Column): Текстовая колонка с индексом search_index.
+        query (str): Поисковый запрос.
+    Returns:
+        ColumnElement: Условие поиска; ложное условие, если в запросе нет слов.
+    """
+    words = SEARCH_WORD.findall(query)
+
+    if not words:
+        return false()
+
+    return and_(*(matches_word(column, word) for word in words))
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, MetaData
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, MetaData, Index
 from sqlalchemy.orm import relationship
 
 from app.database import Base
+from app.models.timestamps import updated_at_column
+from app.models.versioning import version_column
 from app.models.employee import Employee
+from app.models.search import search_index
+from app.models.workload import attach_workload_triggers
 
 metadata_task = MetaData()
 
@@ -12,11 +16,37 @@ class Task(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False, index=True)
-    parent_task_id = Column(Integer, ForeignKey("tasks.id"))
+    parent_task_id = Column(Integer, ForeignKey("tasks.id"), index=True)
     executor_id = Column(Integer, ForeignKey(Employee.id))
     deadline = Column(DateTime)
     is_active = Column(Boolean, default=False)
+    updated_at = updated_at_column()
+    version = version_column(__tablename__)
+
+    __table_args__ = (
+        # Индекс внешнего ключа executor_id, он же для отбора задач сотрудника по активности.
+        Index("ix_tasks_executor_id_is_active", "executor_id", "is_active"),
+        # Частичный индекс активных задач: активных задач намного меньше, чем всех.
+        Index(
+            "ix_tasks_active_executor_id",
+            "executor_id",
+            postgresql_where=is_active.is_(True),
+            sqlite_where=is_active.is_(True),
+        ),
+        # Фильтр по активности без исполнителя: страница списка читается по индексу в порядке id.
+        Index("ix_tasks_is_active_id", "is_active", "id"),
+        # Фильтр и сортировка по сроку: страница по курсору, в том числе среди задач без срока,
+        # читается диапазоном индекса в порядке страницы.
+        Index("ix_tasks_deadline_id", "deadline", "id"),
+        # Полнотекстовый поиск по названию (только PostgreSQL).
+        search_index("ix_tasks_title_search", title),
+    )
 
     executor = relationship("Employee", back_populates="task")
 
+    __mapper_args__ = {"version_id_col": version}
+
     metadata = metadata_task
+
+
+attach_workload_triggers(Task.__table__)
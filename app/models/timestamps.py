@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, func
+
+
+def utc_now() -> datetime:
+    """
+    Текущее время UTC без часового пояса, как хранятся даты в таблицах.
+    Returns:
+        datetime: Текущее время UTC.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def updated_at_column() -> Column:
+    """
+    Колонка времени последнего изменения строки, по которой строятся ETag ответов.
+    Время задается приложением с точностью до микросекунд при каждой вставке и обновлении через SQLAlchemy,
+    значение по умолчанию на стороне базы данных нужно для существующих строк и вставки через INSERT ... SELECT.
+    Returns:
+        Column: Колонка updated_at.
+    """
+    return Column(DateTime, nullable=False, default=utc_now, onupdate=utc_now, server_default=func.now())
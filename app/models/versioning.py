@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, literal_column
+
+
+def version_column(table_name: str) -> Column:
+    """
+    Колонка версии строки для оптимистичной блокировки (version_id_col модели).
+    При изменении объекта через сессию SQLAlchemy сама проверяет и увеличивает версию, а onupdate
+    увеличивает ее в запросах UPDATE без версии в SET (пакетное обновление, импорт).
+    Args:
+        table_name (str): Имя таблицы: в INSERT ... ON CONFLICT DO UPDATE колонка без имени таблицы неоднозначна.
+    Returns:
+        Column: Колонка version.
+    """
+    return Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1",
+        onupdate=literal_column(f"{table_name}.version", Integer) + 1,
+    )
@@ -0,0 +1,116 @@
+from sqlalchemy import DDL, Table, event
+
+# Функция триггеров PostgreSQL: счетчики задач сотрудников обновляются один раз на запрос
+# по таблицам переходов (вставленные, измененные и удаленные строки), а не на каждую строку.
+POSTGRESQL_WORKLOAD_FUNCTION = """
+CREATE OR REPLACE FUNCTION tasks_update_workload() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE employees
+        SET task_count = task_count + delta.total, active_task_count = active_task_count + delta.active
+        FROM (
+            SELECT executor_id, count(*) AS total, count(*) FILTER (WHERE is_active) AS active
+            FROM new_rows WHERE executor_id IS NOT NULL GROUP BY executor_id
+        ) AS delta
+        WHERE employees.id = delta.executor_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE employees
+        SET task_count = task_count - delta.total, active_task_count = active_task_count - delta.active
+        FROM (
+            SELECT executor_id, count(*) AS total, count(*) FILTER (WHERE is_active) AS active
+            FROM old_rows WHERE executor_id IS NOT NULL GROUP BY executor_id
+        ) AS delta
+        WHERE employees.id = delta.executor_id;
+    ELSE
+        UPDATE employees
+        SET task_count = task_count + delta.total, active_task_count = active_task_count + delta.active
+        FROM (
+            SELECT executor_id, sum(total) AS total, sum(active) AS active
+            FROM (
+                SELECT executor_id, 1 AS total, CASE WHEN is_active THEN 1 ELSE 0 END AS active FROM new_rows
+                UNION ALL
+                SELECT executor_id, -1, CASE WHEN is_active THEN -1 ELSE 0 END FROM old_rows
+            ) AS changes
+            WHERE executor_id IS NOT NULL
+            GROUP BY executor_id
+        ) AS delta
+        WHERE employees.id = delta.executor_id AND (delta.total <> 0 OR delta.active <> 0);
+    END IF;
+
+    RETURN NULL;
+END
+$$
+"""
+
+# Триггеры по DDL-командам для каждого диалекта. В SQLite нет триггеров на запрос, поэтому счетчики
+# обновляются построчно, а изменение строки без смены исполнителя и активности пропускается.
+WORKLOAD_TRIGGERS = {
+    "postgresql": [
+        POSTGRESQL_WORKLOAD_FUNCTION,
+        "CREATE TRIGGER tasks_workload_insert AFTER INSERT ON tasks "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_update_workload()",
+        "CREATE TRIGGER tasks_workload_update AFTER UPDATE ON tasks "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION tasks_update_workload()",
+        "CREATE TRIGGER tasks_workload_delete AFTER DELETE ON tasks "
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION tasks_update_workload()",
+    ],
+    "sqlite": [
+        """
+        CREATE TRIGGER tasks_workload_insert AFTER INSERT ON tasks WHEN NEW.executor_id IS NOT NULL
+        BEGIN
+            UPDATE employees
+            SET task_count = task_count + 1, active_task_count = active_task_count + (NEW.is_active IS 1)
+            WHERE id = NEW.executor_id;
+        END
+        """,
+        """
+        CREATE TRIGGER tasks_workload_update AFTER UPDATE OF executor_id, is_active ON tasks
+        WHEN OLD.executor_id IS NOT NEW.executor_id OR OLD.is_active IS NOT NEW.is_active
+        BEGIN
+            UPDATE employees
+            SET task_count = task_count - 1, active_task_count = active_task_count - (OLD.is_active IS 1)
+            WHERE id = OLD.executor_id;
+            UPDATE employees
+            SET task_count = task_count + 1, active_task_count = active_task_count + (NEW.is_active IS 1)
+            WHERE id = NEW.executor_id;
+        END
+        """,
+        """
+        CREATE TRIGGER tasks_workload_delete AFTER DELETE ON tasks WHEN OLD.executor_id IS NOT NULL
+        BEGIN
+            UPDATE employees
+            SET task_count = task_count - 1, active_task_count = active_task_count - (OLD.is_active IS 1)
+            WHERE id = OLD.executor_id;
+        END
+        """,
+    ],
+}
+
+# Команды удаления триггеров для отката миграции.
+DROP_WORKLOAD_TRIGGERS = {
+    "postgresql": [
+        "DROP TRIGGER IF EXISTS tasks_workload_insert ON tasks",
+        "DROP TRIGGER IF EXISTS tasks_workload_update ON tasks",
+        "DROP TRIGGER IF EXISTS tasks_workload_delete ON tasks",
+        "DROP FUNCTION IF EXISTS tasks_update_workload()",
+    ],
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS tasks_workload_insert",
+        "DROP TRIGGER IF EXISTS tasks_workload_update",
+        "DROP TRIGGER IF EXISTS tasks_workload_delete",
+    ],
+}
+
+
+def attach_workload_triggers(tasks: Table) -> None:
+    """
+    Создание триггеров счетчиков задач сотрудников вместе с таблицей задач (create_all).
+    Args:
+        tasks (Table): Таблица задач.
+    Returns:
+        None
+    """
+    for dialect, statements in WORKLOAD_TRIGGERS.items():
+        for statement in statements:
+            event.listen(tasks, "after_create", DDL(statement).execute_if(dialect=dialect))
@@ -0,0 +1,276 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    TypeVar,
+)
+
+from fastapi import Response
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.etag import make_versions_etag
+
+# Заголовок ответа с курсором следующей страницы.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    """Курсор пагинации поврежден или получен для другой сортировки."""
+
+
+class PageSummary(NamedTuple):
+    """
+    ETag страницы и курсор следующей страницы, вычисленные без чтения строк страницы (summarize_page).
+    Attributes:
+        etag (str): ETag страницы, как у ответа со всеми строками.
+        next_cursor (str | None): Курсор следующей страницы или None, если страница неполная.
+    """
+    etag: str
+    next_cursor: str | None
+
+
+def encode_cursor(order_by: str, value: Any, row_id: int) -> str:
+    """
+    Кодирование позиции последней строки страницы в непрозрачный курсор.
+    Args:
+        order_by (str): Ключ сортировки, для которого получен курсор.
+        value (Any): Значение ключа сортировки в последней строке страницы.
+        row_id (int): Идентификатор последней строки страницы.
+    Returns:
+        str: Курсор в кодировке base64url.
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+
+    payload = json.dumps([order_by, value, row_id], separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str, sort_column: InstrumentedAttribute) -> tuple[Any, int]:
+    """
+    Декодирование курсора, полученного функцией encode_cursor.
+    Args:
+        cursor (str): Курсор.
+        order_by (str): Ключ сортировки текущего запроса.
+        sort_column (InstrumentedAttribute): Колонка сортировки, по типу которой восстанавливается значение.
+    Returns:
+        tuple[Any, int]: Значение ключа сортировки и идентификатор последней строки предыдущей страницы.
+    Raises:
+        InvalidCursorError: Если курсор поврежден или получен для другого ключа сортировки.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        cursor_order_by, value, row_id = payload
+
+        if cursor_order_by != order_by or not isinstance(row_id, int):
+            raise InvalidCursorError("Cursor does not match the requested ordering")
+
+        if value is not None and sort_column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as error:
+        if isinstance(error, InvalidCursorError):
+            raise
+        raise InvalidCursorError("Invalid cursor") from error
+
+    return value, row_id
+
+
+def paginate(
+    statement: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    skip: int = 0,
+    limit: int = 100,
+    after: tuple[Any, int] | None = None,
+) -> list[Select]:
+    """
+    Добавление сортировки и пагинации к запросу.
+
+    Строки упорядочиваются по sort_column (NULL в конце) и id_column. Если передана позиция after,
+    используется пагинация по ключу: условие на ключ сортировки позволяет начать чтение страницы
+    с нужного места индекса, и стоимость страницы не зависит от ее номера. Иначе используется OFFSET.
+    Для колонки с NULL строки после курсора со значением не образуют один диапазон индекса, поэтому страница
+    читается двумя запросами: диапазон строк со значением после курсора, затем строки с NULL (iter_page).
+    Когда курсор доходит до строк с NULL, страница - один диапазон sort_column IS NULL и id_column после курсора.
+    Args:
+        statement (Select): Исходный запрос.
+        sort_column (InstrumentedAttribute): Колонка сортировки.
+        id_column (InstrumentedAttribute): Колонка идентификатора, уточняющая порядок при равных значениях.
+        skip (int): Количество пропускаемых строк в режиме OFFSET (по умолчанию 0).
+        limit (int): Размер страницы (по умолчанию 100).
+        after (tuple[Any, int] | None): Значение ключа сортировки и идентификатор последней строки предыдущей страницы.
+    Returns:
+        list[Select]: Запросы диапазонов страницы в порядке страницы.
+    """
+    if sort_column is id_column:
+        statement = statement.order_by(id_column)
+
+        if after is not None:
+            statement = statement.where(id_column > after[1])
+    else:
+        statement = statement.order_by(sort_column.asc().nulls_last(), id_column)
+
+        if after is not None:
+            value, row_id = after
+
+            if value is None:
+                statement = statement.where(sort_column.is_(None), id_column > row_id)
+            else:
+                statements = [statement.where(tuple_(sort_column, id_column) > tuple_(value, row_id))]
+
+                if sort_column.nullable:
+                    statements.append(statement.where(sort_column.is_(None)))
+
+                return [page_range.limit(limit) for page_range in statements]
+
+    if after is None and skip:
+        statement = statement.offset(skip)
+
+    return [statement.limit(limit)]
+
+
+def iter_page(statements: Sequence[Select], limit: int, execute: Callable[[Select], Iterable[T]]) -> Iterator[T]:
+    """
+    Строки страницы по запросам диапазонов paginate. Первый запрос выполняется сразу, следующий - только
+    после чтения всех строк предыдущего, если их меньше limit, и с лимитом на оставшиеся строки.
+    Args:
+        statements (Sequence[Select]): Запросы диапазонов страницы.
+        limit (int): Размер страницы.
+        execute (Callable[[Select], Iterable[T]]): Выполнение запроса, например db.execute или db.scalars.
+    Returns:
+        Iterator[T]: Строки страницы.
+    """
+    first = execute(statements[0])
+
+    def rows():
+        count = 0
+
+        for index, statement in enumerate(statements):
+            for row in first if index == 0 else execute(statement.limit(limit - count)):
+                count += 1
+                yield row
+
+            if count >= limit:
+                return
+
+    return rows()
+
+
+async def stream_page(
+    statements: Sequence[Select], limit: int, stream: Callable[[Select], Awaitable[AsyncIterable[T]]]
+) -> AsyncIterator[T]:
+    """
+    Асинхронный вариант iter_page.
+    Args:
+        statements (Sequence[Select]): Запросы диапазонов страницы.
+        limit (int): Размер страницы.
+        stream (Callable[[Select], Awaitable[AsyncIterable[T]]]): Выполнение запроса, например db.stream
+            или db.stream_scalars.
+    Returns:
+        AsyncIterator[T]: Строки страницы.
+    """
+    first = await stream(statements[0])
+
+    async def rows():
+        count = 0
+
+        for index, statement in enumerate(statements):
+            async for row in first if index == 0 else await stream(statement.limit(limit - count)):
+                count += 1
+                yield row
+
+            if count >= limit:
+                return
+
+    return rows()
+
+
+def get_next_cursor(items: Sequence[Any], order_by: str, limit: int) -> str | None:
+    """
+    Курсор следующей страницы по последнему элементу текущей.
+    Args:
+        items (Sequence[Any]): Элементы текущей страницы с атрибутами (или ключами словаря) id и order_by.
+        order_by (str): Ключ сортировки.
+        limit (int): Размер страницы.
+    Returns:
+        str | None: Курсор или None, если страница неполная и следующей страницы нет.
+    """
+    if not items or len(items) < limit:
+        return None
+
+    last = items[-1]
+
+    if isinstance(last, Mapping):
+        return encode_cursor(order_by, last[order_by], last["id"])
+
+    return encode_cursor(order_by, getattr(last, order_by), last.id)
+
+
+def set_next_cursor(response: Response, items: Sequence[Any], order_by: str, limit: int) -> None:
+    """
+    Передача курсора следующей страницы в заголовке ответа X-Next-Cursor.
+    Args:
+        response (Response): Ответ, в который добавляется заголовок.
+        items (Sequence[Any]): Элементы текущей страницы.
+        order_by (str): Ключ сортировки.
+        limit (int): Размер страницы.
+    Returns:
+        None
+    """
+    response.headers.update(next_cursor_headers(get_next_cursor(items, order_by, limit)))
+
+
+def next_cursor_headers(next_cursor: str | None) -> dict[str, str]:
+    """
+    Заголовок ответа X-Next-Cursor с курсором следующей страницы.
+    Args:
+        next_cursor (str | None): Курсор или None, если следующей страницы нет.
+    Returns:
+        dict[str, str]: Заголовок или пустой словарь.
+    """
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+
+
+def summarize_page(keys: Iterable[Sequence[Any]], table: str, order_by: str, limit: int) -> PageSummary:
+    """
+    ETag и курсор следующей страницы по ключам ее строк, для ответа, который отправляет строки потоком
+    и не может дождаться последней строки перед отправкой заголовков. Ключи обрабатываются по одному
+    и не накапливаются.
+    Args:
+        keys (Iterable[Sequence[Any]]): Идентификатор, версия и значение ключа сортировки каждой строки страницы
+            в порядке страницы.
+        table (str): Таблица строк (для make_versions_etag).
+        order_by (str): Ключ сортировки.
+        limit (int): Размер страницы.
+    Returns:
+        PageSummary: ETag, совпадающий с ETag ответа со всеми строками, и курсор следующей страницы.
+    """
+    last = None
+    count = 0
+
+    def versions():
+        nonlocal last, count
+
+        for row_id, version, value in keys:
+            last, count = (value, row_id), count + 1
+            yield table, row_id, version
+
+    etag = make_versions_etag(versions())
+    next_cursor = encode_cursor(order_by, *last) if last is not None and count >= limit else None
+
+    return PageSummary(etag, next_cursor)
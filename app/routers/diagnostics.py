@@ -0,0 +1,78 @@
+from fastapi import APIRouter
+
+from app.cache import get_cache_status
+import config
+from app.database import async_pool_metrics, engine, get_async_engine, pool_metrics
+from app.metrics import get_pool_status
+from app.schemas.diagnostics_schemas import (
+    CacheStatusSchema,
+    PoolsStatusSchema,
+    SnapshotsStatusSchema,
+    TaskIndexStatusSchema,
+)
+from app.snapshots import get_snapshot_scheduler
+from app.task_index import get_task_index
+
+router = APIRouter(
+    prefix="/diagnostics",
+    tags=["diagnostics"]
+)
+
+
+@router.get("/pool", response_model=PoolsStatusSchema)
+def read_pool_status():
+    """
+    Получение состояния пулов соединений: выданные и свободные соединения, переполнение,
+    таймауты и гистограмма времени ожидания соединения.
+    Returns:
+        PoolsStatusSchema: Состояние пулов синхронного и асинхронного engine (асинхронного - в режиме async).
+    """
+    return {
+        "sync_engine": get_pool_status(engine.pool, pool_metrics),
+        "async_engine": (
+            get_pool_status(get_async_engine().pool, async_pool_metrics) if config.DATABASE_MODE == "async" else None
+        ),
+    }
+
+
+@router.get("/cache", response_model=CacheStatusSchema)
+def read_cache_status():
+    """
+    Получение состояния кэша чтения задач и сотрудников: хранилище, количество записей,
+    попадания, промахи, вытеснения и удаления при изменении данных.
+    Returns:
+        CacheStatusSchema: Состояние кэша.
+    """
+    return get_cache_status()
+
+
+@router.get("/task-index", response_model=TaskIndexStatusSchema)
+def read_task_index_status():
+    """
+    Получение состояния индекса графа задач в памяти: размер графа, занимаемая память,
+    количество перечитанных записей и результаты сверок с базой данных.
+    Returns:
+        TaskIndexStatusSchema: Состояние индекса.
+    """
+    index = get_task_index()
+
+    if index is None:
+        return {"enabled": False}
+
+    return {"enabled": True, **index.status()}
+
+
+@router.get("/snapshots", response_model=SnapshotsStatusSchema)
+def read_snapshots_status():
+    """
+    Получение состояния снимков отчетов, пересчитываемых в фоне: возраст и длительность расчета
+    последнего снимка, количество расчетов, ошибок и пропущенных расчетов.
+    Returns:
+        SnapshotsStatusSchema: Состояние снимков.
+    """
+    scheduler = get_snapshot_scheduler()
+
+    if scheduler is None:
+        return {"enabled": False}
+
+    return {"enabled": True, "snapshots": {name: job.status() for name, job in scheduler.jobs.items()}}
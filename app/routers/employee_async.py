@@ -0,0 +1,286 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import config
+from app.crud.employee_crud_async import (
+    get_employee_page_summary,
+    get_employee_rows,
+    create_employee,
+    get_employee,
+    get_employee_row,
+    delete_employee,
+    partial_update_employee,
+    get_employees_tasks_rows,
+    iter_employee_rows,
+)
+from app.crud.employee_crud import employee_row_versions, employee_tasks_row_versions
+from app.crud.versioning import VersionConflictError
+from app.database import begin_async_snapshot, get_async_db
+from app.etag import (
+    NOT_MODIFIED_RESPONSES,
+    VERSION_CONFLICT_RESPONSES,
+    cache_headers,
+    if_match_versions,
+    is_not_modified,
+    make_versions_etag,
+    make_version_etag,
+    not_modified_response,
+)
+from app.pagination import InvalidCursorError, next_cursor_headers, set_next_cursor
+from app.snapshots import get_workload_page, snapshot_headers
+from app.serialization import (
+    EmployeeRowsResponse,
+    EmployeeTasksRowsResponse,
+    employee_fields,
+    projection_response_class,
+    projection_row_response,
+)
+from app.schemas.employee_schemas import (
+    EmployeeSchema,
+    EmployeeCreateSchema,
+    EmployeeUpdateSchema,
+    EmployeeTasksSchema,
+    EmployeeOrderBy,
+)
+
+router = APIRouter(
+    prefix="/employees",
+    tags=["employees"]
+)
+
+
+@router.post("/", response_model=EmployeeSchema, status_code=status.HTTP_201_CREATED)
+async def create_new_employee(employee: EmployeeCreateSchema, db: AsyncSession = Depends(get_async_db)):
+    """
+    Создание нового сотрудника.
+    Args:
+        employee (EmployeeCreateSchema): Данные для создания нового сотрудника.
+        db (AsyncSession, optional): Асинхронная сессия базы данных. По умолчанию используется Depends(get_async_db).
+    Returns:
+        EmployeeSchema: Созданный сотрудник.
+    """
+    return await create_employee(db=db, employee=employee)
+
+
+@router.get(
+    "/", response_model=list[EmployeeSchema], response_class=EmployeeRowsResponse, responses=NOT_MODIFIED_RESPONSES
+)
+async def read_employees(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: EmployeeOrderBy = "id",
+    cursor: str | None = None,
+    search: str | None = None,
+    fields: tuple[str, ...] | None = Depends(employee_fields),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Получение списка сотрудников с пропуском и лимитом или по курсору, с поиском по ФИО.
+    Если страница заполнена полностью, курсор следующей страницы возвращается в заголовке X-Next-Cursor.
+    Пагинация по курсору не замедляется с ростом номера страницы, в отличие от пропуска skip элементов.
+    ETag страницы строится по идентификаторам и версиям строк сотрудников; при запросе с If-None-Match
+    актуальной версии возвращается 304 без сериализации сотрудников.
+    Сотрудники читаются колонками и сериализуются EmployeeRowsResponse без создания моделей EmployeeSchema;
+    с параметром fields читаются и выводятся только перечисленные поля.
+    Страницы с limit больше LIST_STREAM_THRESHOLD отправляются потоком: ETag и курсор считаются по ключам строк,
+    а сами строки читаются курсором базы данных и кодируются частями по мере отправки.
+    Сводка и строки читаются в одной транзакции с одним снимком базы данных (begin_async_snapshot).
+    Args:
+        request (Request): Запрос с заголовками условного запроса.
+        skip (int, optional): Количество пропускаемых элементов. По умолчанию 0. Не используется вместе с курсором.
+        limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        order_by (EmployeeOrderBy, optional): Ключ сортировки ("id", "full_name", "task_count"
+            или "active_task_count"). По умолчанию "id".
+        cursor (str | None, optional): Курсор из заголовка X-Next-Cursor предыдущего ответа.
+        search (str | None, optional): Поиск по ФИО: каждое слово запроса должно быть началом слова ФИО.
+        fields (tuple[str, ...] | None): Поля ответа из параметра fields (через запятую) или None - все поля.
+        db (AsyncSession, optional): Асинхронная сессия базы данных. По умолчанию используется Depends(get_async_db).
+    Returns:
+        EmployeeRowsResponse: Список сотрудников.
+    """
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Cursor cannot be combined with skip")
+
+    response_class = EmployeeRowsResponse if fields is None else projection_response_class(EmployeeSchema, fields)
+
+    if limit > config.LIST_STREAM_THRESHOLD:
+        await begin_async_snapshot(db)
+
+        try:
+            page = await get_employee_page_summary(
+                db, skip=skip, limit=limit, order_by=order_by, cursor=cursor, search=search
+            )
+        except InvalidCursorError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+
+        if is_not_modified(request, page.etag):
+            return not_modified_response(page.etag)
+
+        employees = await iter_employee_rows(
+            db, skip=skip, limit=limit, order_by=order_by, cursor=cursor, search=search, fields=fields
+        )
+
+        return response_class.stream(
+            employees, headers={**cache_headers(page.etag), **next_cursor_headers(page.next_cursor)}
+        )
+
+    try:
+        employees = await get_employee_rows(
+            db, skip=skip, limit=limit, order_by=order_by, cursor=cursor, search=search, fields=fields
+        )
+    except InvalidCursorError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    etag = make_versions_etag(employee_row_versions(employees))
+
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    response = response_class(employees, headers=cache_headers(etag))
+    set_next_cursor(response, employees, order_by, limit)
+
+    return response
+
+
+@router.get(
+    "/tasks/",
+    response_model=list[EmployeeTasksSchema],
+    response_class=EmployeeTasksRowsResponse,
+    responses=NOT_MODIFIED_RESPONSES,
+)
+async def read_employees_tasks(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    fresh: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Получение списка сотрудников и их активных задач, отсортированного по количеству активных задач.
+    ETag строится по версиям строк сотрудников и их активных задач; при запросе с If-None-Match
+    актуальной версии возвращается 304 без сериализации списка.
+    Сотрудники и задачи читаются колонками и сериализуются EmployeeTasksRowsResponse без создания моделей.
+    Если включены снимки отчетов (ANALYTICS_SNAPSHOTS), страницы из первых WORKLOAD_SNAPSHOT_SIZE сотрудников
+    берутся из последнего снимка, рассчитанного в фоне, с его возрастом в заголовке Age;
+    fresh=true читает страницу из базы данных.
+    Args:
+        request (Request): Запрос с заголовками условного запроса.
+        skip (int, optional): Количество пропускаемых элементов. По умолчанию 0.
+        limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        fresh (bool, optional): Прочитать страницу без снимка. По умолчанию False.
+        db (AsyncSession, optional): Асинхронная сессия базы данных. По умолчанию используется Depends(get_async_db).
+    Returns:
+        EmployeeTasksRowsResponse: Список сотрудников с задачами.
+    """
+    page = None if fresh else get_workload_page(skip, limit)
+
+    if page is not None:
+        employees, snapshot = page
+    else:
+        employees, snapshot = await get_employees_tasks_rows(db, skip=skip, limit=limit), None
+
+    etag = make_versions_etag(employee_tasks_row_versions(employees))
+    headers = {**cache_headers(etag), **snapshot_headers(snapshot)}
+
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return EmployeeTasksRowsResponse(employees, headers=headers)
+
+
+@router.get("/{employee_id}", response_model=EmployeeSchema, responses=NOT_MODIFIED_RESPONSES)
+async def read_employee(
+    employee_id: int,
+    request: Request,
+    response: Response,
+    fields: tuple[str, ...] | None = Depends(employee_fields),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Получение информации о сотруднике по его идентификатору.
+    Ответ содержит заголовок ETag по версии строки сотрудника; при запросе с If-None-Match
+    актуальной версии возвращается 304.
+    С параметром fields сотрудник читается без ORM-объекта (get_employee_row) и выводятся только перечисленные поля.
+    Args:
+        employee_id (int): Идентификатор сотрудника.
+        request (Request): Запрос с заголовками условного запроса.
+        response (Response): Ответ, в который добавляется заголовок ETag.
+        fields (tuple[str, ...] | None): Поля ответа из параметра fields (через запятую) или None - все поля.
+        db (AsyncSession, optional): Асинхронная сессия базы данных. По умолчанию используется Depends(get_async_db).
+    Returns:
+        EmployeeSchema: Информация о сотруднике.
+    """
+    if fields is not None:
+        db_employee = await get_employee_row(db, employee_id=employee_id)
+
+        return projection_row_response(EmployeeSchema, fields, db_employee, request, "Employee not found")
+
+    db_employee = await get_employee(db, employee_id=employee_id)
+
+    if db_employee is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    etag = make_version_etag(db_employee.version)
+
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    response.headers.update(cache_headers(etag))
+
+    return db_employee
+
+
+@router.put("/{employee_id}", response_model=EmployeeSchema, responses=VERSION_CONFLICT_RESPONSES)
+async def put_employee(
+    employee_id: int,
+    employee: EmployeeUpdateSchema,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Обновление информации о сотруднике.
+    Если передан заголовок If-Match, сотрудник изменяется, только если его версия совпадает с ETag из заголовка,
+    иначе возвращается 409. Ответ содержит ETag новой версии сотрудника.
+    Args:
+        employee_id (int): Идентификатор сотрудника.
+        employee (EmployeeUpdateSchema): Данные для обновления сотрудника.
+        request (Request): Запрос с заголовком If-Match.
+        response (Response): Ответ, в который добавляется заголовок ETag.
+        db (AsyncSession, optional): Асинхронная сессия базы данных. По умолчанию используется Depends(get_async_db).
+    Returns:
+        EmployeeSchema: Обновленная информация о сотруднике.
+    """
+    try:
+        db_employee = await partial_update_employee(
+            db=db, employee_id=employee_id, employee=employee, versions=if_match_versions(request)
+        )
+    except VersionConflictError as error:
+        raise HTTPException(status_code=409, detail=str(error))
+
+    if db_employee is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    response.headers["ETag"] = make_version_etag(db_employee.version)
+
+    return db_employee
+
+
+@router.delete("/{employee_id}", response_model=EmployeeSchema)
+async def del_employee(employee_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Удаление сотрудника.
+    Args:
+        employee_id (int): Идентификатор сотрудника.
+        db (AsyncSession, optional): Асинхронная сессия базы данных. По умолчанию используется Depends(get_async_db).
+    Returns:
+        JSONResponse: Сообщение об успешном удалении сотрудника.
+    """
+    response = await delete_employee(db, employee_id=employee_id)
+
+    if response is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    return JSONResponse(content={"message": "Employee deleted"}, status_code=200)
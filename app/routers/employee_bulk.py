@@ -0,0 +1,61 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.crud.employee_crud import bulk_create_employees, bulk_update_employees, bulk_delete_employees
+from app.database import get_db
+from app.schemas.bulk_schemas import BulkResultSchema, BulkDeleteSchema, validate_bulk_items, build_bulk_result
+from app.schemas.employee_schemas import EmployeeCreateSchema, EmployeeBulkUpdateSchema
+
+router = APIRouter(
+    prefix="/employees",
+    tags=["employees"]
+)
+
+
+@router.post("/bulk", response_model=BulkResultSchema)
+def create_employees_bulk(employees: list[dict[str, Any]], db: Session = Depends(get_db)):
+    """
+    Пакетное создание сотрудников.
+    Каждый сотрудник проверяется по схеме EmployeeCreateSchema отдельно: сотрудники с ошибками не создаются,
+    остальные создаются в одной транзакции.
+    Args:
+        employees (list[dict]): Данные для создания сотрудников.
+        db (Session, optional): Сессия базы данных. По умолчанию используется Depends(get_db).
+    Returns:
+        BulkResultSchema: Идентификаторы созданных сотрудников и ошибки по каждому сотруднику.
+    """
+    valid, errors = validate_bulk_items(EmployeeCreateSchema, employees)
+
+    return build_bulk_result(len(employees), errors, bulk_create_employees(db, valid))
+
+
+@router.patch("/bulk", response_model=BulkResultSchema)
+def update_employees_bulk(employees: list[dict[str, Any]], db: Session = Depends(get_db)):
+    """
+    Пакетное частичное обновление сотрудников.
+    Каждый сотрудник проверяется по схеме EmployeeBulkUpdateSchema (EmployeeUpdateSchema с полем id) отдельно,
+    обновляются только переданные поля.
+    Args:
+        employees (list[dict]): Идентификаторы и данные для обновления сотрудников.
+        db (Session, optional): Сессия базы данных. По умолчанию используется Depends(get_db).
+    Returns:
+        BulkResultSchema: Идентификаторы обновленных сотрудников и ошибки по каждому сотруднику.
+    """
+    valid, errors = validate_bulk_items(EmployeeBulkUpdateSchema, employees)
+
+    return build_bulk_result(len(employees), errors, bulk_update_employees(db, valid))
+
+
+@router.delete("/bulk", response_model=BulkResultSchema)
+def delete_employees_bulk(employees: BulkDeleteSchema, db: Session = Depends(get_db)):
+    """
+    Пакетное удаление сотрудников. Задачи удаленных сотрудников остаются без исполнителя.
+    Args:
+        employees (BulkDeleteSchema): Идентификаторы удаляемых сотрудников.
+        db (Session, optional): Сессия базы данных. По умолчанию используется Depends(get_db).
+    Returns:
+        BulkResultSchema: Идентификаторы удаленных сотрудников и ошибки по каждому сотруднику.
+    """
+    return build_bulk_result(len(employees.ids), {}, bulk_delete_employees(db, employees.ids))
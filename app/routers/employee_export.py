@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.crud.employee_crud import iter_employees
+from app.database import get_db
+from app.export import ExportFormat, export_response
+from app.schemas.employee_schemas import EmployeeSchema
+
+router = APIRouter(
+    prefix="/employees",
+    tags=["employees"]
+)
+
+
+@router.get("/export")
+def export_employees(format: ExportFormat = "ndjson", db: Session = Depends(get_db)):
+    """
+    Потоковая выгрузка сотрудников в NDJSON или CSV.
+    Сотрудники читаются серверным курсором и отправляются по мере чтения.
+    Сессия из get_db закрывается после отправки ответа.
+    Args:
+        format (ExportFormat): Формат выгрузки: ndjson или csv (по умолчанию ndjson).
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        StreamingResponse: Выгрузка сотрудников, упорядоченных по идентификатору.
+    """
+    return export_response(iter_employees(db), list(EmployeeSchema.model_fields), format, "employees")
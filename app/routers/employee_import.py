@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.crud.employee_crud import import_employees
+from app.crud.staging import ImportNotSupportedError, check_import_supported
+from app.database import get_db
+from app.export import ExportFormat
+from app.importing import IMPORT_OPENAPI_EXTRA, iter_import_rows, spool_request_body
+from app.schemas.import_schemas import ImportResultSchema
+
+router = APIRouter(
+    prefix="/employees",
+    tags=["employees"]
+)
+
+
+@router.post("/import", response_model=ImportResultSchema, openapi_extra=IMPORT_OPENAPI_EXTRA)
+async def import_employees_file(request: Request, format: ExportFormat = "ndjson", db: Session = Depends(get_db)):
+    """
+    Импорт сотрудников из файла NDJSON или CSV в формате выгрузки /employees/export, переданного в теле запроса.
+    Тело запроса сохраняется во временный файл по мере получения, затем строки проверяются
+    и загружаются в базу данных частями.
+    Если база данных не поддерживает импорт, возвращается 501 без чтения тела запроса.
+    Args:
+        request (Request): Запрос с файлом импорта в теле.
+        format (ExportFormat): Формат файла: ndjson или csv (по умолчанию ndjson).
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        ImportResultSchema: Количество импортированных и отклоненных строк и причины отклонения.
+    """
+    try:
+        check_import_supported(db)
+    except ImportNotSupportedError as error:
+        raise HTTPException(status_code=501, detail=str(error))
+
+    with await spool_request_body(request) as file:
+        return await run_in_threadpool(import_employees, db, iter_import_rows(file, format))
@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+import config
+from app.database import async_pool_metrics, engine, get_async_engine, pool_metrics
+from app.metrics import render_metrics, request_metrics
+from app.snapshots import get_snapshot_scheduler
+
+router = APIRouter(
+    tags=["diagnostics"]
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """
+    Метрики приложения в текстовом формате Prometheus: гистограммы времени обработки запросов,
+    количество ответов, SQL-запросов, время SQL-запросов и сериализации ответов по маршрутам,
+    время ожидания соединений из пулов и время расчета снимков отчетов.
+    Returns:
+        PlainTextResponse: Метрики в формате Prometheus (text/plain; version=0.0.4).
+    """
+    pools = {"sync": (engine.pool, pool_metrics)}
+
+    # Асинхронный engine создается только в режиме async.
+    if config.DATABASE_MODE == "async":
+        pools["async"] = (get_async_engine().pool, async_pool_metrics)
+
+    scheduler = get_snapshot_scheduler()
+    snapshot_jobs = scheduler.jobs if scheduler is not None else None
+
+    return PlainTextResponse(
+        render_metrics(request_metrics, pools, snapshot_jobs), media_type="text/plain; version=0.0.4"
+    )
@@ -1,17 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
+import config
 from app.crud.task_crud import (
     create_task,
-    get_tasks,
+    get_task_page_summary,
+    get_task_rows,
     get_task,
+    get_task_row,
     partial_update_task,
     delete_task,
-    get_important_tasks,
+    get_important_tasks_memoized,
+    iter_task_rows,
+    task_row_versions,
+)
+from app.crud.task_graph import TaskHierarchyError
+from app.crud.versioning import VersionConflictError
+from app.database import begin_snapshot, get_db
+from app.etag import (
+    NOT_MODIFIED_RESPONSES,
+    VERSION_CONFLICT_RESPONSES,
+    cache_headers,
+    if_match_versions,
+    is_not_modified,
+    make_versions_etag,
+    make_version_etag,
+    not_modified_response,
+)
+from app.pagination import InvalidCursorError, next_cursor_headers, set_next_cursor
+from app.snapshots import IMPORTANT_TASKS, get_snapshot, snapshot_headers
+from app.serialization import (
+    TaskRowsResponse,
+    projection_response_class,
+    projection_row_response,
+    task_fields,
+)
+from app.schemas.task_schemas import (
+    TaskSchema,
+    TaskCreateSchema,
+    TaskUpdateSchema,
+    ImportantTasksShowSchema,
+    TaskOrderBy,
+    TaskFilterSchema,
 )
-from app.database import get_db
-from app.schemas.task_schemas import TaskSchema, TaskCreateSchema, TaskUpdateSchema, ImportantTasksShowSchema
 
 router = APIRouter(
     prefix="/tasks",
@@ -23,74 +55,195 @@ router = APIRouter(
 def create_new_task(task: TaskCreateSchema, db: Session = Depends(get_db)):
     """
     Создание новой задачи.
+    Если задача оказалась бы глубже TASK_GRAPH_MAX_DEPTH уровней иерархии, возвращается 400.
     Args:
         task (TaskCreateSchema): Данные для создания новой задачи.
         db (Session): Сессия базы данных SQLAlchemy.
     Returns:
         TaskSchema: Информация о созданной задаче.
     """
-    return create_task(db=db, task=task)
+    try:
+        return create_task(db=db, task=task)
+    except TaskHierarchyError as error:
+        raise HTTPException(status_code=400, detail=str(error))
 
 
-@router.get("/", response_model=list[TaskSchema])
-def read_tasks(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get(
+    "/", response_model=list[TaskSchema], response_class=TaskRowsResponse, responses=NOT_MODIFIED_RESPONSES
+)
+def read_tasks(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    order_by: TaskOrderBy = "id",
+    cursor: str | None = None,
+    filters: TaskFilterSchema = Depends(),
+    fields: tuple[str, ...] | None = Depends(task_fields),
+    db: Session = Depends(get_db),
+):
     """
-    Получение списка задач с пропуском и лимитом.
+    Получение списка задач с пропуском и лимитом или по курсору, с фильтрами и поиском по названию.
+    Если страница заполнена полностью, курсор следующей страницы возвращается в заголовке X-Next-Cursor.
+    Пагинация по курсору не замедляется с ростом номера страницы, в отличие от пропуска skip элементов.
+    ETag страницы строится по идентификаторам и версиям строк задач; при запросе с If-None-Match
+    актуальной версии возвращается 304 без сериализации задач.
+    Задачи читаются колонками и сериализуются TaskRowsResponse без создания моделей TaskSchema;
+    с параметром fields читаются и выводятся только перечисленные поля.
+    Страницы с limit больше LIST_STREAM_THRESHOLD отправляются потоком: ETag и курсор считаются по ключам строк,
+    а сами строки читаются курсором базы данных и кодируются частями по мере отправки.
+    Сводка и строки читаются в одной транзакции с одним снимком базы данных (begin_snapshot).
     Args:
-        skip (int, optional): Количество пропускаемых элементов. По умолчанию 0.
+        request (Request): Запрос с заголовками условного запроса.
+        skip (int, optional): Количество пропускаемых элементов. По умолчанию 0. Не используется вместе с курсором.
         limit (int, optional): Количество извлекаемых элементов. По умолчанию 100.
+        order_by (TaskOrderBy, optional): Ключ сортировки ("id", "deadline" или "title"). По умолчанию "id".
+        cursor (str | None, optional): Курсор из заголовка X-Next-Cursor предыдущего ответа.
+        filters (TaskFilterSchema): Фильтры списка задач из параметров запроса.
+        fields (tuple[str, ...] | None): Поля ответа из параметра fields (через запятую) или None - все поля.
         db (Session): Сессия базы данных SQLAlchemy.
     Returns:
-        List[TaskSchema]: Список задач.
+        TaskRowsResponse: Список задач.
     """
-    tasks = get_tasks(db, skip=skip, limit=limit)
-    return tasks
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Cursor cannot be combined with skip")
+
+    response_class = TaskRowsResponse if fields is None else projection_response_class(TaskSchema, fields)
+
+    if limit > config.LIST_STREAM_THRESHOLD:
+        begin_snapshot(db)
+
+        try:
+            page = get_task_page_summary(db, skip=skip, limit=limit, order_by=order_by, cursor=cursor, filters=filters)
+        except InvalidCursorError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+
+        if is_not_modified(request, page.etag):
+            return not_modified_response(page.etag)
+
+        tasks = iter_task_rows(
+            db, skip=skip, limit=limit, order_by=order_by, cursor=cursor, filters=filters, fields=fields
+        )
+
+        return response_class.stream(
+            tasks, headers={**cache_headers(page.etag), **next_cursor_headers(page.next_cursor)}
+        )
+
+    try:
+        tasks = get_task_rows(
+            db, skip=skip, limit=limit, order_by=order_by, cursor=cursor, filters=filters, fields=fields
+        )
+    except InvalidCursorError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    etag = make_versions_etag(task_row_versions(tasks))
+
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
 
+    response = response_class(tasks, headers=cache_headers(etag))
+    set_next_cursor(response, tasks, order_by, limit)
 
-@router.get("/important/", response_model=list[ImportantTasksShowSchema])
-def read_important_tasks(db: Session = Depends(get_db)):
+    return response
+
+
+@router.get("/important/", response_model=list[ImportantTasksShowSchema], responses=NOT_MODIFIED_RESPONSES)
+def read_important_tasks(request: Request, response: Response, fresh: bool = False, db: Session = Depends(get_db)):
     """
     Получение списка важных задач.
     Важные задачи определяются согласно логике в функции get_important_tasks.
+    Результат пересчитывается только после изменения задач или сотрудников. Ответ содержит заголовки ETag
+    и Last-Modified; при запросе с If-None-Match или If-Modified-Since актуальной версии возвращается 304.
+    Если включены снимки отчетов (ANALYTICS_SNAPSHOTS), возвращается последний снимок, рассчитанный в фоне,
+    с его возрастом в заголовке Age; fresh=true возвращает результат на момент запроса.
     Args:
+        request (Request): Запрос с заголовками условного запроса.
+        response (Response): Ответ, в который добавляются заголовки ETag и Last-Modified.
+        fresh (bool, optional): Рассчитать результат без снимка. По умолчанию False.
         db (Session): Сессия базы данных SQLAlchemy.
     Returns:
         List[ImportantTasksShowSchema]: Список важных задач.
     """
-    tasks = get_important_tasks(db)
-    return tasks
+    snapshot = None if fresh else get_snapshot(IMPORTANT_TASKS)
+    important_tasks = snapshot or get_important_tasks_memoized(db)
+    headers = {**cache_headers(important_tasks.etag, important_tasks.last_modified), **snapshot_headers(snapshot)}
+
+    if is_not_modified(request, important_tasks.etag, important_tasks.last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
+    response.headers.update(headers)
 
-@router.get("/{task_id}", response_model=TaskSchema)
-def read_task(task_id: int, db: Session = Depends(get_db)):
+    return important_tasks.value
+
+
+@router.get("/{task_id}", response_model=TaskSchema, responses=NOT_MODIFIED_RESPONSES)
+def read_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    fields: tuple[str, ...] | None = Depends(task_fields),
+    db: Session = Depends(get_db),
+):
     """
     Получение информации о задаче по её идентификатору.
+    Ответ содержит заголовок ETag по версии строки задачи; при запросе с If-None-Match
+    актуальной версии возвращается 304.
+    С параметром fields задача читается без ORM-объекта (get_task_row) и выводятся только перечисленные поля.
     Args:
         task_id (int): Идентификатор задачи.
+        request (Request): Запрос с заголовками условного запроса.
+        response (Response): Ответ, в который добавляется заголовок ETag.
+        fields (tuple[str, ...] | None): Поля ответа из параметра fields (через запятую) или None - все поля.
         db (Session): Сессия базы данных SQLAlchemy.
     Returns:
         TaskSchema: Информация о задаче.
     """
+    if fields is not None:
+        db_task = get_task_row(db, task_id=task_id)
+
+        return projection_row_response(TaskSchema, fields, db_task, request, "Task not found")
+
     db_task = get_task(db, task_id=task_id)
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
+
+    etag = make_version_etag(db_task.version)
+
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    response.headers.update(cache_headers(etag))
     return db_task
 
 
-@router.put("/{task_id}", response_model=TaskSchema)
-def put_task(task_id: int, task: TaskUpdateSchema, db: Session = Depends(get_db)):
+@router.put("/{task_id}", response_model=TaskSchema, responses=VERSION_CONFLICT_RESPONSES)
+def put_task(
+    task_id: int, task: TaskUpdateSchema, request: Request, response: Response, db: Session = Depends(get_db)
+):
     """
     Обновление информации о задаче по её идентификатору.
+    Если передан заголовок If-Match, задача изменяется, только если ее версия совпадает с ETag из заголовка,
+    иначе возвращается 409. Если новая родительская задача образует цикл, возвращается 400.
+    Ответ содержит ETag новой версии задачи.
     Args:
         task_id (int): Идентификатор задачи.
         task (TaskUpdateSchema): Данные для обновления задачи.
+        request (Request): Запрос с заголовком If-Match.
+        response (Response): Ответ, в который добавляется заголовок ETag.
         db (Session): Сессия базы данных SQLAlchemy.
     Returns:
         TaskSchema: Обновленная информация о задаче.
     """
-    db_task = partial_update_task(db=db, task_id=task_id, task=task)
+    try:
+        db_task = partial_update_task(db=db, task_id=task_id, task=task, versions=if_match_versions(request))
+    except VersionConflictError as error:
+        raise HTTPException(status_code=409, detail=str(error))
+    except TaskHierarchyError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
+
+    response.headers["ETag"] = make_version_etag(db_task.version)
     return db_task
 
 
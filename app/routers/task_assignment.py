@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.crud.task_crud import assign_important_tasks
+from app.database import get_db
+from app.schemas.task_assignment_schemas import TaskAssignmentResultSchema
+
+router = APIRouter(
+    prefix="/tasks",
+    tags=["tasks"]
+)
+
+
+@router.post("/important/assign", response_model=TaskAssignmentResultSchema)
+def assign_important(dry_run: bool = False, db: Session = Depends(get_db)):
+    """
+    Назначение исполнителей всем важным задачам с учетом роста нагрузки сотрудников после каждого назначения.
+    Задача достается исполнителю родительской задачи, если его нагрузка не превышает (минимальная + 2),
+    иначе - наименее загруженному сотруднику. Все назначения применяются в одной транзакции.
+    Args:
+        dry_run (bool): Только рассчитать распределение, не изменяя задачи.
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        TaskAssignmentResultSchema: Назначения и их количество.
+    """
+    return assign_important_tasks(db, dry_run=dry_run)
@@ -0,0 +1,62 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.crud.task_crud import bulk_create_tasks, bulk_update_tasks, bulk_delete_tasks
+from app.database import get_db
+from app.schemas.bulk_schemas import BulkResultSchema, BulkDeleteSchema, validate_bulk_items, build_bulk_result
+from app.schemas.task_schemas import TaskCreateSchema, TaskBulkUpdateSchema
+
+router = APIRouter(
+    prefix="/tasks",
+    tags=["tasks"]
+)
+
+
+@router.post("/bulk", response_model=BulkResultSchema)
+def create_tasks_bulk(tasks: list[dict[str, Any]], db: Session = Depends(get_db)):
+    """
+    Пакетное создание задач.
+    Каждая задача проверяется по схеме TaskCreateSchema отдельно: задачи с ошибками не создаются,
+    остальные создаются в одной транзакции.
+    Args:
+        tasks (list[dict]): Данные для создания задач.
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        BulkResultSchema: Идентификаторы созданных задач и ошибки по каждой задаче.
+    """
+    valid, errors = validate_bulk_items(TaskCreateSchema, tasks)
+
+    return build_bulk_result(len(tasks), errors, bulk_create_tasks(db, valid))
+
+
+@router.patch("/bulk", response_model=BulkResultSchema)
+def update_tasks_bulk(tasks: list[dict[str, Any]], db: Session = Depends(get_db)):
+    """
+    Пакетное частичное обновление задач.
+    Каждая задача проверяется по схеме TaskBulkUpdateSchema (TaskUpdateSchema с полем id) отдельно,
+    обновляются только переданные поля.
+    Args:
+        tasks (list[dict]): Идентификаторы и данные для обновления задач.
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        BulkResultSchema: Идентификаторы обновленных задач и ошибки по каждой задаче.
+    """
+    valid, errors = validate_bulk_items(TaskBulkUpdateSchema, tasks)
+
+    return build_bulk_result(len(tasks), errors, bulk_update_tasks(db, valid))
+
+
+@router.delete("/bulk", response_model=BulkResultSchema)
+def delete_tasks_bulk(tasks: BulkDeleteSchema, db: Session = Depends(get_db)):
+    """
+    Пакетное удаление задач.
+    Задачи, от которых зависят задачи вне пакета, не удаляются.
+    Args:
+        tasks (BulkDeleteSchema): Идентификаторы удаляемых задач.
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        BulkResultSchema: Идентификаторы удаленных задач и ошибки по каждой задаче.
+    """
+    return build_bulk_result(len(tasks.ids), {}, bulk_delete_tasks(db, tasks.ids))
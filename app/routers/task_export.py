@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.crud.task_crud import iter_tasks
+from app.database import get_db
+from app.export import ExportFormat, export_response
+from app.schemas.task_schemas import TaskSchema
+
+router = APIRouter(
+    prefix="/tasks",
+    tags=["tasks"]
+)
+
+
+@router.get("/export")
+def export_tasks(
+        format: ExportFormat = "ndjson",
+        is_active: bool | None = None,
+        executor_id: int | None = None,
+        deadline_from: datetime | None = None,
+        deadline_to: datetime | None = None,
+        db: Session = Depends(get_db),
+):
+    """
+    Потоковая выгрузка задач в NDJSON или CSV.
+    Задачи читаются серверным курсором и отправляются по мере чтения, поэтому расход памяти
+    не зависит от количества задач. Сессия из get_db закрывается после отправки ответа.
+    Args:
+        format (ExportFormat): Формат выгрузки: ndjson или csv (по умолчанию ndjson).
+        is_active (bool | None): Выгрузить только активные или только неактивные задачи.
+        executor_id (int | None): Выгрузить задачи исполнителя.
+        deadline_from (datetime | None): Срок выполнения не раньше указанного.
+        deadline_to (datetime | None): Срок выполнения не позже указанного.
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        StreamingResponse: Выгрузка задач, упорядоченных по идентификатору.
+    """
+    rows = iter_tasks(
+        db,
+        is_active=is_active,
+        executor_id=executor_id,
+        deadline_from=deadline_from,
+        deadline_to=deadline_to,
+    )
+
+    return export_response(rows, list(TaskSchema.model_fields), format, "tasks")
@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.crud.task_graph import get_ancestors, get_descendants, get_subtree_summary
+from app.database import get_db
+from app.schemas.task_graph_schemas import TaskGraphNodeSchema, TaskSubtreeSchema
+from app.task_index import get_task_index
+from config import TASK_GRAPH_MAX_DEPTH
+
+router = APIRouter(
+    prefix="/tasks",
+    tags=["tasks"]
+)
+
+
+@router.get("/{task_id}/descendants", response_model=list[TaskGraphNodeSchema])
+def read_task_descendants(
+    task_id: int, max_depth: int = Query(TASK_GRAPH_MAX_DEPTH, ge=1, le=TASK_GRAPH_MAX_DEPTH),
+    db: Session = Depends(get_db)
+):
+    """
+    Получение всех потомков задачи по уровням.
+    Args:
+        task_id (int): Идентификатор задачи.
+        max_depth (int): Максимальная глубина потомков (не больше TASK_GRAPH_MAX_DEPTH).
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        list[TaskGraphNodeSchema]: Потомки задачи с глубиной относительно задачи.
+    """
+    descendants = get_descendants(db, task_id, max_depth)
+
+    if descendants is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return descendants
+
+
+@router.get("/{task_id}/ancestors", response_model=list[TaskGraphNodeSchema])
+def read_task_ancestors(
+    task_id: int, max_depth: int = Query(TASK_GRAPH_MAX_DEPTH, ge=1, le=TASK_GRAPH_MAX_DEPTH),
+    db: Session = Depends(get_db)
+):
+    """
+    Получение цепочки предков задачи от родительской задачи к корню.
+    Args:
+        task_id (int): Идентификатор задачи.
+        max_depth (int): Максимальное количество предков (не больше TASK_GRAPH_MAX_DEPTH).
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        list[TaskGraphNodeSchema]: Предки задачи с расстоянием до задачи.
+    """
+    ancestors = get_ancestors(db, task_id, max_depth)
+
+    if ancestors is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return ancestors
+
+
+@router.get("/{task_id}/subtree", response_model=TaskSubtreeSchema)
+def read_task_subtree(
+    task_id: int, max_depth: int = Query(TASK_GRAPH_MAX_DEPTH, ge=1, le=TASK_GRAPH_MAX_DEPTH),
+    db: Session = Depends(get_db)
+):
+    """
+    Получение сводки по поддереву задачи: количество задач, активных задач, ближайший срок и глубина.
+    Если включен индекс графа задач (TASK_GRAPH_INDEX), сводка считается по графу в памяти без запроса.
+    Args:
+        task_id (int): Идентификатор корня поддерева.
+        max_depth (int): Максимальная глубина потомков (не больше TASK_GRAPH_MAX_DEPTH).
+        db (Session): Сессия базы данных SQLAlchemy.
+    Returns:
+        TaskSubtreeSchema: Сводка по поддереву, включая саму задачу.
+    """
+    index = get_task_index()
+
+    if index is not None:
+        summary = index.subtree_summary(db, task_id, max_depth)
+    else:
+        summary = get_subtree_summary(db, task_id, max_depth)
+        summary = summary._mapping if summary is not None else None
+
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return TaskSubtreeSchema(task_id=task_id, **summary)
@@ -0,0 +1,92 @@
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class BulkItemResultSchema(BaseModel):
+    """
+    Схема данных результата пакетной операции для одного элемента.
+    Attributes:
+        index (int): Позиция элемента в запросе.
+        id (int | None): Идентификатор созданной, обновленной или удаленной записи или None при ошибке.
+        error (str | None): Описание ошибки или None, если операция выполнена.
+    """
+    index: int
+    id: int | None = None
+    error: str | None = None
+
+
+class BulkResultSchema(BaseModel):
+    """
+    Схема данных результата пакетной операции.
+    Attributes:
+        succeeded (int): Количество выполненных элементов.
+        failed (int): Количество элементов с ошибками.
+        items (list[BulkItemResultSchema]): Результаты по элементам в порядке запроса.
+    """
+    succeeded: int
+    failed: int
+    items: list[BulkItemResultSchema]
+
+
+class BulkDeleteSchema(BaseModel):
+    """
+    Схема данных для пакетного удаления.
+    Attributes:
+        ids (list[int]): Идентификаторы удаляемых записей.
+    """
+    ids: list[int]
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """
+    Краткое описание ошибки валидации элемента пакета.
+    Args:
+        error (ValidationError): Ошибка валидации Pydantic.
+    Returns:
+        str: Ошибки полей через "; " в виде "поле: сообщение".
+    """
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}" for detail in error.errors()
+    )
+
+
+def validate_bulk_items(schema: type[ModelT], items: list[Any]) -> tuple[list[tuple[int, ModelT]], dict[int, str]]:
+    """
+    Поэлементная валидация пакета, чтобы ошибка в одном элементе не отклоняла весь запрос.
+    Args:
+        schema (type[ModelT]): Схема элемента.
+        items (list[Any]): Элементы запроса.
+    Returns:
+        tuple[list[tuple[int, ModelT]], dict[int, str]]: Валидные элементы с их позициями
+            и ошибки валидации по позициям.
+    """
+    valid, errors = [], {}
+
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item)))
+        except ValidationError as error:
+            errors[index] = format_validation_error(error)
+
+    return valid, errors
+
+
+def build_bulk_result(size: int, errors: dict[int, str], results: list[tuple[int, int | None, str | None]]) -> dict:
+    """
+    Сборка ответа пакетной операции из ошибок валидации и результатов CRUD-функции.
+    Args:
+        size (int): Количество элементов в запросе.
+        errors (dict[int, str]): Ошибки валидации по позициям.
+        results (list[tuple[int, int | None, str | None]]): Позиция, идентификатор и ошибка для валидных элементов.
+    Returns:
+        dict: Данные для BulkResultSchema.
+    """
+    items = [{"index": index, "id": None, "error": error} for index, error in errors.items()]
+    items += [{"index": index, "id": item_id, "error": error} for index, item_id, error in results]
+    items.sort(key=lambda item: item["index"])
+    failed = sum(1 for item in items if item["error"] is not None)
+
+    return {"succeeded": size - failed, "failed": failed, "items": items}
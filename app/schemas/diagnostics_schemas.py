@@ -0,0 +1,146 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class HistogramSchema(BaseModel):
+    """
+    Схема данных гистограммы с накопительными счетчиками.
+    Attributes:
+        buckets (list[tuple[float | str, int]]): Пары (верхняя граница корзины, количество наблюдений не больше нее).
+            Последняя граница - "+Inf".
+        count (int): Количество наблюдений.
+        sum (float): Сумма наблюдений.
+    """
+    buckets: list[tuple[float | str, int]]
+    count: int
+    sum: float
+
+
+class PoolStatusSchema(BaseModel):
+    """
+    Схема данных для отображения состояния пула соединений.
+    Attributes:
+        pool_class (str): Класс пула.
+        size (int | None): Размер пула или None для пулов без очереди (NullPool, пулы SQLite).
+        checked_out (int | None): Количество выданных соединений.
+        checked_in (int | None): Количество свободных соединений в пуле.
+        overflow (int | None): Количество соединений сверх размера пула.
+        timeouts (int): Количество ожиданий соединения, завершившихся таймаутом.
+        checkout_wait (HistogramSchema): Гистограмма времени ожидания соединения в секундах.
+    """
+    pool_class: str
+    size: int | None = None
+    checked_out: int | None = None
+    checked_in: int | None = None
+    overflow: int | None = None
+    timeouts: int
+    checkout_wait: HistogramSchema
+
+
+class PoolsStatusSchema(BaseModel):
+    """
+    Схема данных для отображения состояния пулов соединений приложения.
+    Attributes:
+        sync_engine (PoolStatusSchema): Пул синхронного engine.
+        async_engine (PoolStatusSchema | None): Пул асинхронного engine или None в режиме sync
+            (асинхронный engine не создается).
+    """
+    sync_engine: PoolStatusSchema
+    async_engine: PoolStatusSchema | None = None
+
+
+class CacheStatusSchema(BaseModel):
+    """
+    Схема данных для отображения состояния кэша чтения задач и сотрудников.
+    Attributes:
+        backend (str): Хранилище кэша: "none", "memory" или "redis".
+        size (int | None): Количество записей или None, если хранилище его не сообщает (Redis).
+        hits (int): Количество найденных записей.
+        misses (int): Количество отсутствующих записей.
+        evictions (int): Количество записей, вытесненных из-за ограничения размера или истекшего времени жизни.
+        invalidations (int): Количество записей, удаленных при изменении данных.
+        errors (int): Количество ошибок обращения к хранилищу кэша.
+    """
+    backend: str
+    size: int | None = None
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    errors: int
+
+
+class TaskIndexStatusSchema(BaseModel):
+    """
+    Схема данных для отображения состояния индекса графа задач в памяти.
+    Attributes:
+        enabled (bool): Индекс включен (TASK_GRAPH_INDEX).
+        tasks (int): Количество задач в графе.
+        employees (int): Количество сотрудников в графе.
+        important_tasks (int): Количество важных задач.
+        version (int): Версия графа, увеличивается при каждом применении изменений.
+        pending (int): Количество измененных задач и сотрудников, еще не перечитанных из базы данных.
+        memory_bytes (int): Память, занимаемая графом, в байтах.
+        bytes_per_task (float): Память в расчете на одну задачу в байтах.
+        refreshed_tasks (int): Количество задач, перечитанных после изменения.
+        refreshed_employees (int): Количество сотрудников, перечитанных после изменения.
+        reloads (int): Количество полных перезагрузок графа после массовых изменений.
+        reconciliations (int): Количество сверок графа с базой данных.
+        failures (int): Количество фоновых сверок, завершившихся ошибкой.
+        last_drift (int): Количество расхождений с базой данных при последней сверке.
+        last_reconciled_at (datetime | None): Время последней сверки (UTC) или None.
+        last_load_seconds (float): Длительность последней загрузки графа в секундах.
+    """
+    enabled: bool
+    tasks: int = 0
+    employees: int = 0
+    important_tasks: int = 0
+    version: int = 0
+    pending: int = 0
+    memory_bytes: int = 0
+    bytes_per_task: float = 0.0
+    refreshed_tasks: int = 0
+    refreshed_employees: int = 0
+    reloads: int = 0
+    reconciliations: int = 0
+    failures: int = 0
+    last_drift: int = 0
+    last_reconciled_at: datetime | None = None
+    last_load_seconds: float = 0.0
+
+
+class SnapshotStatusSchema(BaseModel):
+    """
+    Схема данных для отображения состояния снимка отчета, пересчитываемого в фоне.
+    Attributes:
+        interval (float): Интервал пересчета в секундах.
+        computed_at (datetime | None): Время расчета последнего снимка (UTC) или None, если снимка еще нет.
+        age_seconds (float | None): Возраст последнего снимка в секундах.
+        last_compute_seconds (float | None): Длительность расчета последнего снимка в секундах.
+        runs (int): Количество выполненных расчетов.
+        failures (int): Количество расчетов, завершившихся ошибкой.
+        skipped (int): Количество пропущенных расчетов: предыдущий расчет еще выполнялся.
+        missed (int): Количество пропущенных запусков по расписанию: расчет длился дольше интервала.
+        compute_time (HistogramSchema): Гистограмма длительности расчетов в секундах.
+    """
+    interval: float
+    computed_at: datetime | None = None
+    age_seconds: float | None = None
+    last_compute_seconds: float | None = None
+    runs: int
+    failures: int
+    skipped: int
+    missed: int
+    compute_time: HistogramSchema
+
+
+class SnapshotsStatusSchema(BaseModel):
+    """
+    Схема данных для отображения состояния снимков отчетов.
+    Attributes:
+        enabled (bool): Снимки включены (ANALYTICS_SNAPSHOTS).
+        snapshots (dict[str, SnapshotStatusSchema]): Состояние снимков по названиям.
+    """
+    enabled: bool
+    snapshots: dict[str, SnapshotStatusSchema] = {}
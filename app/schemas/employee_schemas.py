@@ -1,6 +1,11 @@
+from typing import Literal
+
 from pydantic import BaseModel
 from app.schemas.task_schemas import TaskSchema
 
+# Ключи сортировки списка сотрудников.
+EmployeeOrderBy = Literal["id", "full_name", "task_count", "active_task_count"]
+
 
 class EmployeeBaseSchema(BaseModel):
     """
@@ -43,6 +48,15 @@ class EmployeeUpdateSchema(EmployeeBaseSchema):
     position: str | None = None
 
 
+class EmployeeBulkUpdateSchema(EmployeeUpdateSchema):
+    """
+    Схема данных для частичного обновления сотрудника в пакетном запросе.
+    Attributes:
+        id (int): Идентификатор обновляемого сотрудника.
+    """
+    id: int
+
+
 class EmployeeTasksSchema(EmployeeBaseSchema):
     """
     Схема данных для отображения информации о сотруднике вместе с его задачами.
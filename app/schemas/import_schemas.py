@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+
+
+class ImportErrorSchema(BaseModel):
+    """
+    Схема данных отклоненной строки файла импорта.
+    Attributes:
+        row (int): Номер строки файла (с 1, без заголовка CSV).
+        id (int | str | None): Идентификатор из строки или None, если его нет.
+        error (str): Причина отклонения.
+    """
+    row: int
+    id: int | str | None = None
+    error: str
+
+
+class ImportResultSchema(BaseModel):
+    """
+    Схема данных результата импорта.
+    Attributes:
+        received (int): Количество строк в файле.
+        imported (int): Количество добавленных и обновленных записей.
+        rejected (int): Количество отклоненных строк.
+        errors (list[ImportErrorSchema]): Отклоненные строки по порядку (не больше IMPORT_MAX_ERRORS).
+    """
+    received: int
+    imported: int
+    rejected: int
+    errors: list[ImportErrorSchema]
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class TaskAssignmentSchema(BaseModel):
+    """
+    Схема данных назначения исполнителя важной задаче.
+    Attributes:
+        task_id (int): Идентификатор задачи.
+        title (str): Название задачи.
+        deadline (datetime | None): Срок выполнения задачи или None.
+        employee_id (int): Идентификатор назначенного сотрудника.
+        full_name (str): ФИО назначенного сотрудника.
+        reason (str): Причина выбора: "parent_executor" (исполнитель родительской задачи)
+            или "least_loaded" (наименее загруженный сотрудник).
+    """
+    task_id: int
+    title: str
+    deadline: datetime | None = None
+    employee_id: int
+    full_name: str
+    reason: Literal["parent_executor", "least_loaded"]
+
+
+class TaskAssignmentResultSchema(BaseModel):
+    """
+    Схема данных результата назначения исполнителей важным задачам.
+    Attributes:
+        dry_run (bool): Распределение только рассчитано, задачи не изменены.
+        assigned (int): Количество назначенных задач.
+        unassigned (int): Количество задач, оставшихся без исполнителя (нет сотрудников).
+        assignments (list[TaskAssignmentSchema]): Назначения в порядке распределения.
+    """
+    dry_run: bool
+    assigned: int
+    unassigned: int
+    assignments: list[TaskAssignmentSchema]
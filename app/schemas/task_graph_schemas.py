@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.schemas.task_schemas import TaskSchema
+
+
+class TaskGraphNodeSchema(TaskSchema):
+    """
+    Схема данных задачи в иерархии относительно другой задачи.
+    Attributes:
+        depth (int): Расстояние до задачи, от которой строится обход (1 - дочерняя или родительская задача).
+    """
+    depth: int
+
+
+class TaskSubtreeSchema(BaseModel):
+    """
+    Схема данных сводки по поддереву задачи, включая саму задачу.
+    Attributes:
+        task_id (int): Идентификатор корня поддерева.
+        count (int): Количество задач.
+        active_count (int): Количество активных задач.
+        earliest_deadline (datetime | None): Ближайший срок выполнения или None, если сроков нет.
+        depth (int): Глубина поддерева (0 - у задачи нет дочерних задач).
+    """
+    task_id: int
+    count: int
+    active_count: int
+    earliest_deadline: datetime | None = None
+    depth: int
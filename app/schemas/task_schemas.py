@@ -1,9 +1,13 @@
 from datetime import datetime
+from typing import Literal
 
 import pytz
 from pydantic import BaseModel, field_validator
 from pydantic_core.core_schema import FieldValidationInfo
 
+# Ключи сортировки списка задач.
+TaskOrderBy = Literal["id", "deadline", "title"]
+
 
 class TaskBaseSchema(BaseModel):
     """
@@ -72,6 +76,36 @@ class TaskUpdateSchema(TaskCreateSchema):
     title: str | None = None
 
 
+class TaskBulkUpdateSchema(TaskUpdateSchema):
+    """
+    Схема данных для частичного обновления задачи в пакетном запросе.
+    Attributes:
+        id (int): Идентификатор обновляемой задачи.
+    """
+    id: int
+
+
+class TaskFilterSchema(BaseModel):
+    """
+    Фильтры списка задач (параметры запроса). Фильтры со значением None не применяются.
+    Attributes:
+        is_active (bool | None): Флаг активности задачи.
+        executor_id (int | None): Идентификатор исполнителя.
+        parent_task_id (int | None): Идентификатор родительской задачи.
+        has_children (bool | None): Только задачи, от которых зависят другие задачи (True), или только без них (False).
+        deadline_from (datetime | None): Срок выполнения не раньше указанного.
+        deadline_to (datetime | None): Срок выполнения не позже указанного.
+        search (str | None): Поиск по названию: каждое слово запроса должно быть началом слова названия.
+    """
+    is_active: bool | None = None
+    executor_id: int | None = None
+    parent_task_id: int | None = None
+    has_children: bool | None = None
+    deadline_from: datetime | None = None
+    deadline_to: datetime | None = None
+    search: str | None = None
+
+
 class ImportantTasksShowSchema(BaseModel):
     """
     Схема данных для отображения важных задач.
@@ -0,0 +1,309 @@
+from functools import lru_cache
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, get_args, get_origin
+
+from fastapi import HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy.orm import InstrumentedAttribute
+from typing_extensions import TypedDict
+
+from app.etag import cache_headers, is_not_modified, make_version_etag, not_modified_response
+from app.schemas.employee_schemas import EmployeeSchema, EmployeeTasksSchema
+from app.schemas.task_schemas import TaskSchema
+
+# Количество строк в одной части потокового ответа со списком.
+STREAM_BATCH_SIZE = 500
+
+
+def response_row_type(model: type[BaseModel]) -> type:
+    """
+    TypedDict с полями схемы ответа: описание строки, которую TypeAdapter сериализует без создания модели.
+    Вложенные списки моделей заменяются списками их TypedDict.
+    Args:
+        model (type[BaseModel]): Схема ответа.
+    Returns:
+        type: TypedDict с теми же полями и типами.
+    """
+    fields = {}
+
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        (item_type, *_) = get_args(annotation) or (None,)
+
+        if get_origin(annotation) is list and isinstance(item_type, type) and issubclass(item_type, BaseModel):
+            annotation = list[response_row_type(item_type)]
+
+        fields[name] = annotation
+
+    return TypedDict(f"{model.__name__}Row", fields)
+
+
+def response_columns(model: type[BaseModel], entity: type) -> list[InstrumentedAttribute]:
+    """
+    Колонки модели SQLAlchemy для полей схемы ответа в порядке полей схемы (в этом порядке поля попадут в JSON)
+    и колонка версии для ETag. Поля схемы, которые не являются колонками (связи), пропускаются.
+    Args:
+        model (type[BaseModel]): Схема ответа.
+        entity (type): Модель SQLAlchemy.
+    Returns:
+        list[InstrumentedAttribute]: Колонки для select().
+    """
+    columns = entity.__table__.columns
+
+    return [getattr(entity, name) for name in [*model.model_fields, "version"] if name in columns]
+
+
+class InvalidFieldsError(ValueError):
+    """Параметр fields пуст или содержит поля, которых нет в схеме ответа."""
+
+
+def parse_fields(model: type[BaseModel], fields: str) -> tuple[str, ...]:
+    """
+    Разбор параметра fields: имена полей схемы ответа через запятую.
+    Args:
+        model (type[BaseModel]): Схема ответа.
+        fields (str): Значение параметра.
+    Returns:
+        tuple[str, ...]: Имена полей без повторов в порядке полей схемы.
+    Raises:
+        InvalidFieldsError: Если поля не указаны или их нет в схеме.
+    """
+    names = {name.strip() for name in fields.split(",")} - {""}
+    unknown = names - model.model_fields.keys()
+
+    if not names:
+        raise InvalidFieldsError("Fields must not be empty")
+
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    return tuple(name for name in model.model_fields if name in names)
+
+
+def fields_query(model: type[BaseModel]):
+    """
+    Зависимость маршрута с параметром запроса fields для схемы ответа model.
+    Args:
+        model (type[BaseModel]): Схема ответа.
+    Returns:
+        Callable[[str | None], tuple[str, ...] | None]: Зависимость, возвращающая поля (parse_fields)
+            или None, если параметр не передан. Неизвестные поля - ответ 400.
+    """
+    # Асинхронная функция выполняется в цикле событий, без пула потоков, которым FastAPI вызывает синхронные.
+    async def dependency(
+        fields: str | None = Query(None, description=f"Поля {model.__name__} через запятую, например id,title"),
+    ) -> tuple[str, ...] | None:
+        if fields is None:
+            return None
+
+        try:
+            return parse_fields(model, fields)
+        except InvalidFieldsError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+
+    return dependency
+
+
+def projection_columns(entity: type, fields: tuple[str, ...], *required: str) -> list[InstrumentedAttribute]:
+    """
+    Колонки выборки части полей: поля ответа в порядке схемы, затем колонки, нужные обработчику
+    (например, id и ключ сортировки для курсора), и версия для ETag.
+    Args:
+        entity (type): Модель SQLAlchemy.
+        fields (tuple[str, ...]): Поля ответа (parse_fields).
+        *required (str): Дополнительные колонки; в ответ не попадают, если их нет в fields.
+    Returns:
+        list[InstrumentedAttribute]: Колонки для select().
+    """
+    return [getattr(entity, name) for name in dict.fromkeys([*fields, *required, "version"])]
+
+
+@lru_cache(maxsize=None)
+def projection_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """
+    Схема ответа с частью полей model. Строится один раз для каждого набора полей: fields упорядочены
+    parse_fields, поэтому наборов не больше, чем подмножеств полей схемы.
+    Args:
+        model (type[BaseModel]): Схема ответа.
+        fields (tuple[str, ...]): Поля (parse_fields).
+    Returns:
+        type[BaseModel]: Схема с полями fields.
+    """
+    return create_model(
+        f"{model.__name__}[{','.join(fields)}]",
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields},
+    )
+
+
+class RowsJSONResponse(JSONResponse):
+    """
+    JSON-ответ со списком строк (словарей с полями схемы ответа) или с одной строкой, сериализуемый
+    TypeAdapter.dump_json за один проход: без проверки строк по схеме ответа и без jsonable_encoder,
+    которые FastAPI выполняет для каждой строки при возврате ORM-объектов. Ключи строк, которых нет в схеме
+    (например, version), не выводятся.
+    Обработчик возвращает ответ сам, поэтому response_model маршрута используется только в документации.
+    """
+    adapter: TypeAdapter = TypeAdapter(list[dict[str, Any]])
+
+    def render(self, content: Any) -> bytes:
+        return self.adapter.dump_json(content)
+
+    @classmethod
+    def stream(
+        cls, rows: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]], headers: dict[str, str] | None = None
+    ) -> StreamingResponse:
+        """
+        Потоковый ответ с JSON-массивом строк, кодируемых частями по мере чтения (encode_json_array).
+        Тело совпадает с телом ответа cls для тех же строк.
+        Args:
+            rows (Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]]): Строки, например из курсора базы данных.
+            headers (dict[str, str] | None): Заголовки ответа.
+        Returns:
+            StreamingResponse: Ответ, отправляющий массив частями по STREAM_BATCH_SIZE строк.
+        """
+        if isinstance(rows, AsyncIterable):
+            content = aencode_json_array(rows, cls.adapter)
+        else:
+            content = encode_json_array(rows, cls.adapter)
+
+        return StreamingResponse(content, media_type=cls.media_type, headers=headers)
+
+
+def encode_json_batch(batch: list[dict[str, Any]], adapter: TypeAdapter, first: bool) -> bytes:
+    """
+    Часть JSON-массива: элементы batch без скобок массива, после первой части - с запятой в начале.
+    Args:
+        batch (list[dict[str, Any]]): Строки.
+        adapter (TypeAdapter): Адаптер списка строк.
+        first (bool): Первая часть массива (начинается с "[").
+    Returns:
+        bytes: Часть массива.
+    """
+    return (b"[" if first else b",") + adapter.dump_json(batch)[1:-1]
+
+
+def encode_json_array(
+    rows: Iterable[dict[str, Any]], adapter: TypeAdapter, batch_size: int = STREAM_BATCH_SIZE
+) -> Iterator[bytes]:
+    """
+    Кодирование строк в JSON-массив частями: в памяти одновременно не больше batch_size строк.
+    Args:
+        rows (Iterable[dict[str, Any]]): Строки.
+        adapter (TypeAdapter): Адаптер списка строк (RowsJSONResponse.adapter).
+        batch_size (int): Количество строк в одной части.
+    Yields:
+        bytes: Часть массива.
+    """
+    batch = []
+    first = True
+
+    for row in rows:
+        batch.append(row)
+
+        if len(batch) >= batch_size:
+            yield encode_json_batch(batch, adapter, first)
+            batch.clear()
+            first = False
+
+    if batch:
+        yield encode_json_batch(batch, adapter, first) + b"]"
+    else:
+        yield b"[]" if first else b"]"
+
+
+async def aencode_json_array(
+    rows: AsyncIterable[dict[str, Any]], adapter: TypeAdapter, batch_size: int = STREAM_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Кодирование строк асинхронного итератора в JSON-массив частями (см. encode_json_array).
+    Args:
+        rows (AsyncIterable[dict[str, Any]]): Строки.
+        adapter (TypeAdapter): Адаптер списка строк (RowsJSONResponse.adapter).
+        batch_size (int): Количество строк в одной части.
+    Yields:
+        bytes: Часть массива.
+    """
+    batch = []
+    first = True
+
+    async for row in rows:
+        batch.append(row)
+
+        if len(batch) >= batch_size:
+            yield encode_json_batch(batch, adapter, first)
+            batch.clear()
+            first = False
+
+    if batch:
+        yield encode_json_batch(batch, adapter, first) + b"]"
+    else:
+        yield b"[]" if first else b"]"
+
+
+def rows_response_class(model: type[BaseModel], many: bool = True) -> type[RowsJSONResponse]:
+    """
+    Класс ответа со списком строк (или одной строкой) схемы model с заранее построенным TypeAdapter.
+    Args:
+        model (type[BaseModel]): Схема элемента списка.
+        many (bool): Ответ со списком строк (по умолчанию) или с одной строкой.
+    Returns:
+        type[RowsJSONResponse]: Подкласс RowsJSONResponse.
+    """
+    row_type = response_row_type(model)
+    adapter = TypeAdapter(list[row_type] if many else row_type)
+
+    return type(f"{model.__name__}RowsResponse", (RowsJSONResponse,), {"adapter": adapter})
+
+
+@lru_cache(maxsize=None)
+def projection_response_class(
+    model: type[BaseModel], fields: tuple[str, ...], many: bool = True
+) -> type[RowsJSONResponse]:
+    """
+    Класс ответа с полями fields схемы model (projection_model), один на набор полей.
+    Args:
+        model (type[BaseModel]): Схема ответа.
+        fields (tuple[str, ...]): Поля (parse_fields).
+        many (bool): Ответ со списком строк (по умолчанию) или с одной строкой.
+    Returns:
+        type[RowsJSONResponse]: Подкласс RowsJSONResponse.
+    """
+    return rows_response_class(projection_model(model, fields), many)
+
+
+def projection_row_response(
+    model: type[BaseModel], fields: tuple[str, ...], row: dict[str, Any] | None, request: Request, not_found: str
+) -> Response:
+    """
+    Ответ с полями fields одной строки (например, задачи по идентификатору) с ETag по версии строки.
+    Args:
+        model (type[BaseModel]): Схема ответа.
+        fields (tuple[str, ...]): Поля (parse_fields).
+        row (dict[str, Any] | None): Значения колонок, включая version, или None, если строки нет.
+        request (Request): Запрос с заголовками условного запроса.
+        not_found (str): Сообщение ответа 404.
+    Returns:
+        Response: Ответ с полями строки или 304, если у клиента актуальная версия.
+    Raises:
+        HTTPException: 404, если строки нет.
+    """
+    if row is None:
+        raise HTTPException(status_code=404, detail=not_found)
+
+    etag = make_version_etag(row["version"])
+
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    return projection_response_class(model, fields, many=False)(row, headers=cache_headers(etag))
+
+
+# Ответы списков задач, сотрудников и сотрудников с задачами (task_crud.get_task_rows,
+# employee_crud.get_employee_rows, employee_crud.get_employees_tasks_rows).
+TaskRowsResponse = rows_response_class(TaskSchema)
+EmployeeRowsResponse = rows_response_class(EmployeeSchema)
+EmployeeTasksRowsResponse = rows_response_class(EmployeeTasksSchema)
+
+# Параметр fields маршрутов задач и сотрудников.
+task_fields = fields_query(TaskSchema)
+employee_fields = fields_query(EmployeeSchema)
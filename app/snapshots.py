@@ -0,0 +1,305 @@
+import logging
+import threading
+from datetime import datetime, timezone
+from time import monotonic, perf_counter
+from typing import Any, Callable, NamedTuple
+
+from sqlalchemy.orm import Session
+
+import config
+from app.crud.employee_crud import get_employees_tasks_rows
+from app.crud.task_crud import get_important_tasks
+from app.etag import make_etag
+from app.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+# Границы корзин гистограммы времени расчета снимков, в секундах.
+SNAPSHOT_COMPUTE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+# Названия снимков.
+IMPORTANT_TASKS = "important_tasks"
+EMPLOYEE_WORKLOAD = "employee_workload"
+
+
+class Snapshot(NamedTuple):
+    """
+    Результат отчета, рассчитанный в фоне.
+    Attributes:
+        value (Any): Результат.
+        etag (str): ETag результата.
+        last_modified (datetime): Время изменения результата (UTC): не меняется, если пересчет дал тот же результат.
+        computed_at (datetime): Время расчета (UTC).
+        compute_seconds (float): Длительность расчета в секундах.
+    """
+    value: Any
+    etag: str
+    last_modified: datetime
+    computed_at: datetime
+    compute_seconds: float
+
+    def age(self) -> float:
+        """
+        Возраст снимка.
+        Returns:
+            float: Время с момента расчета в секундах.
+        """
+        return (datetime.now(timezone.utc) - self.computed_at).total_seconds()
+
+
+class SnapshotJob:
+    """
+    Отчет, периодически пересчитываемый в фоне, и его последний снимок.
+    Расчеты одного отчета не выполняются одновременно: вызов run во время расчета пропускается.
+    Attributes:
+        name (str): Название снимка.
+        compute (Callable[[Session], Any]): Функция расчета отчета.
+        interval (float): Интервал пересчета в секундах.
+        runs (int): Количество выполненных расчетов.
+        failures (int): Количество расчетов, завершившихся ошибкой.
+        skipped (int): Количество пропущенных вызовов run: предыдущий расчет еще выполнялся.
+        missed (int): Количество пропущенных запусков по расписанию: расчет длился дольше интервала.
+        compute_time (Histogram): Гистограмма длительности расчетов в секундах.
+    """
+
+    def __init__(self, name: str, compute: Callable[[Session], Any], interval: float):
+        self.name = name
+        self.compute = compute
+        self.interval = interval
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.missed = 0
+        self.compute_time = Histogram(SNAPSHOT_COMPUTE_BUCKETS)
+        self._snapshot: Snapshot | None = None
+        self._running = threading.Lock()
+
+    @property
+    def snapshot(self) -> Snapshot | None:
+        return self._snapshot
+
+    def run(self, session_factory: Callable[[], Session]) -> Snapshot | None:
+        """
+        Расчет нового снимка в отдельной сессии базы данных.
+        Args:
+            session_factory (Callable[[], Session]): Фабрика сессий базы данных.
+        Returns:
+            Snapshot | None: Новый снимок или None, если расчет пропущен из-за уже выполняющегося расчета.
+        Raises:
+            Exception: Ошибка функции расчета; предыдущий снимок сохраняется.
+        """
+        if not self._running.acquire(blocking=False):
+            self.skipped += 1
+            return None
+
+        try:
+            started = perf_counter()
+
+            try:
+                with session_factory() as db:
+                    value = self.compute(db)
+            except Exception:
+                self.failures += 1
+                raise
+
+            seconds = perf_counter() - started
+            self.compute_time.observe(seconds)
+            self.runs += 1
+
+            now, etag, previous = datetime.now(timezone.utc), make_etag(value), self._snapshot
+            last_modified = previous.last_modified if previous and previous.etag == etag else now
+            self._snapshot = Snapshot(value, etag, last_modified, now, seconds)
+
+            return self._snapshot
+        finally:
+            self._running.release()
+
+    def status(self) -> dict:
+        """
+        Состояние снимка для диагностики.
+        Returns:
+            dict: Интервал, возраст и длительность расчета последнего снимка, счетчики расчетов
+                и гистограмма их длительности.
+        """
+        snapshot = self._snapshot
+
+        return {
+            "interval": self.interval,
+            "computed_at": snapshot.computed_at if snapshot else None,
+            "age_seconds": snapshot.age() if snapshot else None,
+            "last_compute_seconds": snapshot.compute_seconds if snapshot else None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "missed": self.missed,
+            "compute_time": self.compute_time.snapshot(),
+        }
+
+
+class SnapshotScheduler:
+    """
+    Фоновые потоки пересчета снимков, по одному на отчет. Расчеты запускаются с постоянным шагом interval
+    от запуска планировщика; если расчет длится дольше шага, пропущенные запуски не догоняются,
+    а учитываются в счетчике missed. Ошибки расчета записываются в журнал.
+    Attributes:
+        jobs (dict[str, SnapshotJob]): Отчеты по названиям снимков.
+        session_factory (Callable[[], Session]): Фабрика сессий базы данных.
+    """
+
+    def __init__(self, jobs: list[SnapshotJob], session_factory: Callable[[], Session]):
+        self.jobs = {job.name: job for job in jobs}
+        self.session_factory = session_factory
+        self._stopped = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._run, args=(job,), name=f"snapshot-{job.name}", daemon=True) for job in jobs
+        ]
+
+    def _run(self, job: SnapshotJob) -> None:
+        next_run = monotonic()
+
+        while True:
+            try:
+                job.run(self.session_factory)
+            except Exception:  # noqa: BLE001 - расчет повторится через interval, до него отдается прежний снимок
+                logger.exception("Snapshot %s computation failed", job.name)
+
+            now = monotonic()
+            next_run += job.interval
+
+            if now > next_run:
+                missed = int((now - next_run) // job.interval) + 1
+                job.missed += missed
+                next_run += missed * job.interval
+
+            if self._stopped.wait(next_run - now):
+                return
+
+    def start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+        for thread in self._threads:
+            thread.join()
+
+
+def create_snapshot_jobs() -> list[SnapshotJob]:
+    """
+    Отчеты, пересчитываемые в фоне: важные задачи (get_important_tasks) и первые WORKLOAD_SNAPSHOT_SIZE
+    сотрудников рейтинга нагрузки (get_employees_tasks_rows).
+    Returns:
+        list[SnapshotJob]: Отчеты с интервалами из настроек.
+    """
+    return [
+        SnapshotJob(IMPORTANT_TASKS, get_important_tasks, config.IMPORTANT_TASKS_SNAPSHOT_INTERVAL),
+        SnapshotJob(
+            EMPLOYEE_WORKLOAD,
+            lambda db: get_employees_tasks_rows(db, limit=config.WORKLOAD_SNAPSHOT_SIZE),
+            config.WORKLOAD_SNAPSHOT_INTERVAL,
+        ),
+    ]
+
+
+_scheduler: SnapshotScheduler | None = None
+
+
+def get_snapshot_scheduler() -> SnapshotScheduler | None:
+    """
+    Текущий планировщик снимков.
+    Returns:
+        SnapshotScheduler | None: Планировщик или None, если снимки выключены (ANALYTICS_SNAPSHOTS).
+    """
+    return _scheduler
+
+
+def set_snapshot_scheduler(scheduler: SnapshotScheduler | None) -> SnapshotScheduler | None:
+    """
+    Замена планировщика снимков, например, в тестах. Потоки планировщиков не запускаются и не останавливаются.
+    Args:
+        scheduler (SnapshotScheduler | None): Новый планировщик или None, чтобы выключить снимки.
+    Returns:
+        SnapshotScheduler | None: Предыдущий планировщик.
+    """
+    global _scheduler
+    previous, _scheduler = _scheduler, scheduler
+
+    return previous
+
+
+def start_snapshots(session_factory: Callable[[], Session]) -> SnapshotScheduler:
+    """
+    Запуск фонового пересчета снимков при запуске приложения. Первые снимки рассчитываются сразу в фоне,
+    до их появления эндпоинты считают отчеты по запросу.
+    Args:
+        session_factory (Callable[[], Session]): Фабрика сессий базы данных.
+    Returns:
+        SnapshotScheduler: Запущенный планировщик.
+    """
+    scheduler = SnapshotScheduler(create_snapshot_jobs(), session_factory)
+    set_snapshot_scheduler(scheduler)
+    scheduler.start()
+
+    return scheduler
+
+
+def stop_snapshots() -> None:
+    """
+    Остановка фонового пересчета и выключение снимков.
+    Returns:
+        None
+    """
+    scheduler = set_snapshot_scheduler(None)
+
+    if scheduler is not None:
+        scheduler.stop()
+
+
+def get_snapshot(name: str) -> Snapshot | None:
+    """
+    Последний снимок отчета.
+    Args:
+        name (str): Название снимка.
+    Returns:
+        Snapshot | None: Снимок или None, если снимки выключены или снимок еще не рассчитан.
+    """
+    scheduler = _scheduler
+    job = scheduler.jobs.get(name) if scheduler is not None else None
+
+    return job.snapshot if job is not None else None
+
+
+def get_workload_page(skip: int, limit: int) -> tuple[list[dict[str, Any]], Snapshot] | None:
+    """
+    Страница рейтинга нагрузки сотрудников (как get_employees_tasks_rows) из снимка.
+    Args:
+        skip (int): Количество пропускаемых сотрудников.
+        limit (int): Количество сотрудников на странице.
+    Returns:
+        tuple[list[dict[str, Any]], Snapshot] | None: Строки страницы и снимок или None, если снимка нет
+            или страница выходит за первые WORKLOAD_SNAPSHOT_SIZE сотрудников рейтинга.
+    """
+    snapshot = get_snapshot(EMPLOYEE_WORKLOAD)
+
+    if snapshot is None:
+        return None
+
+    rows = snapshot.value
+
+    # Снимок короче WORKLOAD_SNAPSHOT_SIZE содержит весь рейтинг, иначе за его пределами могут быть сотрудники.
+    if skip + limit > len(rows) and len(rows) >= config.WORKLOAD_SNAPSHOT_SIZE:
+        return None
+
+    return rows[skip:skip + limit], snapshot
+
+
+def snapshot_headers(snapshot: Snapshot | None) -> dict[str, str]:
+    """
+    Заголовок Age ответа из снимка: возраст снимка в целых секундах.
+    Args:
+        snapshot (Snapshot | None): Снимок или None, если ответ рассчитан по запросу.
+    Returns:
+        dict[str, str]: Заголовок или пустой словарь.
+    """
+    return {"Age": str(int(snapshot.age()))} if snapshot is not None else {}
@@ -0,0 +1,861 @@
+import logging
+import math
+import sys
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import Callable, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import config
+from app.cache import MemoEntry, add_invalidation_listener, remove_invalidation_listener
+from app.crud.bulk import chunked
+from app.etag import make_etag
+from app.models.employee import Employee
+from app.models.task import Task
+
+logger = logging.getLogger(__name__)
+
+# Отсутствующая ссылка (родительская задача, исполнитель, дочерняя или соседняя задача).
+NO_ID = -1
+# Отсутствующий срок выполнения.
+NO_DEADLINE = -(2 ** 63)
+# Флаги задачи.
+EXISTS = 1
+ACTIVE = 2
+
+# Сроки выполнения хранятся целым числом микросекунд от EPOCH.
+EPOCH = datetime(1970, 1, 1)
+
+# Количество строк, читаемых за один раз при загрузке графа.
+LOAD_CHUNK_SIZE = 10000
+
+
+def to_microseconds(value: datetime | None) -> int:
+    return NO_DEADLINE if value is None else (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_microseconds(value: int) -> datetime | None:
+    return None if value == NO_DEADLINE else EPOCH + timedelta(microseconds=value)
+
+
+def _grow(values: array, size: int, fill: int) -> None:
+    if len(values) < size:
+        values.extend(array(values.typecode, [fill]) * (size - len(values)))
+
+
+class TaskGraph:
+    """
+    Граф задач и нагрузка сотрудников в компактных массивах, индексированных идентификатором.
+    Дочерние задачи хранятся двусвязным списком (first_child, next_sibling, prev_sibling), поэтому
+    смена родительской задачи выполняется за O(1). Для каждого сотрудника хранятся счетчики всех
+    и активных задач, сотрудники сгруппированы по количеству задач (load_buckets), а родительские
+    задачи без исполнителя (важные задачи) - в множестве important.
+    Не потокобезопасен, доступ синхронизирует TaskGraphIndex.
+    Attributes:
+        size (int): Наибольший идентификатор задачи + 1.
+        task_count (int): Количество задач.
+        employee_count (int): Количество сотрудников.
+        important (set[int]): Идентификаторы родительских задач без исполнителя.
+        load_buckets (dict[int, set[int]]): Идентификаторы сотрудников по количеству задач.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.task_count = 0
+        self.parent = array("i")
+        self.first_child = array("i")
+        self.next_sibling = array("i")
+        self.prev_sibling = array("i")
+        self.executor = array("i")
+        self.deadline = array("q")
+        self.flags = bytearray()
+        self.titles: list[str | None] = []
+
+        self.employee_count = 0
+        self.employee_names: list[str | None] = []
+        self.employee_tasks = array("i")
+        self.employee_active_tasks = array("i")
+        self.load_buckets: dict[int, set[int]] = {}
+        self.important: set[int] = set()
+
+    @classmethod
+    def build(cls, employees: Iterable[tuple], tasks: Iterable[tuple]) -> "TaskGraph":
+        """
+        Построение графа по всем строкам таблиц. Массивы заполняются за один проход по задачам
+        без пересчета нагрузки и важных задач на каждой строке, поэтому это быстрее, чем set_task для каждой задачи.
+        Args:
+            employees (Iterable[tuple]): Строки (id, full_name) всех сотрудников.
+            tasks (Iterable[tuple]): Строки всех задач в порядке аргументов set_task.
+        Returns:
+            TaskGraph: Граф задач.
+        """
+        graph = cls()
+
+        for employee_id, full_name in employees:
+            graph._reserve_employees(employee_id)
+            graph.employee_names[employee_id] = full_name
+            graph.employee_count += 1
+
+        parent, first_child, next_sibling, prev_sibling = (
+            graph.parent, graph.first_child, graph.next_sibling, graph.prev_sibling
+        )
+        executor, deadlines, flags, titles = graph.executor, graph.deadline, graph.flags, graph.titles
+        employee_tasks, employee_active_tasks = graph.employee_tasks, graph.employee_active_tasks
+
+        for task_id, parent_task_id, executor_id, deadline, is_active, title in tasks:
+            graph._reserve_tasks(max(task_id, parent_task_id or 0))
+            flags[task_id] = EXISTS | (ACTIVE if is_active else 0)
+            titles[task_id] = title
+            graph.task_count += 1
+
+            if deadline is not None:
+                deadlines[task_id] = to_microseconds(deadline)
+
+            if executor_id is not None:
+                graph._reserve_employees(executor_id)
+                executor[task_id] = executor_id
+                employee_tasks[executor_id] += 1
+
+                if is_active:
+                    employee_active_tasks[executor_id] += 1
+
+            if parent_task_id is not None:
+                parent[task_id] = parent_task_id
+                head = first_child[parent_task_id]
+                next_sibling[task_id] = head
+
+                if head != NO_ID:
+                    prev_sibling[head] = task_id
+
+                first_child[parent_task_id] = task_id
+
+        graph.size = len(flags)
+
+        for employee_id, full_name in enumerate(graph.employee_names):
+            if full_name is not None:
+                graph.load_buckets.setdefault(employee_tasks[employee_id], set()).add(employee_id)
+
+        graph.important = {
+            task_id for task_id in range(graph.size)
+            if first_child[task_id] != NO_ID and executor[task_id] == NO_ID and flags[task_id] & EXISTS
+        }
+
+        return graph
+
+    def _reserve_tasks(self, task_id: int) -> None:
+        if task_id < len(self.flags):
+            return
+
+        # Массивы растут с запасом, чтобы вставка новых задач была амортизированно O(1).
+        size = max(task_id + 1, len(self.flags) * 3 // 2)
+
+        for values in (self.parent, self.first_child, self.next_sibling, self.prev_sibling, self.executor):
+            _grow(values, size, NO_ID)
+
+        _grow(self.deadline, size, NO_DEADLINE)
+        self.flags.extend(bytes(size - len(self.flags)))
+        self.titles.extend([None] * (size - len(self.titles)))
+
+    def _reserve_employees(self, employee_id: int) -> None:
+        if employee_id < len(self.employee_names):
+            return
+
+        size = max(employee_id + 1, len(self.employee_names) * 3 // 2)
+        _grow(self.employee_tasks, size, 0)
+        _grow(self.employee_active_tasks, size, 0)
+        self.employee_names.extend([None] * (size - len(self.employee_names)))
+
+    def _move_load(self, employee_id: int, tasks: int, active_tasks: int) -> None:
+        self._reserve_employees(employee_id)
+        exists = self.employee_names[employee_id] is not None
+
+        if exists:
+            self._remove_from_bucket(employee_id)
+
+        self.employee_tasks[employee_id] += tasks
+        self.employee_active_tasks[employee_id] += active_tasks
+
+        if exists:
+            self.load_buckets.setdefault(self.employee_tasks[employee_id], set()).add(employee_id)
+
+    def _remove_from_bucket(self, employee_id: int) -> None:
+        count = self.employee_tasks[employee_id]
+        bucket = self.load_buckets[count]
+        bucket.discard(employee_id)
+
+        if not bucket:
+            del self.load_buckets[count]
+
+    def _refresh_important(self, task_id: int) -> None:
+        if task_id == NO_ID or task_id >= len(self.flags):
+            return
+
+        if self.flags[task_id] & EXISTS and self.executor[task_id] == NO_ID and self.first_child[task_id] != NO_ID:
+            self.important.add(task_id)
+        else:
+            self.important.discard(task_id)
+
+    def _link(self, task_id: int, parent_id: int) -> None:
+        self._reserve_tasks(parent_id)
+        head = self.first_child[parent_id]
+        self.prev_sibling[task_id] = NO_ID
+        self.next_sibling[task_id] = head
+
+        if head != NO_ID:
+            self.prev_sibling[head] = task_id
+
+        self.first_child[parent_id] = task_id
+
+    def _unlink(self, task_id: int, parent_id: int) -> None:
+        prev_id, next_id = self.prev_sibling[task_id], self.next_sibling[task_id]
+
+        if prev_id != NO_ID:
+            self.next_sibling[prev_id] = next_id
+        else:
+            self.first_child[parent_id] = next_id
+
+        if next_id != NO_ID:
+            self.prev_sibling[next_id] = prev_id
+
+        self.prev_sibling[task_id] = self.next_sibling[task_id] = NO_ID
+
+    def remove_task(self, task_id: int) -> None:
+        """
+        Удаление задачи из графа.
+        Args:
+            task_id (int): Идентификатор задачи.
+        Returns:
+            None
+        """
+        if task_id >= len(self.flags) or not self.flags[task_id] & EXISTS:
+            return
+
+        parent_id, executor_id = self.parent[task_id], self.executor[task_id]
+
+        if parent_id != NO_ID:
+            self._unlink(task_id, parent_id)
+
+        if executor_id != NO_ID:
+            self._move_load(executor_id, -1, -1 if self.flags[task_id] & ACTIVE else 0)
+
+        self.parent[task_id] = self.executor[task_id] = NO_ID
+        self.deadline[task_id] = NO_DEADLINE
+        self.flags[task_id] = 0
+        self.titles[task_id] = None
+        self.task_count -= 1
+        self.important.discard(task_id)
+        self._refresh_important(parent_id)
+
+    def set_task(
+        self,
+        task_id: int,
+        parent_task_id: int | None,
+        executor_id: int | None,
+        deadline: datetime | None,
+        is_active: bool | None,
+        title: str,
+    ) -> None:
+        """
+        Добавление задачи в граф или замена ее значений.
+        Args:
+            task_id (int): Идентификатор задачи.
+            parent_task_id (int | None): Идентификатор родительской задачи или None.
+            executor_id (int | None): Идентификатор исполнителя или None.
+            deadline (datetime | None): Срок выполнения или None.
+            is_active (bool | None): Флаг активности задачи.
+            title (str): Название задачи.
+        Returns:
+            None
+        """
+        self.remove_task(task_id)
+        self._reserve_tasks(task_id)
+        parent_id = NO_ID if parent_task_id is None else parent_task_id
+
+        self.parent[task_id] = parent_id
+        self.executor[task_id] = NO_ID if executor_id is None else executor_id
+        self.deadline[task_id] = to_microseconds(deadline)
+        self.flags[task_id] = EXISTS | (ACTIVE if is_active else 0)
+        self.titles[task_id] = title
+        self.task_count += 1
+        self.size = max(self.size, task_id + 1)
+
+        if parent_id != NO_ID:
+            self._link(task_id, parent_id)
+
+        if executor_id is not None:
+            self._move_load(executor_id, 1, 1 if is_active else 0)
+
+        self._refresh_important(task_id)
+        self._refresh_important(parent_id)
+
+    def remove_employee(self, employee_id: int) -> None:
+        """
+        Удаление сотрудника из графа. Счетчики его задач сохраняются до обновления самих задач.
+        Args:
+            employee_id (int): Идентификатор сотрудника.
+        Returns:
+            None
+        """
+        if employee_id >= len(self.employee_names) or self.employee_names[employee_id] is None:
+            return
+
+        self._remove_from_bucket(employee_id)
+        self.employee_names[employee_id] = None
+        self.employee_count -= 1
+
+    def set_employee(self, employee_id: int, full_name: str) -> None:
+        """
+        Добавление сотрудника в граф или замена его ФИО.
+        Args:
+            employee_id (int): Идентификатор сотрудника.
+            full_name (str): ФИО сотрудника.
+        Returns:
+            None
+        """
+        self.remove_employee(employee_id)
+        self._reserve_employees(employee_id)
+        self.employee_names[employee_id] = full_name
+        self.employee_count += 1
+        self.load_buckets.setdefault(self.employee_tasks[employee_id], set()).add(employee_id)
+
+    def important_tasks(self) -> list[dict]:
+        """
+        Важные задачи по правилам task_crud.get_important_tasks.
+        Returns:
+            List[dict]: Список словарей с ключами 'title', 'deadline' и 'employees' в порядке идентификаторов задач.
+        """
+        min_tasks_count = min(self.load_buckets, default=0)
+        min_loaded_employees = [
+            self.employee_names[employee_id] for employee_id in sorted(self.load_buckets.get(min_tasks_count, ()))
+        ]
+        parent, executor, deadlines, titles = self.parent, self.executor, self.deadline, self.titles
+        names, employee_tasks = self.employee_names, self.employee_tasks
+        max_tasks_count = min_tasks_count + 2
+        important_tasks = []
+
+        for task_id in sorted(self.important):
+            employees = min_loaded_employees
+            parent_id = parent[task_id]
+
+            if parent_id != NO_ID:
+                executor_id = executor[parent_id]
+
+                # Исполнитель родительской задачи подходит, если его нагрузка не больше минимальной + 2.
+                if (
+                    executor_id != NO_ID
+                    and names[executor_id] is not None
+                    and employee_tasks[executor_id] <= max_tasks_count
+                ):
+                    employees = [names[executor_id]]
+
+            deadline = deadlines[task_id]
+            important_tasks.append({
+                'title': titles[task_id],
+                'deadline': None if deadline == NO_DEADLINE else EPOCH + timedelta(microseconds=deadline),
+                'employees': employees,
+            })
+
+        return important_tasks
+
+    def subtree_summary(self, task_id: int, max_depth: int) -> dict | None:
+        """
+        Сводка по поддереву задачи обходом по уровням, как у task_graph.get_subtree_summary.
+        Args:
+            task_id (int): Идентификатор корня поддерева.
+            max_depth (int): Максимальная глубина потомков.
+        Returns:
+            dict | None: Ключи 'count', 'active_count', 'earliest_deadline' и 'depth' или None, если задачи нет.
+        """
+        if task_id >= len(self.flags) or not self.flags[task_id] & EXISTS:
+            return None
+
+        flags, deadlines, first_child, next_sibling = self.flags, self.deadline, self.first_child, self.next_sibling
+        count = active_count = depth = 0
+        earliest = NO_DEADLINE
+        level = [task_id]
+
+        while True:
+            children = []
+
+            for node in level:
+                count += 1
+
+                if flags[node] & ACTIVE:
+                    active_count += 1
+
+                deadline = deadlines[node]
+
+                if deadline != NO_DEADLINE and (earliest == NO_DEADLINE or deadline < earliest):
+                    earliest = deadline
+
+                child = first_child[node]
+
+                while child != NO_ID:
+                    children.append(child)
+                    child = next_sibling[child]
+
+            if not children or depth >= max_depth:
+                break
+
+            level = children
+            depth += 1
+
+        return {
+            "count": count,
+            "active_count": active_count,
+            "earliest_deadline": from_microseconds(earliest),
+            "depth": depth,
+        }
+
+    def task_row(self, task_id: int) -> tuple:
+        """
+        Значения задачи в графе для сравнения графов.
+        Args:
+            task_id (int): Идентификатор задачи.
+        Returns:
+            tuple: Флаги, родительская задача, исполнитель, срок и название.
+        """
+        if task_id >= len(self.flags):
+            return 0, NO_ID, NO_ID, NO_DEADLINE, None
+
+        return (
+            self.flags[task_id],
+            self.parent[task_id],
+            self.executor[task_id],
+            self.deadline[task_id],
+            self.titles[task_id],
+        )
+
+    def count_differences(self, other: "TaskGraph") -> int:
+        """
+        Количество задач и сотрудников, значения которых в графах различаются.
+        Args:
+            other (TaskGraph): Граф для сравнения.
+        Returns:
+            int: Количество различий.
+        """
+        size = max(self.size, other.size)
+        columns = ("flags", "parent", "executor", "deadline", "titles")
+
+        # Построчное сравнение нужно, только если различаются сами массивы.
+        if self.size == other.size and all(
+            getattr(self, column)[:size] == getattr(other, column)[:size] for column in columns
+        ):
+            differences = 0
+        else:
+            differences = sum(self.task_row(task_id) != other.task_row(task_id) for task_id in range(size))
+
+        employees = max(len(self.employee_names), len(other.employee_names))
+
+        def employee(graph: TaskGraph, employee_id: int) -> str | None:
+            return graph.employee_names[employee_id] if employee_id < len(graph.employee_names) else None
+
+        return differences + sum(employee(self, i) != employee(other, i) for i in range(employees))
+
+    def memory_usage(self) -> dict:
+        """
+        Память, занимаемая графом: массивы, названия задач и ФИО сотрудников, служебные множества.
+        Returns:
+            dict: Размеры в байтах по ключам 'arrays', 'titles', 'employees', 'indexes' и 'total'.
+        """
+        arrays = sum(
+            values.buffer_info()[1] * values.itemsize
+            for values in (
+                self.parent, self.first_child, self.next_sibling, self.prev_sibling, self.executor, self.deadline,
+                self.employee_tasks, self.employee_active_tasks,
+            )
+        ) + sys.getsizeof(self.flags)
+        titles = sys.getsizeof(self.titles) + sum(sys.getsizeof(title) for title in self.titles if title is not None)
+        employees = sys.getsizeof(self.employee_names) + sum(
+            sys.getsizeof(name) for name in self.employee_names if name is not None
+        )
+        indexes = sys.getsizeof(self.important) + sum(
+            sys.getsizeof(bucket) for bucket in self.load_buckets.values()
+        ) + sys.getsizeof(self.load_buckets)
+
+        return {
+            "arrays": arrays,
+            "titles": titles,
+            "employees": employees,
+            "indexes": indexes,
+            "total": arrays + titles + employees + indexes,
+        }
+
+
+def load_task_graph(db: Session, chunk_size: int = LOAD_CHUNK_SIZE) -> TaskGraph:
+    """
+    Построение графа задач по таблицам tasks и employees.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        chunk_size (int): Количество строк, читаемых за один раз.
+    Returns:
+        TaskGraph: Граф задач.
+    """
+    employees = db.execute(
+        select(Employee.id, Employee.full_name).order_by(Employee.id).execution_options(yield_per=chunk_size)
+    )
+    tasks = db.execute(select_task_rows().order_by(Task.id).execution_options(yield_per=chunk_size))
+
+    return TaskGraph.build(employees, tasks)
+
+
+def select_task_rows():
+    """
+    Запрос колонок задач, хранимых в графе, в порядке аргументов TaskGraph.set_task.
+    Returns:
+        Select: Запрос задач.
+    """
+    return select(Task.id, Task.parent_task_id, Task.executor_id, Task.deadline, Task.is_active, Task.title)
+
+
+class TaskGraphIndexStats:
+    """
+    Счетчики индекса графа задач.
+    Attributes:
+        refreshed_tasks (int): Количество задач, перечитанных после изменения.
+        refreshed_employees (int): Количество сотрудников, перечитанных после изменения.
+        reloads (int): Количество полных перезагрузок графа после массовых изменений (импорт).
+        reconciliations (int): Количество сверок графа с базой данных.
+        failures (int): Количество фоновых сверок, завершившихся ошибкой.
+        last_drift (int): Количество расхождений графа с базой данных при последней сверке.
+        last_reconciled_at (datetime | None): Время последней сверки (UTC).
+        last_load_seconds (float): Длительность последней загрузки графа в секундах.
+    """
+
+    def __init__(self):
+        self.refreshed_tasks = 0
+        self.refreshed_employees = 0
+        self.reloads = 0
+        self.reconciliations = 0
+        self.failures = 0
+        self.last_drift = 0
+        self.last_reconciled_at: datetime | None = None
+        self.last_load_seconds = 0.0
+
+
+class TaskGraphIndex:
+    """
+    Граф задач в памяти процесса, поддерживаемый в актуальном состоянии.
+
+    Граф загружается один раз (load), после чего CRUD-функции сообщают об измененных задачах и сотрудниках
+    через invalidate (app.cache): их идентификаторы запоминаются, а строки перечитываются одним запросом
+    перед следующим чтением графа (sync). После invalidate_all (импорт) граф загружается заново.
+    Изменения в обход CRUD-функций и в других процессах приложения учитываются при периодической
+    сверке с базой данных (reconcile).
+    Attributes:
+        stats (TaskGraphIndexStats): Счетчики индекса.
+        version (int): Номер версии графа, увеличивается при каждом применении изменений.
+    """
+
+    def __init__(self, graph: TaskGraph | None = None):
+        self.stats = TaskGraphIndexStats()
+        self.version = 0
+        self._graph = graph or TaskGraph()
+        self._lock = threading.RLock()
+        self._pending: dict[type, set[int]] = {Task: set(), Employee: set()}
+        self._reload = False
+        # Изменения, сделанные во время сверки: после замены графа они применяются к новому графу.
+        self._tracked: dict[type, set[int]] | None = None
+        self._important: MemoEntry | None = None
+
+    def load(self, db: Session) -> None:
+        """
+        Загрузка графа из базы данных с заменой текущего.
+        Args:
+            db (Session): Сессия базы данных SQLAlchemy.
+        Returns:
+            None
+        """
+        with self._lock:
+            self._replace(db)
+
+    def _replace(self, db: Session) -> TaskGraph:
+        started = perf_counter()
+        graph = load_task_graph(db)
+
+        with self._lock:
+            previous, self._graph = self._graph, graph
+            self._reload = False
+            self.version += 1
+            self.stats.last_load_seconds = perf_counter() - started
+
+        return previous
+
+    def mark_changed(self, model: type, object_ids: list[int] | None) -> None:
+        """
+        Отметка измененных задач или сотрудников (слушатель invalidate и invalidate_all).
+        Args:
+            model (type): Модель Task или Employee.
+            object_ids (list[int] | None): Идентификаторы или None, если изменены все записи модели.
+        Returns:
+            None
+        """
+        if model not in self._pending:
+            return
+
+        with self._lock:
+            if object_ids is None:
+                self._reload = True
+            else:
+                self._pending[model].update(object_ids)
+
+            if self._tracked is not None:
+                if object_ids is None:
+                    self._tracked[model].add(NO_ID)
+                else:
+                    self._tracked[model].update(object_ids)
+
+    def sync(self, db: Session) -> TaskGraph:
+        """
+        Применение отмеченных изменений: перечитываются только измененные задачи и сотрудники.
+        Args:
+            db (Session): Сессия базы данных SQLAlchemy.
+        Returns:
+            TaskGraph: Актуальный граф. Читать его можно только под блокировкой индекса.
+        """
+        with self._lock:
+            if self._reload:
+                self.stats.reloads += 1
+                self._pending = {Task: set(), Employee: set()}
+                self._replace(db)
+                return self._graph
+
+            employee_ids, task_ids = self._pending[Employee], self._pending[Task]
+
+            if not employee_ids and not task_ids:
+                return self._graph
+
+            self._pending = {Task: set(), Employee: set()}
+            graph = self._graph
+
+            # Сотрудники обновляются раньше задач, чтобы новые задачи попали к уже известным исполнителям.
+            for chunk in chunked(sorted(employee_ids)):
+                names = dict(db.execute(select(Employee.id, Employee.full_name).where(Employee.id.in_(chunk))).all())
+
+                for employee_id in chunk:
+                    if employee_id in names:
+                        graph.set_employee(employee_id, names[employee_id])
+                    else:
+                        graph.remove_employee(employee_id)
+
+            for chunk in chunked(sorted(task_ids)):
+                rows = {row.id: row for row in db.execute(select_task_rows().where(Task.id.in_(chunk)))}
+
+                for task_id in chunk:
+                    if task_id in rows:
+                        graph.set_task(*rows[task_id])
+                    else:
+                        graph.remove_task(task_id)
+
+            self.stats.refreshed_employees += len(employee_ids)
+            self.stats.refreshed_tasks += len(task_ids)
+            self.version += 1
+
+            return graph
+
+    def reconcile(self, session_factory: Callable[[], Session]) -> int:
+        """
+        Сверка с базой данных: граф загружается заново без блокировки чтения и заменяет текущий.
+        Изменения, отмеченные во время загрузки, применяются к новому графу при следующем чтении.
+        Args:
+            session_factory (Callable[[], Session]): Фабрика сессий базы данных.
+        Returns:
+            int: Количество задач и сотрудников, расходившихся с базой данных.
+        """
+        with self._lock:
+            self._tracked = {Task: set(), Employee: set()}
+
+        try:
+            started = perf_counter()
+
+            with session_factory() as db:
+                graph = load_task_graph(db)
+
+            with self._lock:
+                previous, self._graph = self._graph, graph
+                tracked = self._tracked
+
+                for model, object_ids in tracked.items():
+                    if NO_ID in object_ids:
+                        self._reload = True
+
+                    self._pending[model].update(object_ids - {NO_ID})
+
+                self.version += 1
+                self.stats.last_load_seconds = perf_counter() - started
+        finally:
+            with self._lock:
+                self._tracked = None
+
+        # Расхождения считаются вне блокировки: старый граф больше не изменяется.
+        drift = previous.count_differences(graph)
+        self.stats.reconciliations += 1
+        self.stats.last_drift = drift
+        self.stats.last_reconciled_at = datetime.now(timezone.utc)
+
+        return drift
+
+    def important_tasks(self, db: Session) -> MemoEntry:
+        """
+        Важные задачи по графу. Результат пересчитывается только после изменения графа.
+        Args:
+            db (Session): Сессия базы данных SQLAlchemy для применения отмеченных изменений.
+        Returns:
+            MemoEntry: Список важных задач (value) с ETag и временем изменения.
+        """
+        with self._lock:
+            graph = self.sync(db)
+            entry = self._important
+
+            if entry is not None and entry.versions == (self.version,):
+                return entry
+
+            value = graph.important_tasks()
+            etag = make_etag(value)
+            last_modified = entry.last_modified if entry and entry.etag == etag else datetime.now(timezone.utc)
+            self._important = MemoEntry(value, (self.version,), etag, last_modified, math.inf)
+
+            return self._important
+
+    def subtree_summary(self, db: Session, task_id: int, max_depth: int) -> dict | None:
+        """
+        Сводка по поддереву задачи по графу.
+        Args:
+            db (Session): Сессия базы данных SQLAlchemy для применения отмеченных изменений.
+            task_id (int): Идентификатор корня поддерева.
+            max_depth (int): Максимальная глубина потомков.
+        Returns:
+            dict | None: Сводка по поддереву или None, если задачи нет.
+        """
+        with self._lock:
+            return self.sync(db).subtree_summary(task_id, max_depth)
+
+    def status(self) -> dict:
+        """
+        Состояние индекса: размер графа, занимаемая память и счетчики.
+        Returns:
+            dict: Состояние индекса.
+        """
+        with self._lock:
+            graph = self._graph
+            memory = graph.memory_usage()
+
+            return {
+                "tasks": graph.task_count,
+                "employees": graph.employee_count,
+                "important_tasks": len(graph.important),
+                "version": self.version,
+                "pending": sum(len(object_ids) for object_ids in self._pending.values()),
+                "memory_bytes": memory["total"],
+                "bytes_per_task": memory["total"] / graph.task_count if graph.task_count else 0.0,
+                **vars(self.stats),
+            }
+
+
+class TaskGraphReconciler:
+    """
+    Фоновый поток периодической сверки индекса графа задач с базой данных.
+    Attributes:
+        index (TaskGraphIndex): Индекс графа задач.
+        session_factory (Callable[[], Session]): Фабрика сессий базы данных.
+        interval (float): Интервал сверки в секундах.
+    """
+
+    def __init__(self, index: TaskGraphIndex, session_factory: Callable[[], Session], interval: float):
+        self.index = index
+        self.session_factory = session_factory
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="task-graph-reconciler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.index.reconcile(self.session_factory)
+            except Exception:  # noqa: BLE001 - сверка повторится через interval
+                self.index.stats.failures += 1
+                logger.exception("Task graph reconciliation failed")
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+
+_index: TaskGraphIndex | None = None
+_reconciler: TaskGraphReconciler | None = None
+
+
+def get_task_index() -> TaskGraphIndex | None:
+    """
+    Текущий индекс графа задач.
+    Returns:
+        TaskGraphIndex | None: Индекс или None, если индекс выключен (TASK_GRAPH_INDEX).
+    """
+    return _index
+
+
+def set_task_index(index: TaskGraphIndex | None) -> TaskGraphIndex | None:
+    """
+    Замена индекса графа задач, например, в тестах и бенчмарках. Индекс подписывается на изменения
+    данных через invalidate, предыдущий индекс отписывается.
+    Args:
+        index (TaskGraphIndex | None): Новый индекс или None, чтобы выключить индекс.
+    Returns:
+        TaskGraphIndex | None: Предыдущий индекс.
+    """
+    global _index
+    previous, _index = _index, index
+
+    if previous is not None:
+        remove_invalidation_listener(previous.mark_changed)
+
+    if index is not None:
+        add_invalidation_listener(index.mark_changed)
+
+    return previous
+
+
+def start_task_index(
+    session_factory: Callable[[], Session], interval: float = config.TASK_GRAPH_RECONCILE_INTERVAL
+) -> TaskGraphIndex:
+    """
+    Загрузка индекса графа задач при запуске приложения и запуск периодической сверки.
+    Args:
+        session_factory (Callable[[], Session]): Фабрика сессий базы данных.
+        interval (float): Интервал сверки в секундах (по умолчанию TASK_GRAPH_RECONCILE_INTERVAL).
+    Returns:
+        TaskGraphIndex: Загруженный индекс.
+    """
+    global _reconciler
+    index = TaskGraphIndex()
+    set_task_index(index)
+
+    with session_factory() as db:
+        index.load(db)
+
+    _reconciler = TaskGraphReconciler(index, session_factory, interval)
+    _reconciler.start()
+
+    return index
+
+
+def stop_task_index() -> None:
+    """
+    Остановка периодической сверки и выключение индекса графа задач.
+    Returns:
+        None
+    """
+    global _reconciler
+
+    if _reconciler is not None:
+        _reconciler.stop()
+        _reconciler = None
+
+    set_task_index(None)
@@ -0,0 +1,98 @@
+import argparse
+from collections import Counter
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.crud.task_crud import assign_important_tasks, get_important_tasks, select_assignable_tasks
+from app.models.employee import Employee
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import count_queries, create_benchmark_engine, measure, reset_schema
+
+
+def plan_by_snapshot(tasks: list, loads: dict[int, int]) -> dict[int, int]:
+    """
+    Распределение по подсказкам списка важных задач: каждая задача достается исполнителю родительской задачи
+    или наименее загруженному сотруднику по нагрузке на момент запроса, без учета уже сделанных назначений.
+    Используется как точка сравнения для plan_assignments.
+    Args:
+        tasks (list): Задачи с полем parent_executor_id.
+        loads (dict[int, int]): Нагрузка сотрудников на момент запроса.
+    Returns:
+        dict[int, int]: Нагрузка сотрудников после назначения.
+    """
+    min_load = min(loads.values())
+    least_loaded = min(employee_id for employee_id, load in loads.items() if load == min_load)
+    added = Counter(
+        task.parent_executor_id
+        if task.parent_executor_id is not None and loads[task.parent_executor_id] <= min_load + 2
+        else least_loaded
+        for task in tasks
+    )
+
+    return {employee_id: load + added[employee_id] for employee_id, load in loads.items()}
+
+
+def spread(loads) -> str:
+    loads = list(loads)
+    return f"{min(loads)}..{max(loads)}"
+
+
+def run(tasks_count: int, employees_count: int, rounds: int) -> None:
+    """
+    Время и число запросов расчета (dry_run) и применения назначений всем важным задачам,
+    а также разброс нагрузки сотрудников до и после назначения в сравнении с подсказками списка важных задач.
+    Args:
+        tasks_count (int): Количество задач.
+        employees_count (int): Количество сотрудников.
+        rounds (int): Количество повторов расчета.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        employees = generate_employees(employees_count)
+        tasks = generate_task_forest(tasks_count, [employee["id"] for employee in employees], assigned_ratio=0.5)
+        seed_database(db, employees, tasks)
+
+        def loads() -> dict[int, int]:
+            return dict(db.execute(select(Employee.id, Employee.task_count)).all())
+
+        before = loads()
+        assignable = db.execute(select_assignable_tasks()).all()
+        print(f"tasks: {tasks_count}, employees: {employees_count}, important tasks: {len(assignable)}")
+        print(f"{'operation':>18} {'queries':>8} {'median, ms':>11}")
+
+        for name, operation, count in [
+            ("important list", lambda: get_important_tasks(db), rounds),
+            ("plan (dry run)", lambda: assign_important_tasks(db, dry_run=True), rounds),
+            ("apply", lambda: assign_important_tasks(db), 1),
+        ]:
+            with count_queries(engine) as counter:
+                timing = measure(operation, count)
+            print(f"{name:>18} {counter.count // count:>8} {timing['median'] * 1000:>11.1f}")
+
+        after = loads()
+        remaining = db.scalar(select(func.count()).select_from(select_assignable_tasks().subquery()))
+
+        print(f"unassigned important tasks after apply: {remaining}")
+        print(f"{'loads':>18} {'min..max':>12}")
+        print(f"{'before':>18} {spread(before.values()):>12}")
+        print(f"{'snapshot hints':>18} {spread(plan_by_snapshot(assignable, before).values()):>12}")
+        print(f"{'batch assignment':>18} {spread(after.values()):>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк назначения исполнителей важным задачам.")
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--employees", type=int, default=5_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.tasks, args.employees, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+from typing import Awaitable, Callable
+
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import get_async_database_url, get_async_db, get_db
+from app.routers import employee, employee_async, task, task_async
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import BENCHMARK_DATABASE_URL, create_benchmark_engine, reset_schema, run_asgi_load
+
+# Одинаковый размер пула для обоих режимов, чтобы сравнивать обработку запросов, а не пулы.
+# В синхронном режиме сессия закрывается в том же пуле потоков Starlette (40 потоков), что и обработчики:
+# при большом числе клиентов все потоки ждут соединение, а вернуть соединения в пул некому.
+# Такие запросы завершаются по таймауту пула и учитываются как ошибки.
+POOL_OPTIONS = {"pool_size": 50, "max_overflow": 0, "pool_timeout": 10}
+
+
+def build_app(mode: str) -> tuple[FastAPI, Callable[[], Awaitable[None]]]:
+    """
+    Сборка приложения с синхронными или асинхронными роутерами поверх базы данных бенчмарков.
+    Args:
+        mode (str): Режим "sync" или "async".
+    Returns:
+        tuple[FastAPI, Callable[[], Awaitable[None]]]: Приложение и корутина закрытия пула соединений.
+    """
+    bench_app = FastAPI()
+
+    if mode == "async":
+        async_engine = create_async_engine(get_async_database_url(BENCHMARK_DATABASE_URL), **POOL_OPTIONS)
+        session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with session_factory() as db:
+                yield db
+
+        bench_app.include_router(employee_async.router)
+        bench_app.include_router(task_async.router)
+        bench_app.dependency_overrides[get_async_db] = override_get_async_db
+
+        return bench_app, async_engine.dispose
+    else:
+        engine = create_engine(BENCHMARK_DATABASE_URL, **POOL_OPTIONS)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def override_get_db():
+            with session_factory() as db:
+                yield db
+
+        bench_app.include_router(employee.router)
+        bench_app.include_router(task.router)
+        bench_app.dependency_overrides[get_db] = override_get_db
+
+        async def dispose():
+            engine.dispose()
+
+        return bench_app, dispose
+
+
+async def run_load(mode: str, paths: list[str], concurrency: int, total_requests: int) -> dict:
+    """
+    Нагрузка приложения запросами от concurrency одновременных клиентов внутри процесса.
+    Args:
+        mode (str): Режим "sync" или "async".
+        paths (list[str]): Пути, запрашиваемые по кругу.
+        concurrency (int): Количество одновременных клиентов.
+        total_requests (int): Общее количество запросов.
+    Returns:
+        dict: Сводка по задержкам и пропускной способности.
+    """
+    bench_app, dispose = build_app(mode)
+
+    try:
+        return await run_asgi_load(bench_app, paths, concurrency, total_requests)
+    finally:
+        await dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение синхронного и асинхронного режимов под нагрузкой.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--employees", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        employees = generate_employees(args.employees)
+        tasks = generate_task_forest(args.tasks, [employee["id"] for employee in employees])
+        seed_database(db, employees, tasks)
+
+    paths = ["/tasks/?limit=50", "/tasks/1", "/employees/1", "/employees/?limit=50"]
+
+    print(f"{'mode':>6} {'clients':>8} {'p50, ms':>9} {'p99, ms':>9} {'rps':>9} {'errors':>7}")
+
+    for concurrency in args.concurrency:
+        for mode in ("sync", "async"):
+            result = asyncio.run(run_load(mode, paths, concurrency, max(args.requests, concurrency)))
+            print(
+                f"{mode:>6} {concurrency:>8} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} "
+                f"{result['rps']:>9.1f} {result['errors']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+from time import perf_counter
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.main import app
+from benchmarks.data import generate_employees, seed_database
+from benchmarks.utils import count_queries, create_benchmark_engine, reset_schema, use_benchmark_database
+
+
+def make_tasks(count: int, employees_count: int) -> list[dict]:
+    return [
+        {"title": f"Task {number}", "executor_id": number % employees_count + 1, "is_active": number % 2 == 0}
+        for number in range(count)
+    ]
+
+
+def run(single_count: int, bulk_count: int, batch_size: int, employees_count: int) -> None:
+    """
+    Сравнение скорости создания, обновления и удаления задач по одной и пакетами, в строках в секунду,
+    и количества запросов к базе данных на строку.
+    Args:
+        single_count (int): Количество задач для операций по одной.
+        bulk_count (int): Количество задач для пакетных операций.
+        batch_size (int): Количество задач в одном пакетном запросе.
+        employees_count (int): Количество сотрудников.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        seed_database(db, generate_employees(employees_count), [])
+
+    use_benchmark_database(app, engine)
+    client = TestClient(app)
+
+    def report(operation, mode, count, started, counter):
+        print(
+            f"{operation:>8} {mode:>7} {count:>8} {count / (perf_counter() - started):>12.0f} "
+            f"{counter.count / count:>12.3f}"
+        )
+
+    print(f"{'op':>8} {'mode':>7} {'rows':>8} {'rows/sec':>12} {'queries/row':>12}")
+
+    with count_queries(engine) as counter:
+        started = perf_counter()
+        tasks = make_tasks(single_count, employees_count)
+        single_ids = [client.post("/tasks/", json=task).json()["id"] for task in tasks]
+        report("create", "single", single_count, started, counter)
+
+    with count_queries(engine) as counter:
+        started = perf_counter()
+        for task_id in single_ids:
+            client.put(f"/tasks/{task_id}", json={"title": f"Updated {task_id}"})
+        report("update", "single", single_count, started, counter)
+
+    with count_queries(engine) as counter:
+        started = perf_counter()
+        for task_id in single_ids:
+            client.delete(f"/tasks/{task_id}")
+        report("delete", "single", single_count, started, counter)
+
+    tasks = make_tasks(bulk_count, employees_count)
+    bulk_ids = []
+
+    with count_queries(engine) as counter:
+        started = perf_counter()
+        for start in range(0, bulk_count, batch_size):
+            items = client.post("/tasks/bulk", json=tasks[start:start + batch_size]).json()["items"]
+            bulk_ids.extend(item["id"] for item in items)
+        report("create", "bulk", bulk_count, started, counter)
+
+    with count_queries(engine) as counter:
+        started = perf_counter()
+        for start in range(0, bulk_count, batch_size):
+            batch = bulk_ids[start:start + batch_size]
+            client.patch("/tasks/bulk", json=[{"id": task_id, "title": f"Updated {task_id}"} for task_id in batch])
+        report("update", "bulk", bulk_count, started, counter)
+
+    with count_queries(engine) as counter:
+        started = perf_counter()
+        for start in range(0, bulk_count, batch_size):
+            client.request("DELETE", "/tasks/bulk", json={"ids": bulk_ids[start:start + batch_size]})
+        report("delete", "bulk", bulk_count, started, counter)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк пакетных операций с задачами.")
+    parser.add_argument("--single", type=int, default=1000)
+    parser.add_argument("--bulk", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--employees", type=int, default=100)
+    args = parser.parse_args()
+
+    run(args.single, args.bulk, args.batch_size, args.employees)
+
+
+if __name__ == "__main__":
+    main()
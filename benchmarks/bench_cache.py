@@ -0,0 +1,159 @@
+import argparse
+import asyncio
+import random
+from time import perf_counter
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.orm import Session
+
+from app.cache import MemoryCache, NullCache, RedisCache, set_cache
+from app.routers import employee, task
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import (
+    count_queries,
+    create_benchmark_engine,
+    reset_schema,
+    summarize_latencies,
+    use_benchmark_database,
+)
+
+
+def generate_requests(
+    count: int, task_ids: list[int], employee_ids: list[int], write_ratio: float, hot_ratio: float, seed: int = 0
+) -> list[tuple[str, str]]:
+    """
+    Генерация запросов с преобладанием чтения: 90% чтений приходится на hot_ratio самых популярных записей.
+    Args:
+        count (int): Количество запросов.
+        task_ids (list[int]): Идентификаторы задач.
+        employee_ids (list[int]): Идентификаторы сотрудников.
+        write_ratio (float): Доля запросов изменения задачи.
+        hot_ratio (float): Доля популярных записей.
+        seed (int): Зерно генератора случайных чисел.
+    Returns:
+        list[tuple[str, str]]: Пары (метод, путь).
+    """
+    rnd = random.Random(seed)
+
+    def pick(ids: list[int]) -> int:
+        hot = ids[:max(int(len(ids) * hot_ratio), 1)]
+        return rnd.choice(hot if rnd.random() < 0.9 else ids)
+
+    requests = []
+
+    for _ in range(count):
+        if rnd.random() < write_ratio:
+            requests.append(("PUT", f"/tasks/{pick(task_ids)}"))
+        elif rnd.random() < 0.7:
+            requests.append(("GET", f"/tasks/{pick(task_ids)}"))
+        else:
+            requests.append(("GET", f"/employees/{pick(employee_ids)}"))
+
+    return requests
+
+
+async def send_requests(bench_app: FastAPI, requests: list[tuple[str, str]]) -> tuple[list[float], float]:
+    """
+    Последовательная отправка запросов приложению внутри процесса.
+    Args:
+        bench_app (FastAPI): Приложение.
+        requests (list[tuple[str, str]]): Пары (метод, путь).
+    Returns:
+        tuple[list[float], float]: Задержки запросов и общая длительность в секундах.
+    """
+    latencies = []
+    transport = httpx.ASGITransport(app=bench_app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = perf_counter()
+
+        for index, (method, path) in enumerate(requests):
+            request_started = perf_counter()
+            body = {"title": f"Updated {index}"} if method == "PUT" else None
+            response = await client.request(method, path, json=body)
+            latencies.append(perf_counter() - request_started)
+            assert response.status_code == 200, response.text
+
+        elapsed = perf_counter() - started
+
+    return latencies, elapsed
+
+
+def run(
+    tasks_count: int,
+    employees_count: int,
+    requests_count: int,
+    write_ratio: float,
+    hot_ratio: float,
+    redis_url: str | None,
+) -> None:
+    """
+    Сравнение задержек и пропускной способности чтения задач и сотрудников по идентификатору без кэша и с кэшем.
+    Args:
+        tasks_count (int): Количество задач.
+        employees_count (int): Количество сотрудников.
+        requests_count (int): Количество запросов на каждый вариант кэша.
+        write_ratio (float): Доля запросов изменения задачи.
+        hot_ratio (float): Доля популярных записей.
+        redis_url (str | None): URL Redis для варианта с Redis или None, чтобы его пропустить.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        employees = generate_employees(employees_count)
+        tasks = generate_task_forest(tasks_count, [employee["id"] for employee in employees])
+        seed_database(db, employees, tasks)
+
+    bench_app = FastAPI()
+    bench_app.include_router(employee.router)
+    bench_app.include_router(task.router)
+    use_benchmark_database(bench_app, engine)
+
+    requests = generate_requests(
+        requests_count, [row["id"] for row in tasks], [row["id"] for row in employees], write_ratio, hot_ratio
+    )
+    backends = [("none", NullCache), ("memory", MemoryCache)]
+
+    if redis_url:
+        backends.append(("redis", lambda: RedisCache(url=redis_url)))
+
+    print(f"{'cache':>8} {'rps':>9} {'p50, ms':>8} {'p95, ms':>8} {'p99, ms':>8} {'queries/req':>12} {'hit rate':>9}")
+
+    for name, factory in backends:
+        cache = factory()
+        cache.clear()
+        set_cache(cache)
+
+        with count_queries(engine) as counter:
+            latencies, elapsed = asyncio.run(send_requests(bench_app, requests))
+
+        summary = summarize_latencies(latencies, elapsed)
+        stats = cache.stats.snapshot()
+        lookups = stats["hits"] + stats["misses"]
+
+        print(
+            f"{name:>8} {summary['rps']:>9.0f} {summary['p50_ms']:>8.2f} {summary['p95_ms']:>8.2f} "
+            f"{summary['p99_ms']:>8.2f} {counter.count / len(requests):>12.2f} "
+            f"{stats['hits'] / lookups if lookups else 0:>9.1%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк чтения задач и сотрудников по идентификатору с кэшем.")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    parser.add_argument("--hot-ratio", type=float, default=0.05)
+    parser.add_argument("--redis-url", default=None, help="URL Redis, чтобы добавить вариант с Redis")
+    args = parser.parse_args()
+
+    run(args.tasks, args.employees, args.requests, args.write_ratio, args.hot_ratio, args.redis_url)
+
+
+if __name__ == "__main__":
+    main()
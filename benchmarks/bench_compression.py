@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import statistics
+from time import perf_counter
+
+from fastapi import FastAPI
+from sqlalchemy.orm import Session
+
+import config
+from app.compression import CompressionMiddleware
+from app.routers import task
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import create_benchmark_engine, reset_schema, use_benchmark_database
+
+
+async def fetch(bench_app, path: str, accept_encoding: str) -> tuple[float, float, int]:
+    """
+    Запрос GET напрямую через ASGI с замером времени до первого байта тела и до конца ответа.
+    Args:
+        bench_app: ASGI-приложение.
+        path (str): Путь с параметрами запроса.
+        accept_encoding (str): Значение заголовка Accept-Encoding.
+    Returns:
+        tuple[float, float, int]: Время до первого байта тела и до конца ответа в секундах, размер тела в байтах.
+    """
+    url_path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": url_path,
+        "raw_path": url_path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", accept_encoding.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    first_byte = None
+    size = 0
+    requested = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        # После тела запроса, как у сервера, receive ожидает отключения клиента (его ждет StreamingResponse).
+        nonlocal requested
+
+        if requested:
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal first_byte, size
+
+        if message["type"] == "http.response.body" and message.get("body"):
+            if first_byte is None:
+                first_byte = perf_counter()
+
+            size += len(message["body"])
+
+    started = perf_counter()
+    await bench_app(scope, receive, send)
+    finished = perf_counter()
+    disconnected.set()
+
+    return first_byte - started, finished - started, size
+
+
+def run(tasks_count: int, employees_count: int, limit: int, rounds: int) -> None:
+    """
+    Время до первого байта, полное время и объем тела большой страницы списка задач: ответ целиком
+    и потоком (LIST_STREAM_THRESHOLD), без сжатия и с gzip.
+    Args:
+        tasks_count (int): Количество задач.
+        employees_count (int): Количество сотрудников.
+        limit (int): Размер страницы.
+        rounds (int): Количество повторов каждого замера.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        employees = generate_employees(employees_count)
+        tasks = generate_task_forest(tasks_count, [employee["id"] for employee in employees])
+        seed_database(db, employees, tasks)
+
+    bench_app = FastAPI()
+    bench_app.include_router(task.router)
+    bench_app.add_middleware(CompressionMiddleware)
+    use_benchmark_database(bench_app, engine)
+
+    path = f"/tasks/?limit={limit}"
+
+    print(f"{engine.dialect.name}, tasks: {tasks_count}, limit: {limit}, rounds: {rounds}")
+    print(f"{'mode':>9} {'encoding':>9} {'ttfb, ms':>9} {'total, ms':>10} {'bytes':>10}")
+
+    for mode, threshold in (("buffered", limit), ("streamed", limit - 1)):
+        config.LIST_STREAM_THRESHOLD = threshold
+
+        for encoding in ("identity", "gzip"):
+            results = [asyncio.run(fetch(bench_app, path, encoding)) for _ in range(rounds)]
+            ttfb = statistics.median(result[0] for result in results)
+            total = statistics.median(result[1] for result in results)
+
+            print(f"{mode:>9} {encoding:>9} {ttfb * 1000:>9.1f} {total * 1000:>10.1f} {results[0][2]:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сжатие и потоковая отправка больших страниц списка задач.")
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    run(args.tasks, args.employees, args.limit, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
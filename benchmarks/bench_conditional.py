@@ -0,0 +1,133 @@
+import argparse
+import asyncio
+import random
+from time import perf_counter
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.orm import Session
+
+from app.routers import employee, task
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import create_benchmark_engine, reset_schema, summarize_latencies, use_benchmark_database
+
+
+def response_size(response: httpx.Response) -> int:
+    """
+    Размер ответа на проводе: строка статуса, заголовки и тело (без сжатия).
+    Args:
+        response (httpx.Response): Ответ.
+    Returns:
+        int: Размер ответа в байтах.
+    """
+    status_line = len(f"HTTP/1.1 {response.status_code} {response.reason_phrase}\r\n")
+    headers = sum(len(name) + len(value) + 4 for name, value in response.headers.raw)
+
+    return status_line + headers + 2 + len(response.content)
+
+
+async def poll(
+    bench_app: FastAPI, paths: list[str], task_ids: list[int], rounds: int, write_ratio: float, conditional: bool,
+    seed: int = 0,
+) -> dict:
+    """
+    Опрос клиентом списка путей по кругу с редкими изменениями задач между кругами.
+    Args:
+        bench_app (FastAPI): Приложение.
+        paths (list[str]): Опрашиваемые пути.
+        task_ids (list[int]): Идентификаторы задач, которые изменяются между кругами.
+        rounds (int): Количество кругов опроса.
+        write_ratio (float): Вероятность изменения одной из задач перед кругом опроса.
+        conditional (bool): Отправлять If-None-Match с ETag предыдущего ответа.
+        seed (int): Зерно генератора случайных чисел.
+    Returns:
+        dict: Сводка задержек, количество ответов 304 и байт на проводе.
+    """
+    rnd = random.Random(seed)
+    etags = {}
+    latencies = []
+    not_modified = 0
+    transferred = 0
+    transport = httpx.ASGITransport(app=bench_app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = perf_counter()
+
+        for number in range(rounds):
+            if rnd.random() < write_ratio:
+                response = await client.put(f"/tasks/{rnd.choice(task_ids)}", json={"title": f"Updated {number}"})
+                assert response.status_code == 200, response.text
+
+            for path in paths:
+                headers = {"If-None-Match": etags[path]} if conditional and path in etags else {}
+                request_started = perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append(perf_counter() - request_started)
+
+                assert response.status_code in (200, 304), response.text
+                not_modified += response.status_code == 304
+                transferred += response_size(response)
+                etags[path] = response.headers["ETag"]
+
+        elapsed = perf_counter() - started
+
+    return {**summarize_latencies(latencies, elapsed), "not_modified": not_modified, "bytes": transferred}
+
+
+def run(tasks_count: int, employees_count: int, rounds: int, page_size: int, write_ratio: float) -> None:
+    """
+    Сравнение объема ответов и задержек клиента, периодически опрашивающего задачи, без условных запросов
+    и с If-None-Match.
+    Args:
+        tasks_count (int): Количество задач.
+        employees_count (int): Количество сотрудников.
+        rounds (int): Количество кругов опроса.
+        page_size (int): Размер опрашиваемых страниц списков.
+        write_ratio (float): Вероятность изменения задачи перед кругом опроса.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        employees = generate_employees(employees_count)
+        tasks = generate_task_forest(tasks_count, [employee["id"] for employee in employees])
+        seed_database(db, employees, tasks)
+
+    bench_app = FastAPI()
+    bench_app.include_router(employee.router)
+    bench_app.include_router(task.router)
+    use_benchmark_database(bench_app, engine)
+
+    # Клиент следит за первой страницей задач, списком нагрузки и несколькими задачами с этой страницы.
+    task_ids = [row["id"] for row in tasks[:page_size]]
+    paths = [f"/tasks/?limit={page_size}", f"/employees/tasks/?limit={page_size}"]
+    paths += [f"/tasks/{task_id}" for task_id in task_ids[:8]]
+
+    print(f"{'mode':>12} {'rps':>9} {'p50, ms':>8} {'p95, ms':>8} {'304':>7} {'bytes/req':>10} {'total, KB':>10}")
+
+    for name, conditional in (("plain", False), ("conditional", True)):
+        summary = asyncio.run(poll(bench_app, paths, task_ids[:8], rounds, write_ratio, conditional))
+
+        print(
+            f"{name:>12} {summary['rps']:>9.0f} {summary['p50_ms']:>8.2f} {summary['p95_ms']:>8.2f} "
+            f"{summary['not_modified'] / summary['requests']:>7.1%} "
+            f"{summary['bytes'] / summary['requests']:>10.0f} {summary['bytes'] / 1024:>10.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк опроса задач с условными запросами (If-None-Match).")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    run(args.tasks, args.employees, args.rounds, args.page_size, args.write_ratio)
+
+
+if __name__ == "__main__":
+    main()
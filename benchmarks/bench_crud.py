@@ -0,0 +1,216 @@
+import argparse
+import sys
+from itertools import count
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.crud import employee_crud, task_crud
+from app.models.employee import Employee
+from app.models.task import Task
+from app.schemas.employee_schemas import EmployeeBulkUpdateSchema, EmployeeCreateSchema, EmployeeUpdateSchema
+from app.schemas.task_schemas import (
+    TaskBulkUpdateSchema,
+    TaskCreateSchema,
+    TaskFilterSchema,
+    TaskUpdateSchema,
+)
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import (
+    compare_results,
+    create_benchmark_engine,
+    load_results,
+    measure,
+    report_regressions,
+    reset_schema,
+    save_results,
+)
+
+# Размер пакета в пакетных операциях и импорте.
+BATCH = 100
+
+
+def build_cases(db: Session, employee_ids: list[int], task_ids: list[int]) -> list[tuple]:
+    """
+    Замеры функций employee_crud и task_crud на заполненной базе данных.
+    Изменяющие функции получают свежие объекты из setup: удаляемые строки создаются перед каждым повтором,
+    поэтому повторы не зависят друг от друга и не входят в замер.
+    Args:
+        db (Session): Сессия базы данных бенчмарков.
+        employee_ids (list[int]): Идентификаторы сгенерированных сотрудников.
+        task_ids (list[int]): Идентификаторы сгенерированных задач.
+    Returns:
+        list[tuple]: Тройки (имя, функция, setup или None).
+    """
+    numbers = count()
+
+    def employee_id() -> int:
+        return employee_ids[next(numbers) % len(employee_ids)]
+
+    def task_id() -> int:
+        return task_ids[next(numbers) % len(task_ids)]
+
+    def new_employees(size: int) -> list[int]:
+        ids = db.scalars(
+            insert(Employee).returning(Employee.id, sort_by_parameter_order=True),
+            [{"full_name": "Benchmark", "position": "Benchmark"} for _ in range(size)],
+        ).all()
+        db.commit()
+        return ids
+
+    def new_tasks(size: int) -> list[int]:
+        ids = db.scalars(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True),
+            [{"title": "Benchmark", "is_active": False} for _ in range(size)],
+        ).all()
+        db.commit()
+        return ids
+
+    employee_rows = [
+        {"id": employee.id, "full_name": employee.full_name, "position": employee.position}
+        for employee in db.scalars(select(Employee).where(Employee.id.in_(employee_ids[:BATCH * 10])))
+    ]
+    task_rows = [
+        {column: getattr(task, column) for column in ("id", "title", "parent_task_id", "executor_id", "is_active")}
+        for task in db.scalars(select(Task).where(Task.id.in_(task_ids[:BATCH * 10])))
+    ]
+    assignable = db.execute(task_crud.select_assignable_tasks()).all()
+    loads = dict(db.execute(select(Employee.id, Employee.task_count)).all())
+    min_task_count = task_crud.get_min_task_count(db)
+    filters = TaskFilterSchema(is_active=True, has_children=True)
+
+    return [
+        # employee_crud
+        ("employee.get_employee", lambda: employee_crud.get_employee(db, employee_id()), None),
+        ("employee.select_employees_page", lambda: employee_crud.select_employees_page(order_by="task_count"), None),
+        ("employee.get_employees", lambda: employee_crud.get_employees(db, limit=BATCH), None),
+        ("employee.get_employees[task_count]",
+         lambda: employee_crud.get_employees(db, limit=BATCH, order_by="task_count"), None),
+        ("employee.get_employees[search]", lambda: employee_crud.get_employees(db, limit=BATCH, search="employee 1"),
+         None),
+        ("employee.iter_employees", lambda: sum(1 for _ in employee_crud.iter_employees(db)), None),
+        ("employee.get_employees_tasks", lambda: employee_crud.get_employees_tasks(db, limit=BATCH), None),
+        ("employee.get_min_loaded_employees", lambda: employee_crud.get_min_loaded_employees(db, min_task_count),
+         None),
+        ("employee.get_update_values",
+         lambda: employee_crud.get_update_values(EmployeeUpdateSchema(position="Benchmark")), None),
+        ("employee.create_employee",
+         lambda: employee_crud.create_employee(db, EmployeeCreateSchema(full_name="Benchmark", position="Benchmark")),
+         None),
+        ("employee.partial_update_employee",
+         lambda: employee_crud.partial_update_employee(db, employee_id(), EmployeeUpdateSchema(position="Updated")),
+         None),
+        ("employee.delete_employee", lambda ids: employee_crud.delete_employee(db, ids[0]),
+         lambda: (new_employees(1),)),
+        ("employee.bulk_create_employees",
+         lambda: employee_crud.bulk_create_employees(
+             db, [(index, EmployeeCreateSchema(full_name="Bulk", position="Bulk")) for index in range(BATCH)]
+         ), None),
+        ("employee.bulk_update_employees",
+         lambda: employee_crud.bulk_update_employees(
+             db, [(index, EmployeeBulkUpdateSchema(id=employee_id(), position="Bulk")) for index in range(BATCH)]
+         ), None),
+        ("employee.bulk_delete_employees", lambda ids: employee_crud.bulk_delete_employees(db, ids),
+         lambda: (new_employees(BATCH),)),
+        ("employee.import_employees", lambda: employee_crud.import_employees(db, employee_rows), None),
+        ("employee.repair_workload_counters", lambda: employee_crud.repair_workload_counters(db), None),
+        # task_crud
+        ("task.get_task", lambda: task_crud.get_task(db, task_id()), None),
+        ("task.select_tasks_page", lambda: task_crud.select_tasks_page(order_by="deadline", filters=filters), None),
+        ("task.get_tasks", lambda: task_crud.get_tasks(db, limit=BATCH), None),
+        ("task.get_tasks[filters]", lambda: task_crud.get_tasks(db, limit=BATCH, filters=filters), None),
+        ("task.get_tasks[search]",
+         lambda: task_crud.get_tasks(db, limit=BATCH, filters=TaskFilterSchema(search="task 1")), None),
+        ("task.filter_tasks", lambda: task_crud.filter_tasks(select(Task), is_active=True, search="task"), None),
+        ("task.iter_tasks", lambda: sum(1 for _ in task_crud.iter_tasks(db, is_active=True)), None),
+        ("task.get_min_task_count", lambda: task_crud.get_min_task_count(db), None),
+        ("task.get_unassigned_parent_tasks", lambda: task_crud.get_unassigned_parent_tasks(db), None),
+        ("task.get_important_tasks", lambda: task_crud.get_important_tasks(db), None),
+        ("task.get_important_tasks_memoized", lambda: task_crud.get_important_tasks_memoized(db), None),
+        ("task.get_important_tasks_reference", lambda: task_crud.get_important_tasks_reference(db), None),
+        ("task.plan_assignments", task_crud.plan_assignments, lambda: (assignable, dict(loads))),
+        ("task.select_assignable_tasks", task_crud.select_assignable_tasks, None),
+        ("task.assign_important_tasks[dry_run]", lambda: task_crud.assign_important_tasks(db, dry_run=True), None),
+        ("task.get_update_values", lambda: task_crud.get_update_values(TaskUpdateSchema(title="Benchmark")), None),
+        ("task.create_task",
+         lambda: task_crud.create_task(db, TaskCreateSchema(title="Benchmark", executor_id=employee_id())), None),
+        ("task.partial_update_task",
+         lambda: task_crud.partial_update_task(db, task_id(), TaskUpdateSchema(title="Updated")), None),
+        ("task.delete_task", lambda ids: task_crud.delete_task(db, ids[0]), lambda: (new_tasks(1),)),
+        ("task.bulk_create_tasks",
+         lambda: task_crud.bulk_create_tasks(
+             db, [(index, TaskCreateSchema(title="Bulk", executor_id=employee_id())) for index in range(BATCH)]
+         ), None),
+        ("task.bulk_update_tasks",
+         lambda: task_crud.bulk_update_tasks(
+             db, [(index, TaskBulkUpdateSchema(id=task_id(), title="Bulk")) for index in range(BATCH)]
+         ), None),
+        ("task.bulk_delete_tasks", lambda ids: task_crud.bulk_delete_tasks(db, ids), lambda: (new_tasks(BATCH),)),
+        ("task.import_tasks", lambda: task_crud.import_tasks(db, task_rows), None),
+    ]
+
+
+def run(tasks_count: int, employees_count: int, rounds: int, only: str | None) -> dict[str, dict]:
+    """
+    Замер всех функций employee_crud и task_crud.
+    Args:
+        tasks_count (int): Количество задач.
+        employees_count (int): Количество сотрудников.
+        rounds (int): Количество повторов каждого замера.
+        only (str | None): Подстрока имени: замеряются только подходящие функции.
+    Returns:
+        dict[str, dict]: Результаты measure по именам замеров.
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+    results = {}
+
+    with Session(engine) as db:
+        employees = generate_employees(employees_count)
+        employee_ids = [employee["id"] for employee in employees]
+        tasks = generate_task_forest(tasks_count, employee_ids)
+        seed_database(db, employees, tasks)
+
+        cases = build_cases(db, employee_ids, [task["id"] for task in tasks])
+        print(f"{engine.dialect.name}, tasks: {tasks_count}, employees: {employees_count}, rounds: {rounds}")
+        print(f"{'function':>42} {'median, ms':>11} {'min, ms':>9}")
+
+        for name, operation, setup in cases:
+            if only is not None and only not in name:
+                continue
+
+            results[name] = measure(operation, rounds, setup=setup)
+            print(f"{name:>42} {results[name]['median'] * 1000:>11.3f} {results[name]['min'] * 1000:>9.3f}")
+
+        print(f"tasks after run: {db.scalar(select(func.count(Task.id)))}")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Микробенчмарки функций employee_crud и task_crud.")
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--only", help="замерять только функции, в имени которых есть подстрока")
+    parser.add_argument("--save", metavar="PATH", help="сохранить результаты в JSON-файл (базовая линия)")
+    parser.add_argument("--compare", metavar="PATH", help="сравнить с базовой линией и завершиться с кодом 1 "
+                                                          "при регрессии")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимый рост медианы (по умолчанию 0.2)")
+    args = parser.parse_args()
+
+    results = run(args.tasks, args.employees, args.rounds, args.only)
+
+    if args.save:
+        save_results(args.save, results)
+
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), results, "median", args.threshold)
+        report_regressions(
+            [(name, before * 1000, after * 1000, change) for name, before, after, change in regressions], "ms"
+        )
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import sys
+from time import perf_counter
+
+from fastapi import FastAPI
+from sqlalchemy.orm import Session
+
+from app.routers import employee_export, task_export
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import create_benchmark_engine, reset_schema, use_benchmark_database
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def current_rss() -> int:
+    """
+    Текущий объем резидентной памяти процесса.
+    Returns:
+        int: Объем памяти в байтах.
+    """
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE
+
+
+def seed(tasks_count: int) -> None:
+    """
+    Заполнение базы данных бенчмарков. Выполняется в отдельном процессе,
+    чтобы память на генерацию данных не учитывалась при замере выгрузки.
+    Args:
+        tasks_count (int): Количество задач.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        employees = generate_employees(1000)
+        seed_database(db, employees, generate_task_forest(tasks_count, [employee["id"] for employee in employees]))
+
+    engine.dispose()
+
+
+async def stream_export(app: FastAPI, path: str, query: str) -> dict:
+    """
+    Выполнение запроса выгрузки напрямую через ASGI-интерфейс приложения.
+    Тело ответа не сохраняется: считаются только байты и строки, после каждого фрагмента
+    замеряется объем памяти процесса.
+    Args:
+        app (FastAPI): Приложение.
+        path (str): Путь запроса.
+        query (str): Строка параметров запроса.
+    Returns:
+        dict: Статус ответа, количество байт и строк, пиковый объем памяти в байтах.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [(b"host", b"benchmark")],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    stats = {"status": None, "bytes": 0, "lines": 0, "peak_rss": current_rss()}
+    requested, disconnected = asyncio.Event(), asyncio.Event()
+
+    async def receive():
+        if not requested.is_set():
+            requested.set()
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            stats["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            stats["bytes"] += len(body)
+            stats["lines"] += body.count(b"\n")
+            stats["peak_rss"] = max(stats["peak_rss"], current_rss())
+
+    await app(scope, receive, send)
+    disconnected.set()
+
+    return stats
+
+
+def run(tasks_count: int, export_format: str, max_rss_mb: float, skip_seed: bool) -> bool:
+    """
+    Замер прироста памяти и времени выгрузки всех задач.
+    Args:
+        tasks_count (int): Количество задач в таблице.
+        export_format (str): Формат выгрузки.
+        max_rss_mb (float): Допустимый прирост резидентной памяти в мегабайтах.
+        skip_seed (bool): Не пересоздавать данные, использовать существующую базу.
+    Returns:
+        bool: True, если прирост памяти не превысил max_rss_mb.
+    """
+    if not skip_seed:
+        process = multiprocessing.get_context("spawn").Process(target=seed, args=(tasks_count,))
+        process.start()
+        process.join()
+
+        if process.exitcode:
+            raise RuntimeError(f"Seeding failed with exit code {process.exitcode}")
+
+    engine = create_benchmark_engine()
+    bench_app = FastAPI()
+    bench_app.include_router(employee_export.router)
+    bench_app.include_router(task_export.router)
+    use_benchmark_database(bench_app, engine)
+
+    baseline = current_rss()
+    started = perf_counter()
+    stats = asyncio.run(stream_export(bench_app, "/tasks/export", f"format={export_format}"))
+    elapsed = perf_counter() - started
+    growth_mb = (stats["peak_rss"] - baseline) / 2 ** 20
+    rows = stats["lines"] - (1 if export_format == "csv" else 0)
+
+    print(f"status:            {stats['status']}")
+    print(f"rows:              {rows}")
+    print(f"size, MB:          {stats['bytes'] / 2 ** 20:.1f}")
+    print(f"time, s:           {elapsed:.2f}")
+    print(f"rows per second:   {rows / elapsed:.0f}")
+    print(f"RSS growth, MB:    {growth_mb:.1f} (limit {max_rss_mb})")
+    print(f"max RSS, MB:       {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f}")
+
+    engine.dispose()
+
+    return stats["status"] == 200 and growth_mb <= max_rss_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк потоковой выгрузки задач: время и прирост памяти.")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--max-rss-mb", type=float, default=64)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    if not run(args.tasks, args.format, args.max_rss_mb, args.skip_seed):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
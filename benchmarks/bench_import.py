@@ -0,0 +1,89 @@
+import argparse
+import json
+from tempfile import TemporaryFile
+from time import perf_counter
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.main import app
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import create_benchmark_engine, reset_schema, use_benchmark_database
+
+
+def prepare(engine, employees_count: int) -> None:
+    """
+    Пересоздание таблиц и заполнение таблицы сотрудников.
+    Args:
+        engine (Engine): SQLAlchemy engine базы данных бенчмарков.
+        employees_count (int): Количество сотрудников.
+    Returns:
+        None
+    """
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        seed_database(db, generate_employees(employees_count), [])
+
+
+def run(single_count: int, import_count: int, employees_count: int) -> None:
+    """
+    Сравнение скорости загрузки задач запросами POST /tasks/ по одной и импортом файла NDJSON, в строках в секунду.
+    Задачи записываются в файл в обратном порядке, поэтому каждая ссылка на родительскую задачу
+    указывает на строку ниже по файлу.
+    Args:
+        single_count (int): Количество задач, создаваемых по одной.
+        import_count (int): Количество задач в файле импорта.
+        employees_count (int): Количество сотрудников.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    use_benchmark_database(app, engine)
+    client = TestClient(app)
+    employee_ids = list(range(1, employees_count + 1))
+
+    print(f"{'mode':>7} {'rows':>9} {'rows/sec':>10}")
+
+    prepare(engine, employees_count)
+    # Идентификаторы назначаются базой данных, поэтому задачи создаются без ссылок на родительские.
+    tasks = generate_task_forest(single_count, employee_ids)
+    started = perf_counter()
+
+    for task in tasks:
+        client.post("/tasks/", json={
+            "title": task["title"],
+            "executor_id": task["executor_id"],
+            "deadline": task["deadline"].isoformat() if task["deadline"] else None,
+            "is_active": task["is_active"],
+        })
+
+    print(f"{'single':>7} {single_count:>9} {single_count / (perf_counter() - started):>10.0f}")
+
+    prepare(engine, employees_count)
+
+    with TemporaryFile() as file:
+        for task in reversed(generate_task_forest(import_count, employee_ids)):
+            file.write(json.dumps(task, default=str).encode() + b"\n")
+
+        file.seek(0)
+        started = perf_counter()
+        result = client.post("/tasks/import", content=file).json()
+        elapsed = perf_counter() - started
+
+    print(f"{'import':>7} {result['imported']:>9} {result['imported'] / elapsed:>10.0f}")
+    print(f"rejected rows: {result['rejected']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк импорта задач из файла по сравнению с созданием по одной.")
+    parser.add_argument("--single", type=int, default=1000)
+    parser.add_argument("--import", dest="import_count", type=int, default=200000)
+    parser.add_argument("--employees", type=int, default=100)
+    args = parser.parse_args()
+
+    run(args.single, args.import_count, args.employees)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+
+from sqlalchemy.orm import Session
+
+from app.crud.task_crud import get_important_tasks, get_important_tasks_reference
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import count_queries, create_benchmark_engine, measure, reset_schema
+
+EMPLOYEES_PER_TASKS = 20
+
+
+def run(sizes: list[int], reference_limit: int) -> None:
+    """
+    Сравнение числа запросов и времени get_important_tasks и эталонной реализации.
+    Args:
+        sizes (list[int]): Размеры таблицы задач.
+        reference_limit (int): Максимальный размер, на котором запускается эталонная реализация.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    print(f"{'tasks':>8} {'impl':>10} {'queries':>8} {'median, ms':>11} {'result':>7}")
+
+    for size in sizes:
+        reset_schema(engine)
+
+        with Session(engine) as db:
+            employees = generate_employees(max(size // EMPLOYEES_PER_TASKS, 1))
+            tasks = generate_task_forest(size, [employee["id"] for employee in employees])
+            seed_database(db, employees, tasks)
+
+            implementations = [("set-based", get_important_tasks)]
+            if size <= reference_limit:
+                implementations.append(("reference", get_important_tasks_reference))
+
+            for name, func in implementations:
+                db.expire_all()
+                with count_queries(engine) as counter:
+                    result = func(db)
+
+                timing = measure(lambda: func(db), rounds=3)
+                print(f"{size:>8} {name:>10} {counter.count:>8} {timing['median'] * 1000:>11.1f} {len(result):>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк get_important_tasks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--reference-limit", type=int, default=10000)
+    args = parser.parse_args()
+
+    run(args.sizes, args.reference_limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crud.task_crud import TASK_SORT_COLUMNS, get_tasks
+from app.models.task import Task
+from app.pagination import encode_cursor
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import create_benchmark_engine, measure, reset_schema
+
+
+def run(tasks_count: int, pages: list[int], limit: int, order_by: str) -> None:
+    """
+    Сравнение времени получения страницы задач по смещению и по курсору в зависимости от номера страницы.
+    Args:
+        tasks_count (int): Количество задач в таблице.
+        pages (list[int]): Номера страниц (с 1).
+        limit (int): Размер страницы.
+        order_by (str): Ключ сортировки.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        employees = generate_employees(100)
+        tasks = generate_task_forest(tasks_count, [employee["id"] for employee in employees])
+        seed_database(db, employees, tasks)
+
+        sort_column = TASK_SORT_COLUMNS[order_by]
+        print(f"{'page':>8} {'offset, ms':>11} {'cursor, ms':>11}")
+
+        for page in pages:
+            skip = (page - 1) * limit
+            cursor = None
+
+            if skip:
+                # Курсор страницы - позиция последней строки предыдущей страницы (вне замера).
+                last = db.scalars(
+                    select(Task).order_by(sort_column.asc().nulls_last(), Task.id).offset(skip - 1).limit(1)
+                ).one()
+                cursor = encode_cursor(order_by, getattr(last, order_by), last.id)
+
+            by_offset = measure(lambda: get_tasks(db, skip=skip, limit=limit, order_by=order_by))
+            by_cursor = measure(lambda: get_tasks(db, limit=limit, order_by=order_by, cursor=cursor))
+            db.expunge_all()
+
+            print(f"{page:>8} {by_offset['median'] * 1000:>11.2f} {by_cursor['median'] * 1000:>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк пагинации списка задач по смещению и по курсору.")
+    parser.add_argument("--tasks", type=int, default=1_000_100)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--order-by", choices=sorted(TASK_SORT_COLUMNS), default="id")
+    args = parser.parse_args()
+
+    run(args.tasks, args.pages, args.limit, args.order_by)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import tracemalloc
+
+from sqlalchemy.orm import Session
+
+from app.crud import task_crud
+from app.schemas.task_schemas import TaskSchema
+from app.serialization import TaskRowsResponse, parse_fields, projection_response_class
+from benchmarks.bench_serialization import schema_response
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import create_benchmark_engine, measure, reset_schema
+
+# Наборы полей параметра fields: None - ответ со всеми полями.
+PROJECTIONS = [None, "id,title,deadline", "id,title", "id"]
+
+
+def peak_memory(func) -> int:
+    """
+    Пиковый объем памяти, выделенной Python во время вызова функции.
+    Args:
+        func (Callable[[], Any]): Функция.
+    Returns:
+        int: Пик в байтах относительно начала вызова.
+    """
+    tracemalloc.start()
+
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(tasks_count: int, employees_count: int, rounds: int) -> None:
+    """
+    Время и пиковая память чтения и сериализации всех задач: ORM-объекты со всеми полями
+    и строки колонок с разными наборами полей (параметр fields).
+    Args:
+        tasks_count (int): Количество задач.
+        employees_count (int): Количество сотрудников.
+        rounds (int): Количество повторов замера времени.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        employees = generate_employees(employees_count)
+        tasks = generate_task_forest(tasks_count, [employee["id"] for employee in employees])
+        seed_database(db, employees, tasks)
+
+    with Session(engine) as db:
+        def read_orm():
+            db.expunge_all()
+            return schema_response(TaskSchema, task_crud.get_tasks(db, limit=tasks_count))
+
+        cases = [("orm", read_orm)]
+
+        for projection in PROJECTIONS:
+            fields = parse_fields(TaskSchema, projection) if projection else None
+            response_class = TaskRowsResponse if fields is None else projection_response_class(TaskSchema, fields)
+            cases.append((
+                f"rows[{projection or 'all'}]",
+                lambda fields=fields, response_class=response_class: response_class(
+                    task_crud.get_task_rows(db, limit=tasks_count, fields=fields)
+                ),
+            ))
+
+        print(f"{engine.dialect.name}, tasks: {tasks_count}, rounds: {rounds}")
+        print(f"{'path':>24} {'median, ms':>11} {'peak, MB':>9} {'bytes':>10}")
+
+        for name, func in cases:
+            size = len(func().body)
+            timing = measure(func, rounds)
+            peak = peak_memory(func)
+            print(f"{name:>24} {timing['median'] * 1000:>11.1f} {peak / 2 ** 20:>9.1f} {size:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время и память чтения задач с частью полей (параметр fields).")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.tasks, args.employees, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import sys
+
+from fastapi import FastAPI
+from sqlalchemy.orm import Session
+
+from app.metrics import MetricsMiddleware, instrument_engines, instrument_routes
+from app.routers import employee, employee_export, task, task_export, task_graph
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import (
+    compare_results,
+    create_benchmark_engine,
+    load_results,
+    report_regressions,
+    reset_schema,
+    run_asgi_load,
+    save_results,
+    use_benchmark_database,
+)
+
+# Доля от --requests для маршрутов, которые отдают все строки таблицы.
+EXPORT_SHARE = 0.05
+
+
+def build_app(engine, metrics: bool) -> FastAPI:
+    """
+    Приложение с синхронными роутерами чтения поверх базы данных бенчмарков, с замерами запросов или без них.
+    Args:
+        engine (Engine): SQLAlchemy engine базы данных бенчмарков.
+        metrics (bool): Подключить MetricsMiddleware и обертки функций маршрутов, как при METRICS_ENABLED.
+    Returns:
+        FastAPI: Приложение.
+    """
+    bench_app = FastAPI()
+
+    for router in (employee_export.router, task_export.router, task_graph.router, employee.router, task.router):
+        bench_app.include_router(router)
+
+    use_benchmark_database(bench_app, engine)
+
+    if metrics:
+        bench_app.add_middleware(MetricsMiddleware)
+        instrument_engines()
+        instrument_routes(bench_app)
+
+    return bench_app
+
+
+def route_paths(employee_ids: list[int], task_ids: list[int], requests: int) -> dict[str, tuple[list[str], int]]:
+    """
+    Запросы к каждому маршруту чтения: пути с разными идентификаторами и количество запросов.
+    Args:
+        employee_ids (list[int]): Идентификаторы сотрудников.
+        task_ids (list[int]): Идентификаторы задач.
+        requests (int): Количество запросов к маршруту.
+    Returns:
+        dict[str, tuple[list[str], int]]: Пути и количество запросов по именам маршрутов.
+    """
+    employees, tasks = employee_ids[:100], task_ids[:100]
+    exports = max(int(requests * EXPORT_SHARE), 1)
+
+    return {
+        "GET /employees/": (["/employees/?limit=50"], requests),
+        "GET /employees/?search": (["/employees/?limit=50&search=employee+1"], requests),
+        "GET /employees/tasks/": (["/employees/tasks/?limit=50"], requests),
+        "GET /employees/{employee_id}": ([f"/employees/{employee_id}" for employee_id in employees], requests),
+        "GET /employees/export": (["/employees/export"], exports),
+        "GET /tasks/": (["/tasks/?limit=50"], requests),
+        "GET /tasks/?filters": (["/tasks/?limit=50&is_active=true&has_children=true&search=task"], requests),
+        "GET /tasks/{task_id}": ([f"/tasks/{task_id}" for task_id in tasks], requests),
+        "GET /tasks/important/": (["/tasks/important/"], requests),
+        "GET /tasks/{task_id}/ancestors": ([f"/tasks/{task_id}/ancestors" for task_id in task_ids[-100:]], requests),
+        "GET /tasks/{task_id}/descendants": ([f"/tasks/{task_id}/descendants" for task_id in tasks], requests),
+        "GET /tasks/{task_id}/subtree": ([f"/tasks/{task_id}/subtree" for task_id in tasks], requests),
+        "GET /tasks/export": (["/tasks/export"], exports),
+    }
+
+
+def run(
+    tasks_count: int, employees_count: int, requests: int, concurrency: int, modes: list[bool], only: str | None
+) -> dict[bool, dict[str, dict]]:
+    """
+    Нагрузка каждого маршрута чтения внутри процесса (ASGI, без сети).
+    Args:
+        tasks_count (int): Количество задач.
+        employees_count (int): Количество сотрудников.
+        requests (int): Количество запросов к маршруту.
+        concurrency (int): Количество одновременных клиентов.
+        modes (list[bool]): Прогоны без замеров запросов (False) и с ними (True).
+        only (str | None): Подстрока имени: нагружаются только подходящие маршруты.
+    Returns:
+        dict[bool, dict[str, dict]]: Результаты run_asgi_load по именам маршрутов для каждого прогона.
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        employees = generate_employees(employees_count)
+        employee_ids = [employee["id"] for employee in employees]
+        tasks = generate_task_forest(tasks_count, employee_ids)
+        seed_database(db, employees, tasks)
+
+    apps = {metrics: build_app(engine, metrics) for metrics in modes}
+    results = {metrics: {} for metrics in modes}
+
+    print(f"{engine.dialect.name}, tasks: {tasks_count}, employees: {employees_count}, clients: {concurrency}")
+    print(f"{'route':>32} {'metrics':>8} {'p50, ms':>9} {'p95, ms':>9} {'p99, ms':>9} {'rps':>9} {'errors':>7}")
+
+    for name, (paths, count) in route_paths(employee_ids, [task["id"] for task in tasks], requests).items():
+        if only is not None and only not in name:
+            continue
+
+        # Прогрев: первые запросы строят кэши SQLAlchemy и приложения.
+        asyncio.run(run_asgi_load(apps[modes[0]], paths, 1, min(count, 10)))
+
+        for metrics in modes:
+            result = results[metrics][name] = asyncio.run(run_asgi_load(apps[metrics], paths, concurrency, count))
+            print(
+                f"{name:>32} {'on' if metrics else 'off':>8} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                f"{result['p99_ms']:>9.2f} {result['rps']:>9.1f} {result['errors']:>7}"
+            )
+
+    return results
+
+
+def report_overhead(without: dict[str, dict], with_metrics: dict[str, dict]) -> None:
+    """
+    Вывод накладных расходов замеров запросов: изменение p50 по маршрутам и суммарной пропускной способности.
+    Args:
+        without (dict[str, dict]): Результаты без замеров.
+        with_metrics (dict[str, dict]): Результаты с замерами.
+    Returns:
+        None
+    """
+    print("metrics overhead (p50):")
+
+    for name, result in with_metrics.items():
+        print(f"  {name}: {result['p50_ms'] / without[name]['p50_ms'] - 1:+.1%}")
+
+    def total_time(results):
+        return sum(result["requests"] / result["rps"] for result in results.values())
+
+    print(f"  total time: {total_time(with_metrics) / total_time(without) - 1:+.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузка маршрутов чтения внутри процесса (ASGI).")
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500, help="количество запросов к каждому маршруту")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--only", help="нагружать только маршруты, в имени которых есть подстрока")
+    parser.add_argument("--overhead", action="store_true", help="сравнить прогоны без замеров запросов и с ними")
+    parser.add_argument("--save", metavar="PATH", help="сохранить результаты в JSON-файл (базовая линия)")
+    parser.add_argument("--compare", metavar="PATH", help="сравнить с базовой линией и завершиться с кодом 1 "
+                                                          "при регрессии")
+    parser.add_argument("--metric", choices=["p50_ms", "p95_ms", "p99_ms"], default="p95_ms")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимый рост метрики (по умолчанию 0.2)")
+    args = parser.parse_args()
+
+    modes = [False, True] if args.overhead else [True]
+    results = run(args.tasks, args.employees, args.requests, args.concurrency, modes, args.only)
+
+    if args.overhead:
+        report_overhead(results[False], results[True])
+
+    if args.save:
+        save_results(args.save, results[True])
+
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), results[True], args.metric, args.threshold)
+        report_regressions(regressions, "ms")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import statistics
+from time import process_time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy.orm import Session
+
+from app.crud import employee_crud, task_crud
+from app.schemas.employee_schemas import EmployeeTasksSchema
+from app.schemas.task_schemas import TaskSchema
+from app.serialization import EmployeeTasksRowsResponse, TaskRowsResponse
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import create_benchmark_engine, reset_schema
+
+
+def schema_response(schema: type, items: list) -> JSONResponse:
+    """
+    Ответ, который FastAPI строит по response_model из возвращенных обработчиком ORM-объектов:
+    проверка по схеме, преобразование в JSON-совместимые объекты и json.dumps.
+    Args:
+        schema (type): Схема элемента списка.
+        items (list): ORM-объекты.
+    Returns:
+        JSONResponse: Ответ.
+    """
+    field = create_response_field(name=f"Response_{schema.__name__}", type_=list[schema], mode="serialization")
+    content = asyncio.run(serialize_response(field=field, response_content=items))
+
+    return JSONResponse(content)
+
+
+def cpu_time(func, rounds: int) -> tuple[float, int]:
+    """
+    Медианное процессорное время функции и размер ее ответа.
+    Args:
+        func (Callable[[], Response]): Чтение страницы и построение ответа.
+        rounds (int): Количество повторов.
+    Returns:
+        tuple[float, int]: Время в секундах и размер тела ответа в байтах.
+    """
+    timings = []
+
+    for _ in range(rounds):
+        started = process_time()
+        response = func()
+        timings.append(process_time() - started)
+
+    return statistics.median(timings), len(response.body)
+
+
+def run(tasks_count: int, employees_count: int, limit: int, rounds: int) -> None:
+    """
+    Процессорное время на строку ответа списков задач и сотрудников с задачами: чтение ORM-объектов
+    с сериализацией по response_model (прежний путь) и чтение колонок с RowsJSONResponse.
+    Args:
+        tasks_count (int): Количество задач.
+        employees_count (int): Количество сотрудников.
+        limit (int): Размер страницы.
+        rounds (int): Количество повторов каждого замера.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        employees = generate_employees(employees_count)
+        tasks = generate_task_forest(tasks_count, [employee["id"] for employee in employees])
+        seed_database(db, employees, tasks)
+
+    with Session(engine) as db:
+        task_rows = len(task_crud.get_task_rows(db, limit=limit))
+        employee_rows = sum(1 + len(row["task"]) for row in employee_crud.get_employees_tasks_rows(db, limit=limit))
+
+        cases = [
+            ("GET /tasks/", "orm", task_rows,
+             lambda: schema_response(TaskSchema, task_crud.get_tasks(db, limit=limit))),
+            ("GET /tasks/", "rows", task_rows,
+             lambda: TaskRowsResponse(task_crud.get_task_rows(db, limit=limit))),
+            ("GET /employees/tasks/", "orm", employee_rows,
+             lambda: schema_response(EmployeeTasksSchema, employee_crud.get_employees_tasks(db, limit=limit))),
+            ("GET /employees/tasks/", "rows", employee_rows,
+             lambda: EmployeeTasksRowsResponse(employee_crud.get_employees_tasks_rows(db, limit=limit))),
+        ]
+
+        print(f"{engine.dialect.name}, tasks: {tasks_count}, employees: {employees_count}, limit: {limit}")
+        print(f"{'route':>22} {'path':>5} {'rows':>6} {'cpu, ms':>9} {'us/row':>8} {'bytes':>9}")
+
+        for name, path, rows, func in cases:
+            # Сессия очищается перед каждым повтором, чтобы ORM-объекты создавались заново, как в запросе.
+            seconds, size = cpu_time(lambda: (db.expunge_all(), func())[1], rounds)
+            print(f"{name:>22} {path:>5} {rows:>6} {seconds * 1000:>9.2f} {seconds / rows * 1e6:>8.2f} {size:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Процессорное время сериализации больших списков на строку ответа.")
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.tasks, args.employees, args.limit, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.crud.task_crud import important_tasks_memo
+from app.routers import employee, task
+from app.snapshots import SnapshotScheduler, create_snapshot_jobs, set_snapshot_scheduler
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import create_benchmark_engine, measure, reset_schema, use_benchmark_database
+
+
+def reset_memo() -> tuple:
+    # Сброс сохраненного результата get_important_tasks, как после изменения данных.
+    important_tasks_memo.clear()
+    return ()
+
+
+def run(tasks_count: int, employees_count: int, limit: int, rounds: int) -> None:
+    """
+    Время расчета снимков отчетов и время ответа эндпоинтов из снимка и с fresh=true
+    (важные задачи считаются заново: сохраненный результат get_important_tasks сбрасывается перед запросом).
+    Args:
+        tasks_count (int): Количество задач.
+        employees_count (int): Количество сотрудников.
+        limit (int): Размер страницы рейтинга нагрузки.
+        rounds (int): Количество повторов каждого замера.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        employees = generate_employees(employees_count)
+        tasks = generate_task_forest(tasks_count, [employee["id"] for employee in employees])
+        seed_database(db, employees, tasks)
+
+    bench_app = FastAPI()
+    bench_app.include_router(employee.router)
+    bench_app.include_router(task.router)
+    use_benchmark_database(bench_app, engine)
+    client = TestClient(bench_app)
+
+    scheduler = SnapshotScheduler(create_snapshot_jobs(), sessionmaker(bind=engine))
+    previous = set_snapshot_scheduler(scheduler)
+
+    print(f"{engine.dialect.name}, tasks: {tasks_count}, employees: {employees_count}, limit: {limit}")
+    print(f"{'snapshot':>18} {'compute, ms':>12}")
+
+    for name, job in scheduler.jobs.items():
+        timing = measure(lambda: job.run(scheduler.session_factory), rounds)
+        print(f"{name:>18} {timing['median'] * 1000:>12.1f}")
+
+    print(f"{'route':>22} {'snapshot, ms':>13} {'fresh, ms':>10}")
+
+    try:
+        for url in ["/tasks/important/", f"/employees/tasks/?limit={limit}"]:
+            snapshot = measure(lambda: client.get(url), rounds)
+            fresh = measure(lambda: client.get(url, params={"fresh": True}), rounds, setup=reset_memo)
+            print(f"{url.partition('?')[0]:>22} {snapshot['median'] * 1000:>13.2f} {fresh['median'] * 1000:>10.2f}")
+    finally:
+        set_snapshot_scheduler(previous)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Снимки отчетов: время расчета и ответа из снимка и с fresh=true.")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    run(args.tasks, args.employees, args.limit, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crud.task_graph import find_hierarchy_errors, get_ancestors, get_descendants, get_subtree_summary
+from app.models.task import Task
+from benchmarks.data import generate_task_chain, generate_task_forest, seed_database
+from benchmarks.utils import count_queries, create_benchmark_engine, measure, reset_schema
+
+
+def get_descendants_by_levels(db: Session, task_id: int) -> list[int]:
+    """
+    Получение потомков задачи циклом в Python: один запрос дочерних задач на каждый уровень дерева.
+    Используется как точка сравнения для рекурсивного CTE.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        task_id (int): Идентификатор задачи.
+    Returns:
+        list[int]: Идентификаторы потомков.
+    """
+    descendants, level = [], [task_id]
+
+    while level:
+        level = db.scalars(select(Task.id).where(Task.parent_task_id.in_(level))).all()
+        descendants.extend(level)
+
+    return descendants
+
+
+def run(depth: int, width: int, rounds: int) -> None:
+    """
+    Время и число запросов обхода иерархии задач на цепочке глубиной depth и на дереве из одного корня
+    с width дочерними задачами: потомки (рекурсивный CTE и цикл по уровням), предки, сводка по поддереву
+    и проверка циклов при смене родительской задачи.
+    Args:
+        depth (int): Глубина цепочки задач.
+        width (int): Количество дочерних задач корня.
+        rounds (int): Количество повторов каждого замера.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    shapes = [
+        ("chain", generate_task_chain(depth)),
+        ("star", generate_task_forest(width + 1, [], depth=2, root_ratio=0)),
+    ]
+
+    print(f"{'tree':>6} {'operation':>22} {'rows':>8} {'queries':>8} {'median, ms':>11}")
+
+    for shape, tasks in shapes:
+        reset_schema(engine)
+
+        with Session(engine) as db:
+            seed_database(db, [], tasks)
+            root, leaf = tasks[0]["id"], tasks[-1]["id"]
+            operations = [
+                ("descendants (cte)", lambda: get_descendants(db, root)),
+                ("descendants (levels)", lambda: get_descendants_by_levels(db, root)),
+                ("ancestors", lambda: get_ancestors(db, leaf)),
+                ("subtree summary", lambda: [get_subtree_summary(db, root)]),
+                ("cycle check", lambda: list(find_hierarchy_errors(db, [leaf]))),
+            ]
+
+            for name, operation in operations:
+                with count_queries(engine) as counter:
+                    rows = len(operation())
+
+                timing = measure(operation, rounds)
+                print(
+                    f"{shape:>6} {name:>22} {rows:>8} {counter.count:>8} {timing['median'] * 1000:>11.2f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк обхода иерархии задач рекурсивными CTE.")
+    parser.add_argument("--depth", type=int, default=10_000)
+    parser.add_argument("--width", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.depth, args.width, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
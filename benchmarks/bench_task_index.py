@@ -0,0 +1,100 @@
+import argparse
+import random
+import tracemalloc
+from time import perf_counter
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.cache import invalidate
+from app.crud.task_crud import get_important_tasks
+from app.crud.task_graph import get_subtree_summary
+from app.models.task import Task
+from app.task_index import TaskGraphIndex, load_task_graph, set_task_index
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import create_benchmark_engine, measure, reset_schema
+
+
+def run(tasks_count: int, employees_count: int, rounds: int) -> None:
+    """
+    Память и время загрузки графа задач в памяти, время получения важных задач и сводки по поддереву
+    из графа и запросами к базе данных, время применения изменения задачи к графу.
+    Args:
+        tasks_count (int): Количество задач.
+        employees_count (int): Количество сотрудников.
+        rounds (int): Количество повторов каждого замера.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+    rnd = random.Random(0)
+
+    with Session(engine) as db:
+        employees = generate_employees(employees_count)
+        tasks = generate_task_forest(tasks_count, [employee["id"] for employee in employees], depth=6)
+        seed_database(db, employees, tasks)
+        del tasks
+
+        index = TaskGraphIndex()
+        set_task_index(index)
+        started = perf_counter()
+        index.load(db)
+        load_seconds = perf_counter() - started
+
+        # Контрольный замер памяти: повторная загрузка под tracemalloc (он замедляет загрузку в разы).
+        tracemalloc.start()
+        graph = load_task_graph(db)
+        traced, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del graph
+
+        status = index.status()
+        per_million = 1_000_000 / status["tasks"]
+        print(f"tasks: {status['tasks']}, employees: {status['employees']}, important: {status['important_tasks']}")
+        print(f"load: {load_seconds:.2f} s")
+        print(
+            f"memory: {status['memory_bytes'] / 2 ** 20:.1f} MiB (graph), {traced / 2 ** 20:.1f} MiB (tracemalloc), "
+            f"{status['memory_bytes'] * per_million / 2 ** 20:.1f} MiB per million tasks"
+        )
+
+        roots = rnd.sample(range(1, tasks_count + 1), 100)
+        changed = rnd.sample(range(1, tasks_count + 1), rounds)
+        index.important_tasks(db)
+
+        def change_task():
+            task_id = changed.pop()
+            db.execute(update(Task).where(Task.id == task_id).values(title=f"Changed {task_id}"))
+            db.commit()
+            invalidate(Task, [task_id])
+            return index.important_tasks(db)
+
+        operations = [
+            ("important tasks (sql)", lambda: get_important_tasks(db)),
+            ("important tasks (index)", lambda: index.important_tasks(db)),
+            ("change + important (index)", change_task),
+            ("subtree x100 (sql)", lambda: [get_subtree_summary(db, task_id) for task_id in roots]),
+            ("subtree x100 (index)", lambda: [index.subtree_summary(db, task_id, 10000) for task_id in roots]),
+        ]
+
+        print(f"{'operation':>28} {'median, us':>12}")
+
+        for name, operation in operations:
+            timing = measure(operation, rounds)
+            print(f"{name:>28} {timing['median'] * 1e6:>12.1f}")
+
+    set_task_index(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк графа задач в памяти.")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--employees", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.tasks, args.employees, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.crud.employee_crud import get_employees_tasks, get_min_loaded_employees
+from app.crud.task_crud import get_min_task_count
+from app.models.employee import Employee
+from app.models.task import Task
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from benchmarks.utils import create_benchmark_engine, measure, reset_schema
+
+
+def aggregate_min_task_count(db: Session) -> int:
+    """Минимальная нагрузка сотрудников агрегацией по таблице задач (без счетчиков)."""
+    workload = (
+        select(func.count(Task.id).label("task_count"))
+        .select_from(Employee)
+        .outerjoin(Task, Task.executor_id == Employee.id)
+        .group_by(Employee.id)
+        .subquery()
+    )
+
+    return db.scalar(select(func.min(workload.c.task_count)))
+
+
+def aggregate_min_loaded_employees(db: Session, min_tasks_count: int) -> list:
+    """Сотрудники с минимальной нагрузкой агрегацией по таблице задач (без счетчиков)."""
+    return db.scalars(
+        select(Employee)
+        .outerjoin(Task, Task.executor_id == Employee.id)
+        .group_by(Employee.id)
+        .having(func.count(Task.id) == min_tasks_count)
+    ).all()
+
+
+def aggregate_employees_tasks(db: Session, limit: int = 100) -> list:
+    """Сотрудники по убыванию количества активных задач агрегацией по таблице задач (без счетчиков)."""
+    return db.scalars(
+        select(Employee)
+        .join(Task, Task.executor_id == Employee.id)
+        .where(Task.is_active.is_(True))
+        .group_by(Employee.id)
+        .order_by(func.count(Task.id).desc())
+        .limit(limit)
+    ).all()
+
+
+def run(tasks_count: int, employees_count: int) -> None:
+    """
+    Сравнение времени запросов нагрузки сотрудников агрегацией по задачам и по счетчикам.
+    Args:
+        tasks_count (int): Количество задач.
+        employees_count (int): Количество сотрудников.
+    Returns:
+        None
+    """
+    engine = create_benchmark_engine()
+    reset_schema(engine)
+
+    with Session(engine) as db:
+        employees = generate_employees(employees_count)
+        seed_database(db, employees, generate_task_forest(tasks_count, [employee["id"] for employee in employees]))
+
+        min_tasks_count = get_min_task_count(db)
+        assert min_tasks_count == aggregate_min_task_count(db)
+
+        cases = [
+            ("min task count", aggregate_min_task_count, get_min_task_count),
+            (
+                "min loaded employees",
+                lambda db: aggregate_min_loaded_employees(db, min_tasks_count),
+                lambda db: get_min_loaded_employees(db, min_tasks_count),
+            ),
+            ("busy employees", aggregate_employees_tasks, get_employees_tasks),
+        ]
+
+        print(f"{'query':>22} {'aggregate, ms':>14} {'counters, ms':>13}")
+
+        for name, aggregate, counters in cases:
+            by_aggregate = measure(lambda: aggregate(db))
+            by_counters = measure(lambda: counters(db))
+            db.expunge_all()
+
+            print(f"{name:>22} {by_aggregate['median'] * 1000:>14.2f} {by_counters['median'] * 1000:>13.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк запросов нагрузки сотрудников: агрегация и счетчики.")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--employees", type=int, default=10_000)
+    args = parser.parse_args()
+
+    run(args.tasks, args.employees)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.employee import Employee
+from app.models.task import Task
+
+
+def generate_employees(count: int, start_id: int = 1) -> list[dict]:
+    """
+    Генерация синтетических сотрудников.
+    Args:
+        count (int): Количество сотрудников.
+        start_id (int): Идентификатор первого сотрудника (по умолчанию 1).
+    Returns:
+        list[dict]: Список словарей для вставки в таблицу employees.
+    """
+    return [
+        {"id": employee_id, "full_name": f"Employee {employee_id}", "position": f"Position {employee_id % 10}"}
+        for employee_id in range(start_id, start_id + count)
+    ]
+
+
+def generate_task_forest(
+    count: int,
+    employee_ids: list[int],
+    depth: int = 3,
+    root_ratio: float = 0.2,
+    assigned_ratio: float = 0.7,
+    active_ratio: float = 0.5,
+    start_id: int = 1,
+    seed: int = 0,
+) -> list[dict]:
+    """
+    Генерация леса задач заданного размера и глубины.
+
+    Родительская задача всегда создается раньше дочерней, поэтому строки можно вставлять по порядку.
+    Активными становятся только задачи с исполнителем, как того требует TaskBaseSchema.
+    Args:
+        count (int): Количество задач.
+        employee_ids (list[int]): Идентификаторы сотрудников, которым назначаются задачи.
+        depth (int): Максимальная глубина дерева (1 - только корневые задачи).
+        root_ratio (float): Доля корневых задач.
+        assigned_ratio (float): Доля задач с исполнителем.
+        active_ratio (float): Доля активных задач среди задач с исполнителем.
+        start_id (int): Идентификатор первой задачи (по умолчанию 1).
+        seed (int): Зерно генератора случайных чисел.
+    Returns:
+        list[dict]: Список словарей для вставки в таблицу tasks.
+    """
+    rnd = random.Random(seed)
+    now = datetime(2030, 1, 1)
+    tasks = []
+    # Задачи, к которым еще можно добавить дочерние (не достигшие максимальной глубины)
+    parents = []
+
+    for task_id in range(start_id, start_id + count):
+        parent_task_id, level = None, 1
+
+        if parents and rnd.random() >= root_ratio:
+            parent_task_id, parent_level = rnd.choice(parents)
+            level = parent_level + 1
+
+        executor_id = rnd.choice(employee_ids) if employee_ids and rnd.random() < assigned_ratio else None
+
+        tasks.append({
+            "id": task_id,
+            "title": f"Task {task_id}",
+            "parent_task_id": parent_task_id,
+            "executor_id": executor_id,
+            "deadline": now + timedelta(hours=rnd.randint(0, 24 * 365)) if rnd.random() < 0.8 else None,
+            "is_active": executor_id is not None and rnd.random() < active_ratio,
+        })
+
+        if level < depth:
+            parents.append((task_id, level))
+
+    return tasks
+
+
+def generate_task_chain(count: int, start_id: int = 1) -> list[dict]:
+    """
+    Генерация цепочки задач: каждая следующая задача - дочерняя для предыдущей.
+    Args:
+        count (int): Количество задач (глубина цепочки).
+        start_id (int): Идентификатор первой (корневой) задачи (по умолчанию 1).
+    Returns:
+        list[dict]: Список словарей для вставки в таблицу tasks.
+    """
+    now = datetime(2030, 1, 1)
+
+    return [
+        {
+            "id": task_id,
+            "title": f"Task {task_id}",
+            "parent_task_id": task_id - 1 if task_id > start_id else None,
+            "executor_id": None,
+            "deadline": now + timedelta(hours=task_id - start_id),
+            "is_active": False,
+        }
+        for task_id in range(start_id, start_id + count)
+    ]
+
+
+def seed_database(db: Session, employees: list[dict], tasks: list[dict], chunk_size: int = 5000) -> None:
+    """
+    Вставка синтетических данных пачками.
+    Args:
+        db (Session): Сессия базы данных SQLAlchemy.
+        employees (list[dict]): Сотрудники для вставки.
+        tasks (list[dict]): Задачи для вставки.
+        chunk_size (int): Размер пачки (по умолчанию 5000).
+    Returns:
+        None
+    """
+    for model, rows in ((Employee, employees), (Task, tasks)):
+        for start in range(0, len(rows), chunk_size):
+            db.execute(insert(model), rows[start:start + chunk_size])
+
+    db.commit()
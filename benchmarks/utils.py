@@ -0,0 +1,295 @@
+import asyncio
+import json
+import os
+import platform
+import statistics
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Callable
+
+import httpx
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, configure_sqlite_engine, get_db, get_engine_options
+from app.metrics import PoolMetrics
+from app.models.employee import Employee
+from app.models.task import Task
+
+load_dotenv()
+
+# URL базы данных для бенчмарков. Таблицы в ней пересоздаются при каждом прогоне.
+BENCHMARK_DATABASE_URL = os.getenv("BENCHMARK_DATABASE_URL", "sqlite:///./benchmark.db")
+
+TABLES = [Employee.__table__, Task.__table__]
+
+
+def create_benchmark_engine(url: str = BENCHMARK_DATABASE_URL) -> Engine:
+    """
+    Создание engine для бенчмарков с параметрами пула и настройками соединений SQLite, как у приложения.
+    Args:
+        url (str): URL базы данных (по умолчанию BENCHMARK_DATABASE_URL).
+    Returns:
+        Engine: SQLAlchemy engine.
+    """
+    return configure_sqlite_engine(create_engine(url, **get_engine_options(url, PoolMetrics())))
+
+
+def reset_schema(engine: Engine) -> None:
+    """
+    Пересоздание таблиц employees и tasks.
+    Args:
+        engine (Engine): SQLAlchemy engine.
+    Returns:
+        None
+    """
+    Base.metadata.drop_all(bind=engine, tables=list(reversed(TABLES)))
+    Base.metadata.create_all(bind=engine, tables=TABLES)
+
+    if engine.dialect.name == "postgresql":
+        # Синтетические данные вставляются с явными идентификаторами, сдвигаем последовательности.
+        with engine.begin() as connection:
+            for table in TABLES:
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), 1000000000)"
+                ))
+
+
+class QueryCounter:
+    """
+    Счетчик SQL-запросов, выполненных через engine.
+    Attributes:
+        statements (list[str]): Выполненные запросы.
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine: Engine):
+    """
+    Контекстный менеджер, подсчитывающий запросы, выполненные через engine внутри блока.
+    Args:
+        engine (Engine): SQLAlchemy engine.
+    Yields:
+        QueryCounter: Счетчик запросов.
+    """
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter._before_cursor_execute)
+
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter._before_cursor_execute)
+
+
+def measure(func, rounds: int = 5, setup: Callable[[], tuple] | None = None) -> dict:
+    """
+    Многократный замер времени выполнения функции.
+    Args:
+        func (Callable[..., Any]): Измеряемая функция.
+        rounds (int): Количество повторов (по умолчанию 5).
+        setup (Callable[[], tuple] | None): Подготовка аргументов функции перед каждым повтором,
+            не входит в замер. Без нее функция вызывается без аргументов.
+    Returns:
+        dict: Минимальное, медианное и среднее время в секундах.
+    """
+    timings = []
+
+    for _ in range(rounds):
+        args = setup() if setup is not None else ()
+        started = perf_counter()
+        func(*args)
+        timings.append(perf_counter() - started)
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "rounds": rounds,
+    }
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Перцентиль по методу ближайшего ранга.
+    Args:
+        values (list[float]): Отсортированные значения.
+        q (float): Перцентиль от 0 до 100.
+    Returns:
+        float: Значение перцентиля.
+    """
+    if not values:
+        return 0.0
+
+    rank = max(int(round(q / 100 * len(values))) - 1, 0)
+
+    return values[min(rank, len(values) - 1)]
+
+
+def summarize_latencies(latencies: list[float], elapsed: float) -> dict:
+    """
+    Сводка по задержкам запросов нагрузочного теста.
+    Args:
+        latencies (list[float]): Задержки отдельных запросов в секундах.
+        elapsed (float): Общая длительность теста в секундах.
+    Returns:
+        dict: p50/p95/p99 в миллисекундах, количество запросов и запросов в секунду.
+    """
+    latencies = sorted(latencies)
+
+    return {
+        "requests": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+    }
+
+
+def use_benchmark_database(app, engine: Engine) -> None:
+    """
+    Переопределение зависимости get_db приложения на сессии базы данных бенчмарков.
+    Args:
+        app (FastAPI): Приложение.
+        engine (Engine): SQLAlchemy engine базы данных бенчмарков.
+    Returns:
+        None
+    """
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+
+
+async def run_asgi_load(app, paths: list[str], concurrency: int, total_requests: int) -> dict:
+    """
+    Нагрузка ASGI-приложения GET-запросами от concurrency одновременных клиентов внутри процесса, без сети.
+    Args:
+        app (FastAPI): Приложение.
+        paths (list[str]): Пути, запрашиваемые по кругу.
+        concurrency (int): Количество одновременных клиентов.
+        total_requests (int): Общее количество запросов.
+    Returns:
+        dict: Сводка по задержкам и пропускной способности (summarize_latencies) и количество ошибок
+            (ответов с кодом, отличным от 200).
+    """
+    latencies = []
+    errors = 0
+    counter = iter(range(total_requests))
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            nonlocal errors
+
+            for number in counter:
+                started = perf_counter()
+                response = await client.get(paths[number % len(paths)])
+                latencies.append(perf_counter() - started)
+
+                if response.status_code != 200:
+                    errors += 1
+
+        started = perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = perf_counter() - started
+
+    return {**summarize_latencies(latencies, elapsed), "errors": errors}
+
+
+def save_results(path: str, results: dict[str, dict]) -> None:
+    """
+    Сохранение результатов прогона в JSON-файл (базовая линия для режима сравнения).
+    Args:
+        path (str): Путь к файлу.
+        results (dict[str, dict]): Результаты по именам замеров.
+    Returns:
+        None
+    """
+    document = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "database": create_benchmark_engine().dialect.name,
+        "results": results,
+    }
+
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(document, file, indent=2, ensure_ascii=False)
+
+
+def load_results(path: str) -> dict[str, dict]:
+    """
+    Загрузка результатов прогона, сохраненных save_results.
+    Args:
+        path (str): Путь к файлу.
+    Returns:
+        dict[str, dict]: Результаты по именам замеров.
+    """
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def compare_results(
+    baseline: dict[str, dict], current: dict[str, dict], metric: str, threshold: float
+) -> list[tuple[str, float, float, float]]:
+    """
+    Поиск регрессий: замеров, у которых значение metric выросло больше чем на threshold относительно базовой линии.
+    Замеры, которых нет в одном из прогонов, не сравниваются.
+    Args:
+        baseline (dict[str, dict]): Результаты базовой линии.
+        current (dict[str, dict]): Результаты текущего прогона.
+        metric (str): Сравниваемое значение (чем меньше, тем лучше), например "median" или "p95_ms".
+        threshold (float): Допустимый относительный рост, например 0.2 - на 20%.
+    Returns:
+        list[tuple[str, float, float, float]]: Имя замера, значение в базовой линии, текущее значение
+            и относительное изменение для каждой регрессии.
+    """
+    regressions = []
+
+    for name, result in current.items():
+        if name not in baseline or not baseline[name][metric]:
+            continue
+
+        before, after = baseline[name][metric], result[metric]
+        change = after / before - 1
+
+        if change > threshold:
+            regressions.append((name, before, after, change))
+
+    return regressions
+
+
+def report_regressions(regressions: list[tuple[str, float, float, float]], unit: str) -> None:
+    """
+    Вывод найденных регрессий.
+    Args:
+        regressions (list[tuple[str, float, float, float]]): Результат compare_results.
+        unit (str): Единица измерения значений для вывода.
+    Returns:
+        None
+    """
+    if not regressions:
+        print("no regressions")
+        return
+
+    print(f"regressions: {len(regressions)}")
+
+    for name, before, after, change in regressions:
+        print(f"  {name}: {before:.3f} -> {after:.3f} {unit} (+{change:.0%})")
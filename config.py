@@ -4,4 +4,94 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-POSTGRESQL_DATABASE_URL = os.getenv("POSTGRESQL_DATABASE_URL")
+
+def get_bool_env(name: str, default: bool = False) -> bool:
+    """
+    Чтение логического значения из переменной окружения.
+    Args:
+        name (str): Имя переменной окружения.
+        default (bool): Значение по умолчанию, если переменная не задана.
+    Returns:
+        bool: True для значений "1", "true", "yes", "on" (без учета регистра).
+    """
+    value = os.getenv(name)
+
+    if value is None:
+        return default
+
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Профиль базы данных: "postgresql" (по умолчанию) - URL базы данных обязателен, "sqlite" - без URL используется
+# файл SQLite tracker.db в текущем каталоге (схема создается миграциями).
+DATABASE_PROFILE = os.getenv("DATABASE_PROFILE", "postgresql")
+
+if DATABASE_PROFILE not in ("postgresql", "sqlite"):
+    raise ValueError(f"Unknown database profile: {DATABASE_PROFILE}")
+
+# URL базы данных приложения, sqlite:// - база данных SQLite в памяти процесса.
+POSTGRESQL_DATABASE_URL = os.getenv("POSTGRESQL_DATABASE_URL") or (
+    "sqlite:///./tracker.db" if DATABASE_PROFILE == "sqlite" else None
+)
+
+if POSTGRESQL_DATABASE_URL is None:
+    raise RuntimeError("POSTGRESQL_DATABASE_URL is not set (DATABASE_PROFILE=sqlite uses a local SQLite file)")
+
+# Режим работы роутеров с базой данных: "sync" (синхронная сессия в пуле потоков)
+# или "async" (AsyncSession поверх asyncpg). Админ-панель всегда использует синхронный engine.
+DATABASE_MODE = os.getenv("DATABASE_MODE", "sync")
+
+# Пул соединений. Значения по умолчанию совпадают со значениями SQLAlchemy.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+# Время ожидания свободного соединения в секундах.
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+# Время жизни соединения в секундах, -1 - без ограничения.
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", -1))
+DB_POOL_PRE_PING = get_bool_env("DB_POOL_PRE_PING")
+# Выдавать последнее возвращенное соединение: лишние соединения простаивают и закрываются по recycle.
+DB_POOL_USE_LIFO = get_bool_env("DB_POOL_USE_LIFO")
+# Без пула на стороне приложения, например, за pgbouncer.
+DB_USE_NULLPOOL = get_bool_env("DB_USE_NULLPOOL")
+# Ограничение времени выполнения запроса в миллисекундах (PostgreSQL), 0 - без ограничения.
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+
+# Кэш чтения задач и сотрудников по идентификатору: "none" (выключен), "memory" (LRU в памяти процесса)
+# или "redis" (общий для процессов кэш по протоколу Redis, адрес - CACHE_REDIS_URL).
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "none")
+# Максимальное количество записей кэша в памяти процесса.
+CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", 10000))
+# Время жизни записи в секундах: ограничивает устаревание при изменениях в обход CRUD-функций.
+CACHE_TTL = float(os.getenv("CACHE_TTL", 60))
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+# Максимальная глубина обхода иерархии задач (потомки, предки, проверка циклов).
+TASK_GRAPH_MAX_DEPTH = int(os.getenv("TASK_GRAPH_MAX_DEPTH", 10000))
+
+# Граф задач в памяти процесса для частых аналитических запросов (важные задачи, сводка по поддереву).
+# Загружается при запуске приложения и обновляется при изменении задач и сотрудников через CRUD-функции.
+TASK_GRAPH_INDEX = get_bool_env("TASK_GRAPH_INDEX")
+# Интервал сверки графа задач с базой данных в секундах: ограничивает устаревание при изменениях
+# в обход CRUD-функций и в других процессах приложения.
+TASK_GRAPH_RECONCILE_INTERVAL = float(os.getenv("TASK_GRAPH_RECONCILE_INTERVAL", 300))
+
+# Метрики запросов по маршрутам (/metrics) и заголовок Server-Timing в ответах.
+METRICS_ENABLED = get_bool_env("METRICS_ENABLED", True)
+
+# Сжатие ответов (zstd, br или gzip по заголовку Accept-Encoding) и минимальный размер сжимаемого ответа в байтах.
+# Кодировки br и zstd доступны, если установлены библиотеки brotli и zstandard.
+COMPRESSION_ENABLED = get_bool_env("COMPRESSION_ENABLED", True)
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024))
+
+# Страницы списков задач и сотрудников с limit больше порога отправляются потоком: строки читаются курсором
+# и кодируются частями, поэтому память и время до первого байта не зависят от размера страницы.
+LIST_STREAM_THRESHOLD = int(os.getenv("LIST_STREAM_THRESHOLD", 1000))
+
+# Снимки дорогих отчетов (важные задачи, рейтинг нагрузки сотрудников), пересчитываемые в фоновых потоках.
+# Эндпоинты отдают последний снимок с его возрастом (заголовок Age), параметр fresh=true считает отчет заново.
+ANALYTICS_SNAPSHOTS = get_bool_env("ANALYTICS_SNAPSHOTS")
+# Интервалы пересчета снимков в секундах.
+IMPORTANT_TASKS_SNAPSHOT_INTERVAL = float(os.getenv("IMPORTANT_TASKS_SNAPSHOT_INTERVAL", 60))
+WORKLOAD_SNAPSHOT_INTERVAL = float(os.getenv("WORKLOAD_SNAPSHOT_INTERVAL", 60))
+# Количество первых сотрудников рейтинга нагрузки в снимке: страницы дальше считаются по запросу.
+WORKLOAD_SNAPSHOT_SIZE = int(os.getenv("WORKLOAD_SNAPSHOT_SIZE", 1000))
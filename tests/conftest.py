@@ -1,34 +1,65 @@
 import os
-from contextlib import closing
+import tempfile
+from contextlib import closing, contextmanager
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, StaticPool
+from sqlalchemy import create_engine, delete, event, make_url, select, NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy_utils import create_database, drop_database
 
-from app.database import Base, get_db
+# Приложению нужен URL базы данных при импорте, но тесты переопределяют get_db и get_async_db:
+# без POSTGRESQL_DATABASE_URL используется профиль sqlite.
+os.environ.setdefault("DATABASE_PROFILE", "sqlite")
+
+from app.cache import get_cache
+from app.crud.task_crud import important_tasks_memo
+from app.database import (
+    Base,
+    configure_sqlite_engine,
+    get_async_database_url,
+    get_async_db,
+    get_db,
+)
 from app.main import app
 from app.models.employee import Employee
 from app.models.task import Task
+from app.routers import employee_async, task_async
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
 from tests.fixtures import new_employee_data, new_task_data
 
-# URL тестовой базы данных из переменной окружения.
-SQLALCHEMY_DATABASE_URL = os.getenv("TEST_POSTGRESQL_DATABASE_URL")
+# Каталог тестовой базы данных SQLite по умолчанию, удаляется после завершения тестов.
+TEST_DATABASE_DIR = tempfile.TemporaryDirectory(prefix="tracker_test_")
+
+# URL существующей тестовой базы данных из переменной окружения. По умолчанию - файл SQLite во временном каталоге:
+# тесты не требуют сервера PostgreSQL. Файл, а не база данных в памяти, нужен для тестов одновременных
+# изменений: блокировки общей базы данных в памяти не ожидают снятия (busy_timeout), а сразу дают ошибку.
+SQLALCHEMY_DATABASE_URL = os.getenv(
+    "TEST_POSTGRESQL_DATABASE_URL", f"sqlite:///{os.path.join(TEST_DATABASE_DIR.name, 'test.db')}"
+)
 
-# Создание тестовой БД.
-create_database(SQLALCHEMY_DATABASE_URL)
+# Соединение SQLite используется из пула потоков тестового клиента, а не только из создавшего его потока.
+connect_args = {"check_same_thread": False} if make_url(SQLALCHEMY_DATABASE_URL).get_backend_name() == "sqlite" else {}
 
-# Создание SQLAlchemy engine с использованием StaticPool для тестовой БД.
-engine = create_engine(SQLALCHEMY_DATABASE_URL, poolclass=StaticPool)
+# Создание SQLAlchemy engine для тестовой БД.
+engine = configure_sqlite_engine(create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args))
 
-# Создание TestingSessionLocal, который будет использоваться в тестах.
+# Создание TestingSessionLocal, который будет использоваться в тестах. На время теста фикстура db_connection
+# привязывает его к соединению теста.
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Создание таблицы для модели Employee.
-Base.metadata.create_all(bind=engine, tables=[Employee.__table__])
+# Асинхронный engine для тестовой БД. NullPool не переносит соединения между циклами событий тестового клиента.
+async_engine = create_async_engine(get_async_database_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool)
+configure_sqlite_engine(async_engine.sync_engine)
+
+# Создание AsyncTestingSessionLocal для тестов асинхронных роутеров.
+AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
-# Создание таблицы для модели Task.
-Base.metadata.create_all(bind=engine, tables=[Task.__table__])
+# Таблицы тестовой БД.
+TABLES = [Employee.__table__, Task.__table__]
+
+# Идентификаторы исходных данных по моделям: остальные строки удаляются после тестов с фикстурой committed.
+seed_ids = {}
 
 
 def bulk_insert_data(session, model, data):
@@ -55,16 +86,30 @@ def override_get_db():
         yield db
 
 
-# Переопределение зависимости get_db в приложении для использования TestingSessionLocal.
+async def override_get_async_db():
+    """Переопределенная зависимость get_async_db для тестовых целей.
+    Returns:
+        sqlalchemy.ext.asyncio.AsyncSession: Асинхронная сессия SQLAlchemy для взаимодействия с базой данных.
+    """
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+
+# Переопределение зависимостей get_db и get_async_db в приложении для использования тестовой БД.
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 
 @pytest.fixture(scope="session", autouse=True)
-def cleanup_database():
-    """Фикстура для очистки базы данных после завершения всех тестов.
+def prepare_database():
+    """Фикстура подготовки тестовой базы данных: таблицы пересоздаются и заполняются исходными данными
+    при каждом запуске, сама база данных не создается и не удаляется.
     Yields:
         None
     """
+    Base.metadata.drop_all(bind=engine, tables=TABLES)
+    Base.metadata.create_all(bind=engine, tables=TABLES)
+
     # Создание сессии для взаимодействия с БД.
     with closing(TestingSessionLocal()) as db:
         # Массовая вставка данных в таблицу Employee.
@@ -72,11 +117,176 @@ def cleanup_database():
         # Массовая вставка данных в таблицу Task.
         bulk_insert_data(db, Task, new_task_data)
 
+        for model in (Employee, Task):
+            seed_ids[model] = set(db.scalars(select(model.id)))
+
     yield
 
-    # Удаление БД.
-    drop_database(SQLALCHEMY_DATABASE_URL)
+    engine.dispose()
+    TEST_DATABASE_DIR.cleanup()
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "module_transaction: тесты модуля выполняются по порядку в одной транзакции (module_connection)"
+    )
+    config.addinivalue_line("markers", "forest(start_id, tasks, employees, **options): размер фикстуры forest")
+
+
+@contextmanager
+def bind_sessions(connection):
+    """Контекстный менеджер, привязывающий TestingSessionLocal, а через него и зависимость get_db тестового клиента,
+    к соединению: коммиты сессий фиксируют только точку сохранения (SAVEPOINT) во внешней транзакции соединения.
+    Args:
+        connection (sqlalchemy.engine.Connection): Соединение с открытой транзакцией.
+    Yields:
+        sqlalchemy.engine.Connection: То же соединение.
+    """
+    options = dict(TestingSessionLocal.kw)
+    TestingSessionLocal.configure(bind=connection, join_transaction_mode="create_savepoint")
+
+    try:
+        yield connection
+    finally:
+        TestingSessionLocal.kw = options
+
+
+@pytest.fixture(scope="module")
+def module_connection():
+    """Фикстура соединения, общего для тестов модуля с меткой module_transaction. Тесты такого модуля - шаги
+    одного сценария (создание, чтение, изменение и удаление записей), изменения откатываются после модуля.
+    Yields:
+        sqlalchemy.engine.Connection: Соединение модуля.
+    """
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        yield connection
+        transaction.rollback()
+
+
+@pytest.fixture(autouse=True)
+def db_connection(request):
+    """Фикстура соединения, все изменения в котором откатываются после завершения теста (bind_sessions).
+    Тесты модулей с меткой module_transaction используют соединение модуля (module_connection),
+    тесты с фикстурой committed выполняются без внешней транзакции.
+    Yields:
+        sqlalchemy.engine.Connection | None: Соединение теста или None для тестов с фикстурой committed.
+    """
+    if "committed" in request.fixturenames:
+        yield None
+    elif request.node.get_closest_marker("module_transaction"):
+        with bind_sessions(request.getfixturevalue("module_connection")) as connection:
+            yield connection
+    else:
+        with engine.connect() as connection:
+            transaction = connection.begin()
+
+            with bind_sessions(connection):
+                yield connection
+
+            transaction.rollback()
+
+
+@pytest.fixture()
+def committed():
+    """Фикстура для тестов, которым нужны зафиксированные изменения: запросы асинхронного клиента и потоки
+    с собственными соединениями не видят транзакцию db_connection. Изменения теста фиксируются в базе данных,
+    после теста удаляются задачи и сотрудники, которых нет в исходных данных.
+    Yields:
+        None
+    """
+    yield
+
+    with closing(TestingSessionLocal()) as db:
+        db.execute(delete(Task).where(Task.id.not_in(seed_ids[Task])))
+        db.execute(delete(Employee).where(Employee.id.not_in(seed_ids[Employee])))
+        db.commit()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Фикстура очистки кэша чтения и сохраненных результатов после теста,
+    чтобы данные тестов с откатом транзакции не попадали в другие тесты.
+    Yields:
+        None
+    """
+    yield
+    get_cache().clear()
+    important_tasks_memo.clear()
+
+
+@pytest.fixture()
+def forest(request):
+    """Фикстура синтетического леса задач с сотрудниками (benchmarks.data). Размер задается меткой forest
+    теста или модуля: start_id - первый идентификатор (явный, чтобы не сдвигать последовательности), tasks
+    и employees - количество задач и сотрудников, остальные параметры передаются generate_task_forest.
+    Данные вставляются через TestingSessionLocal: откатываются после теста или, с фикстурой committed, фиксируются.
+    Returns:
+        list[dict]: Задачи леса.
+    """
+    options = dict(request.node.get_closest_marker("forest").kwargs)
+    start_id = options.pop("start_id")
+    employees = generate_employees(options.pop("employees"), start_id=start_id)
+    tasks = generate_task_forest(
+        options.pop("tasks"), [employee["id"] for employee in employees], start_id=start_id, **options
+    )
+
+    with closing(TestingSessionLocal()) as db:
+        seed_database(db, employees, tasks)
+
+    return tasks
+
+
+@pytest.fixture()
+def db_session(db_connection):
+    """Фикстура сессии в соединении теста (db_connection), все изменения в которой откатываются
+    после завершения теста.
+    Yields:
+        sqlalchemy.orm.Session: Сессия SQLAlchemy для взаимодействия с базой данных.
+    """
+    with TestingSessionLocal() as session:
+        yield session
+
+
+# Команды точек сохранения SQLAlchemy.
+SAVEPOINT_COMMANDS = ("SAVEPOINT ", "RELEASE SAVEPOINT ", "ROLLBACK TO SAVEPOINT ")
+
+
+@contextmanager
+def assert_max_queries(limit):
+    """Контекстный менеджер, проверяющий, что код внутри блока выполнил не больше limit SQL-запросов.
+    Учитываются запросы синхронного и асинхронного тестовых engine, поэтому подходит для любых эндпоинтов.
+    Команды точек сохранения, которыми сессии работают в соединении теста (db_connection), не учитываются.
+    Args:
+        limit (int): Допустимое количество запросов.
+    Yields:
+        list[str]: Выполненные запросы.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not statement.startswith(SAVEPOINT_COMMANDS):
+            statements.append(statement)
+
+    engines = (engine, async_engine.sync_engine)
+    for bind in engines:
+        event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for bind in engines:
+            event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+    assert len(statements) <= limit, f"{len(statements)} queries, expected at most {limit}:\n" + "\n".join(statements)
 
 
 # Создание тестового клиента для взаимодействия с FastAPI-приложением.
 client = TestClient(app)
+
+# Приложение с асинхронными роутерами (DATABASE_MODE=async) и теми же переопределениями зависимостей.
+async_app = FastAPI()
+async_app.include_router(employee_async.router)
+async_app.include_router(task_async.router)
+async_app.dependency_overrides = app.dependency_overrides
+
+async_client = TestClient(async_app)
@@ -0,0 +1,92 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware, GzipEncoder, choose_encoding
+from tests.conftest import client
+
+BODY = "task " * 1000
+
+compression_app = FastAPI()
+compression_app.add_middleware(CompressionMiddleware, minimum_size=100, encoders={"gzip": GzipEncoder})
+
+
+@compression_app.get("/large")
+def large():
+    return PlainTextResponse(BODY, headers={"ETag": '"v1"'})
+
+
+@compression_app.get("/small")
+def small():
+    return PlainTextResponse("task")
+
+
+@compression_app.get("/encoded")
+def encoded():
+    return PlainTextResponse(BODY, headers={"Content-Encoding": "identity"})
+
+
+@compression_app.get("/stream")
+def stream():
+    return StreamingResponse(iter([BODY.encode(), b"", BODY.encode()]), media_type="text/plain")
+
+
+compression_client = TestClient(compression_app)
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate", "gzip"),
+    ("br;q=0.5, gzip;q=0.8, zstd", "zstd"),
+    ("gzip, br, zstd", "zstd"),
+    ("gzip;q=0.5, br;q=0.5", "br"),
+    ("*;q=0.3, zstd;q=0", "br"),
+    ("GZIP;q=1.0", "gzip"),
+    ("gzip;q=0, identity", None),
+    ("gzip;q=abc", None),
+    ("", None),
+])
+def test_choose_encoding(accept_encoding, expected):
+    assert choose_encoding(accept_encoding, {"zstd": None, "br": None, "gzip": None}) == expected
+
+
+def test_compress_large_response():
+    response = compression_client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.text == BODY
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    # Байты сжатого ответа отличаются от несжатого, поэтому его ETag слабый.
+    assert response.headers["ETag"] == 'W/"v1"'
+    assert int(response.headers["Content-Length"]) == response.num_bytes_downloaded < len(BODY)
+
+    response = compression_client.get("/large", headers={"Accept-Encoding": "br"})
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["ETag"] == '"v1"'
+    assert response.num_bytes_downloaded == len(BODY)
+
+
+def test_skip_small_and_encoded_responses():
+    for url in ["/small", "/encoded"]:
+        response = compression_client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert response.headers.get("Content-Encoding") in (None, "identity")
+        assert "Vary" not in response.headers
+
+
+def test_compress_streaming_response():
+    with compression_client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        chunks = list(response.iter_raw())
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert gzip.decompress(b"".join(chunks)).decode() == BODY * 2
+
+
+def test_app_compresses_responses():
+    # Ответы приложения сжимаются кодировкой, которую тестовый клиент запрашивает по умолчанию.
+    response = client.get("/openapi.json")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.json()["paths"]
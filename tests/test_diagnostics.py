@@ -0,0 +1,139 @@
+import re
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool
+
+import config
+from app.database import configure_sqlite_engine, get_engine_options
+from app.metrics import PoolMetrics, format_labels, get_pool_status, instrumented_pool_class, request_metrics
+from tests.conftest import client, SQLALCHEMY_DATABASE_URL, engine
+
+
+def test_read_pool_status():
+    response = client.get("/diagnostics/pool")
+
+    assert response.status_code == 200
+
+    pools = response.json()
+    assert set(pools) == {"sync_engine", "async_engine"}
+    assert pools["sync_engine"]["checkout_wait"]["buckets"][-1][0] == "+Inf"
+
+
+def test_instrumented_pool_records_checkout_wait():
+    metrics = PoolMetrics()
+    pool_engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        poolclass=instrumented_pool_class(QueuePool, metrics),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+
+    with pool_engine.connect():
+        status = get_pool_status(pool_engine.pool, metrics)
+        assert status["checked_out"] == 1
+        assert status["overflow"] == 0
+
+        with pytest.raises(PoolTimeoutError):
+            pool_engine.connect()
+
+    pool_engine.dispose()
+
+    status = get_pool_status(pool_engine.pool, metrics)
+    assert status["checked_out"] == 0
+    assert status["timeouts"] == 1
+    assert status["checkout_wait"]["count"] == 2
+    assert status["checkout_wait"]["sum"] >= 0.05
+    # Ожидание до таймаута (0.05 с) не попадает в корзину 0.025 с.
+    assert dict((str(bound), count) for bound, count in status["checkout_wait"]["buckets"])["0.025"] <= 1
+
+
+def test_engine_options_from_config(monkeypatch):
+    monkeypatch.setattr(config, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(config, "DB_POOL_USE_LIFO", True)
+    monkeypatch.setattr(config, "DB_STATEMENT_TIMEOUT_MS", 1500)
+
+    options = get_engine_options("postgresql://user@localhost/db", PoolMetrics())
+    assert issubclass(options["poolclass"], QueuePool)
+    assert options["pool_size"] == 20
+    assert options["pool_use_lifo"] is True
+    assert options["connect_args"] == {"options": "-c statement_timeout=1500"}
+
+    options = get_engine_options("postgresql+asyncpg://user@localhost/db", PoolMetrics(), is_async=True)
+    assert options["connect_args"] == {"server_settings": {"statement_timeout": "1500"}}
+
+    monkeypatch.setattr(config, "DB_USE_NULLPOOL", True)
+    options = get_engine_options("postgresql://user@localhost/db", PoolMetrics())
+    assert options["poolclass"] is NullPool
+    assert "pool_size" not in options
+
+
+def test_sqlite_profile(tmp_path):
+    options = get_engine_options("sqlite://", PoolMetrics())
+    assert issubclass(options["poolclass"], QueuePool)
+    assert (options["pool_size"], options["max_overflow"]) == (1, 0)
+
+    sqlite_engine = configure_sqlite_engine(create_engine(f"sqlite:///{tmp_path / 'profile.db'}"))
+
+    with sqlite_engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert connection.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+
+    # Откат транзакции отменяет изменения, зафиксированные внутри нее точкой сохранения, в том числе DDL.
+    with sqlite_engine.connect() as connection:
+        with connection.begin() as transaction:
+            connection.exec_driver_sql("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+            with connection.begin_nested():
+                connection.exec_driver_sql("INSERT INTO items VALUES (1)")
+            transaction.rollback()
+
+        assert connection.exec_driver_sql("SELECT count(*) FROM sqlite_master WHERE name = 'items'").scalar() == 0
+
+    sqlite_engine.dispose()
+
+
+@pytest.mark.skipif(engine.dialect.name != "postgresql", reason="statement_timeout есть только в PostgreSQL")
+def test_statement_timeout_applied(monkeypatch):
+    monkeypatch.setattr(config, "DB_STATEMENT_TIMEOUT_MS", 1500)
+    timeout_engine = create_engine(SQLALCHEMY_DATABASE_URL, **get_engine_options(SQLALCHEMY_DATABASE_URL, PoolMetrics()))
+
+    with timeout_engine.connect() as connection:
+        assert connection.execute(text("SHOW statement_timeout")).scalar() == "1500ms"
+
+    timeout_engine.dispose()
+
+
+def test_server_timing_header():
+    response = client.get("/employees/", params={"limit": 5})
+
+    assert response.status_code == 200
+
+    timing = response.headers["server-timing"]
+    assert re.fullmatch(r'db;dur=[\d.]+;desc="(\d+) statements", serialize;dur=[\d.]+, app;dur=[\d.]+', timing)
+    assert int(re.search(r"(\d+) statements", timing).group(1)) >= 1
+
+
+def test_read_metrics():
+    request_metrics.clear()
+    client.get("/employees/", params={"limit": 5})
+    client.get("/employees/0")
+    client.get("/no-such-path")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    text = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/employees/"} 1' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/employees/",le="+Inf"} 1' in text
+    assert 'http_responses_total{method="GET",route="/employees/{employee_id}",status="404"} 1' in text
+    assert 'http_responses_total{method="GET",route="<unmatched>",status="404"} 1' in text
+    assert re.search(r'http_request_db_statements_total\{method="GET",route="/employees/"\} [1-9]', text)
+    assert 'db_pool_timeouts_total{engine="sync"}' in text
+
+
+def test_format_labels_escaping():
+    assert format_labels({"route": 'a"b\\c\nd', "status": 200}) == '{route="a\\"b\\\\c\\nd",status="200"}'
@@ -1,5 +1,10 @@
+import pytest
+
 from tests.conftest import client
 
+# Тесты модуля - шаги одного сценария: создание, чтение, изменение и удаление.
+pytestmark = pytest.mark.module_transaction
+
 
 def test_create_new_employee():
     new_employee_data = [
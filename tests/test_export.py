@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.crud.task_crud import iter_tasks
+from app.models.employee import Employee
+from app.models.task import Task
+from tests.conftest import client
+
+# Идентификаторы синтетических данных заданы явно, чтобы не сдвигать последовательности.
+START_ID = 300000
+
+
+@pytest.fixture()
+def seeded_tasks(db_session):
+    db_session.execute(insert(Employee), [{"id": START_ID, "full_name": "Export Employee", "position": "Tester"}])
+    db_session.execute(insert(Task), [
+        {
+            "id": START_ID + number,
+            "title": f"Task {number}",
+            "executor_id": START_ID if number % 2 else None,
+            "deadline": datetime(2030, 1, 1) + timedelta(days=number),
+            "is_active": number % 3 != 0,
+        }
+        for number in range(30)
+    ])
+    return db_session
+
+
+def test_iter_tasks_filters(seeded_tasks):
+    rows = list(iter_tasks(
+        seeded_tasks,
+        is_active=True,
+        executor_id=START_ID,
+        deadline_from=datetime(2030, 1, 5),
+        deadline_to=datetime(2030, 1, 20),
+        chunk_size=4,
+    ))
+    expected = [
+        START_ID + number for number in range(4, 20) if number % 2 and number % 3 != 0
+    ]
+
+    assert [row["id"] for row in rows] == expected
+
+
+@pytest.mark.parametrize("path", ["/tasks", "/employees"])
+def test_export_ndjson_matches_list(path):
+    expected = client.get(f"{path}/", params={"limit": 1000}).json()
+    response = client.get(f"{path}/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == expected
+
+
+@pytest.mark.parametrize("path", ["/tasks", "/employees"])
+def test_export_csv(path):
+    expected = client.get(f"{path}/", params={"limit": 1000}).json()
+    response = client.get(f"{path}/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+
+    assert [int(row["id"]) for row in rows] == [item["id"] for item in expected]
+    if expected:
+        assert list(rows[0]) == list(expected[0])
+
+
+def test_export_tasks_filter():
+    expected = [task for task in client.get("/tasks/", params={"limit": 1000}).json() if task["is_active"]]
+    response = client.get("/tasks/export", params={"is_active": True})
+
+    assert [json.loads(line) for line in response.text.splitlines()] == expected
+
+
+def test_export_invalid_format():
+    assert client.get("/tasks/export", params={"format": "xml"}).status_code == 422
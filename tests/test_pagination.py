@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.crud.employee_crud import get_employees
+from app.crud.task_crud import get_tasks
+from app.models.employee import Employee
+from app.models.task import Task
+from app.pagination import InvalidCursorError, encode_cursor, get_next_cursor
+from tests.conftest import client
+
+# Идентификаторы синтетических данных заданы явно, чтобы не сдвигать последовательности.
+START_ID = 200000
+
+
+def walk(fetch, order_by, limit):
+    """Обход всех страниц по курсору, fetch(cursor) возвращает страницу."""
+    items, cursor = [], None
+
+    while True:
+        page = fetch(cursor)
+        items.extend(page)
+        cursor = get_next_cursor(page, order_by, limit)
+
+        if cursor is None:
+            return items
+
+
+@pytest.fixture()
+def seeded_tasks(db_session):
+    base = datetime(2030, 1, 1)
+    db_session.execute(insert(Task), [
+        {
+            "id": START_ID + number,
+            "title": f"Task {number}",
+            # Повторяющиеся сроки и задачи без срока проверяют порядок по id при равных значениях.
+            "deadline": None if number % 7 == 0 else base + timedelta(days=number % 5),
+        }
+        for number in range(50)
+    ])
+    db_session.commit()
+
+    return db_session
+
+
+@pytest.mark.parametrize("order_by", ["id", "deadline"])
+def test_cursor_pagination_matches_offset(seeded_tasks, order_by):
+    expected = [task.id for task in get_tasks(seeded_tasks, limit=1000, order_by=order_by)]
+    walked = walk(lambda cursor: get_tasks(seeded_tasks, limit=7, order_by=order_by, cursor=cursor), order_by, 7)
+
+    assert [task.id for task in walked] == expected
+    assert len(set(expected)) == len(expected)
+
+
+def test_deadline_ordering_puts_tasks_without_deadline_last(seeded_tasks):
+    tasks = [task for task in get_tasks(seeded_tasks, limit=1000, order_by="deadline") if task.id >= START_ID]
+
+    assert [task.deadline is None for task in tasks] == sorted(task.deadline is None for task in tasks)
+    assert all(a.deadline <= b.deadline for a, b in zip(tasks, tasks[1:]) if b.deadline is not None)
+
+
+def test_employee_cursor_pagination_by_full_name(db_session):
+    db_session.execute(insert(Employee), [
+        {"id": START_ID + number, "full_name": f"Employee {number % 4}", "position": "Developer"}
+        for number in range(20)
+    ])
+    db_session.commit()
+
+    expected = [employee.id for employee in get_employees(db_session, limit=1000, order_by="full_name")]
+    walked = walk(
+        lambda cursor: get_employees(db_session, limit=3, order_by="full_name", cursor=cursor), "full_name", 3
+    )
+
+    assert [employee.id for employee in walked] == expected
+
+
+def test_invalid_cursor(db_session):
+    with pytest.raises(InvalidCursorError):
+        get_tasks(db_session, cursor="not a cursor")
+
+    with pytest.raises(InvalidCursorError):
+        get_tasks(db_session, order_by="deadline", cursor=encode_cursor("id", 1, 1))
+
+
+@pytest.mark.parametrize("path", ["/tasks/", "/employees/"])
+def test_read_with_cursor(path):
+    expected = client.get(path).json()
+    items, cursor = [], None
+
+    while True:
+        response = client.get(path, params={"limit": 1, "cursor": cursor} if cursor else {"limit": 1})
+        assert response.status_code == 200
+        items.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+
+        if cursor is None:
+            break
+
+    assert items == expected
+
+    response = client.get(path, params={"cursor": "broken"})
+    assert response.status_code == 400
+
+    response = client.get(path, params={"cursor": encode_cursor("id", 1, 1), "skip": 1})
+    assert response.status_code == 400
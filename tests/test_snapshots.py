@@ -0,0 +1,169 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import insert
+
+from app.cache import bump_version
+from app.models.task import Task
+from app.snapshots import (
+    EMPLOYEE_WORKLOAD,
+    IMPORTANT_TASKS,
+    SnapshotJob,
+    SnapshotScheduler,
+    create_snapshot_jobs,
+    set_snapshot_scheduler,
+)
+from tests.conftest import async_client, TestingSessionLocal, client
+
+# Идентификаторы синтетических данных заданы явно, чтобы не сдвигать последовательности.
+START_ID = 730000
+
+pytestmark = pytest.mark.forest(start_id=START_ID, tasks=60, employees=5, assigned_ratio=0.5)
+
+
+@pytest.fixture()
+def scheduler(forest):
+    # Планировщик без фоновых потоков: снимки рассчитываются в тесте вызовом run.
+    scheduler = SnapshotScheduler(create_snapshot_jobs(), TestingSessionLocal)
+    previous = set_snapshot_scheduler(scheduler)
+
+    for job in scheduler.jobs.values():
+        job.run(TestingSessionLocal)
+
+    yield scheduler
+    set_snapshot_scheduler(previous)
+
+
+@pytest.mark.parametrize("api", [client, async_client], ids=["sync", "async"])
+def test_read_snapshots(committed, scheduler, forest, api):
+    for url in ["/tasks/important/", "/employees/tasks/?limit=3"]:
+        response = api.get(url)
+        fresh = api.get(url, params={"fresh": True})
+
+        assert response.json() == fresh.json()
+        assert response.headers["ETag"] == fresh.headers["ETag"]
+        assert int(response.headers["Age"]) >= 0 and "Age" not in fresh.headers
+
+        response = api.get(url, headers={"If-None-Match": response.headers["ETag"]})
+        assert response.status_code == 304 and "Age" in response.headers
+
+    # Снимок не меняется до следующего расчета, fresh=true видит изменение сразу.
+    root_id = START_ID + len(forest)
+
+    with TestingSessionLocal() as db:
+        db.execute(insert(Task), [
+            {"id": root_id, "title": "Snapshot root"},
+            {"id": root_id + 1, "title": "Snapshot child", "parent_task_id": root_id},
+        ])
+        db.commit()
+
+    bump_version(Task)
+    important = api.get("/tasks/important/").json()
+    fresh = api.get("/tasks/important/", params={"fresh": True}).json()
+    assert len(fresh) == len(important) + 1
+
+    scheduler.jobs[IMPORTANT_TASKS].run(TestingSessionLocal)
+    assert api.get("/tasks/important/").json() == fresh
+
+
+def test_workload_pages_beyond_snapshot(scheduler, monkeypatch):
+    rows = scheduler.jobs[EMPLOYEE_WORKLOAD].snapshot.value
+    assert len(rows) >= 3
+
+    monkeypatch.setattr("config.WORKLOAD_SNAPSHOT_SIZE", 3)
+    scheduler.jobs[EMPLOYEE_WORKLOAD].run(TestingSessionLocal)
+
+    assert "Age" in client.get("/employees/tasks/", params={"skip": 1, "limit": 2}).headers
+
+    # Страница за пределами снимка читается из базы данных.
+    response = client.get("/employees/tasks/", params={"skip": 2, "limit": 2})
+    assert "Age" not in response.headers
+    assert response.json() == client.get("/employees/tasks/", params={"skip": 2, "limit": 2, "fresh": True}).json()
+
+
+def test_snapshot_job_overlap_and_failures():
+    started, release = threading.Event(), threading.Event()
+
+    def compute(db):
+        started.set()
+        release.wait(5)
+        return [1]
+
+    job = SnapshotJob("report", compute, interval=60)
+    thread = threading.Thread(target=job.run, args=(TestingSessionLocal,))
+    thread.start()
+    started.wait(5)
+
+    # Второй расчет во время первого пропускается.
+    assert job.run(TestingSessionLocal) is None
+    release.set()
+    thread.join()
+
+    snapshot = job.snapshot
+    assert snapshot.value == [1] and job.runs == 1 and job.skipped == 1
+
+    job.compute = lambda db: 1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        job.run(TestingSessionLocal)
+
+    assert job.snapshot is snapshot and job.failures == 1
+
+    job.compute = lambda db: [1]
+    # Тот же результат не меняет время изменения снимка.
+    assert job.run(TestingSessionLocal).last_modified == snapshot.last_modified
+    assert job.status()["compute_time"]["count"] == 2
+
+
+def test_scheduler_runs_jobs_periodically():
+    job = SnapshotJob("report", lambda db: time.monotonic(), interval=0.01)
+    scheduler = SnapshotScheduler([job], TestingSessionLocal)
+    previous = set_snapshot_scheduler(scheduler)
+    scheduler.start()
+
+    try:
+        deadline = time.monotonic() + 5
+
+        while job.runs < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        status = client.get("/diagnostics/snapshots").json()
+        metrics = client.get("/metrics").text
+    finally:
+        scheduler.stop()
+        set_snapshot_scheduler(previous)
+
+    assert job.runs >= 3
+    assert status["enabled"] and status["snapshots"]["report"]["runs"] >= 3
+    assert 'snapshot_compute_seconds_count{snapshot="report"}' in metrics
+    assert 'snapshot_age_seconds{snapshot="report"}' in metrics
+    assert client.get("/diagnostics/snapshots").json() == {"enabled": False, "snapshots": {}}
+
+
+def test_scheduler_logs_failures_and_counts_missed_runs(caplog):
+    def slow(db):
+        time.sleep(0.05)
+        return [1]
+
+    failing = SnapshotJob("failing", lambda db: 1 / 0, interval=0.01)
+    overrun = SnapshotJob("overrun", slow, interval=0.01)
+    scheduler = SnapshotScheduler([failing, overrun], TestingSessionLocal)
+    scheduler.start()
+
+    try:
+        deadline = time.monotonic() + 5
+
+        while (failing.failures < 2 or overrun.runs < 2) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        scheduler.stop()
+
+    # Ошибка расчета записывается в журнал, расчет продолжается по расписанию.
+    assert failing.failures >= 2
+    assert "Snapshot failing computation failed" in caplog.text
+    assert any(record.exc_info and record.exc_info[0] is ZeroDivisionError for record in caplog.records)
+
+    # Запуски, пропущенные из-за долгого расчета, учитываются отдельно от пересекающихся вызовов run.
+    assert overrun.missed >= overrun.runs - 1 > 0 and overrun.skipped == 0
+    assert overrun.status()["missed"] == overrun.missed
@@ -0,0 +1,84 @@
+from collections import namedtuple
+
+from sqlalchemy import event, insert, select
+
+from app.crud.task_crud import assign_important_tasks, get_important_tasks, plan_assignments
+from app.models.employee import Employee
+from app.models.task import Task
+from tests.conftest import client
+
+# Идентификаторы синтетических данных заданы явно, чтобы не сдвигать последовательности.
+START_ID = 730000
+
+AssignableTask = namedtuple("AssignableTask", ["id", "parent_executor_id"])
+
+
+def test_plan_assignments_balances_load_and_keeps_parent_executor():
+    loads = {1: 0, 2: 0, 3: 5}
+    tasks = [
+        AssignableTask(10, None),
+        AssignableTask(11, None),
+        # Нагрузка исполнителя родительской задачи 5 > 0 + 2: задача достается наименее загруженному.
+        AssignableTask(12, 3),
+        AssignableTask(13, None),
+        # После трех назначений минимальная нагрузка 1, нагрузка 2 сотрудника 2 укладывается в min + 2.
+        AssignableTask(14, 2),
+    ]
+
+    assert plan_assignments(tasks, loads) == [
+        (10, 1, "least_loaded"),
+        (11, 2, "least_loaded"),
+        (12, 1, "least_loaded"),
+        (13, 2, "least_loaded"),
+        (14, 2, "parent_executor"),
+    ]
+    assert loads == {1: 2, 2: 3, 3: 5}
+    assert plan_assignments(tasks, {}) == []
+
+
+def test_assign_important_tasks(db_session):
+    db_session.execute(insert(Employee), [
+        {"id": START_ID, "full_name": "Parent executor", "position": "Developer"},
+    ])
+    db_session.execute(insert(Task), [
+        {"id": START_ID, "title": "Assigned root", "executor_id": START_ID},
+        {"id": START_ID + 1, "title": "Important", "parent_task_id": START_ID},
+        {"id": START_ID + 2, "title": "Important root"},
+        {"id": START_ID + 3, "title": "Child", "parent_task_id": START_ID + 1},
+        {"id": START_ID + 4, "title": "Child", "parent_task_id": START_ID + 2},
+    ])
+    db_session.commit()
+    important_ids = {task.id for task in db_session.execute(select(Task.id).where(Task.executor_id.is_(None)))}
+
+    commits = []
+    on_commit = commits.append
+    event.listen(db_session, "after_commit", on_commit)
+    preview = assign_important_tasks(db_session, dry_run=True)
+    event.remove(db_session, "after_commit", on_commit)
+    # Предварительный расчет не фиксирует транзакцию.
+    assert commits == []
+
+    assigned = {assignment["task_id"] for assignment in preview["assignments"]}
+    assert {START_ID + 1, START_ID + 2} <= assigned < important_ids
+    assert preview["assigned"] == len(get_important_tasks(db_session))
+    assert db_session.scalar(select(Task.executor_id).where(Task.id == START_ID + 1)) is None
+
+    result = assign_important_tasks(db_session)
+
+    assert result["assignments"] == preview["assignments"]
+    assert result["assigned"] == preview["assigned"]
+    assert get_important_tasks(db_session) == []
+    executors = dict(db_session.execute(select(Task.id, Task.executor_id).where(Task.id.in_(assigned))).all())
+    assert executors == {assignment["task_id"]: assignment["employee_id"] for assignment in result["assignments"]}
+
+
+def test_assign_important_tasks_dry_run_endpoint():
+    important = client.get("/tasks/important/").json()
+
+    response = client.post("/tasks/important/assign", params={"dry_run": True})
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["dry_run"] is True
+    assert result["assigned"] + result["unassigned"] == len(important)
+    assert client.get("/tasks/important/").json() == important
@@ -0,0 +1,62 @@
+import pytest
+
+from tests.conftest import async_client, client
+
+
+@pytest.mark.parametrize("path", ["/employees/", "/employees/tasks/", "/tasks/", "/tasks/important/"])
+def test_async_list_endpoints_match_sync(path):
+    response = async_client.get(path)
+
+    assert response.status_code == 200
+    assert response.json() == client.get(path).json()
+
+
+def test_async_employee_crud():
+    response = async_client.post("/employees/", json={"full_name": "Async", "position": "Developer"})
+    assert response.status_code == 201
+    employee_id = response.json()["id"]
+
+    response = async_client.put(f"/employees/{employee_id}", json={"position": "Lead"})
+    assert response.status_code == 200
+    assert response.json() == {"id": employee_id, "full_name": "Async", "position": "Lead"}
+
+    response = async_client.get(f"/employees/{employee_id}")
+    assert response.json() == client.get(f"/employees/{employee_id}").json()
+
+    response = async_client.delete(f"/employees/{employee_id}")
+    assert response.status_code == 200
+
+    for method in (async_client.get, async_client.delete):
+        response = method(f"/employees/{employee_id}")
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Employee not found"
+
+
+def test_async_task_crud():
+    response = async_client.post("/tasks/", json={"title": "Async", "deadline": "3024-11-09T06:46:48"})
+    assert response.status_code == 201
+    task_id = response.json()["id"]
+
+    response = async_client.put(f"/tasks/{task_id}", json={"title": "Async_put"})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Async_put"
+    assert response.json()["deadline"] == "3024-11-09T06:46:48"
+
+    response = async_client.get(f"/tasks/{task_id}")
+    assert response.json() == client.get(f"/tasks/{task_id}").json()
+
+    response = async_client.delete(f"/tasks/{task_id}")
+    assert response.status_code == 200
+
+    for method in (async_client.get, async_client.delete):
+        response = method(f"/tasks/{task_id}")
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Task not found"
+
+
+@pytest.mark.parametrize("path", ["/employees/", "/employees/tasks/", "/tasks/"])
+def test_async_list_etag_matches_sync(path):
+    etag = client.get(path).headers["ETag"]
+
+    assert async_client.get(path).headers["ETag"] == etag
+    assert async_client.get(path, headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,85 @@
+from tests.conftest import client
+
+
+def test_tasks_bulk_crud():
+    response = client.post("/tasks/bulk", json=[
+        {"title": "Bulk_1", "deadline": "3024-11-09T06:46:48"},
+        {"title": "Bulk_past", "deadline": "2020-11-09T06:46:48"},
+        {"title": "Bulk_2", "executor_id": 999999},
+        {"title": "Bulk_3", "is_active": False},
+        {"deadline": "3024-11-09T06:46:48"},
+    ])
+
+    assert response.status_code == 200
+
+    result = response.json()
+    assert (result["succeeded"], result["failed"]) == (2, 3)
+
+    items = result["items"]
+    assert [item["index"] for item in items] == [0, 1, 2, 3, 4]
+    assert "Deadline cannot be set in the past" in items[1]["error"]
+    assert items[2]["error"] == "Executor not found"
+    assert items[4]["error"].startswith("title")
+
+    first_id, second_id = items[0]["id"], items[3]["id"]
+    assert client.get(f"/tasks/{first_id}").json()["title"] == "Bulk_1"
+
+    response = client.patch("/tasks/bulk", json=[
+        {"id": second_id, "parent_task_id": first_id, "title": "Bulk_3_updated"},
+        {"id": first_id, "executor_id": 1, "is_active": True},
+        {"id": 999999, "title": "Missing"},
+        {"id": second_id, "title": "Duplicate"},
+    ])
+
+    result = response.json()
+    assert (result["succeeded"], result["failed"]) == (2, 2)
+    assert [item["error"] for item in result["items"][2:]] == ["Task not found", "Duplicate task id in request"]
+
+    second = client.get(f"/tasks/{second_id}").json()
+    assert (second["title"], second["parent_task_id"]) == ("Bulk_3_updated", first_id)
+
+    first = client.get(f"/tasks/{first_id}").json()
+    assert (first["title"], first["executor_id"], first["is_active"]) == ("Bulk_1", 1, True)
+    assert first["deadline"] == "3024-11-09T06:46:48"
+
+    # Родительская задача не удаляется, пока от нее зависит задача вне пакета.
+    response = client.request("DELETE", "/tasks/bulk", json={"ids": [first_id, 999999]})
+    assert [item["error"] for item in response.json()["items"]] == ["Task has dependent tasks", "Task not found"]
+
+    # Вместе с дочерней задачей родительская удаляется независимо от порядка в пакете.
+    response = client.request("DELETE", "/tasks/bulk", json={"ids": [first_id, second_id]})
+    assert response.json()["succeeded"] == 2
+
+    for task_id in (first_id, second_id):
+        assert client.get(f"/tasks/{task_id}").status_code == 404
+
+
+def test_employees_bulk_crud():
+    response = client.post("/employees/bulk", json=[
+        {"full_name": "Bulk_1", "position": "Developer"},
+        {"full_name": "Bulk_2"},
+        {"full_name": "Bulk_3", "position": "Tester"},
+    ])
+
+    result = response.json()
+    assert (result["succeeded"], result["failed"]) == (2, 1)
+
+    first_id, second_id = result["items"][0]["id"], result["items"][2]["id"]
+
+    response = client.patch("/employees/bulk", json=[
+        {"id": first_id, "position": "Lead"},
+        {"id": second_id, "full_name": None},
+        {"id": 999999, "full_name": "Missing"},
+    ])
+    assert [item["error"] for item in response.json()["items"]] == [None, None, "Employee not found"]
+    assert client.get(f"/employees/{first_id}").json()["position"] == "Lead"
+    assert client.get(f"/employees/{second_id}").json()["full_name"] == "Bulk_3"
+
+    task = client.post("/tasks/", json={"title": "Bulk_task", "executor_id": first_id}).json()
+
+    response = client.request("DELETE", "/employees/bulk", json={"ids": [first_id, second_id]})
+    assert response.json()["succeeded"] == 2
+    assert client.get(f"/employees/{first_id}").status_code == 404
+    assert client.get(f"/tasks/{task['id']}").json()["executor_id"] is None
+
+    client.delete(f"/tasks/{task['id']}")
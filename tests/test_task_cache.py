@@ -0,0 +1,237 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import fakeredis
+import pytest
+
+from app.cache import MemoryCache, NullCache, RedisCache, VersionedMemo, bump_version, set_cache
+from app.crud.task_crud import important_tasks_memo
+from app.models.task import Task
+from tests.conftest import async_client, assert_max_queries, client
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    if request.param == "redis":
+        backend = RedisCache(client=fakeredis.FakeRedis())
+    else:
+        backend = MemoryCache(max_size=100, ttl=60)
+
+    previous = set_cache(backend)
+    yield backend
+    set_cache(previous)
+
+
+def test_task_read_through_and_invalidation(cache):
+    task_id = client.post("/tasks/", json={"title": "Cached", "deadline": "3024-11-09T06:46:48"}).json()["id"]
+
+    first = client.get(f"/tasks/{task_id}").json()
+
+    # Повторное чтение не обращается к базе данных.
+    with assert_max_queries(0):
+        assert client.get(f"/tasks/{task_id}").json() == first
+
+    assert cache.stats.hits == 1
+
+    client.put(f"/tasks/{task_id}", json={"title": "Cached_put"})
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "Cached_put"
+
+    client.patch("/tasks/bulk", json=[{"id": task_id, "title": "Cached_bulk"}])
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "Cached_bulk"
+
+    client.delete(f"/tasks/{task_id}")
+    assert client.get(f"/tasks/{task_id}").status_code == 404
+
+
+def test_async_reads_use_cache(cache):
+    task_id = async_client.post("/tasks/", json={"title": "Cached", "deadline": "3024-11-09T06:46:48"}).json()["id"]
+    first = async_client.get(f"/tasks/{task_id}").json()
+    employee = async_client.get("/employees/1").json()
+
+    # Асинхронные роутеры читают через тот же кэш, что и синхронные, в том числе с параметром fields.
+    with assert_max_queries(0):
+        assert async_client.get(f"/tasks/{task_id}").json() == first
+        assert client.get(f"/tasks/{task_id}").json() == first
+        assert async_client.get(f"/tasks/{task_id}", params={"fields": "title"}).json() == {"title": "Cached"}
+        assert async_client.get("/employees/1").json() == employee
+
+    async_client.put(f"/tasks/{task_id}", json={"title": "Cached_put"})
+    assert async_client.get(f"/tasks/{task_id}").json()["title"] == "Cached_put"
+
+    async_client.delete(f"/tasks/{task_id}")
+    assert async_client.get(f"/tasks/{task_id}").status_code == 404
+
+
+def test_employee_delete_invalidates_employee_and_tasks(cache):
+    employee_id = client.post("/employees/", json={"full_name": "Cached", "position": "Tester"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Cached", "executor_id": employee_id}).json()["id"]
+
+    assert client.get(f"/employees/{employee_id}").json()["full_name"] == "Cached"
+    assert client.get(f"/tasks/{task_id}").json()["executor_id"] == employee_id
+
+    client.put(f"/employees/{employee_id}", json={"position": "Lead"})
+    assert client.get(f"/employees/{employee_id}").json()["position"] == "Lead"
+
+    client.delete(f"/employees/{employee_id}")
+    assert client.get(f"/employees/{employee_id}").status_code == 404
+    assert client.get(f"/tasks/{task_id}").json()["executor_id"] is None
+
+    client.delete(f"/tasks/{task_id}")
+
+
+def test_read_cache_status(cache):
+    client.get("/employees/1")
+    client.get("/employees/1")
+
+    response = client.get("/diagnostics/cache")
+
+    assert response.status_code == 200
+    status = response.json()
+    assert status["backend"] == cache.backend
+    assert (status["hits"], status["misses"]) == (1, 1)
+
+
+def test_memory_cache_evicts_least_recently_used_and_expired():
+    cache = MemoryCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats.evictions == 1
+
+    expired = MemoryCache(ttl=0)
+    expired.set("a", 1)
+
+    assert expired.get("a") is None
+    assert expired.stats.evictions == 1
+
+
+def test_redis_cache_errors_are_misses():
+    server = fakeredis.FakeServer()
+    server.connected = False
+    cache = RedisCache(client=fakeredis.FakeRedis(server=server))
+
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert (cache.stats.misses, cache.stats.errors) == (1, 2)
+
+
+def test_important_tasks_memo_and_conditional_requests(cache):
+    client.get("/tasks/important/")
+    computations = important_tasks_memo.computations
+
+    response = client.get("/tasks/important/")
+    etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+    assert important_tasks_memo.computations == computations
+
+    response = client.get("/tasks/important/", headers={"If-None-Match": etag})
+    assert (response.status_code, response.content) == (304, b"")
+    assert client.get("/tasks/important/", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+    # Новая родительская задача без исполнителя попадает в список важных задач.
+    parent_id = client.post("/tasks/", json={"title": "Important parent"}).json()["id"]
+    child_id = client.post("/tasks/", json={"title": "Child", "parent_task_id": parent_id}).json()["id"]
+
+    response = client.get("/tasks/important/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "Important parent" in [task["title"] for task in response.json()]
+    assert important_tasks_memo.computations == computations + 1
+
+    client.delete(f"/tasks/{child_id}")
+    client.delete(f"/tasks/{parent_id}")
+    assert "Important parent" not in [task["title"] for task in client.get("/tasks/important/").json()]
+
+
+def test_async_important_tasks_use_memo(cache):
+    async_client.get("/tasks/important/")
+    computations = important_tasks_memo.computations
+
+    response = async_client.get("/tasks/important/")
+    assert important_tasks_memo.computations == computations
+    assert response.json() == client.get("/tasks/important/").json()
+
+    headers = {"If-Modified-Since": response.headers["Last-Modified"]}
+    assert async_client.get("/tasks/important/", headers=headers).status_code == 304
+
+    bump_version(Task)
+    async_client.get("/tasks/important/")
+    assert important_tasks_memo.computations == computations + 1
+
+
+def test_important_tasks_memo_without_cache_backend():
+    previous = set_cache(NullCache())
+
+    try:
+        client.get("/tasks/important/")
+        computations = important_tasks_memo.computations
+
+        # Версии данных ведутся и без хранилища кэша: пересчет только после изменения задач.
+        client.get("/tasks/important/")
+        async_client.get("/tasks/important/")
+        assert important_tasks_memo.computations == computations
+
+        task_id = client.post("/tasks/", json={"title": "Versioned"}).json()["id"]
+        client.get("/tasks/important/")
+        assert important_tasks_memo.computations == computations + 1
+
+        client.delete(f"/tasks/{task_id}")
+        client.get("/tasks/important/")
+        assert important_tasks_memo.computations == computations + 2
+    finally:
+        set_cache(previous)
+
+
+def test_important_tasks_etag_without_cache():
+    etag = client.get("/tasks/important/").headers["ETag"]
+
+    assert client.get("/tasks/important/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/tasks/important/", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_versioned_memo_recomputes_once_for_concurrent_requests():
+    previous = set_cache(MemoryCache())
+    memo = VersionedMemo([Task])
+    started = threading.Barrier(8)
+
+    def compute():
+        time.sleep(0.05)
+        return ["result"]
+
+    def request():
+        started.wait()
+        return memo.get(compute).value
+
+    try:
+        with ThreadPoolExecutor(8) as executor:
+            assert list(executor.map(lambda _: request(), range(8))) == [["result"]] * 8
+        assert memo.computations == 1
+
+        bump_version(Task)
+        memo.get(compute)
+        assert memo.computations == 2
+    finally:
+        set_cache(previous)
+
+
+def test_versioned_memo_async_recomputes_once_for_concurrent_requests():
+    previous = set_cache(MemoryCache())
+    memo = VersionedMemo([Task])
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return ["result"]
+
+    async def requests():
+        return await asyncio.gather(*(memo.get_async(compute) for _ in range(8)))
+
+    try:
+        assert [entry.value for entry in asyncio.run(requests())] == [["result"]] * 8
+        assert memo.computations == 1
+    finally:
+        set_cache(previous)
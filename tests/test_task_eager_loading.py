@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import insert
+
+from app.models.employee import Employee
+from app.models.task import Task
+from tests.conftest import TestingSessionLocal, assert_max_queries, client
+
+# Идентификаторы синтетических данных заданы явно, чтобы не сдвигать последовательности.
+START_ID = 700000
+EMPLOYEES = 20
+
+
+@pytest.fixture()
+def employees_with_tasks():
+    employee_ids = list(range(START_ID, START_ID + EMPLOYEES))
+    tasks = [
+        {"id": START_ID + index * 3 + number, "title": f"Task {number}", "executor_id": employee_id,
+         "is_active": number < 2}
+        for index, employee_id in enumerate(employee_ids)
+        for number in range(3)
+    ]
+
+    with TestingSessionLocal() as db:
+        db.execute(insert(Employee), [
+            {"id": employee_id, "full_name": f"Employee {employee_id}", "position": "Tester"}
+            for employee_id in employee_ids
+        ])
+        db.execute(insert(Task), tasks)
+        db.commit()
+
+    return set(employee_ids)
+
+
+def test_read_employees_tasks_loads_active_tasks_eagerly(employees_with_tasks):
+    # Сотрудники и их задачи загружаются двумя запросами независимо от количества сотрудников.
+    with assert_max_queries(2):
+        response = client.get("/employees/tasks/")
+
+    assert response.status_code == 200
+    employees = [employee for employee in response.json() if employee["id"] in employees_with_tasks]
+    assert len(employees) == EMPLOYEES
+    for employee in employees:
+        assert len(employee["task"]) == 2
+        assert all(task["is_active"] and task["executor_id"] == employee["id"] for task in employee["task"])
+
+
+def test_assert_max_queries_fails_on_extra_queries():
+    with pytest.raises(AssertionError, match="2 queries, expected at most 1"):
+        with assert_max_queries(1):
+            client.get("/employees/")
+            client.get("/employees/")
@@ -0,0 +1,64 @@
+import pytest
+
+from tests.conftest import client
+
+
+@pytest.fixture()
+def task_id():
+    task_id = client.post("/tasks/", json={"title": "Etag", "deadline": "3024-11-09T06:46:48"}).json()["id"]
+    yield task_id
+    client.delete(f"/tasks/{task_id}")
+
+
+def test_read_task_conditional_request(task_id):
+    response = client.get(f"/tasks/{task_id}")
+    etag = response.headers["ETag"]
+
+    response = client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag})
+    assert (response.status_code, response.content) == (304, b"")
+    assert response.headers["ETag"] == etag
+    assert client.get(f"/tasks/{task_id}", headers={"If-None-Match": f'"stale", W/{etag}'}).status_code == 304
+
+    # Изменение задачи меняет ETag, в том числе при пакетном обновлении.
+    client.put(f"/tasks/{task_id}", json={"title": "Etag_put"})
+    response = client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Etag_put"
+    etag = response.headers["ETag"]
+
+    client.patch("/tasks/bulk", json=[{"id": task_id, "title": "Etag_bulk"}])
+    assert client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_read_employee_conditional_request():
+    employee_id = client.post("/employees/", json={"full_name": "Etag", "position": "Tester"}).json()["id"]
+    etag = client.get(f"/employees/{employee_id}").headers["ETag"]
+
+    assert client.get(f"/employees/{employee_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/employees/{employee_id}", json={"position": "Lead"})
+    assert client.get(f"/employees/{employee_id}", headers={"If-None-Match": etag}).status_code == 200
+
+    client.delete(f"/employees/{employee_id}")
+
+
+@pytest.mark.parametrize("path", ["/tasks/", "/employees/tasks/"])
+def test_list_conditional_request(path, task_id):
+    employee_id = client.post("/employees/", json={"full_name": "Etag", "position": "Tester"}).json()["id"]
+    client.put(f"/tasks/{task_id}", json={"executor_id": employee_id, "is_active": True})
+
+    etag = client.get(path).headers["ETag"]
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert (response.status_code, response.content) == (304, b"")
+
+    # Изменение задачи на странице меняет ETag страницы.
+    client.put(f"/tasks/{task_id}", json={"title": "Etag_put"})
+    response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    # Удаление строки со страницы тоже меняет ETag.
+    client.delete(f"/tasks/{task_id}")
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 200
+
+    client.delete(f"/employees/{employee_id}")
@@ -0,0 +1,242 @@
+import inspect
+from datetime import datetime, timedelta
+from importlib import import_module
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert, update
+
+from app.crud.employee_crud import get_employees, get_employees_tasks, get_employees_tasks_rows
+from app.crud.task_crud import get_task_rows, get_tasks
+from app.models.employee import Employee
+from app.models.task import Task
+from app.schemas.employee_schemas import EmployeeTasksSchema
+from app.schemas.task_schemas import TaskFilterSchema, TaskSchema
+from app.serialization import EmployeeTasksRowsResponse, TaskRowsResponse
+from tests.conftest import async_client, TestingSessionLocal, client
+from tests.test_pagination import walk
+
+# Идентификаторы синтетических данных заданы явно, чтобы не сдвигать последовательности.
+START_ID = 740000
+BASE = datetime(2030, 1, 1)
+
+EMPLOYEES = [
+    {"id": START_ID, "full_name": "Ivanov Petr", "position": "Developer"},
+    {"id": START_ID + 1, "full_name": "Petrova Anna", "position": "Tester"},
+    {"id": START_ID + 2, "full_name": "Сидоров Иван", "position": "Developer"},
+]
+
+TASKS = [
+    {"id": START_ID, "title": "Quarterly report", "executor_id": START_ID, "is_active": True,
+     "deadline": BASE},
+    {"id": START_ID + 1, "title": "Report draft", "parent_task_id": START_ID, "executor_id": START_ID + 1,
+     "deadline": BASE + timedelta(days=1)},
+    {"id": START_ID + 2, "title": "Отчет за квартал", "parent_task_id": START_ID, "executor_id": START_ID,
+     "is_active": True, "deadline": BASE + timedelta(days=2)},
+    {"id": START_ID + 3, "title": "Review", "parent_task_id": START_ID + 1},
+    {"id": START_ID + 4, "title": "Deploy 100%", "deadline": BASE + timedelta(days=3)},
+]
+
+
+@pytest.fixture()
+def seeded(db_session):
+    db_session.execute(insert(Employee), EMPLOYEES)
+    db_session.execute(insert(Task), [{"is_active": False, **task} for task in TASKS])
+    db_session.commit()
+
+    return db_session
+
+
+def seeded_ids(items):
+    return [item.id - START_ID for item in items if item.id >= START_ID]
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"is_active": True}, [0, 2]),
+    ({"is_active": False}, [1, 3, 4]),
+    ({"executor_id": START_ID}, [0, 2]),
+    ({"parent_task_id": START_ID}, [1, 2]),
+    ({"has_children": True}, [0, 1]),
+    ({"has_children": False}, [2, 3, 4]),
+    ({"deadline_from": BASE + timedelta(days=1), "deadline_to": BASE + timedelta(days=2)}, [1, 2]),
+    ({"is_active": True, "parent_task_id": START_ID}, [2]),
+    ({"search": "rep"}, [0, 1]),
+    ({"search": "REPORT quart"}, [0]),
+    ({"search": "квар"}, [2]),
+    # Поиск по началу слов: "port" не начало ни одного слова.
+    ({"search": "port"}, []),
+    # Символы шаблонов LIKE и синтаксиса tsquery не являются словами.
+    ({"search": "100%"}, [4]),
+    ({"search": "% & !"}, []),
+])
+def test_task_filters(seeded, filters, expected):
+    tasks = get_tasks(seeded, limit=1000, filters=TaskFilterSchema(**filters))
+
+    assert seeded_ids(tasks) == expected
+
+
+def test_filtered_cursor_pagination_by_title(seeded):
+    filters = TaskFilterSchema(deadline_from=BASE)
+    expected = get_tasks(seeded, limit=1000, order_by="title", filters=filters)
+    walked = walk(lambda cursor: get_tasks(seeded, limit=2, order_by="title", cursor=cursor, filters=filters),
+                  "title", 2)
+
+    assert [task.id for task in walked] == [task.id for task in expected]
+    assert [task.title for task in expected] == sorted(task.title for task in expected)
+
+
+def test_employee_search_and_order_by_task_count(seeded):
+    assert seeded_ids(get_employees(seeded, limit=1000, search="pet")) == [0, 1]
+    assert seeded_ids(get_employees(seeded, limit=1000, search="Иван")) == [2]
+
+    employees = walk(
+        lambda cursor: get_employees(seeded, limit=2, order_by="task_count", cursor=cursor), "task_count", 2
+    )
+    assert [employee.task_count for employee in employees] == sorted(employee.task_count for employee in employees)
+    assert seeded_ids(employees)[-1] == 0
+
+
+@pytest.fixture()
+def committed_rows(committed):
+    # Данные нужны и запросам асинхронного клиента, поэтому фиксируются в базе данных.
+    with TestingSessionLocal() as db:
+        db.execute(insert(Employee), EMPLOYEES)
+        db.execute(insert(Task), [{"is_active": False, **task} for task in TASKS])
+        db.commit()
+
+
+@pytest.mark.parametrize("api", [client, async_client], ids=["sync", "async"])
+def test_read_filtered_lists(committed_rows, api):
+    response = api.get("/tasks/", params={"has_children": True, "search": "report", "order_by": "title"})
+    assert response.status_code == 200
+    assert [task["id"] - START_ID for task in response.json()] == [0, 1]
+
+    response = api.get("/tasks/", params={"deadline_from": "2030-01-02T00:00:00", "is_active": True})
+    assert [task["id"] - START_ID for task in response.json()] == [2]
+
+    response = api.get("/employees/", params={"search": "anna petr", "order_by": "active_task_count"})
+    assert [employee["id"] - START_ID for employee in response.json()] == [1]
+
+    assert api.get("/tasks/", params={"order_by": "executor_id"}).status_code == 422
+
+
+def schema_response_body(schema, items):
+    # Тело ответа, которое FastAPI строит по response_model из ORM-объектов.
+    return JSONResponse(jsonable_encoder(TypeAdapter(list[schema]).validate_python(items, from_attributes=True))).body
+
+
+def test_row_responses_match_schema_serialization(seeded):
+    # Ответ из строк колонок совпадает побайтно с ответом по схеме из ORM-объектов, включая порядок полей и даты.
+    filters = TaskFilterSchema(deadline_from=BASE)
+    tasks = get_tasks(seeded, limit=1000, order_by="title", filters=filters)
+    task_rows = get_task_rows(seeded, limit=1000, order_by="title", filters=filters)
+
+    assert sorted(seeded_ids(tasks)) == [0, 1, 2, 4]
+    assert TaskRowsResponse(task_rows).body == schema_response_body(TaskSchema, tasks)
+
+    employees = get_employees_tasks(seeded, limit=1000)
+    employee_rows = get_employees_tasks_rows(seeded, limit=1000)
+
+    assert employee_rows
+    assert EmployeeTasksRowsResponse(employee_rows).body == schema_response_body(EmployeeTasksSchema, employees)
+
+
+@pytest.mark.parametrize("api", [client, async_client], ids=["sync", "async"])
+def test_read_fields(committed_rows, api):
+    params = {"search": "report", "order_by": "title", "fields": "id,title , id"}
+    response = api.get("/tasks/", params={**params, "limit": 1})
+    assert response.json() == [{"title": "Quarterly report", "id": START_ID}]
+
+    # Курсор строится по ключу сортировки и id, даже если их нет среди полей ответа.
+    response = api.get("/tasks/", params={**params, "fields": "deadline", "cursor": response.headers["X-Next-Cursor"]})
+    assert response.json() == [{"deadline": "2030-01-02T00:00:00"}]
+
+    response = api.get(f"/tasks/{START_ID + 2}", params={"fields": "is_active,deadline"})
+    assert response.json() == {"deadline": "2030-01-03T00:00:00", "is_active": True}
+    assert response.headers["ETag"] == api.get(f"/tasks/{START_ID + 2}").headers["ETag"]
+    response = api.get(
+        f"/tasks/{START_ID + 2}", params={"fields": "title"}, headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert response.status_code == 304
+
+    response = api.get("/employees/", params={"search": "petr", "order_by": "task_count", "fields": "position"})
+    assert response.json() == [{"position": "Tester"}, {"position": "Developer"}]
+    assert api.get(f"/employees/{START_ID + 2}", params={"fields": "full_name"}).json() == {"full_name": "Сидоров Иван"}
+
+    assert api.get("/tasks/", params={"fields": "id,version"}).status_code == 400
+    assert api.get(f"/employees/{START_ID}", params={"fields": ","}).status_code == 400
+    assert api.get("/tasks/0", params={"fields": "id"}).status_code == 404
+
+
+@pytest.mark.parametrize("api", [client, async_client], ids=["sync", "async"])
+def test_streamed_list_pages(committed_rows, api, monkeypatch):
+    # Страница, отправленная потоком, совпадает с обычной побайтно, включая ETag и курсор следующей страницы.
+    cases = [
+        ("/tasks/", {"search": "report", "order_by": "title", "limit": 2}),
+        ("/tasks/", {"search": "report", "fields": "title,id", "limit": 5}),
+        ("/employees/", {"search": "petr", "order_by": "task_count", "limit": 2}),
+    ]
+    buffered = [api.get(url, params=params) for url, params in cases]
+
+    monkeypatch.setattr("config.LIST_STREAM_THRESHOLD", 1)
+
+    for (url, params), expected in zip(cases, buffered):
+        response = api.get(url, params=params)
+        assert "Content-Length" not in response.headers
+        assert response.content == expected.content
+        # Потоковый ответ сжимается независимо от размера, поэтому его ETag слабый (app.compression).
+        assert response.headers["ETag"] in (expected.headers["ETag"], "W/" + expected.headers["ETag"])
+        assert response.headers.get("X-Next-Cursor") == expected.headers.get("X-Next-Cursor")
+
+        response = api.get(url, params=params, headers={"If-None-Match": expected.headers["ETag"]})
+        assert response.status_code == 304
+
+    response = api.get("/tasks/", params={"search": "no such task", "limit": 2})
+    assert response.json() == []
+    assert api.get("/tasks/", params={"cursor": "broken", "limit": 2}).status_code == 400
+
+
+@pytest.mark.parametrize("api, routers", [
+    (client, ("app.routers.task", "app.routers.employee")),
+    (async_client, ("app.routers.task_async", "app.routers.employee_async")),
+], ids=["sync", "async"])
+def test_streamed_list_pages_read_one_snapshot(committed_rows, api, routers, monkeypatch):
+    # Изменения, зафиксированные между сводкой страницы (ETag, курсор) и чтением строк, не попадают в ответ.
+    cases = [
+        ("/tasks/", {"search": "report", "order_by": "title", "limit": 2}, Task, {"title": "Report final"}),
+        ("/employees/", {"search": "petr", "order_by": "full_name", "limit": 2}, Employee, {"position": "Lead"}),
+    ]
+    buffered = [api.get(url, params=params) for url, params, _, _ in cases]
+
+    def concurrent_update(model, values):
+        with TestingSessionLocal() as db:
+            db.execute(update(model).where(model.id == START_ID + 1).values(values))
+            db.commit()
+
+    def patch_rows(router, name, model, values):
+        rows = getattr(import_module(router), name)
+
+        if inspect.iscoroutinefunction(rows):
+            async def updated_rows(*args, **kwargs):
+                concurrent_update(model, values)
+                return await rows(*args, **kwargs)
+        else:
+            def updated_rows(*args, **kwargs):
+                concurrent_update(model, values)
+                return rows(*args, **kwargs)
+
+        monkeypatch.setattr(f"{router}.{name}", updated_rows)
+
+    patch_rows(routers[0], "iter_task_rows", *cases[0][2:])
+    patch_rows(routers[1], "iter_employee_rows", *cases[1][2:])
+    monkeypatch.setattr("config.LIST_STREAM_THRESHOLD", 1)
+
+    for (url, params, _, _), expected in zip(cases, buffered):
+        response = api.get(url, params=params)
+        assert response.content == expected.content
+        assert response.headers["ETag"] in (expected.headers["ETag"], "W/" + expected.headers["ETag"])
+
+        # Следующий запрос видит изменение: ETag новый.
+        assert api.get(url, params=params).headers["ETag"].removeprefix("W/") != expected.headers["ETag"]
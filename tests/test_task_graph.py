@@ -0,0 +1,150 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from app.crud.task_graph import CYCLE_ERROR, TOO_DEEP_ERROR, find_hierarchy_errors, find_too_deep_parents
+from app.models.task import Task
+from tests.conftest import async_client, TestingSessionLocal, assert_max_queries, client
+
+# Идентификаторы синтетических данных заданы явно, чтобы не сдвигать последовательности.
+START_ID = 710000
+ROOT, LEFT, RIGHT, LEAF, DEEP_LEAF = range(START_ID, START_ID + 5)
+
+
+@pytest.fixture()
+def task_tree(committed):
+    # ROOT -> LEFT -> LEAF -> DEEP_LEAF, ROOT -> RIGHT. Дерево нужно и запросам асинхронного клиента,
+    # поэтому фиксируется в базе данных.
+    with TestingSessionLocal() as db:
+        db.execute(insert(Task), [
+            {"id": ROOT, "title": "Root", "parent_task_id": None, "deadline": datetime(3024, 1, 5)},
+            {"id": LEFT, "title": "Left", "parent_task_id": ROOT, "deadline": datetime(3024, 1, 3)},
+            {"id": RIGHT, "title": "Right", "parent_task_id": ROOT, "deadline": None},
+            {"id": LEAF, "title": "Leaf", "parent_task_id": LEFT, "deadline": datetime(3024, 1, 1)},
+            {"id": DEEP_LEAF, "title": "Deep leaf", "parent_task_id": LEAF, "deadline": None},
+        ])
+        db.commit()
+
+
+def test_descendants_and_ancestors(task_tree):
+    with assert_max_queries(1):
+        response = client.get(f"/tasks/{ROOT}/descendants")
+
+    assert response.status_code == 200
+    assert [(task["id"], task["depth"]) for task in response.json()] == [
+        (LEFT, 1), (RIGHT, 1), (LEAF, 2), (DEEP_LEAF, 3)
+    ]
+
+    response = client.get(f"/tasks/{ROOT}/descendants", params={"max_depth": 2})
+    assert [task["id"] for task in response.json()] == [LEFT, RIGHT, LEAF]
+
+    with assert_max_queries(1):
+        response = client.get(f"/tasks/{DEEP_LEAF}/ancestors")
+
+    assert [(task["id"], task["depth"]) for task in response.json()] == [(LEAF, 1), (LEFT, 2), (ROOT, 3)]
+    assert client.get(f"/tasks/{ROOT}/ancestors").json() == []
+
+
+def test_subtree_summary(task_tree):
+    with assert_max_queries(1):
+        response = client.get(f"/tasks/{ROOT}/subtree")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "task_id": ROOT, "count": 5, "active_count": 0, "earliest_deadline": "3024-01-01T00:00:00", "depth": 3
+    }
+
+    response = client.get(f"/tasks/{RIGHT}/subtree")
+    assert response.json() == {"task_id": RIGHT, "count": 1, "active_count": 0, "earliest_deadline": None, "depth": 0}
+
+
+@pytest.mark.parametrize("path", ["descendants", "ancestors", "subtree"])
+def test_graph_endpoints_missing_task_and_depth_limit(path):
+    assert client.get(f"/tasks/{START_ID - 1}/{path}").status_code == 404
+    assert client.get(f"/tasks/1/{path}", params={"max_depth": 0}).status_code == 422
+
+
+@pytest.mark.parametrize("test_client", [client, async_client], ids=["sync", "async"])
+def test_put_rejects_cycle(task_tree, test_client):
+    response = test_client.put(f"/tasks/{ROOT}", json={"parent_task_id": DEEP_LEAF})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == CYCLE_ERROR
+    assert client.get(f"/tasks/{ROOT}").json()["parent_task_id"] is None
+
+    response = test_client.put(f"/tasks/{RIGHT}", json={"parent_task_id": DEEP_LEAF})
+    assert (response.status_code, response.json()["parent_task_id"]) == (200, DEEP_LEAF)
+
+
+def test_bulk_update_rejects_cycles_and_applies_the_rest(task_tree):
+    response = client.patch("/tasks/bulk", json=[
+        {"id": ROOT, "parent_task_id": LEAF},
+        {"id": RIGHT, "parent_task_id": LEFT},
+        {"id": LEFT, "title": "Left renamed"},
+    ])
+
+    assert response.status_code == 200
+    assert [item["error"] for item in response.json()["items"]] == [CYCLE_ERROR, None, None]
+    assert client.get(f"/tasks/{ROOT}").json()["parent_task_id"] is None
+    assert client.get(f"/tasks/{RIGHT}").json()["parent_task_id"] == LEFT
+    assert client.get(f"/tasks/{LEFT}").json()["title"] == "Left renamed"
+
+
+def test_find_hierarchy_errors_depth_limit(task_tree):
+    with TestingSessionLocal() as db:
+        assert find_hierarchy_errors(db, [DEEP_LEAF, RIGHT]) == {}
+        assert find_hierarchy_errors(db, [DEEP_LEAF, RIGHT], max_depth=2) == {DEEP_LEAF: TOO_DEEP_ERROR}
+        # Дочерняя задача DEEP_LEAF была бы на четвертом уровне, дочерняя задача LEAF - на третьем.
+        assert find_too_deep_parents(db, [ROOT, LEAF, DEEP_LEAF], max_depth=3) == {DEEP_LEAF}
+
+
+@pytest.mark.parametrize("test_client", [client, async_client], ids=["sync", "async"])
+def test_move_checks_depth_of_moved_subtree(task_tree, test_client, monkeypatch):
+    # ROOT -> LEFT -> LEAF -> DEEP_LEAF и цепочка A1 -> A2 -> A3: под LEAF задача A1 была бы на третьем
+    # уровне, но A3 - на пятом.
+    a1, a2, a3 = range(START_ID + 5, START_ID + 8)
+    monkeypatch.setattr("app.crud.task_crud.TASK_GRAPH_MAX_DEPTH", 3)
+    monkeypatch.setattr("app.crud.task_crud_async.TASK_GRAPH_MAX_DEPTH", 3)
+
+    with TestingSessionLocal() as db:
+        db.execute(insert(Task), [
+            {"id": a1, "title": "A1", "parent_task_id": None},
+            {"id": a2, "title": "A2", "parent_task_id": a1},
+            {"id": a3, "title": "A3", "parent_task_id": a2},
+        ])
+        db.commit()
+
+    response = test_client.put(f"/tasks/{a1}", json={"parent_task_id": LEAF})
+    assert (response.status_code, response.json()["detail"]) == (400, TOO_DEEP_ERROR)
+    assert client.get(f"/tasks/{a1}").json()["parent_task_id"] is None
+
+    # Под RIGHT задача A3 была бы на четвертом уровне.
+    response = client.patch("/tasks/bulk", json=[{"id": a1, "parent_task_id": RIGHT}, {"id": RIGHT, "title": "R"}])
+    assert [item["error"] for item in response.json()["items"]] == [TOO_DEEP_ERROR, None]
+
+    # Высота поддерева считается после всех изменений: без A2 задача A1 под LEAF на третьем уровне,
+    # A2 с дочерней задачей A3 под LEFT - на втором, A3 - на третьем.
+    response = client.patch(
+        "/tasks/bulk", json=[{"id": a1, "parent_task_id": LEAF}, {"id": a2, "parent_task_id": LEFT}]
+    )
+    assert [item["error"] for item in response.json()["items"]] == [None, None]
+    assert [task["id"] for task in client.get(f"/tasks/{a3}/ancestors").json()] == [a2, LEFT, ROOT]
+
+    with TestingSessionLocal() as db:
+        assert find_hierarchy_errors(db, [a2], max_depth=2) == {a2: TOO_DEEP_ERROR}
+        assert find_too_deep_parents(db, [a2], max_depth=3) == set()
+
+
+@pytest.mark.parametrize("test_client", [client, async_client], ids=["sync", "async"])
+def test_create_rejects_too_deep_hierarchy(task_tree, test_client, monkeypatch):
+    # DEEP_LEAF - третий уровень под ROOT: его дочерняя задача оказалась бы на четвертом.
+    monkeypatch.setattr("app.crud.task_crud.TASK_GRAPH_MAX_DEPTH", 3)
+    monkeypatch.setattr("app.crud.task_crud_async.TASK_GRAPH_MAX_DEPTH", 3)
+
+    response = test_client.post("/tasks/", json={"title": "Too deep", "parent_task_id": DEEP_LEAF})
+    assert (response.status_code, response.json()["detail"]) == (400, TOO_DEEP_ERROR)
+
+    response = client.post("/tasks/bulk", json=[{"title": "Too deep", "parent_task_id": DEEP_LEAF}])
+    assert [item["error"] for item in response.json()["items"]] == [TOO_DEEP_ERROR]
+    assert client.get(f"/tasks/{DEEP_LEAF}/descendants").json() == []
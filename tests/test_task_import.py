@@ -0,0 +1,145 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import insert
+
+from app.crud.employee_crud import import_employees
+from app.crud.staging import ImportNotSupportedError
+from app.crud.task_crud import import_tasks
+from app.crud.task_graph import CYCLE_ERROR, TOO_DEEP_ERROR
+from app.importing import iter_csv_rows, iter_ndjson_rows
+from app.models.employee import Employee
+from app.models.task import Task
+from tests.conftest import client
+
+# Идентификаторы синтетических данных заданы явно, чтобы не сдвигать последовательности.
+START_ID = 400000
+
+
+def ndjson(*rows):
+    return io.BytesIO("".join(
+        (row if isinstance(row, str) else json.dumps(row)) + "\n" for row in rows
+    ).encode())
+
+
+def task_row(number, **fields):
+    return {"id": START_ID + number, "title": f"Task {number}", **fields}
+
+
+@pytest.fixture()
+def executor(db_session):
+    db_session.execute(insert(Employee), [{"id": START_ID, "full_name": "Import Employee", "position": "Tester"}])
+    db_session.execute(insert(Task), [{"id": START_ID, "title": "Existing"}])
+    return db_session
+
+
+def test_import_tasks_resolves_parents_within_file(executor):
+    rows = iter_ndjson_rows(ndjson(
+        # Родительская задача идет в файле после дочерней.
+        task_row(1, parent_task_id=START_ID + 2, executor_id=START_ID, is_active=True),
+        task_row(2, title="Tab\tnew\nline\\N", parent_task_id=START_ID),
+        # Цепочка, корень которой отсутствует: отклоняются все задачи цепочки.
+        task_row(3, parent_task_id=START_ID + 99),
+        task_row(4, parent_task_id=START_ID + 3),
+        task_row(5, parent_task_id=START_ID + 4),
+        task_row(6, executor_id=START_ID + 99),
+        task_row(7, parent_task_id=START_ID + 7),
+        task_row(8, is_active=True),
+        task_row(1, title="Duplicate"),
+        "{broken",
+        # Существующая задача обновляется.
+        task_row(0, title="Updated", executor_id=START_ID),
+    ))
+
+    result = import_tasks(executor, rows, batch_size=3)
+
+    assert (result["received"], result["imported"], result["rejected"]) == (11, 3, 8)
+    errors = {error["row"]: error["error"] for error in result["errors"]}
+    assert sorted(errors) == [3, 4, 5, 6, 7, 8, 9, 10]
+    assert [errors[row] for row in (3, 4, 5, 6, 7, 9)] == [
+        "Parent task not found",
+        "Parent task not found",
+        "Parent task not found",
+        "Executor not found",
+        "Task cannot be its own parent",
+        "Duplicate task id in file",
+    ]
+    assert "Task cannot be active without an assigned executor" in errors[8]
+    assert errors[10].startswith("item")
+
+    first, existing = executor.get(Task, START_ID + 1), executor.get(Task, START_ID)
+    assert (first.title, first.parent_task_id, first.is_active) == ("Task 1", START_ID + 2, True)
+    assert (existing.title, existing.executor_id) == ("Updated", START_ID)
+    assert executor.get(Task, START_ID + 2).title == "Tab\tnew\nline\\N"
+
+
+def test_import_tasks_checks_hierarchy(executor, monkeypatch):
+    monkeypatch.setattr("app.crud.task_crud.TASK_GRAPH_MAX_DEPTH", 2)
+    rows = iter_ndjson_rows(ndjson(
+        task_row(1, parent_task_id=START_ID + 2),
+        task_row(2, parent_task_id=START_ID + 1),
+        # Родительская задача отклонена из-за цикла.
+        task_row(3, parent_task_id=START_ID + 1),
+        # Задачи 6 и 7 глубже второго уровня под существующей задачей, задачи 4 и 5 импортируются.
+        task_row(4, parent_task_id=START_ID),
+        task_row(5, parent_task_id=START_ID + 4),
+        task_row(6, parent_task_id=START_ID + 5),
+        task_row(7, parent_task_id=START_ID + 6),
+    ))
+
+    result = import_tasks(executor, rows)
+
+    assert (result["received"], result["imported"], result["rejected"]) == (7, 2, 5)
+    assert [(error["row"], error["error"]) for error in result["errors"]] == [
+        (1, CYCLE_ERROR),
+        (2, CYCLE_ERROR),
+        (3, "Parent task not found"),
+        (6, TOO_DEEP_ERROR),
+        (7, TOO_DEEP_ERROR),
+    ]
+    assert executor.get(Task, START_ID + 1) is None
+    assert executor.get(Task, START_ID + 5).parent_task_id == START_ID + 4
+
+
+def test_import_employees_csv(db_session):
+    content = io.BytesIO(
+        f"full_name,position,id\nFirst,Tester,{START_ID + 1}\n,Tester,{START_ID + 2}\n"
+        f"Second,,{START_ID + 3}\n".encode()
+    )
+
+    result = import_employees(db_session, iter_csv_rows(content))
+
+    assert (result["received"], result["imported"], result["rejected"]) == (3, 1, 2)
+    assert [error["id"] for error in result["errors"]] == [str(START_ID + 2), str(START_ID + 3)]
+    assert db_session.get(Employee, START_ID + 1).full_name == "First"
+
+
+@pytest.mark.parametrize("path", ["/tasks", "/employees"])
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+def test_import_export_round_trip(path, export_format):
+    expected = client.get(f"{path}/", params={"limit": 1000}).json()
+    exported = client.get(f"{path}/export", params={"format": export_format}).content
+
+    response = client.post(f"{path}/import", params={"format": export_format}, content=exported)
+
+    assert response.status_code == 200
+    assert response.json() == {"received": len(expected), "imported": len(expected), "rejected": 0, "errors": []}
+    assert client.get(f"{path}/", params={"limit": 1000}).json() == expected
+
+
+def test_import_rejected_rows():
+    response = client.post("/tasks/import", content=b'{"id": 1, "title": "Self", "parent_task_id": 1}\n')
+
+    assert response.json()["errors"] == [{"row": 1, "id": 1, "error": "Task cannot be its own parent"}]
+
+
+@pytest.mark.parametrize("path", ["/tasks", "/employees"])
+def test_import_unsupported_dialect(path, db_session, monkeypatch):
+    monkeypatch.setattr("app.crud.staging.UPSERT_DIALECTS", {})
+
+    response = client.post(f"{path}/import", content=b'{"id": 1, "title": "Task"}\n')
+    assert response.status_code == 501
+
+    with pytest.raises(ImportNotSupportedError):
+        import_tasks(db_session, [])
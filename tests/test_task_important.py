@@ -0,0 +1,108 @@
+import pytest
+from sqlalchemy import event, insert
+
+from app.crud.task_crud import get_important_tasks, get_important_tasks_reference
+from app.models.employee import Employee
+from app.models.task import Task
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from tests.conftest import engine
+
+# Идентификаторы синтетических данных заданы явно, чтобы не сдвигать последовательности.
+START_ID = 100000
+
+
+def normalize(important_tasks):
+    """Приведение результата к виду, не зависящему от порядка задач и сотрудников."""
+    return sorted(
+        (task["title"], task["deadline"], tuple(sorted(task["employees"])))
+        for task in important_tasks
+    )
+
+
+def count_selects(db_session, func):
+    """Выполнение func(db_session) с подсчетом выполненных SELECT-запросов."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = func(db_session)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return result, len(statements)
+
+
+def seed_forest(db_session, tasks_count, employees_count, seed):
+    employees = generate_employees(employees_count, start_id=START_ID)
+    tasks = generate_task_forest(
+        tasks_count,
+        [employee["id"] for employee in employees],
+        depth=4,
+        assigned_ratio=0.5,
+        start_id=START_ID,
+        seed=seed,
+    )
+    seed_database(db_session, employees, tasks)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_important_tasks_parity(db_session, seed):
+    seed_forest(db_session, tasks_count=300, employees_count=7, seed=seed)
+
+    result = get_important_tasks(db_session)
+
+    assert result
+    assert normalize(result) == normalize(get_important_tasks_reference(db_session))
+
+
+def test_important_tasks_parent_executor_rule(db_session):
+    db_session.execute(insert(Employee), [
+        {"id": START_ID, "full_name": "Idle", "position": "Developer"},
+        {"id": START_ID + 1, "full_name": "Busy", "position": "Developer"},
+        {"id": START_ID + 2, "full_name": "Overloaded", "position": "Developer"},
+    ])
+    db_session.execute(insert(Task), [
+        # Родительские задачи с исполнителями: нагрузка Busy = 2, Overloaded = 3.
+        {"id": START_ID, "title": "Busy root", "executor_id": START_ID + 1},
+        {"id": START_ID + 1, "title": "Busy other", "executor_id": START_ID + 1},
+        {"id": START_ID + 2, "title": "Overloaded root", "executor_id": START_ID + 2},
+        {"id": START_ID + 3, "title": "Overloaded other", "executor_id": START_ID + 2},
+        {"id": START_ID + 4, "title": "Overloaded third", "executor_id": START_ID + 2},
+        # Неназначенные задачи, от которых зависят другие задачи.
+        {"id": START_ID + 5, "title": "Important busy", "parent_task_id": START_ID},
+        {"id": START_ID + 6, "title": "Important overloaded", "parent_task_id": START_ID + 2},
+        {"id": START_ID + 7, "title": "Important root"},
+        {"id": START_ID + 8, "title": "Child", "parent_task_id": START_ID + 5},
+        {"id": START_ID + 9, "title": "Child", "parent_task_id": START_ID + 6},
+        {"id": START_ID + 10, "title": "Child", "parent_task_id": START_ID + 7},
+    ])
+    db_session.commit()
+
+    result = {task["title"]: task["employees"] for task in get_important_tasks(db_session)}
+    min_loaded = result["Important root"]
+
+    assert "Idle" in min_loaded
+    assert result["Important busy"] == ["Busy"]
+    assert result["Important overloaded"] == min_loaded
+    assert normalize(get_important_tasks(db_session)) == normalize(get_important_tasks_reference(db_session))
+
+
+def test_important_tasks_query_count_is_constant(db_session):
+    seed_forest(db_session, tasks_count=50, employees_count=5, seed=0)
+    _, small_count = count_selects(db_session, get_important_tasks)
+
+    employees_count = 50
+    employees = generate_employees(employees_count, start_id=START_ID + 1000)
+    tasks = generate_task_forest(
+        1000, [employee["id"] for employee in employees], depth=4, assigned_ratio=0.5, start_id=START_ID + 1000
+    )
+    seed_database(db_session, employees, tasks)
+    _, large_count = count_selects(db_session, get_important_tasks)
+    _, reference_count = count_selects(db_session, get_important_tasks_reference)
+
+    assert small_count == large_count == 2
+    assert reference_count > large_count
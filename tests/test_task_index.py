@@ -0,0 +1,154 @@
+import random
+import time
+
+import pytest
+from sqlalchemy import update
+
+from app.cache import invalidate
+from app.crud.task_crud import get_important_tasks
+from app.crud.task_graph import get_subtree_summary
+from app.models.employee import Employee
+from app.models.task import Task
+from app.task_index import TaskGraph, TaskGraphIndex, TaskGraphReconciler, set_task_index
+from tests.conftest import TestingSessionLocal, assert_max_queries, client
+
+# Идентификаторы синтетических данных заданы явно, чтобы не сдвигать последовательности.
+START_ID = 720000
+TASKS = 300
+EMPLOYEES = 7
+
+pytestmark = pytest.mark.forest(start_id=START_ID, tasks=TASKS, employees=EMPLOYEES, depth=4, assigned_ratio=0.5)
+
+
+@pytest.fixture()
+def index(forest):
+    index = TaskGraphIndex()
+
+    with TestingSessionLocal() as db:
+        index.load(db)
+
+    previous = set_task_index(index)
+    yield index
+    set_task_index(previous)
+
+
+def assert_matches_database(index, task_ids):
+    with TestingSessionLocal() as db:
+        assert index.important_tasks(db).value == get_important_tasks(db)
+
+        for task_id in task_ids:
+            expected = get_subtree_summary(db, task_id)
+            assert index.subtree_summary(db, task_id, 10000) == (expected._mapping if expected else None)
+
+
+def test_index_matches_database_after_changes(index, forest):
+    rnd = random.Random(0)
+    task_ids = [task["id"] for task in forest]
+    employee_ids = list(range(START_ID, START_ID + EMPLOYEES))
+    assert_matches_database(index, task_ids[:20])
+
+    with TestingSessionLocal() as db:
+        for step in range(60):
+            task_id = rnd.choice(task_ids[1:])
+            operation = rnd.choice(["executor", "parent", "active", "rename"])
+
+            if operation == "executor":
+                values = {"executor_id": rnd.choice(employee_ids + [None]), "is_active": False}
+            elif operation == "parent":
+                # Родительская задача всегда создана раньше дочерней, поэтому циклов нет.
+                values = {"parent_task_id": rnd.choice([None, *(i for i in task_ids if i < task_id)])}
+            elif operation == "active":
+                values = {"is_active": True}
+                db.execute(update(Task).where(Task.id == task_id).values(executor_id=rnd.choice(employee_ids)))
+            else:
+                employee_id = rnd.choice(employee_ids)
+                db.execute(update(Employee).where(Employee.id == employee_id).values(full_name=f"Renamed {step}"))
+                db.commit()
+                invalidate(Employee, [employee_id])
+                continue
+
+            db.execute(update(Task).where(Task.id == task_id).values(**values))
+            db.commit()
+            invalidate(Task, [task_id])
+
+            if step % 10 == 9:
+                assert_matches_database(index, rnd.sample(task_ids, 20))
+
+    assert index.stats.refreshed_tasks > 0
+
+
+def test_index_api_hooks_and_reconciliation(index, forest):
+    root_id = forest[0]["id"]
+    client.get("/tasks/important/")
+
+    # Без изменений важные задачи и сводка по поддереву не требуют запросов.
+    with assert_max_queries(0):
+        etag = client.get("/tasks/important/").headers["ETag"]
+        summary = client.get(f"/tasks/{root_id}/subtree").json()
+
+    task_id = client.post("/tasks/", json={"title": "Indexed child", "parent_task_id": root_id}).json()["id"]
+
+    assert client.get(f"/tasks/{root_id}/subtree").json()["count"] == summary["count"] + 1
+    assert client.get("/tasks/important/", headers={"If-None-Match": etag}).status_code in (200, 304)
+
+    client.delete(f"/tasks/{task_id}")
+    assert client.get(f"/tasks/{root_id}/subtree").json() == summary
+
+    # Изменение в обход CRUD-функций исправляется сверкой с базой данных.
+    with TestingSessionLocal() as db:
+        db.execute(update(Task).where(Task.id == root_id).values(is_active=True, executor_id=START_ID))
+        db.commit()
+
+    assert client.get(f"/tasks/{root_id}/subtree").json() == summary
+    assert index.reconcile(TestingSessionLocal) == 1
+    assert client.get(f"/tasks/{root_id}/subtree").json()["active_count"] == summary["active_count"] + 1
+    assert_matches_database(index, [root_id])
+
+    status = client.get("/diagnostics/task-index").json()
+    assert status["enabled"] and status["tasks"] >= TASKS and status["reconciliations"] == 1
+    assert status["memory_bytes"] > 0
+
+
+def test_reconciler_counts_and_logs_failures(index, caplog):
+    def session_factory():
+        raise RuntimeError("database is unavailable")
+
+    reconciler = TaskGraphReconciler(index, session_factory, interval=0.01)
+    reconciler.start()
+
+    try:
+        deadline = time.monotonic() + 5
+
+        while index.stats.failures < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        reconciler.stop()
+
+    assert client.get("/diagnostics/task-index").json()["failures"] >= 2
+    assert "Task graph reconciliation failed" in caplog.text
+
+
+def test_task_graph_links_and_loads():
+    graph = TaskGraph()
+    graph.set_employee(1, "Employee 1")
+    graph.set_employee(2, "Employee 2")
+    graph.set_task(10, None, None, None, False, "Root")
+    graph.set_task(11, 10, 1, None, True, "Child")
+    graph.set_task(12, 10, None, None, False, "Child")
+
+    assert graph.important == {10}
+    assert graph.load_buckets == {0: {2}, 1: {1}}
+    assert graph.subtree_summary(10, 1) == {"count": 3, "active_count": 1, "earliest_deadline": None, "depth": 1}
+
+    graph.set_task(10, None, 2, None, False, "Root")
+    graph.set_task(12, 11, None, None, False, "Grandchild")
+    graph.remove_task(11)
+
+    assert graph.important == set()
+    assert graph.load_buckets == {0: {1}, 1: {2}}
+    assert graph.first_child[10] == -1 and graph.task_count == 2
+    assert graph.subtree_summary(11, 1) is None
+
+
+def test_diagnostics_task_index_disabled():
+    assert client.get("/diagnostics/task-index").json()["enabled"] is False
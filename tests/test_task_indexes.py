@@ -0,0 +1,292 @@
+import re
+from datetime import datetime
+from typing import NamedTuple
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.crud.employee_crud import get_employee, get_employees, get_employees_tasks, get_min_loaded_employees
+from app.crud.task_crud import (
+    get_important_tasks,
+    get_min_task_count,
+    get_task,
+    get_tasks,
+    get_unassigned_parent_tasks,
+    iter_tasks,
+)
+from app.pagination import encode_cursor
+from app.schemas.task_schemas import TaskFilterSchema
+from benchmarks.data import generate_employees, generate_task_forest, seed_database
+from tests.conftest import engine
+
+# Идентификаторы синтетических данных заданы явно, чтобы не сдвигать последовательности.
+START_ID = 600000
+
+# Обращение к таблице в плане SQLite: SEARCH - поиск по условию на индекс или первичный ключ,
+# SCAN - чтение всей таблицы или всего индекса.
+SQLITE_ACCESS = re.compile(
+    r"^(SEARCH|SCAN) (tasks|employees)(?:_\d+)? ?(?:USING (?:COVERING )?INDEX (\w+)|USING (INTEGER PRIMARY KEY))?"
+)
+
+# Поиск по первичному ключу обозначается именем ограничения <таблица>_pkey. SQLite ищет по rowid,
+# PostgreSQL - по индексу ix_<таблица>_id той же колонки (index=True).
+PRIMARY_KEY_INDEXES = {"ix_tasks_id": "tasks_pkey", "ix_employees_id": "employees_pkey"}
+
+# Индексы задач сотрудника по активности: составной и частичный для активных задач, планировщик выбирает любой.
+EXECUTOR_ACTIVE_INDEXES = ("ix_tasks_executor_id_is_active", "ix_tasks_active_executor_id")
+
+# Полнотекстовые индексы есть только в PostgreSQL, в SQLite поиск просматривает таблицу.
+postgresql_only = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="Full-text indexes are PostgreSQL-only"
+)
+
+
+class QueryPlan(NamedTuple):
+    """
+    Сводка плана запроса.
+    Attributes:
+        searched (set[str]): Индексы, в которых строки ищутся по условию (Index Cond в PostgreSQL, SEARCH в SQLite).
+        indexes (set[str]): Все индексы плана, включая прочитанные целиком.
+        scans (list[str]): Таблицы и индексы, прочитанные целиком.
+        sorted (bool): Есть ли сортировка результата (в PostgreSQL - в том числе досортировка Incremental Sort).
+    """
+    searched: set[str]
+    indexes: set[str]
+    scans: list[str]
+    sorted: bool
+
+
+def capture_selects(db, func):
+    """Выполнение func(db) с сохранением SELECT-запросов и их параметров."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = func(db)
+        if hasattr(result, "__next__"):
+            list(result)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return statements
+
+
+def explain_postgresql(connection, statement, parameters):
+    """Узлы плана запроса PostgreSQL с настройками планировщика по умолчанию."""
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+    nodes, result = [plan[0]["Plan"]], []
+
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(node.get("Plans", []))
+        result.append(node)
+
+    return result
+
+
+def explain(db, statement, parameters):
+    """Сводка плана запроса (QueryPlan)."""
+    connection = db.connection()
+
+    if connection.dialect.name == "postgresql":
+        nodes = explain_postgresql(connection, statement, parameters)
+        indexes = {node["Index Name"]: node for node in nodes if "Index Name" in node}
+
+        return QueryPlan(
+            {PRIMARY_KEY_INDEXES.get(name, name) for name, node in indexes.items() if "Index Cond" in node},
+            set(indexes),
+            [node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"]
+            + [name for name, node in indexes.items() if "Index Cond" not in node],
+            any(node["Node Type"] in ("Sort", "Incremental Sort") for node in nodes),
+        )
+
+    plan = QueryPlan(set(), set(), [], False)
+
+    for *_, detail in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all():
+        if detail == "USE TEMP B-TREE FOR ORDER BY":
+            plan = plan._replace(sorted=True)
+
+        if not (match := SQLITE_ACCESS.match(detail)):
+            continue
+
+        access, table, index, primary_key = match.groups()
+        index = index or (f"{table}_pkey" if primary_key else None)
+
+        if index:
+            plan.indexes.add(index)
+
+        if access == "SEARCH":
+            plan.searched.add(index)
+        else:
+            plan.scans.append(detail)
+
+    return plan
+
+
+@pytest.fixture(scope="module")
+def large_dataset():
+    """Синтетические данные, достаточные для выбора индексов планировщиком; откатываются после модуля."""
+    with engine.connect() as connection:
+        transaction = connection.begin()
+
+        with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
+            employees = generate_employees(500, start_id=START_ID)
+            tasks = generate_task_forest(
+                10000,
+                [employee["id"] for employee in employees],
+                depth=4,
+                root_ratio=0.05,
+                assigned_ratio=0.95,
+                active_ratio=0.2,
+                start_id=START_ID,
+            )
+            seed_database(session, employees, tasks)
+            session.execute(text("ANALYZE"))
+            yield session
+
+        transaction.rollback()
+
+
+@pytest.mark.parametrize("query, indexes", [
+    pytest.param(lambda db: get_task(db, START_ID + 10), ["tasks_pkey"], id="get_task"),
+    pytest.param(lambda db: get_employee(db, START_ID + 10), ["employees_pkey"], id="get_employee"),
+    pytest.param(
+        lambda db: get_tasks(db, limit=100, cursor=encode_cursor("id", START_ID + 100, START_ID + 100)),
+        ["tasks_pkey"],
+        id="get_tasks_by_id",
+    ),
+    pytest.param(
+        lambda db: iter_tasks(db, executor_id=START_ID + 10),
+        ["ix_tasks_executor_id_is_active"],
+        id="iter_tasks_by_executor",
+    ),
+    pytest.param(
+        lambda db: iter_tasks(db, executor_id=START_ID + 10, is_active=True),
+        [EXECUTOR_ACTIVE_INDEXES],
+        id="iter_active_tasks_by_executor",
+    ),
+    pytest.param(get_unassigned_parent_tasks, ["ix_tasks_executor_id_is_active"], id="get_unassigned_parent_tasks"),
+    pytest.param(
+        get_important_tasks,
+        ["ix_employees_task_count", "ix_tasks_executor_id_is_active"],
+        id="get_important_tasks",
+    ),
+    pytest.param(get_min_task_count, ["ix_employees_task_count"], id="get_min_task_count"),
+    pytest.param(
+        lambda db: get_min_loaded_employees(db, 0), ["ix_employees_task_count"], id="get_min_loaded_employees"
+    ),
+    pytest.param(get_employees_tasks, [EXECUTOR_ACTIVE_INDEXES], id="get_employees_tasks"),
+    pytest.param(
+        lambda db: get_tasks(db, filters=TaskFilterSchema(is_active=True)),
+        ["ix_tasks_is_active_id"],
+        id="filter_tasks_by_is_active",
+    ),
+    pytest.param(
+        lambda db: get_tasks(db, filters=TaskFilterSchema(executor_id=START_ID + 10)),
+        ["ix_tasks_executor_id_is_active"],
+        id="filter_tasks_by_executor",
+    ),
+    pytest.param(
+        lambda db: get_tasks(db, filters=TaskFilterSchema(executor_id=START_ID + 10, is_active=False)),
+        ["ix_tasks_executor_id_is_active"],
+        id="filter_tasks_by_executor_and_is_active",
+    ),
+    pytest.param(
+        lambda db: get_tasks(db, filters=TaskFilterSchema(parent_task_id=START_ID + 10)),
+        ["ix_tasks_parent_task_id"],
+        id="filter_tasks_by_parent",
+    ),
+    pytest.param(
+        lambda db: get_tasks(
+            db,
+            order_by="deadline",
+            filters=TaskFilterSchema(deadline_from=datetime(2030, 6, 1), deadline_to=datetime(2030, 6, 2)),
+        ),
+        ["ix_tasks_deadline_id"],
+        id="filter_tasks_by_deadline",
+    ),
+    pytest.param(
+        lambda db: get_tasks(db, order_by="title", cursor=encode_cursor("title", "Task 605000", START_ID + 5000)),
+        ["ix_tasks_title"],
+        id="get_tasks_by_title",
+    ),
+    pytest.param(
+        lambda db: get_employees(db, order_by="task_count", cursor=encode_cursor("task_count", 30, START_ID)),
+        ["ix_employees_task_count"],
+        id="get_employees_by_task_count",
+    ),
+    pytest.param(
+        lambda db: get_tasks(db, filters=TaskFilterSchema(search="6000")),
+        ["ix_tasks_title_search"],
+        id="search_tasks",
+        marks=postgresql_only,
+    ),
+    pytest.param(
+        lambda db: get_employees(db, search="Employee 60012"),
+        ["ix_employees_full_name_search"],
+        id="search_employees",
+        marks=postgresql_only,
+    ),
+])
+def test_crud_queries_use_indexes(large_dataset, query, indexes):
+    # Каждый элемент indexes - индекс (или кортеж равноценных индексов), в котором план ищет строки по условию.
+    statements = capture_selects(large_dataset, query)
+    plans = [explain(large_dataset, statement, parameters) for statement, parameters in statements]
+    searched = set().union(*(plan.searched for plan in plans))
+
+    assert statements
+    for index in indexes:
+        assert searched & set(index if isinstance(index, tuple) else [index]), (index, statements)
+
+    # В PostgreSQL полный просмотр небольшой таблицы сотрудников или неизбирательного условия (например,
+    # задач с дочерними задачами для хеш-соединения) дешевле индекса и допустим. В SQLite каждое обращение
+    # к таблице должно быть поиском.
+    if engine.dialect.name == "sqlite":
+        assert [plan.scans for plan in plans] == [[] for _ in plans], statements
+
+
+@pytest.mark.parametrize("query, index", [
+    pytest.param(
+        lambda db: get_tasks(db, filters=TaskFilterSchema(has_children=True)),
+        "ix_tasks_parent_task_id",
+        id="with_children",
+    ),
+    pytest.param(
+        lambda db: get_tasks(db, filters=TaskFilterSchema(has_children=False)),
+        "ix_tasks_parent_task_id",
+        id="without_children",
+    ),
+])
+def test_unindexed_conditions_read_in_page_order(large_dataset, query, index):
+    # Фильтр has_children не задает диапазон индекса: строки читаются в порядке страницы без полной сортировки,
+    # и чтение заканчивается после limit подходящих строк.
+    (statement, parameters), = capture_selects(large_dataset, query)
+    plan = explain(large_dataset, statement, parameters)
+
+    assert index in plan.indexes and not plan.sorted
+
+
+def test_deep_deadline_cursor_reads_index_ranges(large_dataset):
+    # Курсор после всех сроков: страница читается диапазоном задач со сроком после курсора и, так как их меньше
+    # limit, диапазоном задач без срока. Каждый запрос ищет строки по условию на индекс и не сортирует их.
+    cursor = encode_cursor("deadline", "2031-01-01T00:00:00", START_ID)
+    statements = capture_selects(large_dataset, lambda db: get_tasks(db, order_by="deadline", cursor=cursor))
+    plans = [explain(large_dataset, statement, parameters) for statement, parameters in statements]
+
+    assert len(plans) == 2
+    for plan in plans:
+        assert "ix_tasks_deadline_id" in plan.searched and not plan.sorted and not plan.scans, statements
+
+    # Следующие страницы - один диапазон задач без срока после курсора.
+    cursor = encode_cursor("deadline", None, START_ID + 5000)
+    (statement, parameters), = capture_selects(
+        large_dataset, lambda db: get_tasks(db, order_by="deadline", cursor=cursor)
+    )
+    plan = explain(large_dataset, statement, parameters)
+
+    assert "ix_tasks_deadline_id" in plan.searched and not plan.sorted and not plan.scans
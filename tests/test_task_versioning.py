@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.task_crud import get_task, partial_update_task
+from app.crud.versioning import VersionConflictError
+from app.schemas.task_schemas import TaskUpdateSchema
+from tests.conftest import SQLALCHEMY_DATABASE_URL, assert_max_queries, client
+
+WORKERS = 8
+INCREMENTS = 10
+
+
+@pytest.fixture()
+def task_id():
+    task_id = client.post("/tasks/", json={"title": "0", "deadline": "3024-11-09T06:46:48"}).json()["id"]
+    yield task_id
+    client.delete(f"/tasks/{task_id}")
+
+
+def test_put_task_if_match(task_id):
+    etag = client.get(f"/tasks/{task_id}").headers["ETag"]
+    assert etag == '"1"'
+
+    # Обновление с проверкой версии выполняется одним запросом.
+    with assert_max_queries(1):
+        response = client.put(f"/tasks/{task_id}", json={"title": "1"}, headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2"'
+
+    response = client.put(f"/tasks/{task_id}", json={"title": "stale"}, headers={"If-Match": etag})
+    assert response.status_code == 409
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "1"
+
+    # Слабый ETag не подходит для If-Match, "*" подходит для любой версии.
+    assert client.put(f"/tasks/{task_id}", json={"title": "2"}, headers={"If-Match": 'W/"2"'}).status_code == 409
+    assert client.put(f"/tasks/{task_id}", json={"title": "2"}, headers={"If-Match": "*"}).status_code == 200
+    assert client.put("/tasks/999999", json={"title": "2"}, headers={"If-Match": '"1"'}).status_code == 404
+
+
+def test_put_employee_if_match():
+    employee_id = client.post("/employees/", json={"full_name": "Versioned", "position": "Tester"}).json()["id"]
+    etag = client.get(f"/employees/{employee_id}").headers["ETag"]
+
+    response = client.put(f"/employees/{employee_id}", json={"position": "Lead"}, headers={"If-Match": etag})
+    assert (response.status_code, response.headers["ETag"]) == (200, '"2"')
+    assert client.put(f"/employees/{employee_id}", json={"position": "CTO"}, headers={"If-Match": etag}).status_code == 409
+
+    client.delete(f"/employees/{employee_id}")
+
+
+def test_concurrent_updates_are_not_lost(committed, task_id):
+    # Отдельный engine с соединением для каждого потока.
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_size=WORKERS)
+    session_factory = sessionmaker(bind=engine)
+
+    def increment():
+        for _ in range(INCREMENTS):
+            while True:
+                with session_factory() as db:
+                    task = get_task(db, task_id)
+                    value, version = int(task.title), task.version
+                    try:
+                        partial_update_task(db, task_id, TaskUpdateSchema(title=str(value + 1)), versions=[version])
+                        break
+                    except VersionConflictError:
+                        # Задачу изменил другой поток: повтор с новой версией.
+                        continue
+
+    try:
+        with ThreadPoolExecutor(WORKERS) as executor:
+            for future in [executor.submit(increment) for _ in range(WORKERS)]:
+                future.result()
+    finally:
+        engine.dispose()
+
+    task = client.get(f"/tasks/{task_id}").json()
+    assert task["title"] == str(WORKERS * INCREMENTS)
+    assert client.get(f"/tasks/{task_id}").headers["ETag"] == f'"{WORKERS * INCREMENTS + 1}"'
@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy import insert, select, update
+
+from app.crud.employee_crud import get_employees_tasks, get_min_loaded_employees, repair_workload_counters
+from app.crud.task_crud import (
+    bulk_create_tasks,
+    bulk_delete_tasks,
+    bulk_update_tasks,
+    create_task,
+    delete_task,
+    get_min_task_count,
+    import_tasks,
+    partial_update_task,
+)
+from app.models.employee import Employee
+from app.schemas.task_schemas import TaskBulkUpdateSchema, TaskCreateSchema, TaskUpdateSchema
+
+# Идентификаторы синтетических данных заданы явно, чтобы не сдвигать последовательности.
+START_ID = 500000
+FIRST, SECOND = START_ID, START_ID + 1
+
+
+def counters(db, employee_id):
+    return tuple(db.execute(
+        select(Employee.task_count, Employee.active_task_count).where(Employee.id == employee_id)
+    ).one())
+
+
+@pytest.fixture()
+def employees(db_session):
+    db_session.execute(insert(Employee), [
+        {"id": FIRST, "full_name": "First", "position": "Tester"},
+        {"id": SECOND, "full_name": "Second", "position": "Tester"},
+    ])
+    return db_session
+
+
+def test_counters_follow_task_changes(employees):
+    db = employees
+    task = create_task(db, TaskCreateSchema(title="Task", executor_id=FIRST, is_active=True))
+    assert counters(db, FIRST) == (1, 1)
+
+    results = bulk_create_tasks(db, [
+        (index, TaskCreateSchema(title=f"Bulk {index}", executor_id=SECOND, is_active=index == 0))
+        for index in range(3)
+    ])
+    bulk_ids = [task_id for _, task_id, _ in results]
+    assert counters(db, SECOND) == (3, 1)
+
+    partial_update_task(db, task.id, TaskUpdateSchema(executor_id=SECOND))
+    assert (counters(db, FIRST), counters(db, SECOND)) == ((0, 0), (4, 2))
+
+    bulk_update_tasks(db, [(0, TaskBulkUpdateSchema(id=bulk_ids[0], is_active=False))])
+    assert counters(db, SECOND) == (4, 1)
+
+    delete_task(db, task.id)
+    bulk_delete_tasks(db, bulk_ids[1:])
+    assert counters(db, SECOND) == (1, 0)
+
+    result = import_tasks(db, [
+        {"id": bulk_ids[0], "title": "Moved", "executor_id": FIRST, "is_active": True},
+        {"id": START_ID, "title": "Imported", "executor_id": FIRST},
+    ])
+    assert result["imported"] == 2
+    assert (counters(db, FIRST), counters(db, SECOND)) == ((2, 1), (0, 0))
+
+    assert repair_workload_counters(db) == 0
+
+
+def test_workload_reads(employees):
+    db = employees
+    create_task(db, TaskCreateSchema(title="Task", executor_id=FIRST, is_active=True))
+
+    assert get_min_task_count(db) == 0
+    assert SECOND in [employee.id for employee in get_min_loaded_employees(db, 0)]
+    assert FIRST in [employee.id for employee in get_employees_tasks(db)]
+    assert SECOND not in [employee.id for employee in get_employees_tasks(db)]
+
+
+def test_repair_workload_counters(employees):
+    db = employees
+    create_task(db, TaskCreateSchema(title="Task", executor_id=FIRST, is_active=True))
+    db.execute(update(Employee).where(Employee.id.in_([FIRST, SECOND])).values(task_count=10, active_task_count=5))
+
+    assert repair_workload_counters(db) == 2
+    assert (counters(db, FIRST), counters(db, SECOND)) == ((1, 1), (0, 0))
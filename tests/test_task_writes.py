@@ -0,0 +1,51 @@
+from tests.conftest import assert_max_queries, client
+
+
+def test_put_task_writes_falsy_values():
+    employee_id = client.post("/employees/", json={"full_name": "Writer", "position": "Tester"}).json()["id"]
+    parent_id = client.post("/tasks/", json={"title": "Parent"}).json()["id"]
+    task_id = client.post(
+        "/tasks/", json={"title": "Falsy", "executor_id": employee_id, "is_active": True, "parent_task_id": parent_id}
+    ).json()["id"]
+
+    # Записываются только переданные поля, в том числе False и None.
+    response = client.put(f"/tasks/{task_id}", json={"is_active": False})
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": task_id, "title": "Falsy", "parent_task_id": parent_id, "executor_id": employee_id,
+        "deadline": None, "is_active": False,
+    }
+
+    response = client.put(f"/tasks/{task_id}", json={"executor_id": None, "parent_task_id": None, "title": None})
+    assert response.json()["title"] == "Falsy"
+    assert (response.json()["executor_id"], response.json()["parent_task_id"]) == (None, None)
+
+    response = client.put(f"/employees/{employee_id}", json={"position": ""})
+    assert response.json()["position"] == ""
+
+    client.delete(f"/tasks/{task_id}")
+    client.delete(f"/tasks/{parent_id}")
+    client.delete(f"/employees/{employee_id}")
+
+
+def test_write_round_trips():
+    employee_id = client.post("/employees/", json={"full_name": "Writer", "position": "Tester"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Round trips", "executor_id": employee_id}).json()["id"]
+
+    with assert_max_queries(1):
+        assert client.put(f"/tasks/{task_id}", json={"title": "Updated"}).status_code == 200
+
+    with assert_max_queries(1):
+        assert client.put(f"/employees/{employee_id}", json={"position": "Lead"}).status_code == 200
+
+    # Снятие сотрудника с задач и удаление сотрудника.
+    with assert_max_queries(2):
+        assert client.delete(f"/employees/{employee_id}").status_code == 200
+
+    assert client.get(f"/tasks/{task_id}").json()["executor_id"] is None
+
+    with assert_max_queries(1):
+        assert client.delete(f"/tasks/{task_id}").status_code == 200
+
+    for path in (f"/tasks/{task_id}", f"/employees/{employee_id}"):
+        assert client.delete(path).status_code == 404